@@ -0,0 +1,32 @@
+"""add_provisional_fields_to_analyses
+
+Revision ID: c6d2f8a41e93
+Revises: b3e7c1a9d4f2
+Create Date: 2026-10-16 14:05:21.604187
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6d2f8a41e93'
+down_revision: Union[str, Sequence[str], None] = 'b3e7c1a9d4f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Fields of a quick-preview analysis awaiting the full pipeline
+    op.add_column(
+        'analyses',
+        sa.Column('provisional_fields', sa.dialects.postgresql.JSONB, nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('analyses', 'provisional_fields')
@@ -0,0 +1,52 @@
+"""Add fingerprint index tables
+
+Revision ID: d81a5c3f07b6
+Revises: c6d2f8a41e93
+Create Date: 2026-10-16 21:24:08.532716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81a5c3f07b6'
+down_revision: Union[str, Sequence[str], None] = 'c6d2f8a41e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('track_fingerprints',
+    sa.Column('track_id', sa.Integer(), nullable=False),
+    sa.Column('audio_hash', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('hash_count', sa.Integer(), nullable=False),
+    sa.Column('duration', sa.Float(), nullable=True),
+    sa.Column('duplicate_of_id', sa.Integer(), nullable=True),
+    sa.Column('similarity', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['track_id'], ['tracks.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['duplicate_of_id'], ['tracks.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('track_id')
+    )
+    op.create_index(op.f('ix_track_fingerprints_audio_hash'), 'track_fingerprints', ['audio_hash'], unique=False)
+    op.create_table('fingerprint_hashes',
+    sa.Column('track_id', sa.Integer(), nullable=False),
+    sa.Column('hash', sa.Integer(), nullable=False),
+    sa.Column('offset', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['track_id'], ['tracks.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('track_id', 'hash', 'offset')
+    )
+    op.create_index('ix_fingerprint_hashes_hash', 'fingerprint_hashes', ['hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_fingerprint_hashes_hash', table_name='fingerprint_hashes')
+    op.drop_table('fingerprint_hashes')
+    op.drop_index(op.f('ix_track_fingerprints_audio_hash'), table_name='track_fingerprints')
+    op.drop_table('track_fingerprints')
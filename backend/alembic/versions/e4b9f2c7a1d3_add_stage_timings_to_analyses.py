@@ -0,0 +1,32 @@
+"""add_stage_timings_to_analyses
+
+Revision ID: e4b9f2c7a1d3
+Revises: d81a5c3f07b6
+Create Date: 2026-10-16 22:10:47.318265
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b9f2c7a1d3'
+down_revision: Union[str, Sequence[str], None] = 'd81a5c3f07b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Per-stage timing breakdown of the pipeline run that produced the analysis
+    op.add_column(
+        'analyses',
+        sa.Column('stage_timings', sa.dialects.postgresql.JSONB, nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('analyses', 'stage_timings')
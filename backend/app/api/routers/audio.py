@@ -1,15 +1,39 @@
 """Audio file serving endpoints."""
 
+import asyncio
 import logging
 from pathlib import Path
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import FileResponse
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    status,
+)
+from fastapi.responses import FileResponse, JSONResponse, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ...core.config import settings
 from ...core.database import get_db
-from ...models import Track, TrackAsset
+from ...models import Analysis, TrackAsset
+from ...services.audio.overview import (
+    N_BANDS,
+    Overview,
+    ensure_overview,
+    get_overview_store,
+)
+from ...services.audio.renditions import (
+    RENDITION_MEDIA_TYPE,
+    create_stream_rendition,
+    get_rendition_store,
+)
+from ...services.cache import audio_content_hash
+from ...services.compute import run_cpu_bound
 
 logger = logging.getLogger(__name__)
 
@@ -17,38 +41,71 @@ router = APIRouter()
 
 STORAGE_DIR = Path("files")
 
+# Overviews are content-addressed, so a response never changes
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
 
-@router.get("/{track_id}/stream")
-async def stream_audio(
-    track_id: int,
-    db: AsyncSession = Depends(get_db),
-) -> FileResponse:
-    """
-    Stream audio file for a track.
-    
-    Returns the audio file with appropriate headers for streaming.
-    """
-    # Get track asset
+# Audio files with a streaming rendition being transcoded by this process
+_transcoding: set[str] = set()
+
+
+async def _get_track_asset(track_id: int, db: AsyncSession) -> tuple[TrackAsset, Path]:
+    """Asset of a track and its audio file, or 404."""
     stmt = select(TrackAsset).where(TrackAsset.track_id == track_id)
     result = await db.execute(stmt)
     track_asset = result.scalar_one_or_none()
-    
+
     if not track_asset or not track_asset.audio_path:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Audio file not found for this track",
         )
-    
+
     audio_path = Path(track_asset.audio_path)
-    
+
     if not audio_path.exists():
         logger.error(f"Audio file not found on disk: {audio_path}")
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Audio file not found on disk",
         )
-    
-    # Determine media type
+    return track_asset, audio_path
+
+
+async def _get_overview(track_id: int, db: AsyncSession) -> Overview:
+    """Stored overview of a track, computed now if its analysis predates overviews."""
+    _, audio_path = await _get_track_asset(track_id, db)
+    store = get_overview_store()
+    audio_hash = await asyncio.to_thread(audio_content_hash, audio_path)
+    overview = store.get(audio_hash)
+    if overview is None:
+        await run_cpu_bound(ensure_overview, str(audio_path))
+        overview = store.get(audio_hash)
+    if overview is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not compute the audio overview",
+        )
+    return overview
+
+
+def _immutable_response(
+    request: Request, overview: Overview, content: bytes, headers: dict[str, str] | None = None
+) -> Response:
+    """Binary overview data with long-lived cache headers (304 on a matching ETag)."""
+    cache_headers = {"ETag": overview.etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == overview.etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+    return Response(
+        content=content,
+        media_type="application/octet-stream",
+        headers={**cache_headers, **(headers or {})},
+    )
+
+
+def _original_response(
+    track_id: int, track_asset: TrackAsset, audio_path: Path, **kwargs: Any
+) -> FileResponse:
+    """The uploaded file itself (Range requests get partial content)."""
     media_types = {
         "mp3": "audio/mpeg",
         "wav": "audio/wav",
@@ -56,19 +113,248 @@ async def stream_audio(
         "m4a": "audio/mp4",
         "ogg": "audio/ogg",
     }
-    
+
     media_type = media_types.get(
         track_asset.audio_format.lower() if track_asset.audio_format else "mp3",
         "audio/mpeg",
     )
-    
+
     return FileResponse(
         path=audio_path,
         media_type=media_type,
         filename=f"track_{track_id}.{track_asset.audio_format}",
+        **kwargs,
+    )
+
+
+async def _transcode_in_background(audio_path: str) -> None:
+    """Create a missing streaming rendition (tracks analyzed before renditions)."""
+    if audio_path in _transcoding:
+        return
+    _transcoding.add(audio_path)
+    try:
+        await run_cpu_bound(create_stream_rendition, audio_path)
+    except Exception as e:
+        logger.warning(f"Could not transcode streaming rendition of {audio_path}: {e}")
+    finally:
+        _transcoding.discard(audio_path)
+
+
+@router.get("/{track_id}/stream")
+async def stream_audio(
+    track_id: int,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
+) -> FileResponse:
+    """
+    Stream audio for a track.
+
+    Serves the low-bitrate AAC rendition once it exists, else the original
+    (transcoding the rendition in the background for later plays). Range
+    requests get partial content, so players can seek without downloading
+    the whole file. The original stays available at ``/download``.
+    """
+    track_asset, audio_path = await _get_track_asset(track_id, db)
+
+    cache_control = "public, max-age=31536000"
+    store = get_rendition_store()
+    if store is not None:
+        audio_hash = await asyncio.to_thread(audio_content_hash, audio_path)
+        rendition = store.stream_path(audio_hash)
+        if rendition.exists():
+            return FileResponse(
+                path=rendition,
+                media_type=RENDITION_MEDIA_TYPE,
+                headers={"Cache-Control": cache_control},
+            )
+        background_tasks.add_task(_transcode_in_background, str(audio_path))
+        # Short-lived, so players switch to the rendition once it exists
+        cache_control = "public, max-age=300"
+
+    return _original_response(
+        track_id,
+        track_asset,
+        audio_path,
+        content_disposition_type="inline",
+        headers={"Cache-Control": cache_control},
+    )
+
+
+@router.get("/{track_id}/download")
+async def download_audio(
+    track_id: int,
+    db: AsyncSession = Depends(get_db),
+) -> FileResponse:
+    """Download the original uploaded audio file of a track."""
+    track_asset, audio_path = await _get_track_asset(track_id, db)
+    return _original_response(
+        track_id,
+        track_asset,
+        audio_path,
+        headers={"Cache-Control": "public, max-age=31536000"},
+    )
+
+
+async def _get_hook_segments(track_id: int, db: AsyncSession) -> list[dict[str, Any]]:
+    """Top viral segments of a track's latest analysis (clip order)."""
+    result = await db.execute(
+        select(Analysis)
+        .where(Analysis.track_id == track_id)
+        .order_by(Analysis.created_at.desc())
+        .limit(1)
+    )
+    analysis = result.scalar_one_or_none()
+    hook_data = (analysis.hook_data if analysis else None) or {}
+    return (hook_data.get("viral_segments") or [])[: settings.HOOK_CLIPS_TOP_N]
+
+
+@router.get("/{track_id}/clips")
+async def list_hook_clips(
+    track_id: int,
+    db: AsyncSession = Depends(get_db),
+) -> list[dict[str, Any]]:
+    """
+    List the pre-cut clips of a track's top viral segments, best first.
+
+    Each clip is served at ``/clips/{rank}`` (rank 1 = best segment).
+    """
+    await _get_track_asset(track_id, db)
+    if get_rendition_store() is None:
+        return []
+    segments = await _get_hook_segments(track_id, db)
+    return [
+        {
+            "rank": rank,
+            "start_time": segment["start_time"],
+            "end_time": segment["end_time"],
+            "score": segment.get("score"),
+            "url": f"{settings.API_V1_STR}/audio/{track_id}/clips/{rank}",
+        }
+        for rank, segment in enumerate(segments, start=1)
+    ]
+
+
+@router.get("/{track_id}/clips/{rank}")
+async def get_hook_clip(
+    track_id: int,
+    rank: int,
+    db: AsyncSession = Depends(get_db),
+) -> FileResponse:
+    """
+    Serve the clip of one of a track's top viral segments.
+
+    Clips are cut during analysis; older tracks get theirs cut on request.
+    """
+    _, audio_path = await _get_track_asset(track_id, db)
+    store = get_rendition_store()
+    segments = await _get_hook_segments(track_id, db)
+    if store is None or not 1 <= rank <= len(segments):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Hook clip not found",
+        )
+
+    segment = segments[rank - 1]
+    audio_hash = await asyncio.to_thread(audio_content_hash, audio_path)
+    clip = await run_cpu_bound(
+        store.ensure_clip,
+        str(audio_path),
+        audio_hash,
+        segment["start_time"],
+        segment["end_time"],
+    )
+    # The URL names a rank, whose segment changes if the track is re-analyzed
+    return FileResponse(
+        path=clip,
+        media_type=RENDITION_MEDIA_TYPE,
+        headers={"Cache-Control": "public, max-age=3600"},
+    )
+
+
+@router.get("/{track_id}/overview")
+async def get_audio_overview(
+    track_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """
+    Describe the precomputed waveform and spectrogram of a track.
+
+    Lists the zoom levels of the waveform (samples per bin, bin count) and
+    of the spectrogram (frames per column, columns, tiles), the sample rate,
+    the band frequencies and the quantization, for reading the binary
+    ``/waveform`` and ``/spectrogram`` responses.
+    """
+    overview = await _get_overview(track_id, db)
+    if request.headers.get("if-none-match") == overview.etag:
+        return _immutable_response(request, overview, b"")
+    return JSONResponse(
+        content={key: value for key, value in overview.meta.items() if key != "created_at"},
+        headers={"ETag": overview.etag, "Cache-Control": IMMUTABLE_CACHE_CONTROL},
+    )
+
+
+@router.get("/{track_id}/waveform")
+async def get_waveform(
+    track_id: int,
+    request: Request,
+    zoom: int = Query(0, ge=0, description="Zoom level, 0 = finest (see /overview)"),
+    start: float = Query(0.0, ge=0, description="Start time in seconds"),
+    end: float | None = Query(None, gt=0, description="End time in seconds (default: end of track)"),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """
+    Waveform peaks of a track at one zoom level.
+
+    The body is little-endian int16 (min, max, rms) triples, one per bin,
+    scaled so 32767 is full scale. ``X-Start-Bin`` is the index of the first
+    bin returned, ``X-Samples-Per-Bin`` and ``X-Sample-Rate`` give its time.
+    """
+    overview = await _get_overview(track_id, db)
+    levels = overview.meta["waveform"]["levels"]
+    if zoom >= len(levels):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Zoom level must be below {len(levels)}",
+        )
+    content, first_bin = await asyncio.to_thread(overview.waveform, zoom, start, end)
+    return _immutable_response(
+        request,
+        overview,
+        content,
         headers={
-            "Accept-Ranges": "bytes",
-            "Cache-Control": "public, max-age=31536000",
+            "X-Start-Bin": str(first_bin),
+            "X-Samples-Per-Bin": str(levels[zoom]["samples_per_bin"]),
+            "X-Sample-Rate": str(overview.meta["sample_rate"]),
         },
     )
 
+
+@router.get("/{track_id}/spectrogram/{zoom}/{tile}")
+async def get_spectrogram_tile(
+    track_id: int,
+    zoom: int,
+    tile: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """
+    One spectrogram tile of a track.
+
+    The body is uint8 columns of mel-band levels, lowest band first;
+    ``X-Columns`` gives the column count (the last tile may be short).
+    """
+    overview = await _get_overview(track_id, db)
+    levels = overview.meta["spectrogram"]["levels"]
+    if not 0 <= zoom < len(levels) or not 0 <= tile < levels[zoom]["tiles"]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Spectrogram tile not found",
+        )
+    content = await asyncio.to_thread(overview.spectrogram_tile, zoom, tile)
+    return _immutable_response(
+        request,
+        overview,
+        content,
+        headers={"X-Columns": str(len(content) // N_BANDS), "X-Bands": str(N_BANDS)},
+    )
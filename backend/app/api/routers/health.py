@@ -1,17 +1,21 @@
 """Health check and system status endpoints."""
 
+import asyncio
 import logging
 import os
 import time
 from datetime import datetime
 from typing import Any
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...core.config import settings
 from ...core.database import get_db
+from ...services.inference import InferenceError, batching_stats, get_inference_client
+from ...services.instrumentation import render_metrics
+from ...services.models import get_model_registry
 
 logger = logging.getLogger(__name__)
 
@@ -157,6 +161,35 @@ async def liveness_check() -> dict[str, Any]:
     }
 
 
+@router.get("/health/models", status_code=status.HTTP_200_OK)
+async def model_status() -> dict[str, Any]:
+    """
+    Models resident in this worker process.
+
+    Reports each model's memory, load time and usage, plus the registry's
+    memory budget and the process RSS.
+    """
+    return get_model_registry().stats()
+
+
+@router.get("/health/inference", status_code=status.HTTP_200_OK)
+async def inference_status() -> dict[str, Any]:
+    """
+    Classifier micro-batching histograms.
+
+    Reports batch sizes and queue waits for batches formed in this worker
+    process and, when it is enabled, on the inference server.
+    """
+    stats: dict[str, Any] = {"process": batching_stats()}
+    client = get_inference_client()
+    if client is not None:
+        try:
+            stats["server"] = await asyncio.to_thread(client.call, "batching_stats")
+        except InferenceError as e:
+            stats["server"] = {"error": str(e)}
+    return stats
+
+
 @router.get("/metrics", status_code=status.HTTP_200_OK)
 async def metrics() -> dict[str, Any]:
     """
@@ -171,3 +204,21 @@ async def metrics() -> dict[str, Any]:
             "environment": settings.ENVIRONMENT,
         },
     }
+
+
+@router.get("/metrics/prometheus", status_code=status.HTTP_200_OK)
+async def prometheus_metrics() -> Response:
+    """
+    Prometheus scrape endpoint.
+
+    Exposes the analysis stage histograms: wall time, CPU time and peak RSS
+    growth per stage, analyzer and LLM call.
+    """
+    rendered = render_metrics()
+    if rendered is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="prometheus_client is not installed",
+        )
+    payload, content_type = rendered
+    return Response(content=payload, media_type=content_type)
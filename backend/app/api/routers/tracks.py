@@ -5,6 +5,7 @@ import json
 import logging
 from json import JSONDecodeError
 from pathlib import Path
+import tempfile
 
 import aiofiles
 from fastapi import APIRouter, Body, Depends, File, Form, HTTPException, UploadFile, status
@@ -12,12 +13,16 @@ from pydantic import ValidationError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ...core.config import settings
 from ...core.database import get_db
 from ...core.security import get_current_user_id, get_current_user_id_optional
-from ...models import Analysis, Artist, Track, TrackAsset, TrackTags, PitchCopy, User
+from ...models import Analysis, AnalysisJob, Artist, Track, TrackAsset, TrackTags, PitchCopy, User
 from ...schemas.track import (
     AnalysisResult,
+    AnalysisStageStatus,
     AnalysisStatus,
+    AudioLookupResult,
+    AudioMatch,
     TrackUploadPayload,
     TrackUploadResponse,
     TrackWithAnalysis,
@@ -26,19 +31,18 @@ from ...schemas.track import (
 from ...schemas.track import (
     Track as TrackSchema,
 )
-from ...services.ai_enhancement import (
-    explain_genre_with_ai,
-    explain_hooks_with_ai,
-    predict_breakout_with_ai,
-)
-from ...services.ai_tagging.mood_classifier import MoodClassifier
-from ...services.ai_tagging.pitch_generator import PitchGenerator
-from ...services.audio.feature_extraction import extract_audio_features
-from ...services.audio.transcription import get_transcriber
-from ...services.classification import detect_genre, detect_genre_hybrid
-from ...services.embeddings.search import create_embedding_for_track
-from ...services.lyrics.acquisition import LyricsAcquisition
+from ...services.compute import run_cpu_bound
 from ...services.lyrics.analysis import analyze_lyrics
+from ...services.pipeline import (
+    JOB_STAGES,
+    DuplicateMatch,
+    deduplicate_upload,
+    enqueue_analysis_job,
+    find_by_content_hash,
+    find_duplicate,
+    fingerprint_upload,
+    run_analysis_pipeline,
+)
 from ...services.scoring import calculate_tunescore
 
 logger = logging.getLogger(__name__)
@@ -53,6 +57,23 @@ ALLOWED_AUDIO_EXTENSIONS = {".mp3", ".wav", ".flac", ".m4a", ".ogg"}
 MAX_FILE_SIZE = 500 * 1024 * 1024  # 500MB
 
 
+async def _audio_match(db: AsyncSession, match: DuplicateMatch) -> AudioMatch:
+    """Describe a fingerprint match against one of the caller's tracks."""
+    analyzed = (
+        await db.execute(
+            select(Analysis.id)
+            .where(Analysis.track_id == match.track_id, Analysis.provisional_fields.is_(None))
+            .limit(1)
+        )
+    ).scalar_one_or_none() is not None
+    return AudioMatch(
+        track_id=match.track_id,
+        similarity=match.similarity,
+        exact=match.exact,
+        analyzed=analyzed,
+    )
+
+
 @router.post(
     "/upload", response_model=TrackUploadResponse, status_code=status.HTTP_201_CREATED
 )
@@ -69,9 +90,13 @@ async def upload_track(
     This endpoint:
     1. Validates and saves the audio file
     2. Creates track and artist records
-    3. Performs audio analysis (sonic genome + hook detection)
-    4. Performs lyrical analysis if lyrics provided
-    5. Returns track info and analysis results
+    3. Queues the analysis job for a worker, which fingerprints the audio,
+       stores a provisional preview analysis and runs the full pipeline
+       (with the queue disabled, fingerprinting and the pipeline run inline)
+    4. Returns track info; poll /tracks/{id}/status for progress
+
+    A duplicate of one of the user's analyzed tracks reuses its analysis; a
+    duplicate of another user's track only its audio analysis.
     """
     # Parse metadata payload
     try:
@@ -192,292 +217,64 @@ async def upload_track(
         db.add(track_asset)
         await db.flush()  # Ensure track_asset has an ID before updating
 
-        # Perform audio analysis
-        logger.info(f"Starting audio analysis for track {track.id}")
-        try:
-            sonic_genome, hook_data, quality_metrics, mastering_quality, chord_analysis = extract_audio_features(str(audio_path))
-
-            # Update track duration
-            track.duration = sonic_genome.get("duration")
-
-        except Exception as e:
-            logger.error(f"Audio analysis failed for track {track.id}: {e}")
-            sonic_genome = None
-            hook_data = None
-            quality_metrics = None
-            mastering_quality = None
-            chord_analysis = None
-
-        # Lyrics acquisition using multi-source orchestrator
-        lyrics_acquisition = LyricsAcquisition()
-        lyrics_result = await lyrics_acquisition.get_lyrics(
-            audio_path=str(audio_path) if audio_path else None,
-            track_title=track.title,
-            artist_name=artist_name,
-            duration=sonic_genome.get("duration") if sonic_genome else None,
-            provided_lyrics=lyrics_text,
-        )
-        
-        # Update lyrics text and metadata
-        lyrics_text = lyrics_result["text"] if lyrics_result["success"] else None
-        lyrics_source = lyrics_result["source"]
-        lyrics_confidence = lyrics_result["confidence"]
-        lyrics_language = lyrics_result.get("language")
-        lyrics_metadata = lyrics_result.get("metadata", {})
-        
-        # Update track asset with lyrics provenance
-        track_asset.lyrics_text = lyrics_text
-        track_asset.lyrics_source = lyrics_source
-        track_asset.lyrics_confidence = lyrics_confidence
-        track_asset.lyrics_language = lyrics_language
-        track_asset.lyrics_metadata = lyrics_metadata
-        
-        # Build transcription result for response
-        transcription_result = None
-        if lyrics_result["success"] and lyrics_source != "user":
-            transcription_result = TranscriptionResult(
-                text=lyrics_result["text"],
-                language=lyrics_language or "en",
-                confidence=lyrics_confidence,
-                success=True,
-                verified=False,
+        if settings.ANALYSIS_QUEUE_ENABLED:
+            # Fingerprinting, the preview and the full analysis all decode the
+            # audio, so they run in a worker; the file and job are committed
+            # together
+            job = await enqueue_analysis_job(
+                db,
+                track.id,
+                artist_name=artist_name,
+                verify_lyrics=payload.verify_lyrics,
             )
-        
-        # Handle lyrics verification if requested
-        lyrics_verification = None
-        if payload.verify_lyrics and lyrics_text and audio_path and lyrics_source == "user":
-            logger.info(f"Verifying user-provided lyrics for track {track.id}")
-            try:
-                transcriber = get_transcriber()
-                transcription = transcriber.transcribe_lyrics(str(audio_path))
-                
-                if transcription["success"] and transcription["text"]:
-                    comparison = transcriber.compare_lyrics(
-                        lyrics_text, 
-                        transcription["text"]
-                    )
-                    lyrics_verification = comparison
-                    logger.info(
-                        f"Lyrics verification complete. Similarity: {comparison['similarity_score']:.2f}"
-                    )
-            except Exception as e:
-                logger.error(f"Lyrics verification failed for track {track.id}: {e}")
-        
-        # Perform lyrical analysis if lyrics available
-        lyrical_genome = None
-        if lyrics_text:
-            logger.info(f"Starting lyrical analysis for track {track.id}")
-            try:
-                # Pass track title and artist name for AI context
-                lyrical_genome = analyze_lyrics(
-                    lyrics_text,
-                    track_title=track.title,
-                    artist_name=payload.artist_name
-                )
-            except Exception as e:
-                logger.error(f"Lyrical analysis failed for track {track.id}: {e}")
-
-        # Calculate TuneScore
-        logger.info(f"Calculating TuneScore for track {track.id}")
-        tunescore_data = calculate_tunescore(
-            sonic_genome or {},
-            lyrical_genome,
-            hook_data,
-        )
-        
-        # Detect genre using hybrid (ML + instruments + heuristics)
-        logger.info(f"Detecting genre for track {track.id}")
-        try:
-            genre_data = detect_genre_hybrid(
-                str(audio_path) if audio_path else None,
-                sonic_genome or {},
-                lyrical_genome,
+            await db.commit()
+            await db.refresh(track)
+
+            return TrackUploadResponse(
+                track=TrackSchema.from_orm(track),
+                analysis_started=True,
+                message="Track uploaded; analysis queued",
+                job_id=job.id,
             )
-        except Exception as exc:  # pragma: no cover - resilience
-            logger.warning(f"Hybrid genre detection failed, falling back: {exc}")
-            genre_data = detect_genre(sonic_genome or {}, lyrical_genome)
-        
-        # Extract AI critique from lyrical genome if present
-        ai_lyric_critique = None
-        if lyrical_genome and lyrical_genome.get('ai_critique'):
-            ai_lyric_critique = lyrical_genome['ai_critique']
-        
-        # Create analysis record with enhanced data
-        analysis = Analysis(
-            track_id=track.id,
-            sonic_genome=sonic_genome or {},
-            lyrical_genome=lyrical_genome or {},
-            hook_data=hook_data or {},
-            tunescore=tunescore_data,
-            genre_predictions=genre_data,
-            quality_metrics=quality_metrics or {},
-            mastering_quality=mastering_quality or {},
-            chord_analysis=chord_analysis or {},
-            ai_lyric_critique=ai_lyric_critique,  # Populate from auto-analysis
-        )
-        db.add(analysis)
-
-        # Generate embedding for RIYL
-        logger.info(f"Generating embedding for track {track.id}")
-        try:
-            await create_embedding_for_track(track.id, db)
-        except Exception as e:
-            logger.error(f"Embedding generation failed for track {track.id}: {e}")
 
-        # ===== UNGATED AI FEATURES =====
-        # Generate tags automatically (no button click needed!)
-        logger.info(f"Generating AI tags for track {track.id}")
-        track_tags = None
-        try:
-            classifier = MoodClassifier()
-            mood_data = classifier.classify(sonic_genome or {}, lyrical_genome)
-            commercial_tags = classifier.classify_commercial_tags(sonic_genome or {})
-            
-            track_tags = TrackTags(
-                track_id=track.id,
-                moods=mood_data.get("moods", []),
-                commercial_tags=commercial_tags,
-                use_cases=mood_data.get("use_cases", []),
-                sounds_like=mood_data.get("sounds_like", [])
-            )
-            db.add(track_tags)
-            logger.info(f"✅ Tags generated: {len(track_tags.moods)} moods, {len(commercial_tags)} commercial tags")
-        except Exception as e:
-            logger.error(f"Tag generation failed for track {track.id}: {e}")
-
-        # Generate pitch copy automatically (if AI available)
-        logger.info(f"Generating AI pitch copy for track {track.id}")
-        pitch_copy = None
-        try:
-            pitch_generator = PitchGenerator()
-            pitch_data = pitch_generator.generate_pitch(
-                track_title=track.title,
-                artist_name=payload.artist_name,
-                sonic_genome=sonic_genome or {},
-                lyrical_genome=lyrical_genome,
-                tags={
-                    "moods": track_tags.moods if track_tags else [],
-                    "commercial_tags": track_tags.commercial_tags if track_tags else [],
-                    "sounds_like": track_tags.sounds_like if track_tags else [],
-                } if track_tags else None
-            )
-            
-            pitch_copy = PitchCopy(
-                track_id=track.id,
-                elevator_pitch=pitch_data.get("elevator_pitch"),
-                short_description=pitch_data.get("short_description"),
-                sync_pitch=pitch_data.get("sync_pitch"),
-                cost=pitch_data.get("cost"),
-                generated_at=pitch_data.get("generated_at")
-            )
-            db.add(pitch_copy)
-            logger.info(f"✅ Pitch copy generated (cost: ${pitch_data.get('cost', 0):.4f})")
-        except ValueError as e:
-            logger.warning(f"Pitch generation unavailable (no AI key): {e}")
-        except Exception as e:
-            logger.error(f"Pitch generation failed for track {track.id}: {e}")
-        
-        # ===== PHASE 2: AI-ENHANCED HEURISTICS =====
-        ai_enhancements = {}
-        total_ai_cost = 0.0
-        
-        # AI Genre Reasoning
-        if genre_data and sonic_genome:
-            logger.info(f"Generating AI genre reasoning for track {track.id}")
-            try:
-                genre_reasoning = explain_genre_with_ai(
-                    track_title=track.title,
-                    artist_name=payload.artist_name,
-                    sonic_genome=sonic_genome,
-                    genre_predictions=genre_data,
-                    lyrical_themes=lyrical_genome.get("themes", []) if lyrical_genome else None
-                )
-                if genre_reasoning:
-                    ai_enhancements["genre_reasoning"] = genre_reasoning
-                    total_ai_cost += genre_reasoning.get("cost", 0)
-                    logger.info(f"✅ Genre reasoning: ${genre_reasoning.get('cost', 0):.4f}")
-            except Exception as e:
-                logger.error(f"Genre reasoning failed: {e}")
-        
-        # AI Hook Explanation
-        if hook_data:
-            logger.info(f"Generating AI hook explanation for track {track.id}")
-            try:
-                hook_explanation = explain_hooks_with_ai(
-                    track_title=track.title,
-                    hook_data=hook_data,
-                    lyrical_sections=lyrical_genome.get("sections", []) if lyrical_genome else None,
-                    sonic_genome=sonic_genome
+        # A copy of the user's own analyzed track skips the pipeline, a copy
+        # of anyone's skips the audio analyzers
+        reuse_audio_from = None
+        if settings.FINGERPRINT_ENABLED:
+            cloned, match = await deduplicate_upload(db, track, track_asset)
+            if cloned is not None:
+                duplicate = await _audio_match(db, match)
+                await db.commit()
+                await db.refresh(track)
+                return TrackUploadResponse(
+                    track=TrackSchema.from_orm(track),
+                    analysis_started=False,
+                    message=(
+                        "Track uploaded; identical audio was already analyzed, "
+                        "so its analysis was reused"
+                    ),
+                    duplicate_of=duplicate,
                 )
-                if hook_explanation:
-                    ai_enhancements["hook_explanation"] = hook_explanation
-                    total_ai_cost += hook_explanation.get("cost", 0)
-                    logger.info(f"✅ Hook explanation: ${hook_explanation.get('cost', 0):.4f}")
-            except Exception as e:
-                logger.error(f"Hook explanation failed: {e}")
-        
-        # AI Breakout Prediction
-        if tunescore_data and genre_data:
-            logger.info(f"Generating AI breakout prediction for track {track.id}")
-            try:
-                primary_genre = genre_data.get("top_genres", [{}])[0].get("genre", "Unknown") if genre_data.get("top_genres") else "Unknown"
-                breakout_prediction = predict_breakout_with_ai(
-                    track_title=track.title,
-                    artist_name=payload.artist_name,
-                    tunescore=tunescore_data,
-                    genre=primary_genre,
-                    moods=track_tags.moods if track_tags else [],
-                    hook_strength=hook_data.get("hook_strength", 0.5) if hook_data else 0.5,
-                    track_duration=sonic_genome.get("duration", None) if sonic_genome else None
-                )
-                if breakout_prediction:
-                    ai_enhancements["breakout_prediction"] = breakout_prediction
-                    total_ai_cost += breakout_prediction.get("cost", 0)
-                    logger.info(f"✅ Breakout prediction: ${breakout_prediction.get('cost', 0):.4f}")
-            except Exception as e:
-                logger.error(f"Breakout prediction failed: {e}")
-        
-        # Update analysis with AI enhancements
-        if ai_enhancements:
-            # Store in a new field or merge into existing
-            import json
-            current_ai_costs = analysis.ai_costs or {}
-            current_ai_costs.update({
-                "genre_reasoning": ai_enhancements.get("genre_reasoning", {}).get("cost", 0),
-                "hook_explanation": ai_enhancements.get("hook_explanation", {}).get("cost", 0),
-                "breakout_prediction": ai_enhancements.get("breakout_prediction", {}).get("cost", 0),
-                "phase2_total": total_ai_cost,
-                "grand_total": current_ai_costs.get("total", 0) + total_ai_cost
-            })
-            analysis.ai_costs = current_ai_costs
-            
-            # Store AI enhancements in genre_predictions for now (we can add a dedicated field later)
-            if genre_data:
-                genre_data["ai_reasoning"] = ai_enhancements.get("genre_reasoning")
-                analysis.genre_predictions = genre_data
-            
-            # Store hook explanation in hook_data
-            if hook_data and ai_enhancements.get("hook_explanation"):
-                hook_data["ai_explanation"] = ai_enhancements.get("hook_explanation")
-                analysis.hook_data = hook_data
-            
-            # Store breakout prediction in tunescore
-            if tunescore_data and ai_enhancements.get("breakout_prediction"):
-                tunescore_data["ai_breakout"] = ai_enhancements.get("breakout_prediction")
-                analysis.tunescore = tunescore_data
-            
-            logger.info(f"✅ Phase 2 AI enhancements complete: ${total_ai_cost:.4f}")
-        # ===== END PHASE 2 =====
-        # ===== END UNGATED AI FEATURES =====
+            reuse_audio_from = match.track_id if match else None
+
+        pipeline_result = await run_analysis_pipeline(
+            db,
+            track,
+            track_asset,
+            artist_name=artist_name,
+            verify_lyrics=payload.verify_lyrics,
+            reuse_audio_from=reuse_audio_from,
+        )
 
         await db.commit()
         await db.refresh(track)
 
+        transcription = pipeline_result["transcription"]
         return TrackUploadResponse(
             track=TrackSchema.from_orm(track),
             analysis_started=True,
-            message=f"Track uploaded with full AI analysis! (AI cost: ${current_ai_costs.get('grand_total', 0):.4f})" if ai_enhancements else "Track uploaded and analyzed successfully (AI features included!)",
-            transcription=transcription_result,
+            message=f"Track uploaded with full AI analysis! (AI cost: ${pipeline_result['ai_cost']:.4f})" if pipeline_result["ai_enhanced"] else "Track uploaded and analyzed successfully (AI features included!)",
+            transcription=TranscriptionResult(**transcription) if transcription else None,
         )
 
     except Exception as e:
@@ -489,6 +286,84 @@ async def upload_track(
         )
 
 
+@router.get("/lookup/{audio_hash}", response_model=AudioLookupResult)
+async def lookup_audio_hash(
+    audio_hash: str,
+    db: AsyncSession = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
+) -> AudioLookupResult:
+    """
+    Check whether the caller already uploaded a file with this SHA-256.
+
+    One indexed lookup, so clients can hash a file locally and skip the
+    upload. Only finds byte-identical files among the caller's own tracks;
+    POST the file to /tracks/lookup to also find re-encoded copies.
+    """
+    if len(audio_hash) != 64 or any(c not in "0123456789abcdefABCDEF" for c in audio_hash):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="audio_hash must be a SHA-256 hex digest",
+        )
+
+    row = await find_by_content_hash(db, audio_hash, user_id=current_user_id)
+    if row is None:
+        return AudioLookupResult(analyzed=False)
+
+    match = await _audio_match(
+        db, DuplicateMatch(track_id=row.track_id, similarity=1.0, exact=True)
+    )
+    return AudioLookupResult(analyzed=match.analyzed, match=match)
+
+
+@router.post("/lookup", response_model=AudioLookupResult)
+async def lookup_audio_file(
+    audio_file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id),
+) -> AudioLookupResult:
+    """
+    Check whether the caller already uploaded a file's audio.
+
+    Matches byte-identical files and re-encoded or resampled copies among
+    the caller's own tracks through the fingerprint index. Nothing is stored.
+    """
+    file_ext = Path(audio_file.filename or "").suffix.lower()
+    if file_ext not in ALLOWED_AUDIO_EXTENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid file type. Allowed: {', '.join(ALLOWED_AUDIO_EXTENSIONS)}",
+        )
+
+    with tempfile.TemporaryDirectory(prefix="lookup-") as tmp_dir:
+        audio_path = Path(tmp_dir) / f"audio{file_ext}"
+        file_size = 0
+        async with aiofiles.open(audio_path, "wb") as f:
+            while chunk := await audio_file.read(1024 * 1024):
+                file_size += len(chunk)
+                if file_size > MAX_FILE_SIZE:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"File too large (max: {MAX_FILE_SIZE / (1024 * 1024):.0f}MB)",
+                    )
+                await f.write(chunk)
+
+        try:
+            audio_hash, fingerprint = await fingerprint_upload(str(audio_path))
+        except Exception as e:
+            logger.error(f"Fingerprinting lookup file failed: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Could not decode audio file",
+            ) from e
+
+    match = await find_duplicate(db, audio_hash, fingerprint, user_id=current_user_id)
+    if match is None:
+        return AudioLookupResult(analyzed=False)
+
+    audio_match = await _audio_match(db, match)
+    return AudioLookupResult(analyzed=audio_match.analyzed, match=audio_match)
+
+
 @router.get("/{track_id}", response_model=TrackWithAnalysis)
 async def get_track(
     track_id: int,
@@ -578,6 +453,7 @@ async def get_track(
         mastering_quality=analysis.mastering_quality if analysis else None,
         chord_analysis=analysis.chord_analysis if analysis else None,
         ai_lyric_critique=analysis.ai_lyric_critique if analysis else None,
+        provisional_fields=analysis.provisional_fields if analysis else None,
         ai_tags=ai_tags,
         ai_pitch=ai_pitch,
         track_tags=ai_tags,  # Frontend expects this field name
@@ -649,10 +525,57 @@ async def get_analysis_status(
         select(Analysis)
         .where(Analysis.track_id == track_id)
         .order_by(Analysis.created_at.desc())
+        .limit(1)
     )
     result = await db.execute(stmt)
     analysis = result.scalar_one_or_none()
 
+    # Preview estimates do not count as complete
+    provisional_fields = list((analysis.provisional_fields if analysis else None) or [])
+    sonic_complete = bool(analysis and analysis.sonic_genome) and (
+        "sonic_genome" not in provisional_fields
+    )
+    lyrical_complete = bool(analysis and analysis.lyrical_genome)
+    hook_complete = bool(analysis and analysis.hook_data) and "hook_data" not in provisional_fields
+
+    # Get latest queued job (tracks analyzed inline have none)
+    stmt = (
+        select(AnalysisJob)
+        .where(AnalysisJob.track_id == track_id)
+        .order_by(AnalysisJob.created_at.desc())
+        .limit(1)
+    )
+    result = await db.execute(stmt)
+    job = result.scalar_one_or_none()
+
+    if job is not None:
+        job_stages = job.stages or {}
+        stages = [
+            AnalysisStageStatus(name=name, **job_stages.get(name, {"status": "pending"}))
+            for name in JOB_STAGES
+        ]
+        finished = sum(
+            1 for stage in stages if stage.status in ("completed", "failed", "skipped")
+        )
+        status_str = {
+            "queued": "pending",
+            "running": "processing",
+        }.get(job.status, job.status)
+
+        return AnalysisStatus(
+            track_id=track_id,
+            status=status_str,
+            sonic_genome_complete=sonic_complete,
+            lyrical_genome_complete=lyrical_complete,
+            hook_detection_complete=hook_complete,
+            error=job.error,
+            job_id=job.id,
+            current_stage=job.stage,
+            progress=1.0 if job.status == "completed" else finished / len(stages),
+            stages=stages,
+            provisional_fields=provisional_fields,
+        )
+
     if not analysis:
         return AnalysisStatus(
             track_id=track_id,
@@ -662,11 +585,6 @@ async def get_analysis_status(
             hook_detection_complete=False,
         )
 
-    # Check what's complete
-    sonic_complete = bool(analysis.sonic_genome)
-    lyrical_complete = bool(analysis.lyrical_genome)
-    hook_complete = bool(analysis.hook_data)
-
     status_str = "completed" if sonic_complete and hook_complete else "processing"
 
     return AnalysisStatus(
@@ -675,6 +593,8 @@ async def get_analysis_status(
         sonic_genome_complete=sonic_complete,
         lyrical_genome_complete=lyrical_complete,
         hook_detection_complete=hook_complete,
+        progress=1.0 if status_str == "completed" else 0.0,
+        provisional_fields=provisional_fields,
     )
 
 
@@ -922,7 +842,8 @@ async def update_lyrics(
                 artist_name = artist.name
         
         # Perform lyrical analysis
-        lyrical_genome = analyze_lyrics(
+        lyrical_genome = await run_cpu_bound(
+            analyze_lyrics,
             lyrics.strip(),
             track_title=track.title,
             artist_name=artist_name or ""
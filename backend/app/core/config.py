@@ -105,8 +105,80 @@ class Settings(BaseSettings):
 
     # Analysis Configuration
     DEFAULT_AI_MODEL: str = "claude-3-5-sonnet-20241022"
-    MAX_CONCURRENT_ANALYSES: int = 5
-    ANALYSIS_TIMEOUT: int = 300  # 5 minutes
+    MAX_CONCURRENT_ANALYSES: int = 5  # Analysis process pool size (0 = one per CPU)
+    ANALYSIS_TIMEOUT: int = 300  # 5 minutes, per CPU-bound analysis task
+    ANALYSIS_IO_TIMEOUT: int = 120  # Seconds per LLM pipeline stage (0 = no limit)
+    ANALYSIS_POOL_ENABLED: bool = True  # False runs CPU-bound analysis in threads
+    ANALYSIS_POOL_MAX_TASKS_PER_CHILD: int = 50  # Recycle workers to cap memory growth
+    ANALYSIS_STREAMING_MIN_DURATION: int = 1200  # Seconds; longer audio is streamed (0 = never)
+    ANALYSIS_PREVIEW_ENABLED: bool = True  # Provisional TuneScore from an excerpt before the full analysis
+    ANALYSIS_PREVIEW_SECONDS: float = 30.0  # Excerpt length around the loudest region
+    AUDIO_DECODE_MEMO_MB: int = 512  # Decoded audio kept in memory per process (0 = none)
+    FINGERPRINT_ENABLED: bool = True  # Reuse the analysis of duplicate uploads
+    FINGERPRINT_MATCH_THRESHOLD: float = 0.25  # Aligned-hash share for a near-duplicate
+    FINGERPRINT_DURATION_TOLERANCE: float = 0.05  # Max relative length difference of a near-duplicate
+
+    # Model Registry (Whisper, HuBERT, AST, MiniLM, BART-MNLI, DistilBART, Demucs)
+    MODEL_PRELOAD: str = ""  # Comma-separated specs loaded at startup, e.g. "genre_hubert,whisper:small"
+    MODEL_PRELOAD_BEFORE_FORK: bool = False  # Preload at import for fork-based servers (gunicorn --preload)
+    MODEL_MEMORY_BUDGET_MB: int = 0  # Evict least recently used models above this (0 = unlimited)
+
+    # Classifier backends: "torch", "onnx" (fp32) or "onnx-int8" (needs onnxruntime)
+    GENRE_MODEL_BACKEND: str = "torch"  # HuBERT genre classifier
+    INSTRUMENT_MODEL_BACKEND: str = "torch"  # AST instrument classifier
+    ONNX_CACHE_DIR: str = "files/cache/onnx"  # Exported/quantized models
+    ONNX_INTRA_OP_THREADS: int = 0  # Threads per ONNX session (0 = onnxruntime default)
+    ONNX_PARITY_CHECK: bool = True  # Compare exports with PyTorch before first use
+    ONNX_PARITY_MAX_DIFF: float = 0.05  # Largest allowed probability difference
+    ONNX_PARITY_MIN_TOP1: float = 0.85  # Share of fixture clips whose top label must match
+
+    # Lyrics transcription
+    TRANSCRIPTION_BACKEND: str = "auto"  # "faster-whisper", "whisper" or "auto" (faster-whisper if installed)
+    TRANSCRIPTION_COMPUTE_TYPE: str = "int8"  # CTranslate2 compute type for faster-whisper
+    TRANSCRIPTION_VAD: bool = True  # Skip non-vocal regions
+    TRANSCRIPTION_VAD_ON_STEMS: bool = False  # Run VAD on the Demucs vocal stem (needs demucs)
+    TRANSCRIPTION_CHUNK_SECONDS: float = 30.0  # Longest chunk (Whisper's window)
+    TRANSCRIPTION_PARALLEL_CHUNKS: int = 2  # Chunks transcribed at once (faster-whisper only)
+
+    # Pitch tracking (quality metrics, hook memorability)
+    PITCH_TRACKER: str = "piptrack"  # "piptrack" (fast) or "pyin" (more robust, much slower)
+    PITCH_MAX_FRAMES: int = 0  # Decimate pitch tracking above this many frames (0 = off)
+    PITCH_SOURCE: str = "mix"  # "mix", or "vocals" to track pitch on the Demucs vocal stem
+
+    # Inference Server (run `python jobs/inference_server.py`; hosts the models for every process)
+    INFERENCE_SERVER_ENABLED: bool = False  # False runs models in each process
+    INFERENCE_SOCKET_PATH: str = "files/run/inference.sock"
+    INFERENCE_TIMEOUT: int = 600  # Seconds per request (0 = no limit)
+    INFERENCE_BATCH_MAX_SIZE: int = 8  # Audio clips per classifier forward pass (on the server)
+    INFERENCE_BATCH_MAX_WAIT_MS: float = 10.0  # How long a clip waits for others to batch with
+
+    # Analysis Result Cache (content-addressed by audio SHA-256)
+    ANALYSIS_CACHE_ENABLED: bool = True
+    ANALYSIS_CACHE_DIR: str = "files/cache/analysis"
+    ANALYSIS_CACHE_MAX_MB: int = 2048
+
+    # Demucs Stem Cache (float16 .npy per audio SHA-256, memory-mapped on read)
+    STEM_CACHE_ENABLED: bool = True
+    STEM_CACHE_DIR: str = "files/cache/stems"
+    STEM_CACHE_MAX_MB: int = 10240  # ~125 MB per 3-minute track
+    STEM_CHUNK_SECONDS: float = 60.0  # Audio separated per Demucs call (bounds peak memory)
+    STEM_CHUNK_OVERLAP_SECONDS: float = 2.0  # Cross-fade between chunks
+    FEATURE_STORE_ENABLED: bool = True
+    FEATURE_STORE_DIR: str = "files/cache/features"  # Frame-level features per audio hash
+    OVERVIEW_DIR: str = "files/overviews"  # Waveform peaks and spectrogram tiles per audio hash
+    RENDITIONS_ENABLED: bool = True  # Needs FFmpeg
+    RENDITION_DIR: str = "files/renditions"  # Streaming renditions and hook clips per audio hash
+    RENDITION_BITRATE: str = "128k"  # AAC
+    HOOK_CLIPS_TOP_N: int = 3  # Viral segments cut into clips
+
+    # Analysis Job Queue (run `python jobs/analysis_worker.py` to process jobs)
+    ANALYSIS_QUEUE_ENABLED: bool = True  # False runs analysis inside the upload request
+    ANALYSIS_JOB_MAX_ATTEMPTS: int = 3
+    ANALYSIS_WORKER_POLL_SECONDS: float = 2.0
+    ANALYSIS_JOB_STALE_SECONDS: int = 900  # Reclaim running jobs without a heartbeat
+
+    # Stage Metrics (served at /api/v1/metrics/prometheus)
+    PROMETHEUS_MULTIPROC_DIR: str = "files/metrics"  # Shared by every API and worker process ("" = per process)
 
     # Safety Configuration
     VALIDATE_JSON: bool = True
@@ -147,6 +219,11 @@ class Settings(BaseSettings):
             return max(0.0, self.USER_DAILY_MAX_USD)
         return 50.0
 
+    @property
+    def model_preload(self) -> list[str]:
+        """Parse MODEL_PRELOAD into model specs."""
+        return [spec.strip() for spec in self.MODEL_PRELOAD.split(",") if spec.strip()]
+
     @property
     def is_development(self) -> bool:
         """Check if running in development mode."""
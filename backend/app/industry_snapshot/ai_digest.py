@@ -6,8 +6,23 @@ import os
 from datetime import datetime
 from typing import Any, Optional
 
+from ..services.models import get_model
+
 logger = logging.getLogger(__name__)
 
+SUMMARIZER_MODEL_ID = "sshleifer/distilbart-cnn-12-6"
+
+
+def load_summarizer_pipeline() -> Any:
+    """Model registry loader for the DistilBART news summarizer."""
+    from transformers import pipeline
+
+    return pipeline(
+        "summarization",
+        model=SUMMARIZER_MODEL_ID,
+        device="cpu"  # CPU is fast enough for summaries
+    )
+
 
 class IndustryDigestAI:
     """AI-powered industry digest and news summarization.
@@ -29,14 +44,7 @@ class IndustryDigestAI:
         
         # PRIMARY: Use FREE local DistilBART model (no API key needed!)
         try:
-            from transformers import pipeline
-            
-            logger.info("Loading FREE DistilBART model for news summarization...")
-            self.summarizer = pipeline(
-                "summarization",
-                model="sshleifer/distilbart-cnn-12-6",
-                device="cpu"  # CPU is fast enough for summaries
-            )
+            get_model("news_summarizer")
             self.provider = "huggingface_local"
             self.model = "distilbart-cnn-12-6"
             logger.info("✅ Initialized AI digest with FREE DistilBART (local, no API costs)")
@@ -96,6 +104,11 @@ class IndustryDigestAI:
                 "No AI provider configured. Either install transformers or provide an API key."
             )
 
+    @property
+    def summarizer(self) -> Any:
+        """DistilBART pipeline from the model registry."""
+        return get_model("news_summarizer")
+
     async def generate_daily_digest(
         self, news_items: list[dict[str, Any]], chart_data: dict[str, Any], releases: list[dict[str, Any]]
     ) -> dict[str, Any]:
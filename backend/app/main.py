@@ -1,5 +1,6 @@
 """FastAPI application entry point."""
 
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -22,6 +23,8 @@ from .core.config import settings
 from .core.database import close_database, init_database
 from .middleware.rate_limit import RateLimitMiddleware
 from .middleware.security_headers import SecurityHeadersMiddleware
+from .services.compute import get_process_pool, shutdown_process_pool
+from .services.models import preload_models
 
 # Configure logging
 logging.basicConfig(
@@ -30,6 +33,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Fork-based servers (gunicorn --preload) import this module once in the
+# master; models loaded here are shared copy-on-write by every worker
+if settings.MODEL_PRELOAD_BEFORE_FORK:
+    preload_models(before_fork=True)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):  # noqa: ARG001
@@ -43,10 +51,23 @@ async def lifespan(app: FastAPI):  # noqa: ARG001
         logger.error(f"Failed to initialize application: {e}")
         raise
 
+    # Only needed when uploads are analyzed inline; queued jobs use the workers' pools
+    pool = get_process_pool()
+    if pool is not None and not settings.ANALYSIS_QUEUE_ENABLED:
+        try:
+            await pool.warm_up()
+        except Exception as e:
+            logger.warning(f"Analysis process pool warm-up failed: {e}")
+
+    # Load configured models now so the first request does not pay for them
+    if not settings.MODEL_PRELOAD_BEFORE_FORK:
+        await asyncio.to_thread(preload_models)
+
     yield
 
     # Shutdown
     logger.info("Shutting down TuneScore API...")
+    shutdown_process_pool()
     await close_database()
     logger.info("Database connections closed")
 
@@ -109,6 +130,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Framing of the binary waveform and spectrogram responses
+    expose_headers=["X-Start-Bin", "X-Samples-Per-Bin", "X-Sample-Rate", "X-Columns", "X-Bands"],
 )
 
 # Include API router
@@ -8,6 +8,8 @@ from ..industry_snapshot.models import (
     NewRelease,
     TrendCluster,
 )
+from .analysis_job import AnalysisJob
+from .fingerprint import FingerprintHash, TrackFingerprint
 from .track import (
     Analysis,
     Artist,
@@ -31,6 +33,9 @@ __all__ = [
     "Track",
     "TrackAsset",
     "Analysis",
+    "AnalysisJob",
+    "TrackFingerprint",
+    "FingerprintHash",
     "Embedding",
     "Source",
     "MetricsDaily",
@@ -0,0 +1,56 @@
+"""Analysis job queue model."""
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from ..core.database import Base
+
+
+class AnalysisJob(Base):
+    """
+    Queued upload analysis.
+
+    Workers claim rows with ``SELECT ... FOR UPDATE SKIP LOCKED`` so any
+    number of worker processes, on any machine, can share the queue.
+    """
+
+    __tablename__ = "analysis_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    track_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("tracks.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+
+    # queued, running, completed, failed
+    status: Mapped[str] = mapped_column(String, default="queued", nullable=False)
+    stage: Mapped[str | None] = mapped_column(String, nullable=True)  # Stage in progress
+    # Stage name -> {"status", "started_at", "finished_at", "error"}
+    stages: Mapped[dict[str, Any]] = mapped_column(JSONB, default=dict)
+    # Upload options the pipeline needs (artist_name, verify_lyrics)
+    options: Mapped[dict[str, Any]] = mapped_column(JSONB, default=dict)
+
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    max_attempts: Mapped[int] = mapped_column(Integer, default=3, nullable=False)
+    worker_id: Mapped[str | None] = mapped_column(String, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    track = relationship("Track")
+
+    __table_args__ = (
+        Index("ix_analysis_jobs_status_created_at", "status", "created_at"),
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<AnalysisJob(id={self.id}, track_id={self.track_id}, status={self.status})>"
@@ -0,0 +1,55 @@
+"""Audio fingerprint index models."""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..core.database import Base
+
+
+class TrackFingerprint(Base):
+    """
+    Fingerprint summary of an uploaded track.
+
+    ``audio_hash`` answers exact "already analyzed?" lookups with one index
+    probe; near-duplicates are found through :class:`FingerprintHash`.
+    """
+
+    __tablename__ = "track_fingerprints"
+
+    track_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("tracks.id", ondelete="CASCADE"), primary_key=True
+    )
+    audio_hash: Mapped[str] = mapped_column(String(64), nullable=False, index=True)  # SHA-256
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    hash_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    duration: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    # Track whose analysis this upload reused, if it matched one
+    duplicate_of_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("tracks.id", ondelete="SET NULL"), nullable=True
+    )
+    similarity: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<TrackFingerprint(track_id={self.track_id}, hashes={self.hash_count})>"
+
+
+class FingerprintHash(Base):
+    """Inverted index entry: one spectral-peak hash of one track."""
+
+    __tablename__ = "fingerprint_hashes"
+
+    track_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("tracks.id", ondelete="CASCADE"), primary_key=True
+    )
+    hash: Mapped[int] = mapped_column(Integer, primary_key=True)
+    offset: Mapped[int] = mapped_column(Integer, primary_key=True)  # Anchor frame
+
+    __table_args__ = (Index("ix_fingerprint_hashes_hash", "hash"),)
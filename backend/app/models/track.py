@@ -146,6 +146,13 @@ class Analysis(Base):
     # AI cost tracking (for transparency and cost governor)
     ai_costs = Column(JSONB, default=dict, comment="Track AI API costs by feature")
 
+    # Fields estimated by the quick preview and not yet refined by the full
+    # pipeline (NULL once the analysis is final)
+    provisional_fields = Column(JSONB(none_as_null=True), nullable=True)
+
+    # Per-stage wall time, CPU time and peak RSS growth of the pipeline run
+    stage_timings = Column(JSONB(none_as_null=True), nullable=True)
+
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
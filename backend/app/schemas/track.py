@@ -128,6 +128,8 @@ class AnalysisResult(BaseModel):
     sonic_genome: dict[str, Any] | None = None
     lyrical_genome: dict[str, Any] | None = None
     hook_data: dict[str, Any] | None = None
+    provisional_fields: list[str] | None = None  # Preview estimates awaiting full analysis
+    stage_timings: dict[str, Any] | None = None  # Pipeline timing breakdown
     created_at: datetime
 
     class Config:
@@ -147,6 +149,7 @@ class TrackWithAnalysis(Track):
     mastering_quality: dict[str, Any] | None = None
     chord_analysis: dict[str, Any] | None = None
     ai_lyric_critique: dict[str, Any] | None = None
+    provisional_fields: list[str] | None = None  # Preview estimates awaiting full analysis
     ai_tags: dict[str, Any] | None = None
     ai_pitch: dict[str, Any] | None = None
     track_tags: dict[str, Any] | None = None  # Alias for frontend
@@ -184,6 +187,22 @@ class Artist(ArtistBase):
 
 
 # Response schemas
+class AudioMatch(BaseModel):
+    """Previously uploaded audio matching a file."""
+
+    track_id: int  # One of the caller's own tracks
+    similarity: float  # 1.0 for identical bytes
+    exact: bool
+    analyzed: bool  # The matched track has a finished analysis
+
+
+class AudioLookupResult(BaseModel):
+    """Whether a file's audio has been analyzed already."""
+
+    analyzed: bool
+    match: AudioMatch | None = None
+
+
 class TrackUploadResponse(BaseModel):
     """Response after track upload."""
 
@@ -191,6 +210,18 @@ class TrackUploadResponse(BaseModel):
     analysis_started: bool
     message: str
     transcription: TranscriptionResult | None = None
+    job_id: int | None = None  # Set when analysis was queued for a worker
+    duplicate_of: AudioMatch | None = None  # Set when an existing analysis was reused
+
+
+class AnalysisStageStatus(BaseModel):
+    """Progress of a single analysis pipeline stage."""
+
+    name: str
+    status: str  # pending, running, completed, failed, skipped, cancelled
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    error: str | None = None
 
 
 class AnalysisStatus(BaseModel):
@@ -202,3 +233,9 @@ class AnalysisStatus(BaseModel):
     lyrical_genome_complete: bool
     hook_detection_complete: bool
     error: str | None = None
+    job_id: int | None = None
+    current_stage: str | None = None
+    progress: float = 0.0  # Fraction of pipeline stages finished (0-1)
+    stages: list[AnalysisStageStatus] = []
+    # Fields of the latest analysis that are still preview estimates
+    provisional_fields: list[str] = []
@@ -4,15 +4,43 @@ import logging
 from collections import Counter
 from typing import Any
 
-import librosa
 import numpy as np
 
+from .context import AudioContext
+
 logger = logging.getLogger(__name__)
 
+PITCH_CLASSES = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+
+# Scale-membership profiles used to pick major vs minor mode
+MAJOR_PROFILE = np.array([1, 0, 1, 0, 1, 1, 0, 1, 0, 1, 0, 1])
+MINOR_PROFILE = np.array([1, 0, 1, 1, 0, 1, 0, 1, 1, 0, 1, 0])
+
+
+def _key_profile_matrix() -> np.ndarray:
+    """
+    Mean-centred, unit-norm profiles for all 24 keys.
+
+    Rows 0-11 are major keys C..B, rows 12-23 minor keys. A dot product with
+    a mean-centred, unit-norm chroma vector is its Pearson correlation.
+    """
+    profiles = np.array(
+        [np.roll(MAJOR_PROFILE, k) for k in range(12)]
+        + [np.roll(MINOR_PROFILE, k) for k in range(12)],
+        dtype=np.float64,
+    )
+    centred = profiles - profiles.mean(axis=1, keepdims=True)
+    return centred / np.linalg.norm(centred, axis=1, keepdims=True)
+
 
 class ChordAnalyzer:
     """Analyze chord progressions using chroma-based detection."""
 
+    ANALYZER_VERSION = "2"
+
+    # Chromagram hop length (frames per second = sr / HOP_LENGTH)
+    HOP_LENGTH = 2048
+
     # Common chord progressions in popular music
     COMMON_PROGRESSIONS = {
         "I-V-vi-IV": "Pop progression (very common)",
@@ -55,6 +83,13 @@ class ChordAnalyzer:
         "Bm": [0, 0, 1, 0, 0, 0, 1, 0, 0, 0, 0, 1],
     }
 
+    # Templates as one (n_chords x 12) matrix for scoring all windows at once
+    CHORD_NAMES = list(CHORD_TEMPLATES)
+    TEMPLATE_MATRIX = np.array(list(CHORD_TEMPLATES.values()), dtype=np.float64)
+    TEMPLATE_NORMS = np.linalg.norm(TEMPLATE_MATRIX, axis=1)
+
+    KEY_PROFILES = _key_profile_matrix()
+
     def __init__(self, sample_rate: int = 22050):
         """
         Initialize chord analyzer.
@@ -64,25 +99,25 @@ class ChordAnalyzer:
         """
         self.sample_rate = sample_rate
 
-    def analyze(self, audio_path: str) -> dict[str, Any]:
+    def analyze(self, audio: AudioContext | str) -> dict[str, Any]:
         """
         Analyze chord progression from audio.
 
         Args:
-            audio_path: Path to audio file
+            audio: Shared audio context or path to audio file
 
         Returns:
             Dictionary containing chord analysis
         """
+        ctx = AudioContext.ensure(audio, self.sample_rate)
         try:
-            # Load audio
-            y, sr = librosa.load(audio_path, sr=self.sample_rate, mono=True)
+            sr = ctx.sr
 
             # Extract chromagram
-            chroma = librosa.feature.chroma_cqt(y=y, sr=sr, hop_length=2048)
+            chroma = ctx.chroma_cqt(hop_length=self.HOP_LENGTH)
 
             # Detect chords from chromagram
-            chords = self._detect_chords(chroma, sr)
+            chords = self._detect_chords(chroma, sr, hop_length=self.HOP_LENGTH)
 
             # Detect key and mode
             key, mode = self._detect_key(chroma)
@@ -108,7 +143,9 @@ class ChordAnalyzer:
             novelty_score = 100 - familiarity_score
 
             # Detect modulations (key changes)
-            modulations = self._detect_modulations(chords, chroma, sr)
+            modulations = self._detect_modulations(
+                chords, chroma, sr, hop_length=self.HOP_LENGTH
+            )
 
             # Generate recommendations
             recommendations = self._generate_recommendations(
@@ -120,7 +157,7 @@ class ChordAnalyzer:
             )
 
             return {
-                "chords": chords[:50],  # Limit to first 50 chords for response size
+                "chords": chords,
                 "key": f"{key} {mode}",
                 "chord_sequence": chord_sequence[:20],  # First 20 chords
                 "unique_chords": unique_chords,
@@ -134,7 +171,7 @@ class ChordAnalyzer:
             }
 
         except Exception as e:
-            logger.error(f"Failed to analyze chords for {audio_path}: {e}")
+            logger.error(f"Failed to analyze chords for {ctx.path}: {e}")
             raise
 
     def _detect_chords(
@@ -151,81 +188,90 @@ class ChordAnalyzer:
         Returns:
             List of detected chords with timestamps
         """
-        chords = []
         frames_per_second = sr / hop_length
+        window_means, starts = self._window_chroma_means(
+            chroma, int(2 * frames_per_second)  # 2-second windows
+        )
+        if len(starts) == 0:
+            return []
 
-        # Analyze in 2-second windows
-        window_size = int(2 * frames_per_second)
-
-        for i in range(0, chroma.shape[1], window_size // 2):  # 50% overlap
-            window = chroma[:, i : i + window_size]
-            if window.shape[1] < window_size // 2:
-                break
-
-            # Average chroma over window
-            avg_chroma = np.mean(window, axis=1)
-
-            # Normalize
-            avg_chroma = avg_chroma / (np.sum(avg_chroma) + 1e-8)
-
-            # Match against chord templates
-            best_chord = self._match_chord_template(avg_chroma)
-
-            # Calculate confidence
-            confidence = self._calculate_chord_confidence(avg_chroma, best_chord)
+        # Normalize
+        window_means = window_means / (np.sum(window_means, axis=1, keepdims=True) + 1e-8)
 
-            # Time in seconds
-            time = i / frames_per_second
+        chord_indices, confidences = self._match_chord_templates(window_means)
 
-            chords.append(
-                {
-                    "time": round(time, 1),
-                    "chord": best_chord,
-                    "confidence": round(confidence, 2),
-                    "duration": 2.0,
-                }
+        return [
+            {
+                "time": round(start / frames_per_second, 1),
+                "chord": self.CHORD_NAMES[index] if index >= 0 else "N",
+                "confidence": round(float(confidence), 2),
+                "duration": 2.0,
+            }
+            for start, index, confidence in zip(
+                starts, chord_indices, confidences, strict=True
             )
+        ]
 
-        return chords
-
-    def _match_chord_template(self, chroma: np.ndarray) -> str:
+    def _window_chroma_means(
+        self, chroma: np.ndarray, window_size: int
+    ) -> tuple[np.ndarray, np.ndarray]:
         """
-        Match chroma vector against chord templates.
+        Average chroma over windows with 50% overlap.
+
+        Full windows come from a strided view (no copies); the trailing
+        partial windows, kept when at least half full, are averaged directly.
 
         Args:
-            chroma: Normalized chroma vector
+            chroma: Chromagram (12 x n_frames)
+            window_size: Window length in frames
 
         Returns:
-            Best matching chord name
+            Tuple of (window means (n_windows x 12), window start frames)
         """
-        best_chord = "N"  # No chord
-        best_score = 0
-
-        for chord_name, template in self.CHORD_TEMPLATES.items():
-            # Cosine similarity
-            template_array = np.array(template)
-            score = np.dot(chroma, template_array) / (
-                np.linalg.norm(chroma) * np.linalg.norm(template_array) + 1e-8
-            )
-
-            if score > best_score:
-                best_score = score
-                best_chord = chord_name
-
-        return best_chord
+        n_frames = chroma.shape[1]
+        step = max(window_size // 2, 1)
+        starts = np.arange(0, n_frames, step)
+        # Stop at the first window that is less than half full
+        starts = starts[n_frames - starts >= window_size // 2]
+
+        n_full = int(np.sum(starts + window_size <= n_frames)) if window_size > 0 else 0
+        means = np.empty((len(starts), chroma.shape[0]), dtype=chroma.dtype)
+        if n_full:
+            windows = np.lib.stride_tricks.sliding_window_view(
+                chroma, window_size, axis=1
+            )[:, : (n_full - 1) * step + 1 : step]
+            means[:n_full] = windows.mean(axis=2).T
+        for row, start in enumerate(starts[n_full:], start=n_full):
+            means[row] = np.mean(chroma[:, start : start + window_size], axis=1)
+
+        return means, starts
+
+    def _match_chord_templates(
+        self, chroma_vectors: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Match chroma vectors against all chord templates in one product.
 
-    def _calculate_chord_confidence(self, chroma: np.ndarray, chord: str) -> float:
-        """Calculate confidence score for detected chord."""
-        if chord == "N" or chord not in self.CHORD_TEMPLATES:
-            return 0.0
+        Args:
+            chroma_vectors: Normalized chroma vectors (n x 12)
 
-        template = np.array(self.CHORD_TEMPLATES[chord])
-        # Cosine similarity
-        confidence = np.dot(chroma, template) / (
-            np.linalg.norm(chroma) * np.linalg.norm(template) + 1e-8
+        Returns:
+            Tuple of (best template index per vector, -1 for no chord;
+            cosine-similarity confidence clipped to 0-1)
+        """
+        # Cosine similarity of every vector with every template
+        norms = np.linalg.norm(chroma_vectors, axis=1)
+        scores = (chroma_vectors @ self.TEMPLATE_MATRIX.T) / (
+            norms[:, None] * self.TEMPLATE_NORMS[None, :] + 1e-8
         )
 
-        return float(np.clip(confidence, 0, 1))
+        best = np.argmax(scores, axis=1)
+        best_scores = scores[np.arange(len(best)), best]
+
+        # A chord must correlate positively to beat "no chord"
+        indices = np.where(best_scores > 0, best, -1)
+        confidences = np.where(indices >= 0, np.clip(best_scores, 0, 1), 0.0)
+        return indices, confidences
 
     def _detect_key(self, chroma: np.ndarray) -> tuple[str, str]:
         """
@@ -238,28 +284,34 @@ class ChordAnalyzer:
             Tuple of (key, mode)
         """
         # Average chroma over entire track
-        avg_chroma = np.mean(chroma, axis=1)
+        return self._detect_keys(np.mean(chroma, axis=1)[None, :])[0]
 
-        # Detect key (most prominent pitch class)
-        key_index = int(np.argmax(avg_chroma))
-        keys = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
-        key = keys[key_index]
-
-        # Detect mode (major vs minor) using profile correlation
-        major_profile = np.array([1, 0, 1, 0, 1, 1, 0, 1, 0, 1, 0, 1])
-        minor_profile = np.array([1, 0, 1, 1, 0, 1, 0, 1, 1, 0, 1, 0])
-
-        # Rotate profiles to match detected key
-        major_rotated = np.roll(major_profile, key_index)
-        minor_rotated = np.roll(minor_profile, key_index)
+    def _detect_keys(self, avg_chromas: np.ndarray) -> list[tuple[str, str]]:
+        """
+        Detect key and mode for several averaged chroma vectors at once.
 
-        # Correlate with average chroma
-        major_corr = np.corrcoef(avg_chroma, major_rotated)[0, 1]
-        minor_corr = np.corrcoef(avg_chroma, minor_rotated)[0, 1]
+        The tonic is the most prominent pitch class; the mode is whichever of
+        the tonic's major/minor profiles correlates better. Correlations with
+        all 24 key profiles come from one matrix product.
 
-        mode = "major" if major_corr > minor_corr else "minor"
+        Args:
+            avg_chromas: Averaged chroma vectors (n x 12)
 
-        return key, mode
+        Returns:
+            List of (key, mode) tuples
+        """
+        centred = avg_chromas - avg_chromas.mean(axis=1, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            unit = centred / np.linalg.norm(centred, axis=1, keepdims=True)
+        correlations = unit @ self.KEY_PROFILES.T  # (n x 24)
+
+        results = []
+        for row, key_index in enumerate(np.argmax(avg_chromas, axis=1)):
+            major_corr = correlations[row, key_index]
+            minor_corr = correlations[row, 12 + key_index]
+            mode = "major" if major_corr > minor_corr else "minor"
+            results.append((PITCH_CLASSES[key_index], mode))
+        return results
 
     def _identify_progression(
         self, chord_sequence: list[str], key: str
@@ -365,7 +417,11 @@ class ChordAnalyzer:
         return (common_count / len(chord_sequence)) * 100
 
     def _detect_modulations(
-        self, chords: list[dict[str, Any]], chroma: np.ndarray, sr: int
+        self,
+        chords: list[dict[str, Any]],
+        chroma: np.ndarray,
+        sr: int,
+        hop_length: int = 2048,
     ) -> list[dict[str, Any]]:
         """
         Detect key changes (modulations) in the progression.
@@ -374,6 +430,7 @@ class ChordAnalyzer:
             chords: List of detected chords
             chroma: Chromagram
             sr: Sample rate
+            hop_length: Chromagram hop length
 
         Returns:
             List of modulations
@@ -386,29 +443,35 @@ class ChordAnalyzer:
         if segment_length < 2:
             return modulations
 
-        prev_key = None
-        prev_mode = None
-
-        for i in range(0, len(chords), segment_length):
-            segment_chords = chords[i : i + segment_length]
-            if not segment_chords:
-                continue
-
-            # Get chroma for this segment
-            start_frame = int(segment_chords[0]["time"] * sr / 2048)
-            end_frame = int(segment_chords[-1]["time"] * sr / 2048)
-            segment_chroma = chroma[:, start_frame:end_frame]
-
-            if segment_chroma.shape[1] == 0:
-                continue
+        # Chroma frame span of each segment of chords
+        chord_times = np.array([c["time"] for c in chords])
+        segment_starts = np.arange(0, len(chords), segment_length)
+        segment_ends = np.minimum(segment_starts + segment_length, len(chords)) - 1
+        start_frames = (chord_times[segment_starts] * sr / hop_length).astype(int)
+        end_frames = (chord_times[segment_ends] * sr / hop_length).astype(int)
+
+        non_empty = [
+            (first, start, end)
+            for first, start, end in zip(
+                segment_starts, start_frames, end_frames, strict=True
+            )
+            if chroma[:, start:end].shape[1] > 0
+        ]
+        if not non_empty:
+            return modulations
 
-            # Detect key for this segment
-            key, mode = self._detect_key(segment_chroma)
+        # Detect the key of every segment in one batch
+        keys = self._detect_keys(
+            np.array([np.mean(chroma[:, start:end], axis=1) for _, start, end in non_empty])
+        )
 
+        prev_key = None
+        prev_mode = None
+        for (first, _, _), (key, mode) in zip(non_empty, keys, strict=True):
             if prev_key is not None and (key != prev_key or mode != prev_mode):
                 modulations.append(
                     {
-                        "time": segment_chords[0]["time"],
+                        "time": chords[first]["time"],
                         "from_key": f"{prev_key} {prev_mode}",
                         "to_key": f"{key} {mode}",
                     }
@@ -0,0 +1,380 @@
+"""Shared decode-once audio context for the analysis pipeline.
+
+Every analyzer used to call ``librosa.load`` on the same file and recompute
+beat tracking, chroma and spectrograms independently. ``AudioContext`` decodes
+the file once and lazily memoizes the derived representations so that all
+analyzers of a single upload share them.
+"""
+
+import logging
+import subprocess
+from functools import cached_property
+from pathlib import Path
+from typing import Any
+
+import librosa
+import numpy as np
+
+from .decoder import load_audio
+from .feature_store import FeatureSet, load_features, pitch_array_name
+from .pitch import PitchTrajectory, compute_pitch_trajectory
+
+logger = logging.getLogger(__name__)
+
+# Formats that librosa can only decode through FFmpeg (audioread backend)
+FORMATS_REQUIRING_FFMPEG = {".m4a", ".aac", ".mp4"}
+
+
+def load_audio_file(file_path: str, sample_rate: int) -> tuple[np.ndarray, int]:
+    """
+    Decode an audio file to mono at the requested sample rate.
+
+    Args:
+        file_path: Path to audio file
+        sample_rate: Target sample rate
+
+    Returns:
+        Tuple of (audio data, sample rate)
+
+    Raises:
+        RuntimeError: If the format requires FFmpeg and it is not installed
+    """
+    file_ext = Path(file_path).suffix.lower()
+
+    try:
+        y, sr = load_audio(file_path, sr=sample_rate, mono=True)
+        return y, sr
+    except Exception as e:
+        error_msg = str(e)
+
+        # Check if FFmpeg is missing for formats that need it
+        if file_ext in FORMATS_REQUIRING_FFMPEG:
+            try:
+                subprocess.run(
+                    ["ffmpeg", "-version"], capture_output=True, timeout=2, check=True
+                )
+                ffmpeg_available = True
+            except (
+                subprocess.CalledProcessError,
+                FileNotFoundError,
+                subprocess.TimeoutExpired,
+            ):
+                ffmpeg_available = False
+
+            if not ffmpeg_available:
+                logger.error(
+                    f"Failed to load {file_ext} file {file_path}: FFmpeg is required for {file_ext} files. "
+                    f"Install with: sudo apt-get install -y ffmpeg"
+                )
+                raise RuntimeError(
+                    f"Audio format {file_ext} requires FFmpeg to be installed. "
+                    f"Please install FFmpeg: sudo apt-get install -y ffmpeg"
+                ) from e
+
+        logger.error(f"Failed to load audio file {file_path}: {error_msg}")
+        raise
+
+
+class AudioContext:
+    """
+    Decoded audio plus lazily computed, memoized derived representations.
+
+    Representations are computed on first access with the same parameters the
+    analyzers historically used, so sharing a context does not change results.
+    """
+
+    def __init__(
+        self,
+        audio_path: str,
+        sample_rate: int = 22050,
+        hop_length: int = 512,
+        pitch_tracker: str | None = None,
+        pitch_max_frames: int | None = None,
+        pitch_source: str | None = None,
+    ) -> None:
+        """
+        Initialize audio context.
+
+        Args:
+            audio_path: Path to audio file
+            sample_rate: Target sample rate for decoding
+            hop_length: Hop length shared by frame-based features
+            pitch_tracker: "piptrack" or "pyin" (default: PITCH_TRACKER setting)
+            pitch_max_frames: Frame budget for pitch tracking (default:
+                PITCH_MAX_FRAMES setting, 0 = unlimited)
+            pitch_source: "mix" or "vocals" (track pitch on the Demucs vocal
+                stem; default: PITCH_SOURCE setting)
+        """
+        from ...core.config import settings
+
+        self.path = str(audio_path)
+        self.target_sample_rate = sample_rate
+        self.hop_length = hop_length
+        self.pitch_tracker = pitch_tracker or settings.PITCH_TRACKER
+        self.pitch_max_frames = pitch_max_frames or settings.PITCH_MAX_FRAMES or None
+        self.pitch_source = pitch_source or settings.PITCH_SOURCE
+        self._chroma_cache: dict[int, np.ndarray] = {}
+        self._pitch_cache: dict[tuple[float, float], PitchTrajectory] = {}
+        self._stems: dict[str, np.ndarray | None] = {}
+        self._features: FeatureSet | None = None
+
+    @classmethod
+    def ensure(
+        cls, source: "AudioContext | str", sample_rate: int = 22050
+    ) -> "AudioContext":
+        """
+        Return ``source`` if it is already a context, else wrap the path.
+
+        Lets analyzers keep accepting plain paths from scripts while the
+        pipeline passes a shared context.
+        """
+        if isinstance(source, cls):
+            return source
+        return cls(str(source), sample_rate=sample_rate)
+
+    @classmethod
+    def from_audio(cls, y: np.ndarray, sr: int, audio_path: str | Path) -> "AudioContext":
+        """
+        Context over already-decoded mono audio, e.g. an excerpt of a file.
+
+        ``audio_path`` only labels the context; path-based features (stems)
+        still refer to the whole file.
+        """
+        ctx = cls(str(audio_path), sample_rate=sr)
+        ctx.__dict__["_decoded"] = (y, sr)
+        return ctx
+
+    @classmethod
+    def from_features(cls, features: FeatureSet, audio_path: str | Path) -> "AudioContext":
+        """
+        Context backed by stored frame-level features.
+
+        Stored representations are read lazily from the feature store; the
+        file is decoded only if an analyzer needs the waveform itself.
+
+        Args:
+            features: Stored features of the file
+            audio_path: Path to the audio file
+        """
+        ctx = cls(str(audio_path), sample_rate=features.sr, hop_length=features.hop_length)
+        ctx._features = features
+        return ctx
+
+    @classmethod
+    def from_feature_store(
+        cls, audio_path: str | Path, sample_rate: int = 22050
+    ) -> "AudioContext":
+        """
+        Context backed by the feature store when the file has stored features.
+
+        For re-analysis scripts: a track analyzed before is not decoded
+        again unless an analyzer needs the waveform.
+
+        Args:
+            audio_path: Path to the audio file
+            sample_rate: Target sample rate
+        """
+        features = load_features(audio_path, sr=sample_rate)
+        if features is None:
+            return cls(str(audio_path), sample_rate=sample_rate)
+        return cls.from_features(features, audio_path)
+
+    def _stored(self, name: str) -> np.ndarray | None:
+        """A stored frame-level array, if this context is store-backed."""
+        if self._features is None or name not in self._features:
+            return None
+        return self._features.array(name)
+
+    @cached_property
+    def _decoded(self) -> tuple[np.ndarray, int]:
+        return load_audio_file(self.path, self.target_sample_rate)
+
+    @property
+    def y(self) -> np.ndarray:
+        """Mono audio signal."""
+        return self._decoded[0]
+
+    @property
+    def sr(self) -> int:
+        """Sample rate of ``y``."""
+        if self._features is not None:
+            return self._features.sr
+        return self._decoded[1]
+
+    @cached_property
+    def duration(self) -> float:
+        """Duration in seconds."""
+        if self._features is not None:
+            return self._features.duration
+        return float(librosa.get_duration(y=self.y, sr=self.sr))
+
+    @cached_property
+    def stft_magnitude(self) -> np.ndarray:
+        """Magnitude STFT (n_fft=2048)."""
+        stored = self._stored("stft_magnitude")
+        if stored is not None:
+            return stored
+        return np.abs(librosa.stft(self.y, hop_length=self.hop_length))
+
+    @cached_property
+    def onset_envelope(self) -> np.ndarray:
+        """Onset strength envelope (mean aggregation)."""
+        stored = self._stored("onset_envelope")
+        if stored is not None:
+            return stored
+        return librosa.onset.onset_strength(
+            y=self.y, sr=self.sr, hop_length=self.hop_length
+        )
+
+    @cached_property
+    def rms(self) -> np.ndarray:
+        """Frame-wise RMS energy."""
+        stored = self._stored("rms")
+        if stored is not None:
+            return stored
+        return librosa.feature.rms(y=self.y, hop_length=self.hop_length)[0]
+
+    @cached_property
+    def zero_crossing_rate(self) -> np.ndarray:
+        """Frame-wise zero-crossing rate (librosa's default framing)."""
+        stored = self._stored("zero_crossing_rate")
+        if stored is not None:
+            return stored
+        return librosa.feature.zero_crossing_rate(self.y)[0]
+
+    @cached_property
+    def harmonic_percussive(self) -> tuple[np.ndarray, np.ndarray]:
+        """Harmonic and percussive magnitude spectrograms (HPSS of ``stft_magnitude``)."""
+        return librosa.decompose.hpss(self.stft_magnitude)
+
+    @cached_property
+    def beat_grid(self) -> tuple[Any, np.ndarray]:
+        """Tuple of (tempo, beat frames) from librosa beat tracking."""
+        stored = self._stored("beat_frames")
+        if stored is not None:
+            return np.array([self._features.tempo]), stored
+        return librosa.beat.beat_track(y=self.y, sr=self.sr, hop_length=self.hop_length)
+
+    @property
+    def tempo(self) -> Any:
+        """Estimated tempo in BPM."""
+        return self.beat_grid[0]
+
+    @property
+    def beat_frames(self) -> np.ndarray:
+        """Beat positions in frames."""
+        return self.beat_grid[1]
+
+    @cached_property
+    def beat_times(self) -> np.ndarray:
+        """Beat positions in seconds."""
+        return librosa.frames_to_time(
+            self.beat_frames, sr=self.sr, hop_length=self.hop_length
+        )
+
+    def chroma_cqt(self, hop_length: int = 512) -> np.ndarray:
+        """
+        Constant-Q chromagram, memoized per hop length.
+
+        Args:
+            hop_length: Hop length in samples
+
+        Returns:
+            Chromagram of shape (12, n_frames)
+        """
+        if hop_length not in self._chroma_cache:
+            stored = self._stored("chroma_cqt") if hop_length == self.hop_length else None
+            self._chroma_cache[hop_length] = (
+                stored
+                if stored is not None
+                else librosa.feature.chroma_cqt(y=self.y, sr=self.sr, hop_length=hop_length)
+            )
+        return self._chroma_cache[hop_length]
+
+    def stem(self, name: str) -> np.ndarray | None:
+        """
+        Mono Demucs stem at ``sr``, memoized per stem.
+
+        Reads the stem cache, separating the track once if it is not cached.
+
+        Args:
+            name: Stem name (drums, bass, other, vocals)
+
+        Returns:
+            Stem audio aligned with ``y``, or None if stems are unavailable
+        """
+        if name not in self._stems:
+            from .stem_separator import StemSeparator
+
+            try:
+                audio = StemSeparator().get_stems(self.path).load(name, sr=self.sr)
+                self._stems[name] = audio[: len(self.y)]
+            except Exception as e:
+                logger.warning(f"{name} stem unavailable for {self.path}: {e}")
+                self._stems[name] = None
+        return self._stems[name]
+
+    @cached_property
+    def _pitch_on_vocals(self) -> bool:
+        """Whether pitch is tracked on the vocal stem (configured and obtainable)."""
+        if self.pitch_source != "vocals":
+            return False
+        from .stem_separator import DEMUCS_AVAILABLE, StemSeparator
+
+        return DEMUCS_AVAILABLE or StemSeparator().cached_stems(self.path) is not None
+
+    @property
+    def pitch_signature(self) -> str:
+        """Pitch tracker settings, for analysis cache versions."""
+        signature = self.pitch_tracker
+        if self.pitch_max_frames:
+            signature = f"{signature}@{self.pitch_max_frames}"
+        if self._pitch_on_vocals:
+            signature = f"{signature}+vocals"
+        return signature
+
+    def pitch_trajectory(
+        self, fmin: float = 150.0, fmax: float = 4000.0
+    ) -> PitchTrajectory:
+        """
+        Dominant pitch per frame, memoized per frequency range.
+
+        The piptrack tracker reuses ``stft_magnitude`` rather than running
+        its own STFT. With ``pitch_source="vocals"`` the vocal stem is
+        tracked instead, so accompaniment does not pull the pitch around.
+
+        Args:
+            fmin: Lowest frequency to track
+            fmax: Highest frequency to track
+
+        Returns:
+            Pitch trajectory
+        """
+        key = (float(fmin), float(fmax))
+        if (
+            key not in self._pitch_cache
+            and self._features is not None
+            and self._features.pitch_signature == self.pitch_signature
+        ):
+            stored = self._stored(pitch_array_name(*key))
+            if stored is not None:
+                self._pitch_cache[key] = PitchTrajectory(
+                    f0=stored, sr=self.sr, hop_length=self.hop_length
+                )
+        if key not in self._pitch_cache:
+            vocals = self.stem("vocals") if self._pitch_on_vocals else None
+            self._pitch_cache[key] = compute_pitch_trajectory(
+                self.y if vocals is None else vocals,
+                self.sr,
+                S=self.stft_magnitude if self.pitch_tracker == "piptrack" and vocals is None else None,
+                hop_length=self.hop_length,
+                fmin=fmin,
+                fmax=fmax,
+                method=self.pitch_tracker,
+                max_frames=self.pitch_max_frames,
+            )
+        return self._pitch_cache[key]
+
+    def tracked_pitch(self) -> dict[tuple[float, float], PitchTrajectory]:
+        """Pitch trajectories computed so far, keyed by (fmin, fmax)."""
+        return dict(self._pitch_cache)
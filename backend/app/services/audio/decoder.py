@@ -0,0 +1,323 @@
+"""Decode-once, multi-rate audio loading.
+
+The analyzers need the same upload at several rates: 22.05 kHz mono for the
+librosa features, 16 kHz mono for the Hugging Face classifiers and 44.1 kHz
+stereo for Demucs. Each used to run its own ``librosa.load``, decoding the
+file (slow for MP3/M4A) and resampling it from scratch. ``DecodedAudio``
+decodes once at the native rate and derives every requested rate from that
+with the band-limited soxr HQ resampler, the same one ``librosa.load``
+uses. Files soundfile can read give the same samples as ``librosa.load``;
+formats decoded through FFmpeg may differ slightly from librosa's audioread
+fallback.
+
+Decodes are memoized within the process under a byte budget
+(``AUDIO_DECODE_MEMO_MB``), least recently used first out. A track whose
+decodes alone exceed the budget is not kept at all. Consumers that only need
+one pass over the native-rate samples (loudness metering) use
+``stream_native`` instead, which holds one block at a time.
+"""
+
+import json
+import logging
+import shutil
+import subprocess
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from pathlib import Path
+
+import librosa
+import numpy as np
+import soundfile as sf
+
+logger = logging.getLogger(__name__)
+
+# (path, size, mtime_ns) -> DecodedAudio, most recently used last
+_memo: OrderedDict[tuple[str, int, int], "DecodedAudio"] = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def _probe_ffmpeg(path: str) -> tuple[int, int]:
+    """Return (sample rate, channels) of the first audio stream."""
+    result = subprocess.run(
+        [
+            "ffprobe", "-v", "error", "-select_streams", "a:0",
+            "-show_entries", "stream=sample_rate,channels", "-of", "json", path,
+        ],
+        capture_output=True,
+        check=True,
+        timeout=30,
+    )
+    stream = json.loads(result.stdout)["streams"][0]
+    return int(stream["sample_rate"]), int(stream["channels"])
+
+
+def _decode_ffmpeg(path: str, duration: float | None) -> tuple[np.ndarray, int]:
+    """Decode through an FFmpeg pipe as native-rate float32 PCM."""
+    sr, channels = _probe_ffmpeg(path)
+    command = ["ffmpeg", "-nostdin", "-v", "error", "-i", path]
+    if duration is not None:
+        command += ["-t", str(duration)]
+    command += ["-f", "f32le", "-acodec", "pcm_f32le", "-"]
+
+    result = subprocess.run(command, capture_output=True, check=True)
+    samples = np.frombuffer(result.stdout, dtype="<f4")
+    samples = samples[: len(samples) - len(samples) % channels]
+    return samples.reshape(-1, channels).T.copy(), sr
+
+
+def _stream_ffmpeg(path: str, channels: int, blocksize: int) -> Iterator[np.ndarray]:
+    """Decode through an FFmpeg pipe, ``blocksize`` native-rate frames at a time."""
+    command = [
+        "ffmpeg", "-nostdin", "-v", "error", "-i", path,
+        "-f", "f32le", "-acodec", "pcm_f32le", "-",
+    ]
+    frame_bytes = 4 * channels
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    assert process.stdout is not None
+    try:
+        rest = b""
+        while chunk := process.stdout.read(blocksize * frame_bytes):
+            data = rest + chunk
+            usable = len(data) - len(data) % frame_bytes
+            rest = data[usable:]
+            if usable:
+                yield np.frombuffer(data[:usable], dtype="<f4").reshape(-1, channels).T
+        if process.wait() != 0:
+            raise subprocess.CalledProcessError(process.returncode, command)
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+
+
+def stream_native(
+    path: str, block_seconds: float = 10.0
+) -> tuple[Iterator[np.ndarray], int, int]:
+    """
+    Decode an audio file at its native sample rate, one block at a time.
+
+    Uses the same decoders as ``decode_native``, and the memoized decode if
+    the whole track is already in memory. Only librosa's audioread fallback
+    decodes the whole file up front.
+
+    Args:
+        path: Path to audio file
+        block_seconds: Length of each block
+
+    Returns:
+        Tuple of (iterator over consecutive blocks of shape (channels, n),
+        sample rate, channels)
+    """
+    with _memo_lock:
+        memoized = _memo.get(_memo_key(path))
+    if memoized is not None and memoized._native_complete:
+        native, sr = memoized._native, memoized._native_sr
+    else:
+        try:
+            info = sf.info(path)
+        except RuntimeError as e:
+            logger.debug(f"soundfile cannot decode {path} ({e}); trying FFmpeg")
+        else:
+            blocksize = max(1, int(block_seconds * info.samplerate))
+            blocks = sf.blocks(path, blocksize=blocksize, dtype="float32", always_2d=True)
+            return (block.T for block in blocks), info.samplerate, info.channels
+
+        if shutil.which("ffmpeg") and shutil.which("ffprobe"):
+            try:
+                sr, channels = _probe_ffmpeg(path)
+            except (subprocess.SubprocessError, KeyError, IndexError, ValueError) as e:
+                logger.warning(f"FFmpeg probe failed for {path}: {e}")
+            else:
+                blocksize = max(1, int(block_seconds * sr))
+                return _stream_ffmpeg(path, channels, blocksize), sr, channels
+
+        y, sr = librosa.load(path, sr=None, mono=False)
+        native, sr = np.atleast_2d(y), int(sr)
+
+    step = max(1, int(block_seconds * sr))
+    blocks = (native[:, start : start + step] for start in range(0, native.shape[1], step))
+    return blocks, sr, native.shape[0]
+
+
+def decode_native(path: str, duration: float | None = None) -> tuple[np.ndarray, int]:
+    """
+    Decode an audio file at its native sample rate.
+
+    Tries soundfile, then an FFmpeg pipe (MP3/M4A/AAC without libsndfile
+    support), then librosa's audioread fallback.
+
+    Args:
+        path: Path to audio file
+        duration: Only decode this many seconds from the start (None = all)
+
+    Returns:
+        Tuple of (samples of shape (channels, n), sample rate)
+    """
+    try:
+        with sf.SoundFile(path) as f:
+            frames = -1 if duration is None else int(round(duration * f.samplerate))
+            samples = f.read(frames=frames, dtype="float32", always_2d=True)
+            return samples.T.copy(), f.samplerate
+    except RuntimeError as e:
+        logger.debug(f"soundfile cannot decode {path} ({e}); trying FFmpeg")
+
+    if shutil.which("ffmpeg") and shutil.which("ffprobe"):
+        try:
+            return _decode_ffmpeg(path, duration)
+        except (subprocess.SubprocessError, KeyError, IndexError, ValueError) as e:
+            logger.warning(f"FFmpeg decode failed for {path}: {e}")
+
+    y, sr = librosa.load(path, sr=None, mono=False, duration=duration)
+    return np.atleast_2d(y), int(sr)
+
+
+class DecodedAudio:
+    """
+    One track decoded at its native rate, with memoized resampled versions.
+
+    A request for the first N seconds decodes only that much until the full
+    track is needed, so excerpt-only consumers (the 30s classifiers) do not
+    pay for decoding an hour-long mix.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Initialize decoded audio (nothing is decoded until first use).
+
+        Args:
+            path: Path to audio file
+        """
+        self.path = str(path)
+        self._native: np.ndarray | None = None
+        self._native_sr = 0
+        self._native_complete = False
+        self._resampled: dict[tuple[int, bool, float | None], np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def _native_excerpt(self, duration: float | None) -> tuple[np.ndarray, int]:
+        """Native-rate samples, decoding more of the file if needed."""
+        if self._native is not None:
+            if self._native_complete:
+                covered = True
+            else:
+                covered = duration is not None and self._native.shape[1] >= int(
+                    round(duration * self._native_sr)
+                )
+            if covered:
+                if duration is None:
+                    return self._native, self._native_sr
+                return self._native[:, : int(round(duration * self._native_sr))], self._native_sr
+
+        self._native, self._native_sr = decode_native(self.path, duration)
+        self._native_complete = duration is None
+        return self._native, self._native_sr
+
+    def load(
+        self, sr: int | None = 22050, mono: bool = True, duration: float | None = None
+    ) -> tuple[np.ndarray, int]:
+        """
+        Return the track at ``sr``, matching ``librosa.load``.
+
+        Args:
+            sr: Target sample rate (None = native)
+            mono: Downmix to mono
+            duration: Only return this many seconds from the start
+
+        Returns:
+            Tuple of (audio, sample rate); mono audio is 1-D, otherwise
+            shaped (channels, n). The array is shared; do not modify it.
+        """
+        with self._lock:
+            key = (sr or 0, mono, duration)
+            cached = self._resampled.get(key)
+            if cached is not None:
+                return cached, sr or self._native_sr
+
+            native, native_sr = self._native_excerpt(duration)
+            y = librosa.to_mono(native) if mono else native
+            if not mono and y.shape[0] == 1:
+                y = y[0]
+            if sr is not None and sr != native_sr:
+                y = librosa.resample(y, orig_sr=native_sr, target_sr=sr, res_type="soxr_hq")
+            y = np.ascontiguousarray(y)
+            self._resampled[key] = y
+            return y, sr or native_sr
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the native decode and every resampled version."""
+        arrays = [self._native, *self._resampled.values()]
+        unique = {id(array): array for array in arrays if array is not None}
+        return sum(array.nbytes for array in unique.values())
+
+
+def _memo_key(path: str | Path) -> tuple[str, int, int]:
+    resolved = Path(path).resolve()
+    stat = resolved.stat()
+    return str(resolved), stat.st_size, stat.st_mtime_ns
+
+
+def get_decoded_audio(path: str | Path) -> DecodedAudio:
+    """
+    Get the memoized decoder for a track.
+
+    The memo is keyed by path, size and mtime, so a replaced file is decoded
+    again.
+
+    Args:
+        path: Path to audio file
+
+    Returns:
+        Decoded audio for the file
+    """
+    key = _memo_key(path)
+    with _memo_lock:
+        decoded = _memo.get(key)
+        if decoded is None:
+            decoded = DecodedAudio(str(path))
+            _memo[key] = decoded
+        _memo.move_to_end(key)
+    return decoded
+
+
+def _trim_decode_memo() -> None:
+    """Evict least recently used decodes until the memo fits its byte budget."""
+    from ...core.config import settings
+
+    budget = settings.AUDIO_DECODE_MEMO_MB * 2**20
+    with _memo_lock:
+        total = sum(decoded.nbytes for decoded in _memo.values())
+        while _memo and total > budget:
+            _, evicted = _memo.popitem(last=False)
+            total -= evicted.nbytes
+
+
+def clear_decode_memo() -> None:
+    """Drop every memoized decode, e.g. to measure a cold analysis."""
+    with _memo_lock:
+        _memo.clear()
+
+
+def load_audio(
+    path: str | Path,
+    sr: int | None = 22050,
+    mono: bool = True,
+    duration: float | None = None,
+) -> tuple[np.ndarray, int]:
+    """
+    Drop-in replacement for ``librosa.load`` backed by the per-track memo.
+
+    Args:
+        path: Path to audio file
+        sr: Target sample rate (None = native)
+        mono: Downmix to mono
+        duration: Only load this many seconds from the start
+
+    Returns:
+        Tuple of (audio, sample rate); the array is shared, do not modify it
+    """
+    audio = get_decoded_audio(path).load(sr=sr, mono=mono, duration=duration)
+    _trim_decode_memo()
+    return audio
@@ -6,14 +6,31 @@ from typing import Any
 import librosa
 import numpy as np
 
+from .context import AudioContext, load_audio_file
+from .feature_store import store_features
 from .spectral_advanced import AdvancedSpectralAnalyzer
 
 logger = logging.getLogger(__name__)
 
 
+def coefficient_of_variation(values: np.ndarray) -> float | None:
+    """Standard deviation over mean of a series (None if it is empty)."""
+    if len(values) == 0:
+        return None
+    return float(np.std(values) / (np.mean(values) + 1e-8))
+
+
+def chroma_clarity(chroma: np.ndarray) -> np.ndarray:
+    """Per-frame peak-to-average chroma ratio (high = well-defined chords)."""
+    return np.max(chroma, axis=0) / (np.mean(chroma, axis=0) + 1e-8)
+
+
 class AudioFeatureExtractor:
     """Extract audio features using librosa."""
 
+    # Part of the analysis cache key; bump whenever extractor output changes
+    ANALYZER_VERSION = "1"
+
     def __init__(self, sample_rate: int = 22050):
         """
         Initialize audio feature extractor.
@@ -34,78 +51,46 @@ class AudioFeatureExtractor:
         Returns:
             Tuple of (audio data, sample rate)
         """
-        import subprocess
-        from pathlib import Path
-        
-        file_path_obj = Path(file_path)
-        file_ext = file_path_obj.suffix.lower()
-        
-        # Check if FFmpeg is needed for this format
-        formats_requiring_ffmpeg = {'.m4a', '.aac', '.mp4'}
-        
-        try:
-            y, sr = librosa.load(file_path, sr=self.sample_rate, mono=True)
-            return y, sr
-        except Exception as e:
-            error_msg = str(e)
-            
-            # Check if FFmpeg is missing for formats that need it
-            if file_ext in formats_requiring_ffmpeg:
-                # Check if FFmpeg is available
-                try:
-                    subprocess.run(['ffmpeg', '-version'], 
-                                 capture_output=True, 
-                                 timeout=2,
-                                 check=True)
-                    ffmpeg_available = True
-                except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-                    ffmpeg_available = False
-                
-                if not ffmpeg_available:
-                    logger.error(
-                        f"Failed to load {file_ext} file {file_path}: FFmpeg is required for {file_ext} files. "
-                        f"Install with: sudo apt-get install -y ffmpeg"
-                    )
-                    raise RuntimeError(
-                        f"Audio format {file_ext} requires FFmpeg to be installed. "
-                        f"Please install FFmpeg: sudo apt-get install -y ffmpeg"
-                    ) from e
-            
-            logger.error(f"Failed to load audio file {file_path}: {error_msg}")
-            raise
+        return load_audio_file(file_path, self.sample_rate)
 
-    def extract_sonic_genome(self, audio_path: str) -> dict[str, Any]:
+    def extract_sonic_genome(
+        self, audio: AudioContext | str, include_spectral: bool = True
+    ) -> dict[str, Any]:
         """
         Extract comprehensive sonic features (Sonic DNA).
 
         Args:
-            audio_path: Path to audio file
+            audio: Shared audio context or path to audio file
+            include_spectral: Run the advanced spectral analysis (Essentia or
+                enhanced librosa); skipped by quick previews
 
         Returns:
             Dictionary containing sonic genome features
         """
-        y, sr = self.load_audio(audio_path)
+        ctx = AudioContext.ensure(audio, self.sample_rate)
+        y, sr = ctx.y, ctx.sr
 
         # Duration
-        duration = librosa.get_duration(y=y, sr=sr)
+        duration = ctx.duration
 
         # Tempo and beat tracking
-        tempo, beats = librosa.beat.beat_track(y=y, sr=sr)
+        tempo, beats = ctx.beat_grid
 
         # Key and mode detection (using chroma features)
-        chroma = librosa.feature.chroma_cqt(y=y, sr=sr)
+        chroma = ctx.chroma_cqt()
         key = int(np.argmax(np.sum(chroma, axis=1)))
 
-        # Spectral features
-        spectral_centroids = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
-        spectral_rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr)[0]
-        spectral_bandwidth = librosa.feature.spectral_bandwidth(y=y, sr=sr)[0]
+        # Spectral features (all share the memoized magnitude STFT)
+        spec = ctx.stft_magnitude
+        spectral_centroids = librosa.feature.spectral_centroid(S=spec, sr=sr)[0]
+        spectral_rolloff = librosa.feature.spectral_rolloff(S=spec, sr=sr)[0]
+        spectral_bandwidth = librosa.feature.spectral_bandwidth(S=spec, sr=sr)[0]
 
         # Zero crossing rate (indicator of percussiveness)
-        zcr = librosa.feature.zero_crossing_rate(y)[0]
+        zcr = ctx.zero_crossing_rate
 
         # RMS energy (loudness proxy)
-        rms = librosa.feature.rms(y=y)[0]
+        rms = ctx.rms
 
         # MFCC (timbre characteristics)
         mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
@@ -114,14 +99,17 @@ class AudioFeatureExtractor:
         timing_precision = self._measure_timing_precision_score(tempo, beats, rms)
         
         # Calculate harmonic coherence for context
-        harmonic_coherence_score = self._measure_harmonic_coherence_score(y, sr)
+        harmonic_coherence_score = self._measure_harmonic_coherence_score(
+            float(np.mean(chroma_clarity(chroma)))
+        )
         
         # Advanced spectral analysis (Essentia or enhanced librosa)
-        try:
-            essentia_features = self.spectral_analyzer.analyze(audio_path)
-        except Exception as e:
-            logger.warning(f"Advanced spectral analysis failed: {e}")
-            essentia_features = {}
+        essentia_features: dict[str, Any] = {}
+        if include_spectral:
+            try:
+                essentia_features = self.spectral_analyzer.analyze(ctx)
+            except Exception as e:
+                logger.warning(f"Advanced spectral analysis failed: {e}")
         
         # Compute aggregate statistics
         return {
@@ -147,10 +135,19 @@ class AudioFeatureExtractor:
             "mfcc_means": [float(x) for x in np.mean(mfccs, axis=1)],
             "mfcc_stds": [float(x) for x in np.std(mfccs, axis=1)],
             # Context-aware derived metrics (considers musicianship!)
-            "energy": self._compute_energy(rms),
-            "danceability": self._compute_danceability_aware(tempo, beats, timing_precision),
-            "valence": self._compute_valence(chroma, spectral_centroids),
-            "acousticness": self._compute_acousticness(spectral_rolloff, zcr, rms, spectral_centroids),
+            "energy": self._compute_energy(float(np.mean(rms))),
+            "danceability": self._compute_danceability_aware(
+                tempo, coefficient_of_variation(np.diff(beats)), timing_precision
+            ),
+            "valence": self._compute_valence(
+                np.mean(chroma, axis=1), float(np.mean(spectral_centroids))
+            ),
+            "acousticness": self._compute_acousticness(
+                float(np.mean(spectral_rolloff)),
+                float(np.mean(zcr)),
+                coefficient_of_variation(rms),
+                coefficient_of_variation(spectral_centroids),
+            ),
             # Raw quality indicators (for transparency)
             "timing_precision_score": float(timing_precision),
             "harmonic_coherence_score": float(harmonic_coherence_score),
@@ -159,26 +156,27 @@ class AudioFeatureExtractor:
         }
 
     def detect_hook(
-        self, audio_path: str, segment_duration: float = 15.0
+        self, audio: AudioContext | str, segment_duration: float = 15.0
     ) -> dict[str, Any]:
         """
         Detect the most "viral" hook segment using energy and novelty.
 
         Args:
-            audio_path: Path to audio file
+            audio: Shared audio context or path to audio file
             segment_duration: Duration of hook segment in seconds
 
         Returns:
             Dictionary with hook information
         """
-        y, sr = self.load_audio(audio_path)
-        duration = librosa.get_duration(y=y, sr=sr)
+        ctx = AudioContext.ensure(audio, self.sample_rate)
+        sr = ctx.sr
+        duration = ctx.duration
 
         # Compute onset strength (novelty curve)
-        onset_env = librosa.onset.onset_strength(y=y, sr=sr)
+        onset_env = ctx.onset_envelope
 
         # Compute RMS energy
-        rms = librosa.feature.rms(y=y, hop_length=512)[0]
+        rms = ctx.rms
 
         # Normalize both curves
         onset_norm = (onset_env - np.min(onset_env)) / (
@@ -223,11 +221,10 @@ class AudioFeatureExtractor:
         keys = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
         return keys[key_index % 12]
 
-    def _compute_energy(self, rms: np.ndarray) -> float:
-        """Compute energy score (0-1)."""
+    def _compute_energy(self, rms_mean: float) -> float:
+        """Compute energy score (0-1) from the mean RMS."""
         # Normalize RMS to 0-1 range
-        energy = np.mean(rms)
-        return float(np.clip(energy * 10, 0, 1))
+        return float(np.clip(rms_mean * 10, 0, 1))
 
     def _measure_timing_precision_score(self, tempo: float, beats: np.ndarray, 
                                           rms: np.ndarray = None) -> float:
@@ -248,10 +245,49 @@ class AudioFeatureExtractor:
             if len(beat_intervals) == 0:
                 return 50.0
             
-            # Coefficient of variation for beat consistency
-            mean_interval = np.mean(beat_intervals)
-            std_interval = np.std(beat_intervals)
+            # Check for repeating patterns (syncopation vs randomness)
+            pattern_correlation = None
+            if len(beat_intervals) >= 8:
+                # Check if intervals repeat in patterns (syncopation)
+                # Compare first half vs second half correlation
+                mid_point = len(beat_intervals) // 2
+                first_half = beat_intervals[:mid_point]
+                second_half = beat_intervals[mid_point:mid_point*2]
+                
+                if len(first_half) > 0 and len(second_half) > 0 and len(first_half) == len(second_half):
+                    pattern_correlation = np.corrcoef(first_half, second_half)[0, 1]
             
+            return self._score_timing_precision(
+                float(np.mean(beat_intervals)),
+                float(np.std(beat_intervals)),
+                rms_cv=coefficient_of_variation(rms) if rms is not None else None,
+                pattern_correlation=pattern_correlation,
+            )
+                
+        except Exception:
+            return 50.0
+
+    def _score_timing_precision(
+        self,
+        mean_interval: float,
+        std_interval: float,
+        rms_cv: float | None = None,
+        pattern_correlation: float | None = None,
+    ) -> float:
+        """
+        Timing precision score (0-100) from beat interval statistics.
+
+        Args:
+            mean_interval: Mean beat interval
+            std_interval: Standard deviation of beat intervals
+            rms_cv: Coefficient of variation of frame RMS (production quality)
+            pattern_correlation: Correlation between first- and second-half
+                beat intervals (None if unknown)
+
+        Returns:
+            Timing precision score
+        """
+        try:
             if mean_interval == 0:
                 return 50.0
             
@@ -260,30 +296,19 @@ class AudioFeatureExtractor:
             # Check for production quality indicators (professional vs amateur)
             production_quality_boost = 0.0
             
-            if rms is not None:
+            if rms_cv is not None:
                 # Professional production has consistent RMS (compression/mastering)
-                rms_cv = np.std(rms) / (np.mean(rms) + 1e-8)
                 if rms_cv < 0.5:  # Well-produced, consistent dynamics
                     production_quality_boost = 15.0  # Boost by up to 15 points
                 elif rms_cv < 0.7:
                     production_quality_boost = 10.0
             
-            # Check for repeating patterns (syncopation vs randomness)
             pattern_consistency = 0.0
-            if len(beat_intervals) >= 8:
-                # Check if intervals repeat in patterns (syncopation)
-                # Compare first half vs second half correlation
-                mid_point = len(beat_intervals) // 2
-                first_half = beat_intervals[:mid_point]
-                second_half = beat_intervals[mid_point:mid_point*2]
-                
-                if len(first_half) > 0 and len(second_half) > 0 and len(first_half) == len(second_half):
-                    correlation = np.corrcoef(first_half, second_half)[0, 1]
-                    if not np.isnan(correlation):
-                        if correlation > 0.5:  # Strong pattern repetition = intentional
-                            pattern_consistency = 10.0
-                        elif correlation > 0.3:
-                            pattern_consistency = 5.0
+            if pattern_correlation is not None and not np.isnan(pattern_correlation):
+                if pattern_correlation > 0.5:  # Strong pattern repetition = intentional
+                    pattern_consistency = 10.0
+                elif pattern_correlation > 0.3:
+                    pattern_consistency = 5.0
             
             # Base score from CV
             if cv < 0.02:
@@ -324,21 +349,16 @@ class AudioFeatureExtractor:
         except Exception:
             return 50.0
     
-    def _measure_harmonic_coherence_score(self, y: np.ndarray, sr: int) -> float:
+    def _measure_harmonic_coherence_score(self, mean_clarity: float) -> float:
         """
         Lightweight harmonic coherence measurement (0-100 scale).
         
         Returns just the score for use in context-aware metrics.
+
+        Args:
+            mean_clarity: Mean per-frame chord clarity (see ``chroma_clarity``)
         """
         try:
-            chroma = librosa.feature.chroma_cqt(y=y, sr=sr)
-            
-            # Chord clarity
-            chroma_max = np.max(chroma, axis=0)
-            chroma_mean = np.mean(chroma, axis=0)
-            clarity_ratio = chroma_max / (chroma_mean + 1e-8)
-            mean_clarity = np.mean(clarity_ratio)
-            
             if mean_clarity > 4.0:
                 return 100.0
             elif mean_clarity > 3.0:
@@ -354,7 +374,7 @@ class AudioFeatureExtractor:
             return 70.0
     
     def _compute_danceability_aware(
-        self, tempo: float, beats: np.ndarray, timing_precision: float
+        self, tempo: float, beat_interval_cv: float | None, timing_precision: float
     ) -> float:
         """
         Improved danceability score (0-1) with better genre coverage.
@@ -366,7 +386,8 @@ class AudioFeatureExtractor:
         
         Args:
             tempo: Detected tempo in BPM
-            beats: Beat frames
+            beat_interval_cv: Coefficient of variation of beat intervals
+                (None if fewer than two beats)
             timing_precision: Timing precision score (0-100, now syncopation-aware)
         
         Returns:
@@ -402,12 +423,8 @@ class AudioFeatureExtractor:
             tempo_score = 0.3
 
         # Beat regularity (variance in beat intervals)
-        if len(beats) > 1:
-            beat_intervals = np.diff(beats)
-            beat_regularity = 1.0 - (
-                np.std(beat_intervals) / (np.mean(beat_intervals) + 1e-8)
-            )
-            beat_regularity = max(0, min(1, beat_regularity))
+        if beat_interval_cv is not None:
+            beat_regularity = max(0, min(1, 1.0 - beat_interval_cv))
         else:
             beat_regularity = 0.5
 
@@ -465,21 +482,22 @@ class AudioFeatureExtractor:
         danceability = 0.6 * tempo_score + 0.4 * beat_regularity
         return float(np.clip(danceability, 0, 1))
 
-    def _compute_valence(
-        self, chroma: np.ndarray, spectral_centroids: np.ndarray
-    ) -> float:
+    def _compute_valence(self, chroma_mean: np.ndarray, centroid_mean: float) -> float:
         """
         Compute valence (musical positiveness) score (0-1).
 
         Higher spectral centroid and major-key tendency → higher valence.
+
+        Args:
+            chroma_mean: Mean chroma vector (12 pitch classes)
+            centroid_mean: Mean spectral centroid in Hz
         """
         # Major vs minor tendency (simplified)
         major_profile = np.array([1, 0, 1, 0, 1, 1, 0, 1, 0, 1, 0, 1])
-        chroma_mean = np.mean(chroma, axis=1)
         major_score = np.dot(chroma_mean, major_profile) / (np.sum(chroma_mean) + 1e-8)
 
         # Brightness (spectral centroid)
-        brightness = np.mean(spectral_centroids) / 4000  # Normalize
+        brightness = centroid_mean / 4000  # Normalize
         brightness = min(1, brightness)
 
         # Combine
@@ -487,8 +505,8 @@ class AudioFeatureExtractor:
         return float(np.clip(valence, 0, 1))
 
     def _compute_acousticness(
-        self, spectral_rolloff: np.ndarray, zcr: np.ndarray, rms: np.ndarray = None, 
-        spectral_centroid: np.ndarray = None
+        self, mean_rolloff: float, mean_zcr: float, rms_cv: float | None = None,
+        centroid_cv: float | None = None
     ) -> float:
         """
         Compute acousticness score (0-1).
@@ -496,10 +514,13 @@ class AudioFeatureExtractor:
         Improved to better distinguish electronic/produced music from acoustic.
         Lower spectral rolloff + natural dynamics → more acoustic.
         Low rolloff + consistent dynamics → electronic/produced (low acousticness).
+
+        Args:
+            mean_rolloff: Mean spectral rolloff in Hz
+            mean_zcr: Mean zero crossing rate
+            rms_cv: Coefficient of variation of frame RMS
+            centroid_cv: Coefficient of variation of the spectral centroid
         """
-        mean_rolloff = np.mean(spectral_rolloff)
-        mean_zcr = np.mean(zcr)
-        
         # Base acousticness from spectral features
         # Lower rolloff = potentially more acoustic
         rolloff_score = 1.0 - (mean_rolloff / 8000)
@@ -513,17 +534,15 @@ class AudioFeatureExtractor:
         # Electronic music has low rolloff BUT also very consistent dynamics
         electronic_confidence = 0.0
         
-        if rms is not None:
+        if rms_cv is not None:
             # Electronic/produced music has more consistent loudness
-            rms_cv = np.std(rms) / (np.mean(rms) + 1e-8)  # Coefficient of variation
             if rms_cv < 0.4:  # Very consistent = likely electronic/compressed
                 electronic_confidence += 0.5
             elif rms_cv < 0.6:
                 electronic_confidence += 0.3
         
-        if spectral_centroid is not None:
+        if centroid_cv is not None:
             # Synthesized sounds have more consistent spectral characteristics
-            centroid_cv = np.std(spectral_centroid) / (np.mean(spectral_centroid) + 1e-8)
             if centroid_cv < 0.4:  # Very consistent = likely synthesized
                 electronic_confidence += 0.3
             elif centroid_cv < 0.6:
@@ -549,7 +568,7 @@ class AudioFeatureExtractor:
         
         return float(np.clip(acousticness, 0, 1))
 
-    def extract_quality_metrics(self, audio_path: str) -> dict[str, Any]:
+    def extract_quality_metrics(self, audio: AudioContext | str) -> dict[str, Any]:
         """
         Extract advanced quality metrics for professional assessment.
         
@@ -559,22 +578,30 @@ class AudioFeatureExtractor:
         - Harmonic coherence (chord/instrument alignment)
         
         Args:
-            audio_path: Path to audio file
+            audio: Shared audio context or path to audio file
         
         Returns:
             Dictionary with quality metrics (0-100 scores)
         """
-        y, sr = self.load_audio(audio_path)
+        ctx = AudioContext.ensure(audio, self.sample_rate)
         
         # 1. Pitch Accuracy (0-100)
-        pitch_accuracy = self._measure_pitch_accuracy(y, sr)
+        pitch_accuracy = self._measure_pitch_accuracy(ctx)
         
         # 2. Timing Precision (0-100)
-        timing_precision = self._measure_timing_precision(y, sr)
+        timing_precision = self._measure_timing_precision(ctx)
         
         # 3. Harmonic Coherence (0-100)
-        harmonic_coherence = self._measure_harmonic_coherence(y, sr)
+        harmonic_coherence = self._measure_harmonic_coherence(ctx)
         
+        return self._quality_metrics_result(
+            pitch_accuracy, timing_precision, harmonic_coherence
+        )
+
+    def _quality_metrics_result(
+        self, pitch_accuracy: float, timing_precision: float, harmonic_coherence: float
+    ) -> dict[str, Any]:
+        """Combine the three quality scores into the quality metrics payload."""
         # Overall quality score (weighted average)
         overall_quality = (
             pitch_accuracy * 0.35 +
@@ -590,7 +617,7 @@ class AudioFeatureExtractor:
             "quality_grade": self._get_quality_grade(overall_quality),
         }
     
-    def _measure_pitch_accuracy(self, y: np.ndarray, sr: int) -> float:
+    def _measure_pitch_accuracy(self, ctx: AudioContext) -> float:
         """
         Measure pitch accuracy/tuning consistency (0-100).
         
@@ -599,52 +626,61 @@ class AudioFeatureExtractor:
         - Pitch confidence (strong fundamental = clear pitch)
         """
         try:
-            # Extract pitch using piptrack (faster than pyin)
-            pitches, magnitudes = librosa.piptrack(y=y, sr=sr, fmin=80, fmax=400)
-            
-            # Get pitch trajectory (strongest pitch at each frame)
-            pitch_trajectory = []
-            for t in range(pitches.shape[1]):
-                index = magnitudes[:, t].argmax()
-                pitch = pitches[index, t]
-                if pitch > 0:  # Valid pitch detected
-                    pitch_trajectory.append(pitch)
-            
-            if len(pitch_trajectory) < 10:
+            trajectory = ctx.pitch_trajectory(fmin=80, fmax=400)
+            pitch_array = trajectory.voiced_pitches
+
+            if len(pitch_array) < 10:
                 # Not enough pitch data (instrumental or very quiet)
                 return 70.0  # Neutral score
             
-            pitch_array = np.array(pitch_trajectory)
-            
-            # 1. Pitch stability (low variance = consistent tuning)
             # Convert to cents (100 cents = 1 semitone)
             pitch_cents = 1200 * np.log2(pitch_array / np.median(pitch_array) + 1e-8)
-            pitch_variance = np.std(pitch_cents)
-            
-            # Score: lower variance = better (professional: <30 cents std)
-            if pitch_variance < 30:
-                stability_score = 100
-            elif pitch_variance < 50:
-                stability_score = 80
-            elif pitch_variance < 80:
-                stability_score = 60
-            elif pitch_variance < 120:
-                stability_score = 40
-            else:
-                stability_score = 20  # Very unstable (The Shaggs territory)
-            
-            # 2. Pitch confidence (strong fundamental detection)
-            confidence_score = min(len(pitch_trajectory) / (pitches.shape[1] * 0.8), 1.0) * 100
-            
-            # Combine scores
-            pitch_accuracy = (stability_score * 0.7) + (confidence_score * 0.3)
-            return float(np.clip(pitch_accuracy, 0, 100))
+            return self._score_pitch_accuracy(
+                float(np.std(pitch_cents)), len(pitch_array), len(trajectory.f0)
+            )
             
         except Exception as e:
             logger.warning(f"Pitch accuracy measurement failed: {e}")
             return 70.0  # Neutral score on error
+
+    def _score_pitch_accuracy(
+        self, pitch_variance: float, voiced_frames: int, total_frames: int
+    ) -> float:
+        """
+        Pitch accuracy score (0-100) from pitch trajectory statistics.
+
+        Args:
+            pitch_variance: Standard deviation of voiced pitches in cents
+            voiced_frames: Number of frames with a detected pitch
+            total_frames: Number of analyzed frames
+
+        Returns:
+            Pitch accuracy score
+        """
+        if voiced_frames < 10:
+            return 70.0  # Not enough pitch data
+
+        # 1. Pitch stability (low variance = consistent tuning)
+        # Score: lower variance = better (professional: <30 cents std)
+        if pitch_variance < 30:
+            stability_score = 100
+        elif pitch_variance < 50:
+            stability_score = 80
+        elif pitch_variance < 80:
+            stability_score = 60
+        elif pitch_variance < 120:
+            stability_score = 40
+        else:
+            stability_score = 20  # Very unstable (The Shaggs territory)
+        
+        # 2. Pitch confidence (strong fundamental detection)
+        confidence_score = min(voiced_frames / (total_frames * 0.8), 1.0) * 100
+        
+        # Combine scores
+        pitch_accuracy = (stability_score * 0.7) + (confidence_score * 0.3)
+        return float(np.clip(pitch_accuracy, 0, 100))
     
-    def _measure_timing_precision(self, y: np.ndarray, sr: int) -> float:
+    def _measure_timing_precision(self, ctx: AudioContext) -> float:
         """
         Measure timing precision/beat consistency (0-100).
         
@@ -654,48 +690,62 @@ class AudioFeatureExtractor:
         """
         try:
             # Track beats
-            tempo, beats = librosa.beat.beat_track(y=y, sr=sr)
+            beats = ctx.beat_frames
             
             if len(beats) < 4:
                 return 50.0  # Not enough beats to measure
             
-            # 1. Beat interval consistency
-            beat_times = librosa.frames_to_time(beats, sr=sr)
-            beat_intervals = np.diff(beat_times)
-            
-            # Coefficient of variation (CV) - lower is better
-            mean_interval = np.mean(beat_intervals)
-            std_interval = np.std(beat_intervals)
-            cv = std_interval / (mean_interval + 1e-8)
-            
-            # Score: professional recordings have CV < 0.05
-            if cv < 0.05:
-                consistency_score = 100
-            elif cv < 0.10:
-                consistency_score = 85
-            elif cv < 0.15:
-                consistency_score = 70
-            elif cv < 0.25:
-                consistency_score = 50
-            else:
-                consistency_score = 30  # Erratic timing (The Shaggs)
-            
-            # 2. Onset strength (clear rhythmic definition)
-            onset_env = librosa.onset.onset_strength(y=y, sr=sr)
-            onset_strength = np.mean(onset_env) / (np.std(onset_env) + 1e-8)
-            
-            # Normalize to 0-100
-            onset_score = min(onset_strength * 20, 100)
-            
-            # Combine scores
-            timing_precision = (consistency_score * 0.7) + (onset_score * 0.3)
-            return float(np.clip(timing_precision, 0, 100))
+            # Beat interval consistency and onset strength
+            onset_env = ctx.onset_envelope
+            return self._score_beat_consistency(
+                coefficient_of_variation(np.diff(ctx.beat_times)),
+                float(np.mean(onset_env)),
+                float(np.std(onset_env)),
+            )
             
         except Exception as e:
             logger.warning(f"Timing precision measurement failed: {e}")
             return 70.0  # Neutral score on error
+
+    def _score_beat_consistency(
+        self, beat_interval_cv: float, onset_mean: float, onset_std: float
+    ) -> float:
+        """
+        Timing precision quality score (0-100).
+
+        Args:
+            beat_interval_cv: Coefficient of variation of beat intervals
+            onset_mean: Mean of the onset strength envelope
+            onset_std: Standard deviation of the onset strength envelope
+
+        Returns:
+            Timing precision score
+        """
+        # 1. Beat interval consistency
+        # Score: professional recordings have CV < 0.05 (lower is better)
+        cv = beat_interval_cv
+        if cv < 0.05:
+            consistency_score = 100
+        elif cv < 0.10:
+            consistency_score = 85
+        elif cv < 0.15:
+            consistency_score = 70
+        elif cv < 0.25:
+            consistency_score = 50
+        else:
+            consistency_score = 30  # Erratic timing (The Shaggs)
+        
+        # 2. Onset strength (clear rhythmic definition)
+        onset_strength = onset_mean / (onset_std + 1e-8)
+        
+        # Normalize to 0-100
+        onset_score = min(onset_strength * 20, 100)
+        
+        # Combine scores
+        timing_precision = (consistency_score * 0.7) + (onset_score * 0.3)
+        return float(np.clip(timing_precision, 0, 100))
     
-    def _measure_harmonic_coherence(self, y: np.ndarray, sr: int) -> float:
+    def _measure_harmonic_coherence(self, ctx: AudioContext) -> float:
         """
         Measure harmonic coherence (0-100).
         
@@ -705,50 +755,58 @@ class AudioFeatureExtractor:
         """
         try:
             # Extract chromagram (pitch class distribution)
-            chroma = librosa.feature.chroma_cqt(y=y, sr=sr)
-            
-            # 1. Chord clarity - how well-defined are the chords?
-            # Strong chords have high peak-to-average ratio in chroma
-            chroma_max = np.max(chroma, axis=0)
-            chroma_mean = np.mean(chroma, axis=0)
-            clarity_ratio = chroma_max / (chroma_mean + 1e-8)
-            
-            # Average clarity across time
-            mean_clarity = np.mean(clarity_ratio)
-            
-            # Score: professional recordings have clarity > 3.0
-            if mean_clarity > 4.0:
-                clarity_score = 100
-            elif mean_clarity > 3.0:
-                clarity_score = 85
-            elif mean_clarity > 2.0:
-                clarity_score = 70
-            elif mean_clarity > 1.5:
-                clarity_score = 50
-            else:
-                clarity_score = 30  # Muddy/chaotic harmonics
+            chroma = ctx.chroma_cqt()
             
-            # 2. Tonal consistency - do the pitch classes stay coherent?
-            # Measure variance in chroma distribution over time
-            chroma_variance = np.mean(np.std(chroma, axis=1))
-            
-            # Lower variance = more consistent tonality
-            if chroma_variance < 0.10:
-                consistency_score = 100
-            elif chroma_variance < 0.15:
-                consistency_score = 80
-            elif chroma_variance < 0.20:
-                consistency_score = 60
-            else:
-                consistency_score = 40  # Inconsistent tonality
-            
-            # Combine scores
-            harmonic_coherence = (clarity_score * 0.6) + (consistency_score * 0.4)
-            return float(np.clip(harmonic_coherence, 0, 100))
+            # Chord clarity (averaged across time) and tonal consistency
+            # (variance in chroma distribution over time)
+            return self._score_harmonic_coherence(
+                float(np.mean(chroma_clarity(chroma))),
+                float(np.mean(np.std(chroma, axis=1))),
+            )
             
         except Exception as e:
             logger.warning(f"Harmonic coherence measurement failed: {e}")
             return 70.0  # Neutral score on error
+
+    def _score_harmonic_coherence(self, mean_clarity: float, chroma_variance: float) -> float:
+        """
+        Harmonic coherence quality score (0-100).
+
+        Args:
+            mean_clarity: Mean per-frame chord clarity (see ``chroma_clarity``)
+            chroma_variance: Mean over pitch classes of the chroma standard
+                deviation over time
+
+        Returns:
+            Harmonic coherence score
+        """
+        # 1. Chord clarity - how well-defined are the chords?
+        # Score: professional recordings have clarity > 3.0
+        if mean_clarity > 4.0:
+            clarity_score = 100
+        elif mean_clarity > 3.0:
+            clarity_score = 85
+        elif mean_clarity > 2.0:
+            clarity_score = 70
+        elif mean_clarity > 1.5:
+            clarity_score = 50
+        else:
+            clarity_score = 30  # Muddy/chaotic harmonics
+        
+        # 2. Tonal consistency - do the pitch classes stay coherent?
+        # Lower variance = more consistent tonality
+        if chroma_variance < 0.10:
+            consistency_score = 100
+        elif chroma_variance < 0.15:
+            consistency_score = 80
+        elif chroma_variance < 0.20:
+            consistency_score = 60
+        else:
+            consistency_score = 40  # Inconsistent tonality
+        
+        # Combine scores
+        harmonic_coherence = (clarity_score * 0.6) + (consistency_score * 0.4)
+        return float(np.clip(harmonic_coherence, 0, 100))
     
     def _get_quality_grade(self, score: float) -> str:
         """Convert quality score to grade."""
@@ -774,45 +832,261 @@ class AudioFeatureExtractor:
         return "Lower hook potential - consider emphasizing dynamics"
 
 
-# Convenience function
-def extract_audio_features(
-    audio_path: str,
-) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any], dict[str, Any], dict[str, Any]]:
+def sonic_genome_cache_version(extractor: AudioFeatureExtractor) -> str:
     """
-    Extract comprehensive audio analysis: sonic genome, hook data, quality metrics, mastering quality, and chord analysis.
+    Analysis cache version for ``extract_sonic_genome`` output.
+
+    The spectral provider (essentia vs librosa) changes the embedded
+    ``essentia_features`` block, so it is part of the version.
+    """
+    spectral = extractor.spectral_analyzer
+    provider = "essentia" if spectral.use_essentia else "librosa"
+    return f"{extractor.ANALYZER_VERSION}+spectral{spectral.ANALYZER_VERSION}-{provider}"
+
+
+def quality_metrics_cache_version(extractor: AudioFeatureExtractor, ctx: AudioContext) -> str:
+    """
+    Analysis cache version for ``extract_quality_metrics`` output.
+
+    Pitch accuracy comes from the context's pitch trajectory, so the pitch
+    tracker settings are part of the version.
+    """
+    return f"{extractor.ANALYZER_VERSION}-{ctx.pitch_signature}"
+
+
+def use_streaming_analysis(audio_path: str) -> bool:
+    """
+    Whether a file is long enough for the bounded-memory streaming analyzer.
 
     Args:
         audio_path: Path to audio file
 
     Returns:
-        Tuple of (sonic_genome, hook_data, quality_metrics, mastering_quality, chord_analysis)
+        True if its duration reaches ``ANALYSIS_STREAMING_MIN_DURATION``
     """
-    from .mastering_analyzer import MasteringAnalyzer
-    from .chord_analyzer import ChordAnalyzer
-    from .hook_detector_advanced import ViralHookDetector
+    from ...core.config import settings
+    from .streaming import probe_duration
+
+    min_streaming_duration = settings.ANALYSIS_STREAMING_MIN_DURATION
+    if not min_streaming_duration:
+        return False
+    duration = probe_duration(audio_path)
+    return duration is not None and duration >= min_streaming_duration
+
+
+def analyze_core_features(audio: AudioContext | str) -> dict[str, Any]:
+    """
+    Sonic genome, hook data and quality metrics of a track.
+
+    These three share the context's STFT, onset envelope, beat grid and
+    chroma, so they always run together. Those frame-level features are then
+    kept in the feature store. A plain path to a long file is analyzed by the
+    :class:`~.streaming.StreamingAnalyzer` instead (and not stored).
+
+    Args:
+        audio: Shared audio context or path to audio file
+
+    Returns:
+        Dictionary with sonic_genome, hook_data and quality_metrics
+    """
+    from ..cache import cached_analysis
+
+    if isinstance(audio, str) and use_streaming_analysis(audio):
+        from .streaming import StreamingAnalyzer
+
+        logger.info(f"{audio} is long, using streaming analysis")
+        streaming = StreamingAnalyzer()
+        result = cached_analysis(
+            audio, "streaming", streaming.ANALYZER_VERSION,
+            lambda: streaming.analyze(audio),
+        )
+        return {
+            "sonic_genome": result["sonic_genome"],
+            "hook_data": result["hook_data"],
+            "quality_metrics": result["quality_metrics"],
+        }
 
     extractor = AudioFeatureExtractor()
-    sonic_genome = extractor.extract_sonic_genome(audio_path)
-    hook_data = extractor.detect_hook(audio_path)
-    quality_metrics = extractor.extract_quality_metrics(audio_path)
+    ctx = AudioContext.ensure(audio, extractor.sample_rate)
+    extractor_version = extractor.ANALYZER_VERSION
+
+    sonic_genome = cached_analysis(
+        ctx.path, "sonic_genome", sonic_genome_cache_version(extractor),
+        lambda: extractor.extract_sonic_genome(ctx),
+    )
+    hook_data = cached_analysis(
+        ctx.path, "hook", extractor_version, lambda: extractor.detect_hook(ctx)
+    )
+    quality_metrics = cached_analysis(
+        ctx.path, "quality_metrics", quality_metrics_cache_version(extractor, ctx),
+        lambda: extractor.extract_quality_metrics(ctx),
+    )
+    store_features(ctx)
+    return {
+        "sonic_genome": sonic_genome,
+        "hook_data": hook_data,
+        "quality_metrics": quality_metrics,
+    }
+
+
+def analyze_mastering(audio: AudioContext | str) -> dict[str, Any]:
+    """
+    Mastering quality of a track (empty for streamed long files).
+
+    Args:
+        audio: Shared audio context or path to audio file
+
+    Returns:
+        Mastering quality dictionary
+    """
+    from ..cache import cached_analysis
+    from .mastering_analyzer import MasteringAnalyzer
+
+    if isinstance(audio, str) and use_streaming_analysis(audio):
+        return {}
 
-    # Add mastering quality analysis
     mastering_analyzer = MasteringAnalyzer()
-    mastering_quality = mastering_analyzer.analyze(audio_path)
+    ctx = AudioContext.ensure(audio, mastering_analyzer.sample_rate)
+    return cached_analysis(
+        ctx.path, "mastering", mastering_analyzer.ANALYZER_VERSION,
+        lambda: mastering_analyzer.analyze(ctx),
+    )
+
+
+def analyze_chords(audio: AudioContext | str) -> dict[str, Any]:
+    """
+    Chord analysis of a track (empty for streamed long files).
+
+    Args:
+        audio: Shared audio context or path to audio file
+
+    Returns:
+        Chord analysis dictionary
+    """
+    from ..cache import cached_analysis
+    from .chord_analyzer import ChordAnalyzer
+
+    if isinstance(audio, str) and use_streaming_analysis(audio):
+        return {}
 
-    # Add chord analysis
     chord_analyzer = ChordAnalyzer()
-    chord_analysis = chord_analyzer.analyze(audio_path)
+    ctx = AudioContext.ensure(audio, chord_analyzer.sample_rate)
+    return cached_analysis(
+        ctx.path, "chords", chord_analyzer.ANALYZER_VERSION,
+        lambda: chord_analyzer.analyze(ctx),
+    )
+
+
+def analyze_viral_segments(audio: AudioContext | str) -> dict[str, Any]:
+    """
+    Most shareable segments of a track.
+
+    Args:
+        audio: Shared audio context or path to audio file
+
+    Returns:
+        ``ViralHookDetector.detect_viral_segments`` result; empty for
+        streamed long files, whose hook data already has viral segments
+    """
+    from ..cache import cached_analysis
+    from .hook_detector_advanced import ViralHookDetector
+
+    if isinstance(audio, str) and use_streaming_analysis(audio):
+        return {}
+
+    viral_detector = ViralHookDetector()
+    viral_provider = "madmom" if viral_detector.use_madmom else "librosa"
+    ctx = AudioContext.ensure(audio, viral_detector.sample_rate)
+    return cached_analysis(
+        ctx.path, "viral_segments",
+        f"{viral_detector.ANALYZER_VERSION}-{viral_provider}-{ctx.pitch_signature}",
+        lambda: viral_detector.detect_viral_segments(ctx, segment_duration=15.0, top_n=5),
+    )
+
+
+def merge_viral_segments(hook_data: dict[str, Any], viral_result: dict[str, Any] | None) -> None:
+    """
+    Add detected viral segments to ``hook_data`` in place.
+
+    Args:
+        hook_data: Hook detection result
+        viral_result: ``analyze_viral_segments`` result, or None if it failed
+    """
+    if viral_result is None:
+        hook_data["viral_segments"] = []
+    elif viral_result.get("viral_segments"):
+        hook_data["viral_segments"] = viral_result["viral_segments"]
+        logger.info(f"✅ Detected {len(viral_result['viral_segments'])} viral segments")
+
+
+def analyze_audio(audio: AudioContext | str) -> dict[str, Any]:
+    """
+    Run every audio analyzer of a track on one shared decode.
+
+    The file is decoded once into a shared :class:`AudioContext`; every analyzer
+    reuses its memoized STFT, onset envelope, RMS, beat grid and chroma. Each
+    analyzer result is looked up in the content-addressed analysis cache first,
+    so unchanged audio is only decoded when some analyzer version changed.
+
+    Audio longer than ``ANALYSIS_STREAMING_MIN_DURATION`` is analyzed by the
+    bounded-memory :class:`~.streaming.StreamingAnalyzer` instead; mastering
+    and chord analysis are empty in that mode.
+
+    Args:
+        audio: Shared audio context or path to audio file
+
+    Returns:
+        Dictionary with sonic_genome, hook_data (viral segments merged in),
+        quality_metrics, mastering_quality, chord_analysis and viral_segments
+        (the detector result, None if it failed)
+    """
+    if isinstance(audio, str) and use_streaming_analysis(audio):
+        core = analyze_core_features(audio)
+        return {**core, "mastering_quality": {}, "chord_analysis": {}, "viral_segments": {}}
+
+    ctx = AudioContext.ensure(audio, AudioFeatureExtractor().sample_rate)
+    core = analyze_core_features(ctx)
+    hook_data = dict(core["hook_data"])
+    mastering_quality = analyze_mastering(ctx)
+    chord_analysis = analyze_chords(ctx)
 
-    # Add viral segments detection to hook_data
     try:
-        viral_detector = ViralHookDetector()
-        viral_result = viral_detector.detect_viral_segments(audio_path, segment_duration=15.0, top_n=5)
-        if viral_result.get("viral_segments"):
-            hook_data["viral_segments"] = viral_result["viral_segments"]
-            logger.info(f"✅ Detected {len(viral_result['viral_segments'])} viral segments")
+        viral_result = analyze_viral_segments(ctx)
     except Exception as e:
         logger.warning(f"Viral segment detection failed: {e}")
-        hook_data["viral_segments"] = []
+        viral_result = None
+    merge_viral_segments(hook_data, viral_result)
+
+    return {
+        "sonic_genome": core["sonic_genome"],
+        "hook_data": hook_data,
+        "quality_metrics": core["quality_metrics"],
+        "mastering_quality": mastering_quality,
+        "chord_analysis": chord_analysis,
+        "viral_segments": viral_result,
+    }
+
 
-    return sonic_genome, hook_data, quality_metrics, mastering_quality, chord_analysis
+# Convenience function
+def extract_audio_features(
+    audio_path: str,
+) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any], dict[str, Any], dict[str, Any]]:
+    """
+    Extract comprehensive audio analysis: sonic genome, hook data, quality metrics, mastering quality, and chord analysis.
+
+    See :func:`analyze_audio`, which this unpacks.
+
+    Args:
+        audio_path: Path to audio file
+
+    Returns:
+        Tuple of (sonic_genome, hook_data, quality_metrics, mastering_quality, chord_analysis)
+    """
+    result = analyze_audio(audio_path)
+    return (
+        result["sonic_genome"],
+        result["hook_data"],
+        result["quality_metrics"],
+        result["mastering_quality"],
+        result["chord_analysis"],
+    )
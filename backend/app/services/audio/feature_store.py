@@ -0,0 +1,354 @@
+"""Persisted frame-level features for re-analysis without the audio.
+
+The analysis pipeline computes STFT magnitude, onset envelope, RMS,
+zero-crossing rate, chroma, beats and pitch for every upload, then keeps only
+aggregates in ``Analysis.sonic_genome``. The feature store keeps the
+frame-level arrays, so re-analysis scripts and new analyzers can build an
+:class:`~.context.AudioContext` from them instead of decoding the file and
+recomputing each representation.
+
+Arrays are stored per audio SHA-256, sample rate and hop length as float16
+(beats as int32), frame-major and split into chunks of ``CHUNK_FRAMES``
+frames. Each chunk is a ``.npy`` file opened as a read-only memory map, so
+reading one array, or a time range of it, touches only those chunks.
+
+Layout: ``<root>/<hash[:2]>/<hash>/v<version>-<sr>-<hop>/{meta.json,<array>/<chunk>.npy}``.
+Bump ``FEATURE_STORE_VERSION`` whenever a stored representation changes.
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FEATURE_STORE_VERSION = 1
+FEATURE_DTYPE = np.float16
+CHUNK_FRAMES = 2048  # ~47 s at 22.05 kHz with hop 512
+
+# Frame-level representations of AudioContext, in their natural orientation
+# (features, frames); stored frame-major
+FRAME_ARRAYS = ("stft_magnitude", "onset_envelope", "rms", "zero_crossing_rate", "chroma_cqt")
+
+
+def pitch_array_name(fmin: float, fmax: float) -> str:
+    """Stored name of a pitch trajectory for one frequency range."""
+    return f"pitch_f0_{fmin:g}_{fmax:g}"
+
+
+class FeatureSet:
+    """The stored features of one track, read lazily from memory maps."""
+
+    def __init__(self, directory: Path, meta: dict[str, Any]) -> None:
+        """
+        Initialize feature set.
+
+        Args:
+            directory: Entry directory
+            meta: Stored metadata (see ``FeatureWriter``)
+        """
+        self.directory = directory
+        self.meta = meta
+        self.sr: int = meta["sr"]
+        self.hop_length: int = meta["hop_length"]
+        self.samples: int = meta["samples"]
+        self.duration: float = meta["duration"]
+        self.tempo: float = meta["tempo"]
+        self.pitch_signature: str | None = meta.get("pitch_signature")
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        """Names of the stored arrays."""
+        return tuple(self.meta["arrays"])
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.meta["arrays"]
+
+    def _chunk(self, name: str, index: int) -> np.ndarray:
+        return np.load(self.directory / name / f"{index:04d}.npy", mmap_mode="r")
+
+    def frames(self, name: str, start: int = 0, stop: int | None = None) -> np.ndarray:
+        """
+        A frame range of one array, reading only the chunks it spans.
+
+        Args:
+            name: Array name
+            start: First frame
+            stop: End frame (exclusive; None = last)
+
+        Returns:
+            float32 array in its natural orientation, frames on the last axis
+        """
+        if name not in self:
+            raise KeyError(f"No stored feature {name!r}")
+        info = self.meta["arrays"][name]
+        total = info["shape"][-1]
+        stop = total if stop is None else min(stop, total)
+        if start >= stop:
+            return np.zeros((*info["shape"][:-1], 0), dtype=np.float32)
+
+        first, last = start // CHUNK_FRAMES, (stop - 1) // CHUNK_FRAMES
+        parts = [self._chunk(name, index) for index in range(first, last + 1)]
+        offset = first * CHUNK_FRAMES
+        data = np.concatenate(parts, axis=0)[start - offset : stop - offset]
+        return np.ascontiguousarray(data.T, dtype=np.float32)
+
+    def array(self, name: str) -> np.ndarray:
+        """
+        One whole array.
+
+        Args:
+            name: Array name (see ``names``)
+
+        Returns:
+            float32 array (int64 for beat frames) in its natural orientation
+        """
+        if name == "beat_frames":
+            return np.load(self.directory / "beat_frames.npy").astype(np.int64)
+        return self.frames(name)
+
+
+class FeatureWriter:
+    """
+    Write one track's features into a temporary directory.
+
+    ``commit`` moves the entry into place so readers never see a partial one.
+    """
+
+    def __init__(self, directory: Path, sr: int, hop_length: int, samples: int) -> None:
+        """
+        Initialize feature writer.
+
+        Args:
+            directory: Final entry directory
+            sr: Sample rate the features were computed at
+            hop_length: Hop length of the frame-level features
+            samples: Samples of the decoded audio
+        """
+        self.directory = directory
+        self.meta: dict[str, Any] = {
+            "version": FEATURE_STORE_VERSION,
+            "sr": sr,
+            "hop_length": hop_length,
+            "samples": samples,
+            "duration": samples / sr,
+            "tempo": 0.0,
+            "chunk_frames": CHUNK_FRAMES,
+            "arrays": {},
+            "created_at": datetime.utcnow().isoformat(),
+        }
+        directory.parent.mkdir(parents=True, exist_ok=True)
+        self.tmp_dir = Path(tempfile.mkdtemp(prefix=".features-", dir=directory.parent))
+
+    def add(self, name: str, array: np.ndarray) -> None:
+        """
+        Store a frame-level array.
+
+        Args:
+            name: Array name
+            array: Array with frames on the last axis
+        """
+        frame_major = np.asarray(array).T.astype(FEATURE_DTYPE)
+        (self.tmp_dir / name).mkdir()
+        starts = range(0, len(frame_major), CHUNK_FRAMES)
+        for index, start in enumerate(starts):
+            np.save(
+                self.tmp_dir / name / f"{index:04d}.npy",
+                np.ascontiguousarray(frame_major[start : start + CHUNK_FRAMES]),
+            )
+        self.meta["arrays"][name] = {
+            "shape": list(np.shape(array)),
+            "dtype": np.dtype(FEATURE_DTYPE).name,
+            "chunks": len(starts),
+        }
+
+    def add_beats(self, tempo: float, beat_frames: np.ndarray) -> None:
+        """
+        Store the beat grid (exact frame indices, not float16).
+
+        Args:
+            tempo: Estimated tempo in BPM
+            beat_frames: Beat positions in frames
+        """
+        self.meta["tempo"] = float(np.atleast_1d(tempo)[0])
+        np.save(self.tmp_dir / "beat_frames.npy", np.asarray(beat_frames, dtype=np.int32))
+        self.meta["arrays"]["beat_frames"] = {
+            "shape": [len(beat_frames)],
+            "dtype": "int32",
+            "chunks": 1,
+        }
+
+    def commit(self) -> Path:
+        """
+        Move the entry into place.
+
+        Returns:
+            Entry directory (an existing one if another process finished first)
+        """
+        (self.tmp_dir / "meta.json").write_text(json.dumps(self.meta))
+        try:
+            os.replace(self.tmp_dir, self.directory)
+        except OSError:
+            # Another writer won the race; keep its entry
+            self.abort()
+        return self.directory
+
+    def abort(self) -> None:
+        """Discard everything written."""
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+
+class FeatureStore:
+    """On-disk store of frame-level features per audio hash."""
+
+    def __init__(self, root: str | Path) -> None:
+        """
+        Initialize feature store.
+
+        Args:
+            root: Store directory
+        """
+        self.root = Path(root)
+
+    def entry_dir(self, audio_hash: str, sr: int, hop_length: int) -> Path:
+        """Directory of one track's features at one framing."""
+        return (
+            self.root / audio_hash[:2] / audio_hash
+            / f"v{FEATURE_STORE_VERSION}-{sr}-{hop_length}"
+        )
+
+    def get(self, audio_hash: str, sr: int = 22050, hop_length: int = 512) -> FeatureSet | None:
+        """
+        Look up stored features.
+
+        Args:
+            audio_hash: SHA-256 of the audio file
+            sr: Sample rate
+            hop_length: Hop length
+
+        Returns:
+            Feature set, or None if the track has none at this framing
+        """
+        directory = self.entry_dir(audio_hash, sr, hop_length)
+        try:
+            meta = json.loads((directory / "meta.json").read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Discarding unreadable feature store entry {directory}: {e}")
+            shutil.rmtree(directory, ignore_errors=True)
+            return None
+        return FeatureSet(directory, meta)
+
+    def save(self, ctx: Any, audio_hash: str) -> Path:
+        """
+        Store the frame-level features of an audio context.
+
+        Representations the context has not computed yet are computed now,
+        except pitch: only trajectories already tracked are stored, since
+        tracking on the vocal stem may need a Demucs separation.
+
+        Args:
+            ctx: Audio context of the track
+            audio_hash: SHA-256 of its audio file
+
+        Returns:
+            Entry directory
+        """
+        writer = FeatureWriter(
+            self.entry_dir(audio_hash, ctx.sr, ctx.hop_length),
+            sr=ctx.sr,
+            hop_length=ctx.hop_length,
+            samples=len(ctx.y),
+        )
+        try:
+            for name in FRAME_ARRAYS:
+                value = ctx.chroma_cqt(ctx.hop_length) if name == "chroma_cqt" else getattr(ctx, name)
+                writer.add(name, value)
+            writer.add_beats(ctx.tempo, ctx.beat_frames)
+            pitch_ranges = {}
+            for (fmin, fmax), trajectory in ctx.tracked_pitch().items():
+                name = pitch_array_name(fmin, fmax)
+                writer.add(name, trajectory.f0)
+                pitch_ranges[name] = [fmin, fmax]
+            writer.meta["pitch_ranges"] = pitch_ranges
+            writer.meta["pitch_signature"] = ctx.pitch_signature if pitch_ranges else None
+        except Exception:
+            writer.abort()
+            raise
+        return writer.commit()
+
+
+# Singleton instance (lazy-loaded)
+_feature_store_instance: FeatureStore | None = None
+
+
+def get_feature_store() -> FeatureStore | None:
+    """
+    Get the process-wide feature store.
+
+    Returns:
+        Store instance, or None when the feature store is disabled in settings
+    """
+    global _feature_store_instance
+
+    from ...core.config import settings
+
+    if not settings.FEATURE_STORE_ENABLED:
+        return None
+
+    if _feature_store_instance is None:
+        _feature_store_instance = FeatureStore(settings.FEATURE_STORE_DIR)
+    return _feature_store_instance
+
+
+def store_features(ctx: Any) -> None:
+    """
+    Persist a context's features unless the store already has them.
+
+    Best effort: failures are logged, never raised, so analysis results do
+    not depend on the store.
+
+    Args:
+        ctx: Audio context of an analyzed track
+    """
+    from ..cache import audio_content_hash
+
+    store = get_feature_store()
+    if store is None:
+        return
+    try:
+        audio_hash = audio_content_hash(ctx.path)
+        if store.get(audio_hash, ctx.target_sample_rate, ctx.hop_length) is None:
+            store.save(ctx, audio_hash)
+    except Exception as e:
+        logger.warning(f"Could not store frame-level features for {ctx.path}: {e}")
+
+
+def load_features(
+    audio_path: str | Path, sr: int = 22050, hop_length: int = 512
+) -> FeatureSet | None:
+    """
+    Stored features of an audio file.
+
+    Args:
+        audio_path: Path to the audio file (only hashed, not decoded)
+        sr: Sample rate
+        hop_length: Hop length
+
+    Returns:
+        Feature set, or None if not stored (or the store is disabled)
+    """
+    from ..cache import audio_content_hash
+
+    store = get_feature_store()
+    if store is None:
+        return None
+    return store.get(audio_content_hash(audio_path), sr, hop_length)
@@ -0,0 +1,253 @@
+"""Spectral-peak audio fingerprints for duplicate upload detection.
+
+A constellation fingerprint in the style of Chromaprint/Shazam: local maxima
+of the 11 kHz log spectrogram are paired with a few peaks that follow them,
+and each pair (anchor bin, target bin, frame gap) packs into a 24-bit hash
+stored with the anchor's frame offset. Peak pairs survive re-encoding,
+resampling and loudness changes, so a transcoded copy of a track shares most
+of its hashes at a constant time offset.
+
+Only hashes divisible by ``HASH_STRIDE`` are kept. Selection depends on the
+hash value alone, so an upload and the indexed copy keep the same subset.
+That value ends in the pair's frame gap, which a sub-frame shift of the audio
+(trimmed leading silence, codec delay) changes by one frame for many pairs,
+dropping them from the subset. Lookups therefore also search each pair with
+its gap off by up to ``DT_TOLERANCE`` frames; the index is unchanged.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.ndimage import maximum_filter, uniform_filter
+
+from .decoder import load_audio
+
+# Stored with every fingerprint; fingerprints only match the same version
+FINGERPRINT_VERSION = 1
+
+FINGERPRINT_SR = 11025
+N_FFT = 1024
+HOP_LENGTH = 256  # ~23 ms frames
+
+# Peak picking: local maxima over ~0.25 s x ~300 Hz, at most this many per second
+PEAK_NEIGHBORHOOD = (29, 11)  # (frequency bins, frames)
+PEAKS_PER_SECOND = 30
+PEAK_FLOOR_DB = -60.0  # Relative to the loudest bin
+# Peaks must stand this far above their neighborhood's mean level, which
+# rejects the maxima that broadband noise (and codec noise) always has
+PEAK_PROMINENCE_DB = 10.0
+
+# Each anchor pairs with the next FAN_OUT peaks at most MAX_DT frames later
+FAN_OUT = 5
+MAX_DT = 63  # 6 bits
+FREQ_BITS = 9  # Bins above 511 (~5.5 kHz) are dropped
+
+HASH_STRIDE = 4
+# Frame gap jitter searched for at lookup time
+DT_TOLERANCE = 1
+
+# Spectrogram frames analyzed at a time (~48 s), so peak picking on a long
+# track never holds its whole spectrogram
+BLOCK_FRAMES = 2048
+
+# Hashes of a match must agree on their offset within this many frames,
+# and a match needs at least this many of them
+OFFSET_TOLERANCE = 1
+MIN_ALIGNED_HASHES = 10
+
+
+@dataclass
+class Fingerprint:
+    """Hashes of one recording."""
+
+    hashes: np.ndarray  # (n,) uint32
+    offsets: np.ndarray  # (n,) int32 anchor frame of each hash
+    duration: float
+    # Hashes with frame gaps within DT_TOLERANCE, to search the index with
+    lookup_hashes: np.ndarray | None = None
+    lookup_offsets: np.ndarray | None = None
+
+    def lookup(self) -> tuple[np.ndarray, np.ndarray]:
+        """Hashes and anchor offsets to search the index with."""
+        if self.lookup_hashes is None or self.lookup_offsets is None:
+            return self.hashes, self.offsets
+        return self.lookup_hashes, self.lookup_offsets
+
+
+def _log_spectrogram(y: np.ndarray, first: int, last: int) -> np.ndarray:
+    """Log magnitude spectrogram (bins, frames) of frames ``first`` to ``last``."""
+    segment = y[first * HOP_LENGTH : (last - 1) * HOP_LENGTH + N_FFT]
+    windows = np.lib.stride_tricks.sliding_window_view(segment, N_FFT)[::HOP_LENGTH]
+    spectrum = np.abs(np.fft.rfft(windows * np.hanning(N_FFT).astype(np.float32), axis=1))
+    return 20 * np.log10(spectrum[:, : 1 << FREQ_BITS].T + 1e-10)
+
+
+def spectral_peaks(y: np.ndarray, sr: int = FINGERPRINT_SR) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Constellation of prominent spectrogram peaks.
+
+    The spectrogram is processed in blocks of ``BLOCK_FRAMES`` frames, each
+    padded with enough neighboring frames for the peak filters, so memory
+    stays bounded however long the track is.
+
+    Args:
+        y: Mono audio at ``sr``
+        sr: Sample rate
+
+    Returns:
+        (frames, bins) of the peaks, sorted by frame then bin
+    """
+    if len(y) < N_FFT:
+        return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32)
+
+    frames = 1 + (len(y) - N_FFT) // HOP_LENGTH
+    halo = PEAK_NEIGHBORHOOD[1] // 2
+    all_times, all_bins, all_levels = [], [], []
+    loudest = -np.inf
+    for first in range(0, frames, BLOCK_FRAMES):
+        last = min(first + BLOCK_FRAMES, frames)
+        padded_first, padded_last = max(0, first - halo), min(frames, last + halo)
+        log_spec = _log_spectrogram(y, padded_first, padded_last)
+
+        is_peak = (
+            maximum_filter(log_spec, size=PEAK_NEIGHBORHOOD, mode="constant", cval=-np.inf)
+            == log_spec
+        )
+        local_mean = uniform_filter(log_spec, size=PEAK_NEIGHBORHOOD, mode="nearest")
+        is_peak &= log_spec > local_mean + PEAK_PROMINENCE_DB
+
+        # Only the block's own frames; the padding belongs to its neighbors
+        core = slice(first - padded_first, last - padded_first)
+        log_spec, is_peak = log_spec[:, core], is_peak[:, core]
+        loudest = max(loudest, float(log_spec.max()))
+        bins, times = np.nonzero(is_peak)
+        all_times.append(times + first)
+        all_bins.append(bins)
+        all_levels.append(log_spec[bins, times])
+
+    times, bins, levels = (np.concatenate(parts) for parts in (all_times, all_bins, all_levels))
+    above_floor = levels > loudest + PEAK_FLOOR_DB
+    times, bins, levels = times[above_floor], bins[above_floor], levels[above_floor]
+
+    # Keep the strongest peaks up to the density budget
+    budget = int(PEAKS_PER_SECOND * len(y) / sr)
+    if len(times) > budget:
+        strongest = np.argsort(levels)[::-1][:budget]
+        bins, times = bins[strongest], times[strongest]
+
+    order = np.lexsort((bins, times))
+    return times[order].astype(np.int32), bins[order].astype(np.int32)
+
+
+def hash_peaks(
+    times: np.ndarray, bins: np.ndarray, dt_tolerance: int = 0
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pair each peak with the peaks following it.
+
+    Args:
+        times: Peak frames, sorted
+        bins: Peak frequency bins
+        dt_tolerance: Also hash each pair with its frame gap off by up to
+            this many frames (for lookups)
+
+    Returns:
+        (hashes, anchor offsets), sampled by ``HASH_STRIDE``
+    """
+    hashes, offsets = [], []
+    for k in range(1, FAN_OUT + 1):
+        dt = times[k:] - times[:-k]
+        valid = (dt > 0) & (dt <= MAX_DT)
+        anchor_bins = bins[:-k][valid].astype(np.uint32)
+        target_bins = bins[k:][valid].astype(np.uint32)
+        anchor_times = times[:-k][valid]
+        for shift in range(-dt_tolerance, dt_tolerance + 1):
+            gap = dt[valid] + shift
+            in_range = (gap > 0) & (gap <= MAX_DT)
+            hashes.append(
+                (anchor_bins[in_range] << (FREQ_BITS + 6))
+                | (target_bins[in_range] << 6)
+                | gap[in_range].astype(np.uint32)
+            )
+            offsets.append(anchor_times[in_range])
+
+    all_hashes = np.concatenate(hashes) if hashes else np.zeros(0, dtype=np.uint32)
+    all_offsets = np.concatenate(offsets) if offsets else np.zeros(0, dtype=np.int32)
+    kept = all_hashes % HASH_STRIDE == 0
+    return all_hashes[kept], all_offsets[kept]
+
+
+def compute_fingerprint(audio_path: str) -> Fingerprint:
+    """
+    Fingerprint an audio file.
+
+    Args:
+        audio_path: Path to audio file
+
+    Returns:
+        Fingerprint of the whole recording
+    """
+    y, sr = load_audio(audio_path, sr=FINGERPRINT_SR, mono=True)
+    times, bins = spectral_peaks(np.asarray(y, dtype=np.float32), sr)
+    hashes, offsets = hash_peaks(times, bins)
+    lookup_hashes, lookup_offsets = hash_peaks(times, bins, dt_tolerance=DT_TOLERANCE)
+    return Fingerprint(
+        hashes=hashes,
+        offsets=offsets,
+        duration=float(len(y) / sr),
+        lookup_hashes=lookup_hashes,
+        lookup_offsets=lookup_offsets,
+    )
+
+
+def score_matches(
+    query: Fingerprint,
+    hashes: np.ndarray,
+    track_ids: np.ndarray,
+    offsets: np.ndarray,
+) -> dict[int, float]:
+    """
+    Similarity of a query to each indexed recording sharing its hashes.
+
+    Counts the hits of the query's lookup hashes in a recording that agree
+    on one time offset (a histogram peak, within ``OFFSET_TOLERANCE``
+    frames) relative to the query's own hash count. An excerpt of a longer recording still scores high,
+    so callers that look for whole-track copies must also compare durations.
+
+    Args:
+        query: Query fingerprint
+        hashes: Hash of each index hit (looked up with ``query.lookup()``)
+        track_ids: Track of each index hit
+        offsets: Indexed anchor offset of each index hit
+
+    Returns:
+        Track id -> similarity between 0 and 1, for tracks with enough
+        aligned hashes to count as a match
+    """
+    if not len(hashes) or not len(query.hashes):
+        return {}
+
+    query_hashes, query_offsets = query.lookup()
+
+    # Join index hits with every query occurrence of the same hash
+    order = np.argsort(query_hashes, kind="stable")
+    sorted_hashes = query_hashes[order]
+    first = np.searchsorted(sorted_hashes, hashes, side="left")
+    last = np.searchsorted(sorted_hashes, hashes, side="right")
+    repeats = last - first
+    hit = np.repeat(np.arange(len(hashes)), repeats)
+    position = np.arange(len(hit)) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+    hit_offsets = query_offsets[order[np.repeat(first, repeats) + position]]
+    delta = offsets[hit].astype(np.int64) - hit_offsets
+    hit_tracks = track_ids[hit]
+
+    window = np.ones(2 * OFFSET_TOLERANCE + 1, dtype=np.int64)
+    scores = {}
+    for track_id in np.unique(hit_tracks):
+        track_delta = delta[hit_tracks == track_id]
+        counts = np.bincount(track_delta - track_delta.min())
+        aligned = int(np.convolve(counts, window, mode="same").max())
+        if aligned < MIN_ALIGNED_HASHES:
+            continue
+        scores[int(track_id)] = min(1.0, aligned / len(query.hashes))
+    return scores
@@ -10,6 +10,9 @@ from typing import Any
 import librosa
 import numpy as np
 
+from .context import AudioContext
+from .pitch import PitchTrajectory
+
 logger = logging.getLogger(__name__)
 
 # Try to import madmom (optional dependency)
@@ -34,6 +37,8 @@ class ViralHookDetector:
     falls back to librosa otherwise.
     """
 
+    ANALYZER_VERSION = "2"
+
     def __init__(self, sample_rate: int = 22050) -> None:
         """
         Initialize viral hook detector.
@@ -45,32 +50,36 @@ class ViralHookDetector:
         self.use_madmom = MADMOM_AVAILABLE
 
     def detect_viral_segments(
-        self, audio_path: str, segment_duration: float = 15.0, top_n: int = 3
+        self,
+        audio: AudioContext | str,
+        segment_duration: float = 15.0,
+        top_n: int = 3,
     ) -> dict[str, Any]:
         """
         Detect top viral hook segments.
 
         Args:
-            audio_path: Path to audio file
+            audio: Shared audio context or path to audio file
             segment_duration: Target duration for each segment (default 15s)
             top_n: Number of top segments to return
 
         Returns:
             Dictionary with viral segments and scores
         """
+        ctx = AudioContext.ensure(audio, self.sample_rate)
         if self.use_madmom:
-            return self._detect_with_madmom(audio_path, segment_duration, top_n)
+            return self._detect_with_madmom(ctx, segment_duration, top_n)
         else:
-            return self._detect_with_librosa(audio_path, segment_duration, top_n)
+            return self._detect_with_librosa(ctx, segment_duration, top_n)
 
     def _detect_with_madmom(
-        self, audio_path: str, segment_duration: float, top_n: int
+        self, ctx: AudioContext, segment_duration: float, top_n: int
     ) -> dict[str, Any]:
         """
         Detect viral segments using madmom.
 
         Args:
-            audio_path: Path to audio file
+            ctx: Shared audio context
             segment_duration: Segment duration in seconds
             top_n: Number of segments to return
 
@@ -78,59 +87,52 @@ class ViralHookDetector:
             Viral segment analysis with madmom precision
         """
         try:
-            # Load audio
-            y, sr = librosa.load(audio_path, sr=self.sample_rate, mono=True)
-            duration = librosa.get_duration(y=y, sr=sr)
+            duration = ctx.duration
 
             # Madmom onset detection (more precise than librosa)
             onset_proc = madmom.features.onsets.OnsetPeakPickingProcessor(
                 fps=100, threshold=0.5
             )
-            onset_act = madmom.features.onsets.RNNOnsetProcessor()(audio_path)
+            onset_act = madmom.features.onsets.RNNOnsetProcessor()(ctx.path)
             onsets = onset_proc(onset_act)
 
             # Beat tracking with madmom
             beat_proc = madmom.features.beats.BeatTrackingProcessor(fps=100)
-            beat_act = madmom.features.beats.RNNBeatProcessor()(audio_path)
+            beat_act = madmom.features.beats.RNNBeatProcessor()(ctx.path)
             beats = beat_proc(beat_act)
 
             # Novelty detection
-            novelty = self._compute_novelty(y, sr)
+            novelty = self._compute_novelty(ctx)
 
             # Energy envelope
-            energy = librosa.feature.rms(y=y)[0]
+            energy = ctx.rms
 
             # Score segments
-            segments = self._score_segments(
-                y, sr, duration, onsets, beats, novelty, energy, segment_duration
+            windows = self._score_segments(
+                ctx, duration, onsets, beats, novelty, energy, segment_duration
             )
 
-            # Return top N segments
-            top_segments = sorted(segments, key=lambda x: x["score"], reverse=True)[
-                :top_n
-            ]
-
             return {
                 "provider": "madmom",
                 "segment_duration": segment_duration,
-                "total_segments_analyzed": len(segments),
-                "viral_segments": top_segments,
+                "total_segments_analyzed": len(windows["start_time"]),
+                "viral_segments": self._top_segments(windows, segment_duration, top_n),
                 "onsets_count": len(onsets),
                 "beats_count": len(beats),
             }
 
         except Exception as e:
             logger.error(f"Madmom detection failed: {e}, falling back to librosa")
-            return self._detect_with_librosa(audio_path, segment_duration, top_n)
+            return self._detect_with_librosa(ctx, segment_duration, top_n)
 
     def _detect_with_librosa(
-        self, audio_path: str, segment_duration: float, top_n: int
+        self, ctx: AudioContext, segment_duration: float, top_n: int
     ) -> dict[str, Any]:
         """
         Detect viral segments using librosa.
 
         Args:
-            audio_path: Path to audio file
+            ctx: Shared audio context
             segment_duration: Segment duration in seconds
             top_n: Number of segments to return
 
@@ -138,41 +140,33 @@ class ViralHookDetector:
             Viral segment analysis with librosa
         """
         try:
-            # Load audio
-            y, sr = librosa.load(audio_path, sr=self.sample_rate, mono=True)
-            duration = librosa.get_duration(y=y, sr=sr)
+            sr = ctx.sr
+            duration = ctx.duration
 
             # Onset detection
-            onset_env = librosa.onset.onset_strength(y=y, sr=sr)
             onsets = librosa.onset.onset_detect(
-                onset_envelope=onset_env, sr=sr, units="time"
+                onset_envelope=ctx.onset_envelope, sr=sr, units="time"
             )
 
             # Beat tracking
-            tempo, beats = librosa.beat.beat_track(y=y, sr=sr)
-            beat_times = librosa.frames_to_time(beats, sr=sr)
+            beat_times = ctx.beat_times
 
             # Novelty
-            novelty = self._compute_novelty(y, sr)
+            novelty = self._compute_novelty(ctx)
 
             # Energy
-            energy = librosa.feature.rms(y=y)[0]
+            energy = ctx.rms
 
             # Score segments
-            segments = self._score_segments(
-                y, sr, duration, onsets, beat_times, novelty, energy, segment_duration
+            windows = self._score_segments(
+                ctx, duration, onsets, beat_times, novelty, energy, segment_duration
             )
 
-            # Return top N
-            top_segments = sorted(segments, key=lambda x: x["score"], reverse=True)[
-                :top_n
-            ]
-
             return {
                 "provider": "librosa",
                 "segment_duration": segment_duration,
-                "total_segments_analyzed": len(segments),
-                "viral_segments": top_segments,
+                "total_segments_analyzed": len(windows["start_time"]),
+                "viral_segments": self._top_segments(windows, segment_duration, top_n),
                 "onsets_count": len(onsets),
                 "beats_count": len(beat_times),
             }
@@ -187,21 +181,22 @@ class ViralHookDetector:
 
     def _score_segments(
         self,
-        y: np.ndarray,
-        sr: int,
+        ctx: AudioContext,
         duration: float,
         onsets: np.ndarray,
         beats: np.ndarray,
         novelty: np.ndarray,
         energy: np.ndarray,
         segment_duration: float,
-    ) -> list[dict[str, Any]]:
+    ) -> dict[str, np.ndarray]:
         """
-        Score all possible segments for viral potential.
+        Score every 1-second-step window for viral potential.
+
+        All windows are scored at once with prefix sums and ``searchsorted``
+        instead of slicing per window, so cost is linear in track length.
 
         Args:
-            y: Audio signal
-            sr: Sample rate
+            ctx: Shared audio context
             duration: Total duration
             onsets: Onset times
             beats: Beat times
@@ -210,153 +205,226 @@ class ViralHookDetector:
             segment_duration: Target segment duration
 
         Returns:
-            List of scored segments
+            Dictionary of per-window arrays: start_time, end_time, score and
+            each factor (all 0-1 except score, which is 0-100)
         """
-        segments = []
-        hop_length = 512  # For frame-to-time conversions
+        sr = ctx.sr
         segment_samples = int(segment_duration * sr)
 
         # Slide window through track (1-second steps)
-        step = sr  # 1 second
-        for start_sample in range(0, len(y) - segment_samples, step):
-            end_sample = start_sample + segment_samples
-            start_time = start_sample / sr
-            end_time = end_sample / sr
-
-            # Extract segment
-            segment = y[start_sample:end_sample]
-
-            # Calculate scores
-            onset_score = self._calculate_onset_density(
-                onsets, start_time, end_time
-            )
-            beat_score = self._calculate_beat_quality(beats, start_time, end_time)
-            energy_score = self._calculate_energy_score(
-                energy, start_sample, end_sample, hop_length
-            )
-            novelty_score = self._calculate_novelty_score(
-                novelty, start_sample, end_sample, hop_length
-            )
-            hook_score = self._calculate_hook_memorability(segment, sr)
-
-            # Weighted composite score
-            composite_score = (
-                onset_score * 0.15
-                + beat_score * 0.20
-                + energy_score * 0.25
-                + novelty_score * 0.20
-                + hook_score * 0.20
-            )
+        start_samples = np.arange(0, int(round(ctx.duration * sr)) - segment_samples, sr)
 
-            # Bonus for ideal placement (not at very start or end)
-            if 15 < start_time < duration - 30:
-                composite_score *= 1.1
+        try:
+            trajectory = ctx.pitch_trajectory()
+        except Exception:
+            trajectory = None
+
+        return self._score_windows(
+            start_samples,
+            start_samples + segment_samples,
+            sr,
+            ctx.hop_length,
+            duration,
+            onsets,
+            beats,
+            novelty,
+            energy,
+            float(np.max(energy)),
+            trajectory,
+        )
+
+    def _score_windows(
+        self,
+        start_samples: np.ndarray,
+        end_samples: np.ndarray,
+        sr: int,
+        hop_length: int,
+        duration: float,
+        onsets: np.ndarray,
+        beats: np.ndarray,
+        novelty: np.ndarray,
+        energy: np.ndarray,
+        energy_max: float,
+        trajectory: PitchTrajectory | None,
+        frame_offset: int = 0,
+    ) -> dict[str, np.ndarray]:
+        """
+        Score windows given by sample ranges.
 
+        The frame-level inputs may start at frame ``frame_offset`` instead of
+        the beginning of the track, so windows can also be scored from a
+        bounded history of frames (see ``audio.streaming``).
+
+        Args:
+            start_samples: Window start positions in samples
+            end_samples: Window end positions in samples
+            sr: Sample rate
+            hop_length: Hop length of the frame-level inputs
+            duration: Total track duration in seconds
+            onsets: Onset times
+            beats: Beat times
+            novelty: Normalized novelty curve
+            energy: Energy envelope
+            energy_max: Maximum of the energy envelope over the whole track
+            trajectory: Dominant pitch trajectory (None = unavailable)
+            frame_offset: Track frame index of the first frame-level input
+
+        Returns:
+            Per-window arrays, as returned by ``_score_segments``
+        """
+        start_times = start_samples / sr
+        end_times = end_samples / sr
+        start_frames = start_samples // hop_length - frame_offset
+        end_frames = end_samples // hop_length - frame_offset
+
+        onset_score = self._window_onset_density(onsets, start_times, end_times)
+        beat_score = self._window_beat_quality(beats, start_times, end_times)
+        energy_score = np.minimum(
+            1.0,
+            self._window_mean(energy, start_frames, end_frames) / (energy_max + 1e-6),
+        )
+        novelty_score = np.minimum(
+            1.0, self._window_mean(novelty, start_frames, end_frames)
+        )
+        offset_samples = frame_offset * hop_length
+        hook_score = self._window_hook_memorability(
+            trajectory, start_samples - offset_samples, end_samples - offset_samples
+        )
+
+        # Weighted composite score
+        composite_score = (
+            onset_score * 0.15
+            + beat_score * 0.20
+            + energy_score * 0.25
+            + novelty_score * 0.20
+            + hook_score * 0.20
+        )
+
+        # Bonus for ideal placement (not at very start or end)
+        ideal = (start_times > 15) & (start_times < duration - 30)
+        composite_score = np.where(ideal, composite_score * 1.1, composite_score)
+
+        return {
+            "start_time": start_times,
+            "end_time": end_times,
+            "score": composite_score * 100,
+            "onset_density": onset_score,
+            "beat_quality": beat_score,
+            "energy": energy_score,
+            "novelty": novelty_score,
+            "hook_memorability": hook_score,
+        }
+
+    def _top_segments(
+        self, windows: dict[str, np.ndarray], segment_duration: float, top_n: int
+    ) -> list[dict[str, Any]]:
+        """Build result entries (with reasons) for the top-N scoring windows."""
+        # Rank on the rounded 0-100 score, ties keep track order
+        rounded = np.round(windows["score"], 1)
+        top_indices = np.argsort(-rounded, kind="stable")[:top_n]
+
+        factor_names = ("onset_density", "beat_quality", "energy", "novelty", "hook_memorability")
+        segments = []
+        for i in top_indices:
+            factors = {name: float(windows[name][i]) for name in factor_names}
             segments.append(
                 {
-                    "start_time": round(start_time, 2),
-                    "end_time": round(end_time, 2),
+                    "start_time": round(float(windows["start_time"][i]), 2),
+                    "end_time": round(float(windows["end_time"][i]), 2),
                     "duration": segment_duration,
-                    "score": round(composite_score * 100, 1),  # 0-100 scale
+                    "score": round(float(windows["score"][i]), 1),  # 0-100 scale
                     "factors": {
-                        "onset_density": round(onset_score * 100, 1),
-                        "beat_quality": round(beat_score * 100, 1),
-                        "energy": round(energy_score * 100, 1),
-                        "novelty": round(novelty_score * 100, 1),
-                        "hook_memorability": round(hook_score * 100, 1),
+                        name: round(value * 100, 1) for name, value in factors.items()
                     },
-                    "reasons": self._generate_reasons(
-                        onset_score, beat_score, energy_score, novelty_score, hook_score
-                    ),
+                    "reasons": self._generate_reasons(*factors.values()),
                 }
             )
-
         return segments
 
-    def _calculate_onset_density(
-        self, onsets: np.ndarray, start: float, end: float
-    ) -> float:
-        """Calculate onset density in segment (more onsets = more interesting)."""
-        segment_onsets = onsets[(onsets >= start) & (onsets < end)]
-        density = len(segment_onsets) / (end - start)
+    @staticmethod
+    def _window_sums(
+        values: np.ndarray, start_idx: np.ndarray, end_idx: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Sum and element count of ``values[start:end]`` for every window."""
+        prefix = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+        end = np.clip(end_idx, 0, len(values))
+        start = np.clip(start_idx, 0, end)
+        return prefix[end] - prefix[start], end - start
+
+    def _window_mean(
+        self, values: np.ndarray, start_idx: np.ndarray, end_idx: np.ndarray
+    ) -> np.ndarray:
+        """Mean of ``values[start:end]`` per window (0 for empty windows)."""
+        sums, counts = self._window_sums(values, start_idx, end_idx)
+        return np.where(counts > 0, sums / np.maximum(counts, 1), 0.0)
+
+    def _window_onset_density(
+        self, onsets: np.ndarray, start: np.ndarray, end: np.ndarray
+    ) -> np.ndarray:
+        """Onset density per window (more onsets = more interesting)."""
+        onsets = np.sort(np.asarray(onsets, dtype=np.float64))
+        counts = np.searchsorted(onsets, end, side="left") - np.searchsorted(
+            onsets, start, side="left"
+        )
         # Normalize: 5-10 onsets per second is good
-        return min(1.0, density / 7.0)
-
-    def _calculate_beat_quality(
-        self, beats: np.ndarray, start: float, end: float
-    ) -> float:
-        """Calculate beat quality (strong, regular beats = more danceable)."""
-        segment_beats = beats[(beats >= start) & (beats < end)]
-        if len(segment_beats) < 2:
-            return 0.0
-
-        # Beat regularity
-        beat_intervals = np.diff(segment_beats)
-        regularity = 1.0 - (np.std(beat_intervals) / (np.mean(beat_intervals) + 1e-6))
-
-        return max(0.0, min(1.0, regularity))
-
-    def _calculate_energy_score(
-        self, energy: np.ndarray, start_sample: int, end_sample: int, hop_length: int
-    ) -> float:
-        """Calculate energy score (high energy = more engaging)."""
-        start_frame = start_sample // hop_length
-        end_frame = end_sample // hop_length
-        segment_energy = energy[start_frame:end_frame]
-
-        if len(segment_energy) == 0:
-            return 0.0
-
-        # Normalize by max energy in track
-        normalized_energy = np.mean(segment_energy) / (np.max(energy) + 1e-6)
-        return min(1.0, normalized_energy)
-
-    def _calculate_novelty_score(
-        self, novelty: np.ndarray, start_sample: int, end_sample: int, hop_length: int
-    ) -> float:
-        """Calculate novelty score (new elements = more interesting)."""
-        start_frame = start_sample // hop_length
-        end_frame = end_sample // hop_length
-        segment_novelty = novelty[start_frame:end_frame]
-
-        if len(segment_novelty) == 0:
-            return 0.0
-
-        return min(1.0, np.mean(segment_novelty))
-
-    def _calculate_hook_memorability(self, segment: np.ndarray, sr: int) -> float:
-        """
-        Calculate hook memorability (melodic repetition + pitch clarity).
+        return np.minimum(1.0, counts / (end - start) / 7.0)
+
+    def _window_beat_quality(
+        self, beats: np.ndarray, start: np.ndarray, end: np.ndarray
+    ) -> np.ndarray:
+        """Beat regularity per window (strong, regular beats = more danceable)."""
+        beats = np.sort(np.asarray(beats, dtype=np.float64))
+        first = np.searchsorted(beats, start, side="left")
+        last = np.searchsorted(beats, end, side="left")
+
+        # Intervals between consecutive in-window beats are intervals[first:last-1]
+        intervals = np.diff(beats)
+        total, count = self._window_sums(intervals, first, last - 1)
+        total_sq, _ = self._window_sums(intervals**2, first, last - 1)
+
+        safe_count = np.maximum(count, 1)
+        mean = total / safe_count
+        std = np.sqrt(np.maximum(total_sq / safe_count - mean**2, 0.0))
+        regularity = np.clip(1.0 - std / (mean + 1e-6), 0.0, 1.0)
+
+        return np.where(last - first >= 2, regularity, 0.0)
+
+    def _window_hook_memorability(
+        self,
+        trajectory: PitchTrajectory | None,
+        start_samples: np.ndarray,
+        end_samples: np.ndarray,
+    ) -> np.ndarray:
         """
-        try:
-            # Pitch tracking
-            pitches, magnitudes = librosa.piptrack(y=segment, sr=sr)
+        Hook memorability per window (melodic repetition + pitch clarity).
 
-            # Get dominant pitch over time
-            pitch_track = []
-            for t in range(pitches.shape[1]):
-                index = magnitudes[:, t].argmax()
-                pitch = pitches[index, t]
-                if pitch > 0:
-                    pitch_track.append(pitch)
+        Uses the track's shared pitch trajectory; each window takes the
+        frames centred inside it, which matches per-segment ``piptrack`` calls.
+        """
+        if trajectory is None:
+            return np.full(len(start_samples), 0.5)  # Default
 
-            if len(pitch_track) < 10:
-                return 0.0
+        pitch_track = trajectory.f0.astype(np.float64)
+        voiced = trajectory.voiced
+        frame_samples = trajectory.frame_samples
+        first = np.searchsorted(frame_samples, start_samples, side="left")
+        last = np.searchsorted(frame_samples, end_samples, side="left")
 
-            # Pitch consistency (more consistent = more memorable)
-            pitch_std = np.std(pitch_track)
-            pitch_mean = np.mean(pitch_track)
-            consistency = 1.0 - (pitch_std / (pitch_mean + 1e-6))
+        total, _ = self._window_sums(np.where(voiced, pitch_track, 0.0), first, last)
+        total_sq, _ = self._window_sums(np.where(voiced, pitch_track**2, 0.0), first, last)
+        count, _ = self._window_sums(voiced.astype(np.float64), first, last)
 
-            # Normalize to 0-1
-            return max(0.0, min(1.0, consistency))
+        # Pitch consistency (more consistent = more memorable)
+        safe_count = np.maximum(count, 1)
+        mean = total / safe_count
+        std = np.sqrt(np.maximum(total_sq / safe_count - mean**2, 0.0))
+        consistency = np.clip(1.0 - std / (mean + 1e-6), 0.0, 1.0)
 
-        except Exception:
-            return 0.5  # Default
+        return np.where(count >= 10, consistency, 0.0)
 
-    def _compute_novelty(self, y: np.ndarray, sr: int) -> np.ndarray:
+    def _compute_novelty(self, ctx: AudioContext) -> np.ndarray:
         """Compute spectral novelty curve."""
-        spec = np.abs(librosa.stft(y))
+        spec = ctx.stft_magnitude
         novelty = librosa.onset.onset_strength(S=librosa.amplitude_to_db(spec, ref=np.max))
         # Normalize
         novelty = (novelty - np.min(novelty)) / (np.max(novelty) - np.min(novelty) + 1e-6)
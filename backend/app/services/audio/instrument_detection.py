@@ -2,11 +2,10 @@
 
 from __future__ import annotations
 
-from functools import lru_cache
 from typing import Any, Dict, List
 
-from transformers import pipeline
-
+from ..inference import run_batched, run_inference
+from ..models import get_model
 
 MODEL_ID = "MIT/ast-finetuned-audioset-10-10-0.4593"
 TARGET_INSTRUMENTS = {
@@ -19,15 +18,44 @@ TARGET_INSTRUMENTS = {
 }
 
 
-@lru_cache(maxsize=1)
+def load_instrument_pipeline():
+    """Model registry loader for the AST AudioSet classifier (torch or ONNX backend)."""
+    from ...core.config import settings
+    from ..models.onnx_backend import load_audio_classifier
+
+    return load_audio_classifier(MODEL_ID, settings.INSTRUMENT_MODEL_BACKEND)
+
+
 def _load_pipeline():
-    return pipeline("audio-classification", model=MODEL_ID)
+    return get_model("instrument_ast")
+
+
+def detect_instruments_batch(
+    audios: List[Any], sampling_rate: int, top_k: int = 100
+) -> List[List[Dict[str, Any]]]:
+    """
+    Raw AudioSet predictions in this process.
+
+    On the inference server, clips of concurrent requests share one forward
+    pass. AST pads every clip to a fixed frame count, so clips of any length
+    batch without changing their predictions.
+    """
+    def run_batch(clips: List[Any]) -> List[List[Dict[str, Any]]]:
+        clf = _load_pipeline()
+        return clf(clips, sampling_rate=sampling_rate, top_k=top_k, batch_size=len(clips))
+
+    return run_batched("detect_instruments", (sampling_rate, top_k), run_batch, audios)
 
 
 def detect_instruments(audio: Any, sampling_rate: int, top_k: int = 100) -> Dict[str, float]:
     """Detect instruments from raw audio array."""
-    clf = _load_pipeline()
-    results: List[Dict[str, Any]] = clf(audio, sampling_rate=sampling_rate, top_k=top_k)
+    results: List[Dict[str, Any]] = run_inference(
+        "detect_instruments",
+        detect_instruments_batch,
+        audios=[audio],
+        sampling_rate=sampling_rate,
+        top_k=top_k,
+    )[0]
     scored = {item["label"].lower(): float(item["score"]) for item in results}
 
     instrument_scores: Dict[str, float] = {}
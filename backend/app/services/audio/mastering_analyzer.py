@@ -1,73 +1,94 @@
-"""Mastering quality analysis using LUFS and Dynamic Range metering."""
+"""Mastering quality analysis using LUFS, true-peak and Dynamic Range metering."""
 
 import logging
 from typing import Any
 
-import librosa
-import numpy as np
-import pyloudnorm as pyln
+from .context import AudioContext
+from .decoder import stream_native
+from .loudness import CURVE_HOP_SUBBLOCKS, SHORT_TERM_SUBBLOCKS, SUBBLOCK_SECONDS, LoudnessMeter
 
 logger = logging.getLogger(__name__)
 
+# Reported level for digital silence instead of -inf (not JSON-serializable)
+SILENCE_DB = -120.0
+
+
+def _db(value: float) -> float:
+    return round(max(value, SILENCE_DB), 1)
+
 
 class MasteringAnalyzer:
     """Analyze mastering quality using industry-standard LUFS and DR metering."""
 
+    ANALYZER_VERSION = "2"
+
     def __init__(self, sample_rate: int = 22050):
         """
         Initialize mastering analyzer.
 
         Args:
-            sample_rate: Target sample rate for audio processing
+            sample_rate: Sample rate of contexts created from plain paths
+                (metering itself always runs on the native-rate decode)
         """
         self.sample_rate = sample_rate
-        self.meter = pyln.Meter(sample_rate)  # BS.1770 meter
 
-    def analyze(self, audio_path: str) -> dict[str, Any]:
+    def analyze(self, audio: AudioContext | str) -> dict[str, Any]:
         """
         Analyze mastering quality of an audio file.
 
+        Loudness (BS.1770-4 / EBU R128), true peak and dynamic range are
+        measured in one pass over the native-rate, multichannel audio,
+        decoded block by block so the whole track is never held in memory;
+        resampling to 22.05 kHz mono would understate both peaks and the
+        loudness of the high end.
+
         Args:
-            audio_path: Path to audio file
+            audio: Shared audio context or path to audio file
 
         Returns:
-            Dictionary containing mastering quality metrics
+            Dictionary containing mastering quality metrics, including a
+            short-term loudness curve (one value per second) for the UI
         """
+        ctx = AudioContext.ensure(audio, self.sample_rate)
         try:
-            # Load audio
-            y, sr = librosa.load(audio_path, sr=self.sample_rate, mono=True)
-
-            # 1. LUFS measurement (integrated loudness)
-            lufs = self.meter.integrated_loudness(y)
-
-            # 2. Peak level (dBFS)
-            peak_db = 20 * np.log10(np.max(np.abs(y)))
-
-            # 3. RMS level (dBFS)
-            rms = np.sqrt(np.mean(y**2))
-            rms_db = 20 * np.log10(rms + 1e-8)
+            blocks, sr, channels = stream_native(ctx.path)
+            meter = LoudnessMeter(sr, channels)
+            for block in blocks:
+                meter.process(block)
+            measurement = meter.result()
 
-            # 4. Dynamic Range (DR) score
-            dynamic_range = self._calculate_dr_score(y)
+            lufs = measurement.integrated_lufs
+            true_peak = max(measurement.true_peak_dbtp, SILENCE_DB)
+            dynamic_range = measurement.dynamic_range
 
-            # 5. Platform target comparison
+            # Platform target comparison
             platform_targets = self._compare_platform_targets(lufs)
 
-            # 6. Overall quality score (0-100)
-            overall_quality = self._calculate_quality_score(lufs, peak_db, dynamic_range)
+            # Overall quality score (0-100); inter-sample peaks are what clip
+            # after lossy encoding, so peaks are judged on true peak
+            overall_quality = self._calculate_quality_score(lufs, true_peak, dynamic_range)
 
-            # 7. Recommendations
             recommendations = self._generate_recommendations(
-                lufs, peak_db, dynamic_range, platform_targets
+                lufs, true_peak, dynamic_range, platform_targets
             )
 
             return {
                 "lufs": round(lufs, 1),
                 "lufs_grade": self._get_lufs_grade(lufs),
-                "peak_db": round(peak_db, 1),
-                "rms_db": round(rms_db, 1),
+                "peak_db": _db(measurement.sample_peak_db),
+                "true_peak_dbtp": _db(true_peak),
+                "rms_db": _db(measurement.rms_db),
                 "dynamic_range": round(dynamic_range, 1),
                 "dr_grade": self._get_dr_grade(dynamic_range),
+                "loudness_range": round(measurement.loudness_range, 1),
+                "max_momentary_lufs": round(measurement.max_momentary_lufs, 1),
+                "max_short_term_lufs": round(measurement.max_short_term_lufs, 1),
+                "short_term_lufs": {
+                    "hop_seconds": round(CURVE_HOP_SUBBLOCKS * SUBBLOCK_SECONDS, 3),
+                    "window_seconds": round(SHORT_TERM_SUBBLOCKS * SUBBLOCK_SECONDS, 3),
+                    "values": measurement.short_term_lufs,
+                },
+                "sample_rate": sr,
                 "platform_targets": platform_targets,
                 "overall_quality": round(overall_quality, 1),
                 "quality_grade": self._get_quality_grade(overall_quality),
@@ -75,42 +96,9 @@ class MasteringAnalyzer:
             }
 
         except Exception as e:
-            logger.error(f"Failed to analyze mastering quality for {audio_path}: {e}")
+            logger.error(f"Failed to analyze mastering quality for {ctx.path}: {e}")
             raise
 
-    def _calculate_dr_score(self, y: np.ndarray) -> float:
-        """
-        Calculate Dynamic Range score (DR meter standard).
-
-        Args:
-            y: Audio signal
-
-        Returns:
-            Dynamic Range score in dB
-        """
-        # Split into 3-second segments
-        segment_length = self.sample_rate * 3
-        segments = [
-            y[i : i + segment_length]
-            for i in range(0, len(y), segment_length)
-            if len(y[i : i + segment_length]) == segment_length
-        ]
-
-        if not segments:
-            return 0.0
-
-        # Calculate DR for each segment
-        dr_values = []
-        for segment in segments:
-            peak = np.max(np.abs(segment))
-            seg_rms = np.sqrt(np.mean(segment**2))
-            if seg_rms > 0:
-                dr = 20 * np.log10(peak / seg_rms)
-                dr_values.append(dr)
-
-        # Return median DR (robust to outliers)
-        return float(np.median(dr_values)) if dr_values else 0.0
-
     def _compare_platform_targets(self, lufs: float) -> dict[str, dict[str, Any]]:
         """
         Compare LUFS to streaming platform targets.
@@ -156,7 +144,7 @@ class MasteringAnalyzer:
 
         Args:
             lufs: LUFS value
-            peak_db: Peak level in dBFS
+            peak_db: True peak level in dBTP
             dr: Dynamic Range score
 
         Returns:
@@ -174,7 +162,7 @@ class MasteringAnalyzer:
         else:
             lufs_score = 40
 
-        # 2. Peak score (optimal: -0.5 to -0.1 dBFS)
+        # 2. Peak score (optimal: -0.5 to -0.1 dBTP)
         if -0.5 <= peak_db <= -0.1:
             peak_score = 100
         elif -1.0 <= peak_db < -0.5:
@@ -247,7 +235,7 @@ class MasteringAnalyzer:
 
         Args:
             lufs: LUFS value
-            peak_db: Peak level
+            peak_db: True peak level
             dr: Dynamic Range
             platform_targets: Platform target comparison
 
@@ -269,7 +257,7 @@ class MasteringAnalyzer:
         # Peak recommendations
         if peak_db > -0.1:
             recommendations.append(
-                "Peak level is too high (clipping risk). Leave at least -0.3 dBFS headroom."
+                "True peak is too high (clipping risk). Leave at least -0.3 dBTP headroom."
             )
         elif peak_db < -2.0:
             recommendations.append(
@@ -0,0 +1,420 @@
+"""Precomputed waveform and spectrogram overviews for the track page.
+
+Drawing a waveform or spectrogram in the browser used to mean downloading
+and decoding the whole file. Instead, one streaming pass over the audio
+computes:
+
+- waveform summaries: min, max and RMS per bin of ``128 * 2**level``
+  samples at 22.05 kHz, for ``WAVEFORM_LEVELS`` zoom levels, as int16
+  triples (full scale = 32767)
+- spectrogram tiles: 128 mel bands in dB per STFT frame (hop 512), quantized
+  to uint8 over ``SPECTROGRAM_DB_RANGE`` below the loudest bin, at zoom
+  levels averaging ``2**level`` frames per column, cut into tiles of
+  ``TILE_COLUMNS`` columns
+
+Every level is stored as one little-endian binary file, frame-major, so a
+time range of any level is a contiguous byte range. Entries are keyed by the
+audio SHA-256, so duplicate uploads share them.
+
+Layout: ``<root>/<hash[:2]>/<hash>/v<version>/{meta.json,waveform-<level>.bin,spectrogram-<level>.bin}``.
+Bump ``OVERVIEW_VERSION`` whenever the format or a computation changes.
+"""
+
+import json
+import logging
+import math
+import os
+import shutil
+import tempfile
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import librosa
+import numpy as np
+
+from .decoder import load_audio
+from .streaming import iter_audio_chunks, iter_frame_blocks, probe_duration
+
+logger = logging.getLogger(__name__)
+
+OVERVIEW_VERSION = 1
+SAMPLE_RATE = 22050
+
+BASE_SAMPLES_PER_BIN = 128  # ~5.8 ms
+WAVEFORM_LEVELS = 10  # Up to 65536 samples (~3 s) per bin
+WAVEFORM_SCALE = 32767
+
+N_FFT = 2048
+HOP_LENGTH = 512
+N_BANDS = 128
+SPECTROGRAM_DB_RANGE = 80.0
+TILE_COLUMNS = 256
+
+
+def _iter_signal(audio_path: str) -> Iterator[np.ndarray]:
+    """Mono signal at ``SAMPLE_RATE``, streamed when soundfile can read the file."""
+    if probe_duration(audio_path) is not None:
+        yield from iter_audio_chunks(audio_path, SAMPLE_RATE)
+    else:
+        yield load_audio(audio_path, sr=SAMPLE_RATE, mono=True)[0]
+
+
+class _WaveformBins:
+    """Min, max and sum of squares per base bin, accumulated chunk by chunk."""
+
+    def __init__(self) -> None:
+        self.remainder = np.zeros(0, dtype=np.float32)
+        self.parts: list[np.ndarray] = []  # (bins, 4): min, max, sum of squares, count
+        self.samples = 0
+
+    def _add_bins(self, samples: np.ndarray) -> None:
+        bins = samples.reshape(-1, BASE_SAMPLES_PER_BIN)
+        self.parts.append(
+            np.column_stack(
+                [
+                    bins.min(axis=1),
+                    bins.max(axis=1),
+                    np.square(bins, dtype=np.float64).sum(axis=1),
+                    np.full(len(bins), BASE_SAMPLES_PER_BIN, dtype=np.float64),
+                ]
+            )
+        )
+
+    def update(self, chunk: np.ndarray) -> None:
+        self.samples += len(chunk)
+        samples = np.concatenate([self.remainder, chunk])
+        whole = len(samples) - len(samples) % BASE_SAMPLES_PER_BIN
+        if whole:
+            self._add_bins(samples[:whole])
+        self.remainder = samples[whole:]
+
+    def finish(self) -> np.ndarray:
+        if len(self.remainder):
+            tail = self.remainder
+            self.parts.append(
+                np.array(
+                    [[tail.min(), tail.max(), np.square(tail, dtype=np.float64).sum(), len(tail)]]
+                )
+            )
+        return np.concatenate(self.parts) if self.parts else np.zeros((0, 4))
+
+
+def _waveform_levels(base: np.ndarray) -> list[np.ndarray]:
+    """Quantized (bins, 3) min/max/RMS arrays per level, halving each time."""
+    levels = []
+    current = base
+    for _ in range(WAVEFORM_LEVELS):
+        rms = np.sqrt(current[:, 2] / np.maximum(current[:, 3], 1))
+        summary = np.column_stack([current[:, 0], current[:, 1], rms])
+        levels.append(
+            np.round(np.clip(summary, -1.0, 1.0) * WAVEFORM_SCALE).astype("<i2")
+        )
+        if len(current) <= 1:
+            break
+        starts = np.arange(0, len(current), 2)
+        current = np.column_stack(
+            [
+                np.minimum.reduceat(current[:, 0], starts),
+                np.maximum.reduceat(current[:, 1], starts),
+                np.add.reduceat(current[:, 2], starts),
+                np.add.reduceat(current[:, 3], starts),
+            ]
+        )
+    return levels
+
+
+def _spectrogram_levels(db: np.ndarray) -> list[np.ndarray]:
+    """Quantized (columns, bands) uint8 arrays per level, halving each time."""
+    floor = float(db.max(initial=-SPECTROGRAM_DB_RANGE)) - SPECTROGRAM_DB_RANGE
+    levels = []
+    current = db.astype(np.float32)
+    while True:
+        scaled = (current - floor) * (255.0 / SPECTROGRAM_DB_RANGE)
+        levels.append(np.round(np.clip(scaled, 0, 255)).astype(np.uint8))
+        if len(current) <= TILE_COLUMNS:
+            break
+        starts = np.arange(0, len(current), 2)
+        counts = np.diff(np.append(starts, len(current)))[:, None]
+        current = np.add.reduceat(current, starts, axis=0) / counts
+    return levels
+
+
+def _mel_db(power: np.ndarray, mel_basis: np.ndarray) -> np.ndarray:
+    """(frames, N_BANDS) float16 mel spectrogram in dB from STFT power."""
+    return librosa.power_to_db(mel_basis @ power, ref=1.0, amin=1e-10).T.astype(np.float16)
+
+
+def overview_from_context(ctx: Any) -> dict[str, Any] | None:
+    """
+    Overview from an already decoded audio context.
+
+    Reuses the context's signal and magnitude STFT (same framing as
+    :func:`compute_overview`), so the analysis stage computing the other
+    features pays for neither a second decode nor a second STFT.
+
+    Args:
+        ctx: Audio context of the track
+
+    Returns:
+        Same as :func:`compute_overview`, or None if the context's sample
+        rate or hop length differ from the overview's
+    """
+    if ctx.sr != SAMPLE_RATE or ctx.hop_length != HOP_LENGTH:
+        return None
+    waveform = _WaveformBins()
+    waveform.update(np.asarray(ctx.y, dtype=np.float32))
+    mel_basis = librosa.filters.mel(sr=SAMPLE_RATE, n_fft=N_FFT, n_mels=N_BANDS)
+    return {
+        "samples": waveform.samples,
+        "waveform": _waveform_levels(waveform.finish()),
+        "spectrogram": _spectrogram_levels(_mel_db(ctx.stft_magnitude**2, mel_basis)),
+    }
+
+
+def compute_overview(audio_path: str) -> dict[str, Any]:
+    """
+    Waveform and spectrogram overview of a file, in one streaming pass.
+
+    Memory grows with duration only through the summaries themselves
+    (under 150 MB per hour of audio, while quantizing).
+
+    Args:
+        audio_path: Path to audio file
+
+    Returns:
+        Dictionary with samples, "waveform" (list of (bins, 3) int16 arrays)
+        and "spectrogram" (list of (columns, N_BANDS) uint8 arrays)
+    """
+    waveform = _WaveformBins()
+    mel_basis = librosa.filters.mel(sr=SAMPLE_RATE, n_fft=N_FFT, n_mels=N_BANDS)
+    spectrogram: list[np.ndarray] = []
+
+    def signal() -> Iterator[np.ndarray]:
+        for chunk in _iter_signal(audio_path):
+            waveform.update(chunk)
+            yield chunk
+
+    for _, block in iter_frame_blocks(signal(), n_fft=N_FFT, hop_length=HOP_LENGTH):
+        power = np.abs(librosa.stft(block, n_fft=N_FFT, hop_length=HOP_LENGTH, center=False)) ** 2
+        spectrogram.append(_mel_db(power, mel_basis))
+
+    return {
+        "samples": waveform.samples,
+        "waveform": _waveform_levels(waveform.finish()),
+        "spectrogram": _spectrogram_levels(
+            np.concatenate(spectrogram) if spectrogram else np.zeros((0, N_BANDS), np.float16)
+        ),
+    }
+
+
+class Overview:
+    """The stored overview of one track."""
+
+    def __init__(self, directory: Path, meta: dict[str, Any]) -> None:
+        """
+        Initialize overview.
+
+        Args:
+            directory: Entry directory
+            meta: Stored metadata (see ``OverviewStore.save``)
+        """
+        self.directory = directory
+        self.meta = meta
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.meta["audio_hash"]}-v{self.meta["version"]}"'
+
+    def waveform(self, level: int, start: float = 0.0, end: float | None = None) -> tuple[bytes, int]:
+        """
+        Waveform bins of one level covering a time range.
+
+        Args:
+            level: Zoom level (0 = finest)
+            start: Start time in seconds
+            end: End time in seconds (None = end of track)
+
+        Returns:
+            Tuple of (int16 min/max/RMS triples as bytes, index of the first bin)
+
+        Raises:
+            IndexError: If the level does not exist
+        """
+        info = self.meta["waveform"]["levels"][level]
+        samples_per_bin = info["samples_per_bin"]
+        first = max(0, int(start * self.meta["sample_rate"]) // samples_per_bin)
+        last = info["bins"]
+        if end is not None:
+            last = min(last, math.ceil(end * self.meta["sample_rate"] / samples_per_bin))
+        return self._read(f"waveform-{level}.bin", first, max(first, last), 3 * 2), first
+
+    def spectrogram_tile(self, level: int, tile: int) -> bytes:
+        """
+        One spectrogram tile: up to ``TILE_COLUMNS`` columns of ``N_BANDS`` bytes.
+
+        Args:
+            level: Zoom level (0 = one STFT frame per column)
+            tile: Tile index within the level
+
+        Returns:
+            uint8 columns, lowest band first (empty past the last tile)
+
+        Raises:
+            IndexError: If the level does not exist
+        """
+        info = self.meta["spectrogram"]["levels"][level]
+        first = tile * TILE_COLUMNS
+        last = min(first + TILE_COLUMNS, info["columns"])
+        return self._read(f"spectrogram-{level}.bin", first, max(first, last), N_BANDS)
+
+    def _read(self, name: str, first: int, last: int, row_bytes: int) -> bytes:
+        with open(self.directory / name, "rb") as f:
+            f.seek(first * row_bytes)
+            return f.read((last - first) * row_bytes)
+
+
+class OverviewStore:
+    """On-disk store of track overviews per audio hash."""
+
+    def __init__(self, root: str | Path) -> None:
+        """
+        Initialize overview store.
+
+        Args:
+            root: Store directory
+        """
+        self.root = Path(root)
+
+    def entry_dir(self, audio_hash: str) -> Path:
+        """Directory of one track's overview."""
+        return self.root / audio_hash[:2] / audio_hash / f"v{OVERVIEW_VERSION}"
+
+    def get(self, audio_hash: str) -> Overview | None:
+        """
+        Look up a stored overview.
+
+        Args:
+            audio_hash: SHA-256 of the audio file
+
+        Returns:
+            Overview, or None if not computed yet
+        """
+        directory = self.entry_dir(audio_hash)
+        try:
+            meta = json.loads((directory / "meta.json").read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Discarding unreadable overview {directory}: {e}")
+            shutil.rmtree(directory, ignore_errors=True)
+            return None
+        return Overview(directory, meta)
+
+    def save(self, audio_hash: str, overview: dict[str, Any]) -> Overview:
+        """
+        Store a computed overview.
+
+        Written to a temporary directory and moved into place, so readers
+        never see a partial entry.
+
+        Args:
+            audio_hash: SHA-256 of the audio file
+            overview: Result of :func:`compute_overview`
+
+        Returns:
+            Stored overview (an existing one if another process finished first)
+        """
+        directory = self.entry_dir(audio_hash)
+        directory.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=".overview-", dir=directory.parent))
+        meta = {
+            "version": OVERVIEW_VERSION,
+            "audio_hash": audio_hash,
+            "sample_rate": SAMPLE_RATE,
+            "samples": overview["samples"],
+            "duration": overview["samples"] / SAMPLE_RATE,
+            "waveform": {
+                "format": "int16le min,max,rms",
+                "scale": WAVEFORM_SCALE,
+                "levels": [],
+            },
+            "spectrogram": {
+                "format": "uint8 columns x bands",
+                "bands": N_BANDS,
+                # Centre frequency of each mel band in Hz
+                "band_frequencies": librosa.mel_frequencies(
+                    n_mels=N_BANDS + 2, fmax=SAMPLE_RATE / 2
+                )[1:-1].round(1).tolist(),
+                "hop_length": HOP_LENGTH,
+                "db_range": SPECTROGRAM_DB_RANGE,
+                "tile_columns": TILE_COLUMNS,
+                "levels": [],
+            },
+            "created_at": datetime.utcnow().isoformat(),
+        }
+        try:
+            for level, bins in enumerate(overview["waveform"]):
+                (tmp_dir / f"waveform-{level}.bin").write_bytes(bins.tobytes())
+                meta["waveform"]["levels"].append(
+                    {"samples_per_bin": BASE_SAMPLES_PER_BIN * 2**level, "bins": len(bins)}
+                )
+            for level, columns in enumerate(overview["spectrogram"]):
+                (tmp_dir / f"spectrogram-{level}.bin").write_bytes(columns.tobytes())
+                meta["spectrogram"]["levels"].append(
+                    {
+                        "frames_per_column": 2**level,
+                        "columns": len(columns),
+                        "tiles": math.ceil(len(columns) / TILE_COLUMNS),
+                    }
+                )
+            (tmp_dir / "meta.json").write_text(json.dumps(meta))
+            os.replace(tmp_dir, directory)
+        except OSError:
+            # Another writer won the race; keep its entry
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            existing = self.get(audio_hash)
+            if existing is None:
+                raise
+            return existing
+        return Overview(directory, meta)
+
+
+# Singleton instance (lazy-loaded)
+_overview_store_instance: OverviewStore | None = None
+
+
+def get_overview_store() -> OverviewStore:
+    """Get the process-wide overview store."""
+    global _overview_store_instance
+
+    from ...core.config import settings
+
+    if _overview_store_instance is None:
+        _overview_store_instance = OverviewStore(settings.OVERVIEW_DIR)
+    return _overview_store_instance
+
+
+def ensure_overview(audio_path: str, ctx: Any = None) -> dict[str, Any]:
+    """
+    Compute and store a file's overview unless it is stored already.
+
+    Args:
+        audio_path: Path to audio file
+        ctx: Decoded audio context of the file to compute from, if any
+            (otherwise the file is streamed)
+
+    Returns:
+        Stored metadata of the overview
+    """
+    from ..cache import audio_content_hash
+
+    store = get_overview_store()
+    audio_hash = audio_content_hash(audio_path)
+    overview = store.get(audio_hash)
+    if overview is None:
+        computed = overview_from_context(ctx) if ctx is not None else None
+        overview = store.save(audio_hash, computed or compute_overview(audio_path))
+        logger.info(f"Stored waveform/spectrogram overview of {audio_path}")
+    return overview.meta
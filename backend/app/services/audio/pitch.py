@@ -0,0 +1,122 @@
+"""Dominant-pitch trajectory extraction.
+
+Quality metrics and hook memorability both need "the strongest pitch in each
+frame". This computes it once with a vectorized ``argmax`` over the
+``piptrack`` output, processing the spectrogram in blocks so long tracks do
+not materialise full-size pitch/magnitude matrices.
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+
+import librosa
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PITCH_TRACKERS = ("piptrack", "pyin")
+
+# librosa.pyin default, in octaves per second
+PYIN_MAX_TRANSITION_RATE = 35.92
+
+# Frames handed to piptrack at a time (bounds the bins x frames temporaries)
+BLOCK_FRAMES = 2048
+
+
+@dataclass(frozen=True)
+class PitchTrajectory:
+    """Per-frame dominant pitch in Hz (0 where no pitch was detected)."""
+
+    f0: np.ndarray
+    sr: int
+    hop_length: int
+
+    @property
+    def voiced(self) -> np.ndarray:
+        """Boolean mask of frames with a detected pitch."""
+        return self.f0 > 0
+
+    @property
+    def voiced_pitches(self) -> np.ndarray:
+        """Detected pitches only, in frame order."""
+        return self.f0[self.f0 > 0]
+
+    @property
+    def frame_samples(self) -> np.ndarray:
+        """Sample position of each frame centre."""
+        return np.arange(len(self.f0)) * self.hop_length
+
+
+def _dominant_pitch(pitches: np.ndarray, magnitudes: np.ndarray) -> np.ndarray:
+    """Pitch of the strongest bin in each frame."""
+    frames = np.arange(pitches.shape[1])
+    return pitches[magnitudes.argmax(axis=0), frames]
+
+
+def compute_pitch_trajectory(
+    y: np.ndarray,
+    sr: int,
+    S: np.ndarray | None = None,
+    hop_length: int = 512,
+    fmin: float = 150.0,
+    fmax: float = 4000.0,
+    method: str = "piptrack",
+    max_frames: int | None = None,
+) -> PitchTrajectory:
+    """
+    Compute the dominant pitch per frame.
+
+    Args:
+        y: Mono audio signal
+        sr: Sample rate
+        S: Optional precomputed magnitude STFT (n_fft=2048, ``hop_length``)
+            to reuse for piptrack
+        hop_length: Hop length of ``S`` / the output frames
+        fmin: Lowest frequency to track
+        fmax: Highest frequency to track
+        method: "piptrack" (fast, default) or "pyin" (probabilistic YIN,
+            more robust but much slower)
+        max_frames: Frame budget; longer tracks are decimated by using a
+            proportionally larger hop (None = no limit)
+
+    Returns:
+        Pitch trajectory
+    """
+    if method not in PITCH_TRACKERS:
+        raise ValueError(f"Unknown pitch tracker {method!r}; expected one of {PITCH_TRACKERS}")
+
+    n_frames = 1 + len(y) // hop_length
+    stride = 1
+    if max_frames and n_frames > max_frames:
+        stride = math.ceil(n_frames / max_frames)
+    frame_hop = hop_length * stride
+
+    if method == "pyin":
+        # When decimating, frames must still cover a hop, and the allowed
+        # pitch jump per frame stays what it is at the base hop
+        frame_length = max(2048, 1 << (frame_hop - 1).bit_length())
+        f0, _, _ = librosa.pyin(
+            y,
+            fmin=fmin,
+            fmax=fmax,
+            sr=sr,
+            frame_length=frame_length,
+            hop_length=frame_hop,
+            max_transition_rate=PYIN_MAX_TRANSITION_RATE / stride,
+        )
+        return PitchTrajectory(np.nan_to_num(f0, nan=0.0), sr, frame_hop)
+
+    if S is None:
+        S = np.abs(librosa.stft(y, hop_length=hop_length))
+    if stride > 1:
+        S = S[:, ::stride]
+
+    # piptrack is frame-local, so blockwise results equal a single call
+    f0 = np.empty(S.shape[1], dtype=np.float32)
+    for start in range(0, S.shape[1], BLOCK_FRAMES):
+        block = S[:, start : start + BLOCK_FRAMES]
+        pitches, magnitudes = librosa.piptrack(S=block, sr=sr, fmin=fmin, fmax=fmax)
+        f0[start : start + block.shape[1]] = _dominant_pitch(pitches, magnitudes)
+
+    return PitchTrajectory(f0, sr, frame_hop)
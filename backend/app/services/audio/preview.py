@@ -0,0 +1,170 @@
+"""Quick-preview audio analysis.
+
+Analyzes a representative excerpt (the loudest ``PREVIEW_SECONDS`` window,
+usually the chorus) instead of the whole track, skipping the advanced
+spectral analysis. The result is a reduced sonic genome and hook estimate,
+good enough for a provisional TuneScore within a few seconds of an upload;
+the full pipeline replaces it later.
+
+Files long enough for streaming analysis (``ANALYSIS_STREAMING_MIN_DURATION``)
+are never decoded whole: the loudest window is found in one streamed pass
+and only that window is read back.
+"""
+
+import logging
+from typing import Any
+
+import numpy as np
+import soundfile as sf
+import soxr
+
+from .context import AudioContext
+from .decoder import load_audio
+from .feature_extraction import AudioFeatureExtractor, use_streaming_analysis
+from .streaming import iter_audio_chunks
+
+logger = logging.getLogger(__name__)
+
+# Part of the analysis cache key; bump whenever preview output changes
+PREVIEW_VERSION = "1"
+
+PREVIEW_SECONDS = 30.0
+
+# Analysis fields filled from the excerpt, flagged as provisional
+PROVISIONAL_FIELDS = ("sonic_genome", "hook_data", "tunescore")
+
+
+def select_excerpt(
+    y: np.ndarray, sr: int, seconds: float = PREVIEW_SECONDS, hop_length: int = 512
+) -> tuple[int, int]:
+    """
+    Find the window of maximum RMS energy.
+
+    Args:
+        y: Mono audio
+        sr: Sample rate
+        seconds: Window length
+        hop_length: Energy frame size in samples
+
+    Returns:
+        (start, end) sample indices; the whole signal if it is shorter
+    """
+    window = int(seconds * sr)
+    if len(y) <= window:
+        return 0, len(y)
+
+    frames = len(y) // hop_length
+    framed = y[: frames * hop_length].reshape(frames, hop_length)
+    energy = np.einsum("ij,ij->i", framed, framed)
+    start = _loudest_window(energy, window // hop_length) * hop_length
+    return start, min(start + window, len(y))
+
+
+def _loudest_window(energy: np.ndarray, window_frames: int) -> int:
+    """First frame of the ``window_frames`` long window with the most energy."""
+    cumulative = np.concatenate([[0.0], np.cumsum(energy, dtype=np.float64)])
+    totals = cumulative[window_frames:] - cumulative[:-window_frames]
+    return int(np.argmax(totals))
+
+
+def stream_excerpt(
+    audio_path: str, sr: int, seconds: float = PREVIEW_SECONDS, hop_length: int = 512
+) -> tuple[np.ndarray, int, float]:
+    """
+    Loudest window of a file, without holding the whole decode in memory.
+
+    Selects the same window as ``select_excerpt`` from frame energies
+    gathered in one streamed pass, then seeks to it and decodes only it.
+
+    Args:
+        audio_path: Path to audio file (a format soundfile can read)
+        sr: Sample rate of the returned excerpt
+        seconds: Window length
+        hop_length: Energy frame size in samples
+
+    Returns:
+        (mono excerpt at ``sr``, its start sample at ``sr``, track duration
+        in seconds)
+    """
+    energies = []
+    carry = np.zeros(0, dtype=np.float32)
+    total = 0
+    for chunk in iter_audio_chunks(audio_path, sr):
+        total += len(chunk)
+        samples = np.concatenate([carry, chunk])
+        frames = len(samples) // hop_length
+        framed = samples[: frames * hop_length].reshape(frames, hop_length)
+        energies.append(np.einsum("ij,ij->i", framed, framed))
+        carry = samples[frames * hop_length :]
+
+    window = int(seconds * sr)
+    start = 0
+    if total > window:
+        start = _loudest_window(np.concatenate(energies), window // hop_length) * hop_length
+    length = min(window, total - start)
+
+    native_rate = sf.info(audio_path).samplerate
+    native_start = int(start * native_rate / sr)
+    block, _ = sf.read(
+        audio_path,
+        start=native_start,
+        stop=native_start + int(np.ceil(length * native_rate / sr)),
+        dtype="float32",
+        always_2d=True,
+    )
+    excerpt = block.mean(axis=1)
+    if native_rate != sr:
+        excerpt = soxr.resample(excerpt, native_rate, sr, quality="HQ")
+    return excerpt[:length], start, total / sr
+
+
+def analyze_preview(audio_path: str, seconds: float | None = None) -> dict[str, Any]:
+    """
+    Reduced sonic genome and hook estimate from the loudest excerpt.
+
+    Args:
+        audio_path: Path to audio file
+        seconds: Excerpt length (default: ANALYSIS_PREVIEW_SECONDS setting)
+
+    Returns:
+        Dictionary with sonic_genome, hook_data and the excerpt bounds in
+        seconds; durations refer to the whole track
+    """
+    from ...core.config import settings
+    from ..cache import cached_analysis
+
+    seconds = seconds or settings.ANALYSIS_PREVIEW_SECONDS or PREVIEW_SECONDS
+    return cached_analysis(
+        audio_path, "preview", f"{PREVIEW_VERSION}-{seconds:g}s",
+        lambda: _analyze_excerpt(audio_path, seconds),
+    )
+
+
+def _analyze_excerpt(audio_path: str, seconds: float) -> dict[str, Any]:
+    extractor = AudioFeatureExtractor()
+    sr = extractor.sample_rate
+    if use_streaming_analysis(audio_path):
+        excerpt, start, duration = stream_excerpt(audio_path, sr, seconds)
+    else:
+        y, sr = load_audio(audio_path, sr=sr, mono=True)
+        start, end = select_excerpt(y, sr, seconds)
+        excerpt, duration = y[start:end], len(y) / sr
+    end = start + len(excerpt)
+    offset = start / sr
+
+    ctx = AudioContext.from_audio(excerpt, sr, audio_path)
+    sonic_genome = extractor.extract_sonic_genome(ctx, include_spectral=False)
+    sonic_genome["duration"] = float(duration)
+
+    hook_data = extractor.detect_hook(ctx, segment_duration=min(15.0, (end - start) / sr))
+    hook_data["start_time"] = round(hook_data["start_time"] + offset, 3)
+    hook_data["end_time"] = round(hook_data["end_time"] + offset, 3)
+
+    logger.info(
+        f"Preview analysis of {audio_path}: {offset:.1f}-{end / sr:.1f}s excerpt"
+    )
+    return {
+        "sonic_genome": sonic_genome,
+        "hook_data": hook_data,
+        "excerpt": {"start": round(offset, 3), "end": round(end / sr, 3)},
+    }
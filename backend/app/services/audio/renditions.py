@@ -0,0 +1,210 @@
+"""Low-bitrate streaming renditions and pre-cut hook clips.
+
+Uploads are often 50 MB WAV/FLAC files; serving them for every play costs
+egress and delays the first audio. Each upload is transcoded once, in the
+background, to AAC in an MP4 container (``RENDITION_BITRATE``, ``faststart``
+so playback starts before the download ends), and the top viral segments of
+its hook data are cut from the original into short clips with fades.
+
+Files are keyed by the audio SHA-256 (clips also by their time range), so
+duplicate uploads share them and a stored file never changes.
+
+Layout: ``<root>/<hash[:2]>/<hash>/v<version>/{stream.m4a,clip-<start>-<end>.m4a}``.
+Bump ``RENDITION_VERSION`` whenever the encoding changes.
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+RENDITION_VERSION = 1
+RENDITION_MEDIA_TYPE = "audio/mp4"
+RENDITION_SAMPLE_RATE = 44100
+CLIP_FADE_IN_SECONDS = 0.05
+CLIP_FADE_OUT_SECONDS = 0.3
+
+
+def _encode(
+    src: str, dst: Path, bitrate: str, start: float | None = None, duration: float | None = None
+) -> None:
+    """
+    Transcode (part of) a file to AAC through FFmpeg, atomically.
+
+    Args:
+        src: Source audio file
+        dst: Output path (written to a temporary file, then moved)
+        bitrate: AAC bitrate, e.g. "128k"
+        start: Clip start in seconds (None = whole file)
+        duration: Clip length in seconds
+
+    Raises:
+        subprocess.CalledProcessError: If FFmpeg fails
+    """
+    command = ["ffmpeg", "-nostdin", "-v", "error", "-y"]
+    if start is not None:
+        command += ["-ss", f"{start:.3f}"]
+    if duration is not None:
+        command += ["-t", f"{duration:.3f}"]
+    command += ["-i", src, "-vn", "-map", "0:a:0"]
+    if duration is not None:
+        fade_out_start = max(0.0, duration - CLIP_FADE_OUT_SECONDS)
+        command += [
+            "-af",
+            f"afade=t=in:d={CLIP_FADE_IN_SECONDS},"
+            f"afade=t=out:st={fade_out_start:.3f}:d={CLIP_FADE_OUT_SECONDS}",
+        ]
+    command += [
+        "-c:a", "aac", "-b:a", bitrate, "-ar", str(RENDITION_SAMPLE_RATE),
+        "-movflags", "+faststart", "-f", "mp4",
+    ]
+
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=".rendition-", suffix=".m4a", dir=dst.parent)
+    os.close(fd)
+    try:
+        subprocess.run(command + [tmp_name], capture_output=True, check=True)
+        os.replace(tmp_name, dst)
+    finally:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+
+
+class RenditionStore:
+    """On-disk store of streaming renditions and hook clips per audio hash."""
+
+    def __init__(self, root: str | Path, bitrate: str = "128k") -> None:
+        """
+        Initialize rendition store.
+
+        Args:
+            root: Store directory
+            bitrate: AAC bitrate of renditions and clips
+        """
+        self.root = Path(root)
+        self.bitrate = bitrate
+
+    def entry_dir(self, audio_hash: str) -> Path:
+        """Directory of one track's renditions."""
+        return self.root / audio_hash[:2] / audio_hash / f"v{RENDITION_VERSION}"
+
+    def stream_path(self, audio_hash: str) -> Path:
+        """Path of the streaming rendition (may not exist yet)."""
+        return self.entry_dir(audio_hash) / "stream.m4a"
+
+    def clip_path(self, audio_hash: str, start: float, end: float) -> Path:
+        """Path of the clip of a time range (may not exist yet)."""
+        return self.entry_dir(audio_hash) / f"clip-{start:.2f}-{end:.2f}.m4a"
+
+    def ensure_stream(self, audio_path: str, audio_hash: str) -> Path:
+        """
+        Transcode the streaming rendition unless it is stored already.
+
+        Args:
+            audio_path: Original audio file
+            audio_hash: Its SHA-256
+
+        Returns:
+            Path of the rendition
+        """
+        path = self.stream_path(audio_hash)
+        if not path.exists():
+            _encode(audio_path, path, self.bitrate)
+            logger.info(f"Stored {self.bitrate} streaming rendition of {audio_path}")
+        return path
+
+    def ensure_clip(self, audio_path: str, audio_hash: str, start: float, end: float) -> Path:
+        """
+        Cut a clip from the original unless it is stored already.
+
+        Args:
+            audio_path: Original audio file
+            audio_hash: Its SHA-256
+            start: Clip start in seconds
+            end: Clip end in seconds
+
+        Returns:
+            Path of the clip
+        """
+        path = self.clip_path(audio_hash, start, end)
+        if not path.exists():
+            _encode(audio_path, path, self.bitrate, start=start, duration=end - start)
+        return path
+
+
+# Singleton instance (lazy-loaded)
+_rendition_store_instance: RenditionStore | None = None
+
+
+def get_rendition_store() -> RenditionStore | None:
+    """
+    Get the process-wide rendition store.
+
+    Returns:
+        Store instance, or None when renditions are disabled in settings or
+        FFmpeg is not installed
+    """
+    global _rendition_store_instance
+
+    from ...core.config import settings
+
+    if not settings.RENDITIONS_ENABLED or shutil.which("ffmpeg") is None:
+        return None
+
+    if _rendition_store_instance is None:
+        _rendition_store_instance = RenditionStore(
+            settings.RENDITION_DIR, bitrate=settings.RENDITION_BITRATE
+        )
+    return _rendition_store_instance
+
+
+def create_stream_rendition(audio_path: str) -> str | None:
+    """
+    Pipeline entry point: the streaming rendition of an upload.
+
+    Args:
+        audio_path: Original audio file
+
+    Returns:
+        Path of the rendition, or None if renditions are unavailable
+    """
+    from ..cache import audio_content_hash
+
+    store = get_rendition_store()
+    if store is None:
+        return None
+    return str(store.ensure_stream(audio_path, audio_content_hash(audio_path)))
+
+
+def create_hook_clips(audio_path: str, audio_features: dict[str, Any] | None) -> list[str]:
+    """
+    Pipeline entry point: clips of the top viral segments of an upload.
+
+    Args:
+        audio_path: Original audio file
+        audio_features: Audio stage result, whose hook data holds the
+            viral segments
+
+    Returns:
+        Paths of the clips, best segment first (empty if renditions are
+        unavailable)
+    """
+    from ...core.config import settings
+    from ..cache import audio_content_hash
+
+    store = get_rendition_store()
+    hook_data = (audio_features or {}).get("hook_data") or {}
+    segments = hook_data.get("viral_segments") or []
+    if store is None or not segments:
+        return []
+
+    audio_hash = audio_content_hash(audio_path)
+    return [
+        str(store.ensure_clip(audio_path, audio_hash, segment["start_time"], segment["end_time"]))
+        for segment in segments[: settings.HOOK_CLIPS_TOP_N]
+    ]
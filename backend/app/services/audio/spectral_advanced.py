@@ -10,6 +10,8 @@ from typing import Any
 import librosa
 import numpy as np
 
+from .context import AudioContext
+
 logger = logging.getLogger(__name__)
 
 # Try to import essentia (optional dependency)
@@ -27,6 +29,71 @@ except ImportError:
     )
 
 
+# Frame grid of the Essentia descriptors
+ESSENTIA_FRAME_SIZE = 4096
+ESSENTIA_HOP_SIZE = 2048
+
+
+class RunningStats:
+    """Streaming mean and standard deviation (Welford), for scalars or vectors."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean: Any = 0.0
+        self._m2: Any = 0.0
+
+    def add(self, value: Any) -> None:
+        """Accumulate one observation."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean = self.mean + delta / self.count
+        self._m2 = self._m2 + delta * (value - self.mean)
+
+    @property
+    def std(self) -> Any:
+        """Population standard deviation (0 without observations)."""
+        return np.sqrt(self._m2 / self.count) if self.count else 0.0
+
+
+def essentia_frame_descriptors(audio: np.ndarray, sr: int) -> dict[str, RunningStats]:
+    """
+    Per-frame Essentia descriptors in a single pass.
+
+    Every frame is windowed and transformed once; HPCP, spectral complexity,
+    inharmonicity and dissonance all read the same spectrum and spectral
+    peaks, and only running statistics are kept.
+
+    Args:
+        audio: Mono float32 audio
+        sr: Sample rate
+
+    Returns:
+        Running statistics keyed by hpcp, complexity, inharmonicity and
+        dissonance
+    """
+    window = es.Windowing(type="hann", size=ESSENTIA_FRAME_SIZE)
+    spectrum = es.Spectrum(size=ESSENTIA_FRAME_SIZE)
+    # Peaks below 20 Hz (DC) would be taken as the fundamental by Inharmonicity
+    spectral_peaks = es.SpectralPeaks(sampleRate=sr, minFrequency=20.0, orderBy="frequency")
+    hpcp = es.HPCP(sampleRate=sr)
+    spectral_complexity = es.SpectralComplexity(sampleRate=sr)
+    inharmonicity = es.Inharmonicity()
+    dissonance = es.Dissonance()
+
+    stats = {name: RunningStats() for name in ("hpcp", "complexity", "inharmonicity", "dissonance")}
+    for frame in es.FrameGenerator(
+        audio, frameSize=ESSENTIA_FRAME_SIZE, hopSize=ESSENTIA_HOP_SIZE
+    ):
+        spec = spectrum(window(frame))
+        stats["complexity"].add(float(spectral_complexity(spec)))
+        freqs, mags = spectral_peaks(spec)
+        stats["hpcp"].add(np.asarray(hpcp(freqs, mags), dtype=np.float64))
+        if len(freqs) > 0:
+            stats["inharmonicity"].add(float(inharmonicity(freqs, mags)))
+            stats["dissonance"].add(float(dissonance(freqs, mags)))
+    return stats
+
+
 class AdvancedSpectralAnalyzer:
     """
     Advanced spectral and timbral analysis.
@@ -35,6 +102,8 @@ class AdvancedSpectralAnalyzer:
     falls back to enhanced librosa analysis otherwise.
     """
 
+    ANALYZER_VERSION = "2"
+
     def __init__(self, sample_rate: int = 22050) -> None:
         """
         Initialize advanced spectral analyzer.
@@ -45,100 +114,49 @@ class AdvancedSpectralAnalyzer:
         self.sample_rate = sample_rate
         self.use_essentia = ESSENTIA_AVAILABLE
 
-    def analyze(self, audio_path: str) -> dict[str, Any]:
+    def analyze(self, audio: AudioContext | str) -> dict[str, Any]:
         """
         Perform comprehensive spectral analysis.
 
         Args:
-            audio_path: Path to audio file
+            audio: Shared audio context or path to audio file
 
         Returns:
             Dictionary with advanced spectral features
         """
+        ctx = AudioContext.ensure(audio, self.sample_rate)
         if self.use_essentia:
-            return self._analyze_with_essentia(audio_path)
+            return self._analyze_with_essentia(ctx)
         else:
-            return self._analyze_with_librosa(audio_path)
+            return self._analyze_with_librosa(ctx)
 
-    def _analyze_with_essentia(self, audio_path: str) -> dict[str, Any]:
+    def _analyze_with_essentia(self, ctx: AudioContext) -> dict[str, Any]:
         """
         Perform analysis using Essentia algorithms.
 
         Args:
-            audio_path: Path to audio file
+            ctx: Shared audio context
 
         Returns:
             Essentia-based spectral features
         """
         try:
-            # Load audio with Essentia
-            loader = es.MonoLoader(filename=audio_path, sampleRate=self.sample_rate)
-            audio = loader()
+            # Reuse the shared decode (Essentia expects float32)
+            audio = ctx.y.astype(np.float32, copy=False)
 
             # Rhythm features
             rhythm_extractor = es.RhythmExtractor2013()
             bpm, beats, beats_confidence, _, beats_intervals = rhythm_extractor(audio)
 
-            # Tonal features (HPCP - Harmonic Pitch Class Profile)
-            spectrum = es.Spectrum()
-            spectral_peaks = es.SpectralPeaks()
-            hpcp = es.HPCP()
-
-            # Process in frames
-            frame_size = 4096
-            hop_size = 2048
-            hpcp_values = []
-
-            for frame in es.FrameGenerator(
-                audio, frameSize=frame_size, hopSize=hop_size
-            ):
-                spec = spectrum(frame)
-                freqs, mags = spectral_peaks(spec)
-                hpcp_frame = hpcp(freqs, mags)
-                hpcp_values.append(hpcp_frame)
-
-            hpcp_mean = np.mean(hpcp_values, axis=0) if hpcp_values else np.zeros(12)
-
-            # Key detection
-            key_extractor = es.KeyExtractor()
-            key, scale, strength = key_extractor(audio)
-
-            # Spectral complexity
-            spectral_complexity = es.SpectralComplexity()
-            complexity_values = []
-
-            for frame in es.FrameGenerator(
-                audio, frameSize=frame_size, hopSize=hop_size
-            ):
-                spec = spectrum(frame)
-                complexity = spectral_complexity(spec)
-                complexity_values.append(complexity)
-
-            # Inharmonicity
-            inharmonicity_extractor = es.Inharmonicity()
-            inharmonicity_values = []
-
-            for frame in es.FrameGenerator(
-                audio, frameSize=frame_size, hopSize=hop_size
-            ):
-                spec = spectrum(frame)
-                freqs, mags = spectral_peaks(spec)
-                if len(freqs) > 0:
-                    inharmonicity = inharmonicity_extractor(freqs, mags)
-                    inharmonicity_values.append(inharmonicity)
-
-            # Dissonance
-            dissonance_extractor = es.Dissonance()
-            dissonance_values = []
-
-            for frame in es.FrameGenerator(
-                audio, frameSize=frame_size, hopSize=hop_size
-            ):
-                spec = spectrum(frame)
-                freqs, mags = spectral_peaks(spec)
-                if len(freqs) > 0:
-                    dissonance = dissonance_extractor(freqs, mags)
-                    dissonance_values.append(dissonance)
+            # Tonal and spectral frame descriptors, one pass over the audio
+            stats = essentia_frame_descriptors(audio, ctx.sr)
+            hpcp_mean = (
+                np.asarray(stats["hpcp"].mean) if stats["hpcp"].count else np.zeros(12)
+            )
+
+            # Key detection (its own whitened HPCP profile; more reliable than
+            # a key fit to the plain HPCP mean)
+            key, scale, strength = es.KeyExtractor(sampleRate=ctx.sr)(audio)
 
             return {
                 "provider": "essentia",
@@ -160,49 +178,42 @@ class AdvancedSpectralAnalyzer:
                     "tonal_clarity": float(np.max(hpcp_mean) / (np.mean(hpcp_mean) + 1e-6)),
                 },
                 "spectral": {
-                    "complexity_mean": float(np.mean(complexity_values))
-                    if complexity_values
-                    else 0.0,
-                    "complexity_std": float(np.std(complexity_values))
-                    if complexity_values
-                    else 0.0,
-                    "inharmonicity_mean": float(np.mean(inharmonicity_values))
-                    if inharmonicity_values
-                    else 0.0,
-                    "dissonance_mean": float(np.mean(dissonance_values))
-                    if dissonance_values
-                    else 0.0,
-                    "dissonance_std": float(np.std(dissonance_values))
-                    if dissonance_values
-                    else 0.0,
+                    "complexity_mean": float(stats["complexity"].mean),
+                    "complexity_std": float(stats["complexity"].std),
+                    "inharmonicity_mean": float(stats["inharmonicity"].mean),
+                    "dissonance_mean": float(stats["dissonance"].mean),
+                    "dissonance_std": float(stats["dissonance"].std),
                 },
             }
 
         except Exception as e:
             logger.error(f"Essentia analysis failed: {e}, falling back to librosa")
-            return self._analyze_with_librosa(audio_path)
+            return self._analyze_with_librosa(ctx)
 
-    def _analyze_with_librosa(self, audio_path: str) -> dict[str, Any]:
+    def _analyze_with_librosa(self, ctx: AudioContext) -> dict[str, Any]:
         """
         Enhanced spectral analysis using librosa.
 
+        Reads the spectrogram, chroma, beat grid and zero-crossing rate the
+        caller's context already computed for the sonic genome; HPSS is a
+        median filter over that same spectrogram rather than a fresh STFT.
+
         Args:
-            audio_path: Path to audio file
+            ctx: Shared audio context
 
         Returns:
             Librosa-based spectral features
         """
         try:
-            # Load audio
-            y, sr = librosa.load(audio_path, sr=self.sample_rate, mono=True)
+            sr = ctx.sr
 
             # Tempo and beats
-            tempo, beats = librosa.beat.beat_track(y=y, sr=sr)
-            beat_times = librosa.frames_to_time(beats, sr=sr)
+            tempo, beats = ctx.beat_grid
+            beat_times = ctx.beat_times
             beat_intervals = np.diff(beat_times) if len(beat_times) > 1 else np.array([])
 
             # Chroma features (HPCP equivalent)
-            chroma_cqt = librosa.feature.chroma_cqt(y=y, sr=sr)
+            chroma_cqt = ctx.chroma_cqt()
             chroma_mean = np.mean(chroma_cqt, axis=1)
 
             # Key estimation (simple approach)
@@ -211,18 +222,17 @@ class AdvancedSpectralAnalyzer:
             estimated_key = key_names[key_index]
 
             # Spectral features
-            spectral_contrast = librosa.feature.spectral_contrast(y=y, sr=sr)
-            spectral_flatness = librosa.feature.spectral_flatness(y=y)
-            spectral_rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr)
+            spec = ctx.stft_magnitude
+            spectral_contrast = librosa.feature.spectral_contrast(S=spec, sr=sr)
+            spectral_flatness = librosa.feature.spectral_flatness(S=spec)
+            spectral_rolloff = librosa.feature.spectral_rolloff(S=spec, sr=sr)
 
             # Harmonic-percussive separation for complexity estimation
-            y_harmonic, y_percussive = librosa.effects.hpss(y)
-            harmonic_ratio = np.mean(np.abs(y_harmonic)) / (
-                np.mean(np.abs(y)) + 1e-6
-            )
+            harmonic, _ = ctx.harmonic_percussive
+            harmonic_ratio = np.sum(harmonic) / (np.sum(spec) + 1e-6)
 
             # Zero-crossing rate (inharmonicity proxy)
-            zcr = librosa.feature.zero_crossing_rate(y)
+            zcr = ctx.zero_crossing_rate
 
             return {
                 "provider": "librosa",
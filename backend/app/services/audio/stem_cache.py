@@ -0,0 +1,293 @@
+"""Content-addressed on-disk cache for Demucs stems.
+
+Separating a track costs tens of seconds, so each track is separated once
+and its stems are stored per audio SHA-256 and model as float16 ``.npy``
+files (half the size of float32, lossless enough for analysis). Stems are
+opened as read-only memory maps, so a consumer needing only the vocals
+pages in only the vocals.
+
+Layout: ``<root>/<hash[:2]>/<hash>/<model>/{meta.json,<stem>.npy}``. The
+mtime of ``meta.json`` doubles as the last-access time for LRU eviction.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any
+
+import librosa
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+STEM_NAMES = ("drums", "bass", "other", "vocals")
+STEM_DTYPE = np.float16
+
+
+class StemSet:
+    """The stems of one track, opened lazily as read-only memory maps."""
+
+    def __init__(self, directory: Path, meta: dict[str, Any], owner: Any = None) -> None:
+        """
+        Initialize stem set.
+
+        Args:
+            directory: Directory holding ``<stem>.npy`` files
+            meta: Stored metadata (sample rate, stems, samples, model)
+            owner: Object keeping ``directory`` alive (temporary directories)
+        """
+        self.directory = directory
+        self.sr: int = meta["sr"]
+        self.names: tuple[str, ...] = tuple(meta["stems"])
+        self.samples: int = meta["samples"]
+        self.model: str = meta.get("model", "")
+        self._owner = owner
+
+    def stem(self, name: str) -> np.ndarray:
+        """
+        Memory-mapped stem.
+
+        Args:
+            name: Stem name (drums, bass, other, vocals)
+
+        Returns:
+            Read-only float16 array of shape (channels, samples)
+        """
+        if name not in self.names:
+            raise KeyError(f"Unknown stem {name!r}")
+        return np.load(self.directory / f"{name}.npy", mmap_mode="r")
+
+    def load(self, name: str, sr: int | None = None, mono: bool = True) -> np.ndarray:
+        """
+        Read one stem into memory as float32.
+
+        Args:
+            name: Stem name
+            sr: Target sample rate (None = stored rate)
+            mono: Average the channels
+
+        Returns:
+            Audio of shape (samples,) if mono, else (channels, samples)
+        """
+        data = self.stem(name)
+        audio = data.mean(axis=0, dtype=np.float32) if mono else np.asarray(data, dtype=np.float32)
+        if sr and sr != self.sr:
+            audio = librosa.resample(audio, orig_sr=self.sr, target_sr=sr, res_type="soxr_hq")
+        return audio
+
+
+class StemWriter:
+    """
+    Write stems chunk by chunk into float16 memory maps.
+
+    Files are created in a temporary directory; ``commit`` moves them into
+    place so readers never see a partial entry.
+    """
+
+    def __init__(self, directory: Path, sr: int, channels: int, samples: int, model: str) -> None:
+        """
+        Initialize stem writer.
+
+        Args:
+            directory: Final entry directory (or a temporary one to fill in place)
+            sr: Sample rate of the stems
+            channels: Channels per stem
+            samples: Samples per channel
+            model: Separation model name
+        """
+        self.directory = directory
+        self.meta = {
+            "sr": sr,
+            "stems": list(STEM_NAMES),
+            "samples": samples,
+            "channels": channels,
+            "model": model,
+        }
+        directory.parent.mkdir(parents=True, exist_ok=True)
+        self.tmp_dir = Path(tempfile.mkdtemp(prefix=".stems-", dir=directory.parent))
+        self._sinks = {
+            name: np.lib.format.open_memmap(
+                self.tmp_dir / f"{name}.npy", mode="w+", dtype=STEM_DTYPE, shape=(channels, samples)
+            )
+            for name in STEM_NAMES
+        }
+
+    def write(self, start: int, sources: dict[str, np.ndarray]) -> None:
+        """
+        Store a block of every stem.
+
+        Args:
+            start: First sample of the block
+            sources: Stem name -> (channels, block samples) array
+        """
+        for name, block in sources.items():
+            self._sinks[name][:, start : start + block.shape[-1]] = block
+
+    def commit(self) -> Path:
+        """
+        Flush and move the stems into place.
+
+        Returns:
+            Directory holding the stems (an existing entry if another
+            process finished first)
+        """
+        for sink in self._sinks.values():
+            sink.flush()
+        self._sinks.clear()
+        (self.tmp_dir / "meta.json").write_text(json.dumps(self.meta))
+        try:
+            os.replace(self.tmp_dir, self.directory)
+        except OSError:
+            # Another writer won the race; keep its entry
+            self.abort()
+        return self.directory
+
+    def abort(self) -> None:
+        """Discard everything written."""
+        self._sinks.clear()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+
+class StemCache:
+    """On-disk stem cache with size-bounded LRU eviction."""
+
+    def __init__(self, root: str | Path, max_bytes: int) -> None:
+        """
+        Initialize stem cache.
+
+        Args:
+            root: Cache directory
+            max_bytes: Total size budget before least-recently-used eviction
+        """
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def entry_dir(self, audio_hash: str, model: str) -> Path:
+        """Directory of one track's stems for one model."""
+        return self.root / audio_hash[:2] / audio_hash / model.replace("/", "_")
+
+    def get(self, audio_hash: str, model: str) -> StemSet | None:
+        """
+        Look up cached stems.
+
+        Args:
+            audio_hash: SHA-256 of the audio file
+            model: Separation model name
+
+        Returns:
+            Stem set, or None on miss
+        """
+        directory = self.entry_dir(audio_hash, model)
+        meta_path = directory / "meta.json"
+        try:
+            meta = json.loads(meta_path.read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Discarding unreadable stem cache entry {directory}: {e}")
+            shutil.rmtree(directory, ignore_errors=True)
+            return None
+
+        # Touch for LRU ordering
+        with contextlib.suppress(OSError):
+            os.utime(meta_path)
+        return StemSet(directory, meta)
+
+    def writer(self, audio_hash: str, model: str, sr: int, channels: int, samples: int) -> StemWriter:
+        """
+        Start writing a track's stems.
+
+        Args:
+            audio_hash: SHA-256 of the audio file
+            model: Separation model name
+            sr: Sample rate of the stems
+            channels: Channels per stem
+            samples: Samples per channel
+
+        Returns:
+            Writer; call ``commit`` when done, then ``evict``
+        """
+        return StemWriter(self.entry_dir(audio_hash, model), sr, channels, samples, model)
+
+    def _scan(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        if not self.root.exists():
+            return entries
+        for meta_path in self.root.glob("*/*/*/meta.json"):
+            directory = meta_path.parent
+            try:
+                last_used = meta_path.stat().st_mtime
+                size = sum(path.stat().st_size for path in directory.iterdir())
+            except OSError:
+                continue
+            entries.append((last_used, size, directory))
+        return entries
+
+    def evict(self, keep: Path | None = None) -> int:
+        """
+        Remove least-recently-used tracks until under 90% of the budget.
+
+        Args:
+            keep: Entry directory never to remove (e.g. one just written and
+                about to be read)
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            entries = sorted(self._scan())
+            total = sum(size for _, size, _ in entries)
+            if total <= self.max_bytes:
+                return 0
+
+            target = int(self.max_bytes * 0.9)
+            removed = 0
+            for _, size, directory in entries:
+                if total <= target:
+                    break
+                if directory == keep:
+                    continue
+                shutil.rmtree(directory, ignore_errors=True)
+                total -= size
+                removed += 1
+                # Drop now-empty hash directories
+                try:
+                    directory.parent.rmdir()
+                    directory.parent.parent.rmdir()
+                except OSError:
+                    pass
+
+        logger.info(f"Stem cache evicted {removed} tracks ({total} bytes remain)")
+        return removed
+
+
+# Singleton instance (lazy-loaded)
+_stem_cache_instance: StemCache | None = None
+
+
+def get_stem_cache() -> StemCache | None:
+    """
+    Get the process-wide stem cache.
+
+    Returns:
+        Cache instance, or None when stem caching is disabled in settings
+    """
+    global _stem_cache_instance
+
+    from ...core.config import settings
+
+    if not settings.STEM_CACHE_ENABLED:
+        return None
+
+    if _stem_cache_instance is None:
+        _stem_cache_instance = StemCache(
+            settings.STEM_CACHE_DIR,
+            max_bytes=settings.STEM_CACHE_MAX_MB * 1024 * 1024,
+        )
+    return _stem_cache_instance
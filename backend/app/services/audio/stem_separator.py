@@ -1,11 +1,19 @@
 """Stem separation using Demucs for production quality assessment.
 
 Demucs is Meta's state-of-the-art source separation model.
-Separates audio into vocals, drums, bass, and other stems.
+Separates audio into vocals, drums, bass, and other stems. Separation runs in
+overlapping blocks to bound memory, and the stems of each track are kept in
+the stem cache so other analyzers can read single stems without re-running
+Demucs.
 """
 
+import json
 import logging
 import os
+import tempfile
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
@@ -13,6 +21,11 @@ import librosa
 import numpy as np
 import soundfile as sf
 
+from ..cache import audio_content_hash
+from ..models import get_model_registry
+from .decoder import load_audio
+from .stem_cache import STEM_NAMES, StemSet, StemWriter, get_stem_cache
+
 logger = logging.getLogger(__name__)
 
 # Try to import demucs (optional dependency)
@@ -31,6 +44,30 @@ except ImportError:
     )
 
 
+# Audio hash -> lock, so concurrent requests for one track separate it once
+_separation_locks: dict[str, threading.Lock] = {}
+_separation_locks_guard = threading.Lock()
+
+
+@contextmanager
+def _separation_lock(audio_hash: str) -> Iterator[None]:
+    with _separation_locks_guard:
+        lock = _separation_locks.setdefault(audio_hash, threading.Lock())
+    with lock:
+        yield
+    with _separation_locks_guard:
+        if not lock.locked():
+            _separation_locks.pop(audio_hash, None)
+
+
+def load_demucs_model(model_name: str = "htdemucs", device: str = "cpu") -> Any:
+    """Model registry loader for Demucs."""
+    model = get_model(model_name)
+    model.to(device)
+    model.eval()
+    return model
+
+
 class StemSeparator:
     """
     Separate audio into stems (vocals, drums, bass, other) using Demucs.
@@ -49,18 +86,157 @@ class StemSeparator:
         """
         self.model_name = model_name
         self.device = device
-        self.model = None
-
-        if DEMUCS_AVAILABLE:
-            try:
-                logger.info(f"Loading Demucs model: {model_name}")
-                self.model = get_model(model_name)
-                self.model.to(device)
-                self.model.eval()
-                logger.info(f"✅ Demucs model loaded on {device}")
-            except Exception as e:
-                logger.error(f"Failed to load Demucs model: {e}")
-                self.model = None
+        self._load_failed = False
+
+    @property
+    def model(self) -> Any:
+        """Demucs model from the model registry, or None if unavailable."""
+        if not DEMUCS_AVAILABLE or self._load_failed:
+            return None
+        try:
+            return get_model_registry().get("demucs", self.model_name, self.device)
+        except Exception as e:
+            logger.error(f"Failed to load Demucs model: {e}")
+            self._load_failed = True
+            return None
+
+    def _apply(self, model: Any, block: np.ndarray) -> np.ndarray:
+        """Run Demucs on one (channels, samples) block; returns (stems, channels, samples)."""
+        audio_tensor = torch.from_numpy(np.ascontiguousarray(block)).float().unsqueeze(0)
+        with torch.no_grad():
+            sources = apply_model(
+                model, audio_tensor.to(self.device), device=self.device, split=True, overlap=0.25
+            )
+        # Demucs returns: [batch, stems, channels, time]
+        return sources[0].cpu().numpy()
+
+    def separate_into(self, audio: np.ndarray, writer: StemWriter) -> None:
+        """
+        Separate audio block by block into a stem writer.
+
+        Only one block of input and output is held as float32 at a time.
+        Consecutive blocks overlap and are cross-faded linearly, so block
+        edges leave no seams.
+
+        Args:
+            audio: Stereo (2, samples) audio at the model's sample rate
+            writer: Destination for the stems
+
+        Raises:
+            RuntimeError: If Demucs is unavailable
+        """
+        from ...core.config import settings
+
+        model = self.model
+        if model is None:
+            raise RuntimeError("Demucs not installed or model failed to load")
+
+        sr = writer.meta["sr"]
+        total = audio.shape[-1]
+        block = max(int(settings.STEM_CHUNK_SECONDS * sr), sr)
+        overlap = min(int(settings.STEM_CHUNK_OVERLAP_SECONDS * sr), block // 2)
+        fade_in = np.linspace(0.0, 1.0, overlap, dtype=np.float32)
+        # Output index of each stem (htdemucs: drums, bass, other, vocals)
+        model_sources = list(getattr(model, "sources", STEM_NAMES))
+        indices = {name: model_sources.index(name) for name in STEM_NAMES}
+
+        carry: np.ndarray | None = None  # Faded-out tail of the previous block
+        start = 0
+        while True:
+            end = min(total, start + block)
+            sources = self._apply(model, audio[:, start:end])
+            if carry is not None:
+                sources[..., :overlap] = sources[..., :overlap] * fade_in + carry
+
+            final = end >= total
+            keep = sources.shape[-1] if final else sources.shape[-1] - overlap
+            writer.write(start, {name: sources[i, :, :keep] for name, i in indices.items()})
+            if final:
+                return
+            carry = sources[..., keep:] * (1.0 - fade_in)
+            start += keep
+
+    def cached_stems(self, audio_path: str) -> StemSet | None:
+        """
+        Stems of a track if they are already in the stem cache.
+
+        Args:
+            audio_path: Path to input audio file
+
+        Returns:
+            Memory-mapped stem set, or None
+        """
+        cache = get_stem_cache()
+        if cache is None:
+            return None
+        return cache.get(audio_content_hash(audio_path), self.model_name)
+
+    def get_stems(self, audio_path: str) -> StemSet:
+        """
+        Stems of a track, separated once per audio content.
+
+        Cached stems are reused without loading Demucs. Otherwise the track
+        is separated into the stem cache (or a temporary directory when the
+        cache is disabled).
+
+        Args:
+            audio_path: Path to input audio file
+
+        Returns:
+            Memory-mapped stem set
+
+        Raises:
+            RuntimeError: If the stems are not cached and Demucs is unavailable
+        """
+        cache = get_stem_cache()
+        audio_hash = audio_content_hash(audio_path) if cache else None
+        if cache is not None and audio_hash is not None:
+            with _separation_lock(audio_hash):
+                stems = cache.get(audio_hash, self.model_name)
+                if stems is not None:
+                    return stems
+                directory = self._separate_to(
+                    audio_path,
+                    lambda sr, channels, samples: cache.writer(
+                        audio_hash, self.model_name, sr, channels, samples
+                    ),
+                )
+            cache.evict(keep=directory)
+            return StemSet(directory, json.loads((directory / "meta.json").read_text()))
+
+        tmp = tempfile.TemporaryDirectory(prefix="stems-")
+        directory = self._separate_to(
+            audio_path,
+            lambda sr, channels, samples: StemWriter(
+                Path(tmp.name) / "stems", sr, channels, samples, self.model_name
+            ),
+        )
+        # The stem set keeps the temporary directory alive
+        return StemSet(directory, json.loads((directory / "meta.json").read_text()), owner=tmp)
+
+    def _separate_to(
+        self, audio_path: str, make_writer: Callable[[int, int, int], StemWriter]
+    ) -> Path:
+        model = self.model
+        if model is None:
+            raise RuntimeError("Demucs not installed or model failed to load")
+
+        sr = getattr(model, "samplerate", 44100)
+        audio, sr = load_audio(audio_path, sr=sr, mono=False)
+
+        # Ensure stereo (Demucs expects stereo)
+        if audio.ndim == 1:
+            audio = np.stack([audio, audio])
+        elif audio.shape[0] == 1:
+            audio = np.concatenate([audio, audio], axis=0)
+
+        writer = make_writer(sr, audio.shape[0], audio.shape[-1])
+        try:
+            self.separate_into(audio, writer)
+        except BaseException:
+            writer.abort()
+            raise
+        return writer.commit()
 
     def separate(
         self, audio_path: str, output_dir: str | None = None
@@ -75,49 +251,32 @@ class StemSeparator:
         Returns:
             Dictionary with stem analysis and file paths
         """
-        if not DEMUCS_AVAILABLE or self.model is None:
-            logger.warning("Demucs not available, skipping stem separation")
+        try:
+            stems = self.get_stems(audio_path)
+        except RuntimeError as e:
+            logger.warning(f"Demucs not available, skipping stem separation: {e}")
             return {
                 "available": False,
                 "error": "Demucs not installed or model failed to load",
             }
+        except Exception as e:
+            logger.error(f"Stem separation failed: {e}")
+            return {
+                "available": True,
+                "error": str(e),
+                "stem_features": {},
+            }
 
         try:
-            # Load audio
-            audio, sr = librosa.load(audio_path, sr=44100, mono=False)
-
-            # Ensure stereo (Demucs expects stereo)
-            if audio.ndim == 1:
-                audio = np.stack([audio, audio])
-            elif audio.shape[0] == 1:
-                audio = np.concatenate([audio, audio], axis=0)
-
-            # Convert to torch tensor
-            audio_tensor = torch.from_numpy(audio).float().unsqueeze(0).to(self.device)
-
-            # Apply model
-            with torch.no_grad():
-                sources = apply_model(
-                    self.model, audio_tensor, device=self.device, split=True, overlap=0.25
-                )
-
-            # Demucs returns: [batch, stems, channels, time]
-            # stems order: drums, bass, other, vocals
-            sources = sources[0].cpu().numpy()  # Remove batch dimension
-
-            stems_dict = {
-                "drums": sources[0],
-                "bass": sources[1],
-                "other": sources[2],
-                "vocals": sources[3],
-            }
+            sr = stems.sr
 
             # Analyze each stem
             stem_analysis = {}
             stem_paths = {}
 
-            for stem_name, stem_audio in stems_dict.items():
-                # Analyze stem
+            for stem_name in stems.names:
+                # One stem in memory at a time
+                stem_audio = stems.load(stem_name, mono=True)
                 analysis = self._analyze_stem(stem_audio, sr)
                 stem_analysis[stem_name] = analysis
 
@@ -126,9 +285,7 @@ class StemSeparator:
                     os.makedirs(output_dir, exist_ok=True)
                     stem_path = os.path.join(output_dir, f"{stem_name}.wav")
 
-                    # Convert to mono for saving (mix stereo channels)
-                    stem_mono = np.mean(stem_audio, axis=0)
-                    sf.write(stem_path, stem_mono, sr)
+                    sf.write(stem_path, stem_audio, sr)
                     stem_paths[stem_name] = stem_path
                     logger.info(f"Saved {stem_name} stem to {stem_path}")
 
@@ -0,0 +1,881 @@
+"""Streaming, bounded-memory analysis for long audio.
+
+DJ mixes, podcasts and live sets run for hours; decoding them whole and
+keeping STFT/CQT matrices for the full duration takes several GB per worker.
+``StreamingAnalyzer`` instead reads the file block by block with
+``soundfile``, resamples incrementally, and keeps only running aggregates
+(Welford mean/variance), a frame history one hook window long and bounded
+top-k heaps of window candidates, so peak memory does not grow with duration.
+
+Two passes are made over the file. The first gathers the statistics that do
+not depend on loudness normalization plus the track-wide peaks; the second
+uses those peaks for the onset/novelty dB floors and window normalization,
+exactly as the in-memory analyzers do with whole-track ``np.max``.
+
+Results use the same keys as the in-memory analyzers, with these differences:
+- the chroma tuning estimate uses a per-block magnitude threshold
+- beats are tracked per block, so tempo may drift across a set, and the
+  half-vs-half beat pattern check of timing precision is skipped
+- hook/viral normalization uses onset and novelty peaks measured in the
+  first pass, where dB floors follow the loudest frame seen so far
+- pitch tracking always uses piptrack
+- there is no Essentia spectral block, mastering or chord analysis
+"""
+
+import heapq
+import logging
+import math
+from collections.abc import Iterator
+from typing import Any
+
+import librosa
+import numpy as np
+import soundfile as sf
+import soxr
+
+from .feature_extraction import AudioFeatureExtractor, chroma_clarity
+from .hook_detector_advanced import ViralHookDetector
+from .pitch import PitchTrajectory, compute_pitch_trajectory
+
+logger = logging.getLogger(__name__)
+
+N_FFT = 2048
+HOP_LENGTH = 512
+
+# Frames per analysis block (~47s at 22.05kHz); bounds every per-block matrix
+BLOCK_FRAMES = 2048
+
+# Samples read from the file at a time, at its native rate
+READ_BLOCK_SAMPLES = 65536
+
+# Dynamic range kept below the loudest frame, as librosa's ``top_db``
+TOP_DB = 80.0
+
+# Autocorrelation window for tempo estimation (librosa's ``ac_size``)
+TEMPO_AC_SECONDS = 8.0
+
+# Frames of signal on each side of a block for the CQT (longer than its
+# longest filter, ~1.6s at the chroma_cqt default fmin)
+CQT_CONTEXT_FRAMES = 128
+
+# chroma_cqt defaults
+CQT_BINS_PER_OCTAVE = 36
+
+
+def probe_duration(audio_path: str) -> float | None:
+    """
+    Read the duration from the file header without decoding.
+
+    Args:
+        audio_path: Path to audio file
+
+    Returns:
+        Duration in seconds, or None if soundfile cannot read the format
+        (such files cannot be streamed)
+    """
+    try:
+        return float(sf.info(audio_path).duration)
+    except Exception:
+        return None
+
+
+def iter_audio_chunks(audio_path: str, sample_rate: int) -> Iterator[np.ndarray]:
+    """
+    Decode a file incrementally to mono float32 at ``sample_rate``.
+
+    Mono downmix and soxr HQ resampling match ``librosa.load``.
+
+    Args:
+        audio_path: Path to audio file
+        sample_rate: Target sample rate
+
+    Yields:
+        Consecutive chunks of the decoded signal
+    """
+    native_rate = sf.info(audio_path).samplerate
+    resampler = None
+    if native_rate != sample_rate:
+        resampler = soxr.ResampleStream(
+            native_rate, sample_rate, 1, dtype="float32", quality="HQ"
+        )
+
+    for block in sf.blocks(
+        audio_path, blocksize=READ_BLOCK_SAMPLES, dtype="float32", always_2d=True
+    ):
+        mono = block.mean(axis=1)
+        if resampler is not None:
+            mono = resampler.resample_chunk(mono)
+        if len(mono):
+            yield mono
+
+    if resampler is not None:
+        tail = resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True)
+        if len(tail):
+            yield tail
+
+
+def iter_frame_blocks(
+    chunks: Iterator[np.ndarray],
+    n_fft: int = N_FFT,
+    hop_length: int = HOP_LENGTH,
+    block_frames: int = BLOCK_FRAMES,
+) -> Iterator[tuple[int, np.ndarray]]:
+    """
+    Regroup sample chunks into blocks of whole, centred STFT frames.
+
+    The signal is zero-padded by ``n_fft // 2`` on both ends, like
+    ``librosa.stft(center=True)``, so running an uncentred STFT on each block
+    yields exactly the frames of the whole-signal STFT. The final block takes
+    whatever is left (between one and two blocks), so no block is tiny.
+
+    Args:
+        chunks: Consecutive signal chunks
+        n_fft: Frame length
+        hop_length: Hop length
+        block_frames: Frames per block
+
+    Yields:
+        Tuples of (index of the block's first frame, samples spanning its frames)
+    """
+    pending: list[np.ndarray] = [np.zeros(n_fft // 2, dtype=np.float32)]
+    buffered = n_fft // 2
+    first_frame = 0
+
+    def available(n_samples: int) -> int:
+        return 1 + (n_samples - n_fft) // hop_length if n_samples >= n_fft else 0
+
+    for chunk in chunks:
+        pending.append(chunk)
+        buffered += len(chunk)
+        if available(buffered) < 2 * block_frames:
+            continue
+
+        buffer = np.concatenate(pending)
+        while available(len(buffer)) >= 2 * block_frames:
+            yield first_frame, buffer[: (block_frames - 1) * hop_length + n_fft]
+            buffer = buffer[block_frames * hop_length :]
+            first_frame += block_frames
+        pending = [buffer]
+        buffered = len(buffer)
+
+    buffer = np.concatenate(pending + [np.zeros(n_fft // 2, dtype=np.float32)])
+    n_frames = available(len(buffer))
+    if n_frames:
+        yield first_frame, buffer[: (n_frames - 1) * hop_length + n_fft]
+
+
+class RunningStats:
+    """
+    Running mean, variance and range of a scalar or per-row series.
+
+    Batches are merged with Chan et al.'s parallel form of Welford's
+    algorithm, so updating with one block at a time is numerically stable
+    and gives the population (``np.std``) statistics of all values seen.
+    """
+
+    def __init__(self, rows: int | None = None) -> None:
+        """
+        Initialize accumulator.
+
+        Args:
+            rows: Number of parallel series (None for a scalar series)
+        """
+        shape = () if rows is None else (rows,)
+        self.count = 0
+        self._mean = np.zeros(shape)
+        self._m2 = np.zeros(shape)
+        self.min = np.full(shape, np.inf)
+        self.max = np.full(shape, -np.inf)
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        Add a batch of observations.
+
+        Args:
+            values: Array of shape (n,) for a scalar series or (rows, n)
+        """
+        n = values.shape[-1]
+        if n == 0:
+            return
+        values = values.astype(np.float64)
+        batch_mean = values.mean(axis=-1)
+        batch_m2 = ((values - batch_mean[..., None]) ** 2).sum(axis=-1)
+
+        total = self.count + n
+        delta = batch_mean - self._mean
+        self._mean = self._mean + delta * (n / total)
+        self._m2 = self._m2 + batch_m2 + delta**2 * (self.count * n / total)
+        self.count = total
+        self.min = np.minimum(self.min, values.min(axis=-1))
+        self.max = np.maximum(self.max, values.max(axis=-1))
+
+    @property
+    def mean(self) -> Any:
+        """Mean of all observations (0 if none)."""
+        return self._mean
+
+    @property
+    def std(self) -> Any:
+        """Population standard deviation of all observations."""
+        return np.sqrt(self._m2 / max(self.count, 1))
+
+    @property
+    def cv(self) -> float:
+        """Coefficient of variation, as ``feature_extraction.coefficient_of_variation``."""
+        return float(self.std / (self.mean + 1e-8))
+
+
+class TopK:
+    """Bounded min-heap keeping the ``k`` highest-scoring items (earliest wins ties)."""
+
+    def __init__(self, k: int) -> None:
+        """
+        Initialize heap.
+
+        Args:
+            k: Number of items to keep
+        """
+        self.k = k
+        self._heap: list[tuple[float, int, Any]] = []
+        self._pushed = 0
+
+    def push(self, score: float, item: Any) -> None:
+        """Offer an item; it is kept only if it ranks among the top ``k``."""
+        entry = (score, -self._pushed, item)
+        self._pushed += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self) -> list[Any]:
+        """Kept items, best first."""
+        return [entry[2] for entry in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+
+
+class _SpectralFlux:
+    """
+    Streaming ``librosa.onset.onset_strength`` over a dB spectrogram.
+
+    Reproduces librosa's lag-1 half-wave rectified difference averaged over
+    bins, including the framing compensation that delays the envelope by
+    ``n_fft // (2 * hop_length)`` frames.
+    """
+
+    def __init__(self, n_fft: int = N_FFT, hop_length: int = HOP_LENGTH) -> None:
+        self._previous: np.ndarray | None = None
+        self._delayed = np.zeros(n_fft // (2 * hop_length), dtype=np.float32)
+
+    def update(self, S_db: np.ndarray) -> np.ndarray:
+        """Onset strength for the frames of ``S_db`` (bins x frames)."""
+        previous = S_db[:, :1] if self._previous is None else self._previous
+        self._previous = S_db[:, -1:]
+        flux = np.maximum(0.0, np.diff(np.hstack([previous, S_db]), axis=1)).mean(axis=0)
+        delayed = np.concatenate([self._delayed, flux])
+        self._delayed = delayed[len(flux) :]
+        return delayed[: len(flux)]
+
+
+class _TuningEstimate:
+    """
+    Streaming ``librosa.estimate_tuning``.
+
+    Accumulates the histogram of pitch residuals block by block; the
+    magnitude threshold is each block's median rather than the track's.
+    """
+
+    def __init__(self, bins_per_octave: int = CQT_BINS_PER_OCTAVE, resolution: float = 0.01) -> None:
+        self.bins_per_octave = bins_per_octave
+        self._edges = np.linspace(-0.5, 0.5, int(np.ceil(1.0 / resolution)) + 1)
+        self._counts = np.zeros(len(self._edges) - 1, dtype=np.int64)
+
+    def update(self, S: np.ndarray, sr: int) -> None:
+        """Add the pitches of one block's magnitude spectrogram."""
+        pitch, mag = librosa.piptrack(S=S, sr=sr)
+        voiced = pitch > 0
+        if not voiced.any():
+            return
+        frequencies = pitch[(mag >= np.median(mag[voiced])) & voiced]
+        residual = np.mod(self.bins_per_octave * librosa.hz_to_octs(frequencies), 1.0)
+        residual[residual >= 0.5] -= 1.0
+        self._counts += np.histogram(residual, self._edges)[0]
+
+    @property
+    def tuning(self) -> float:
+        """Estimated tuning deviation in fractions of a bin."""
+        if not self._counts.any():
+            return 0.0
+        return float(self._edges[np.argmax(self._counts)])
+
+
+class _StreamingChroma:
+    """
+    ``librosa.feature.chroma_cqt`` over a stream of frame blocks.
+
+    Each block's CQT is computed with ``CQT_CONTEXT_FRAMES`` of real signal
+    on both sides, so it lags one block behind the input and its frames
+    match the whole-signal chromagram.
+    """
+
+    def __init__(self, sr: int, n_samples: int, n_frames: int, tuning: float) -> None:
+        self.sr = sr
+        self.n_samples = n_samples
+        self.n_frames = n_frames
+        self.tuning = tuning
+        self._raw = np.zeros(0, dtype=np.float32)
+        self._raw_start = 0  # track sample index of _raw[0]
+        self._next = 0  # next frame to emit
+
+    def update(self, first_frame: int, samples: np.ndarray, final: bool) -> np.ndarray:
+        """
+        Add a frame block and return chroma for every frame now computable.
+
+        Args:
+            first_frame: Index of the block's first frame
+            samples: Samples spanning the block's frames (centre-padded)
+            final: Whether this is the last block
+
+        Returns:
+            Chroma of shape (12, n) for the next n frames (n may be 0)
+        """
+        # Append the unpadded samples not seen yet
+        block_start = first_frame * HOP_LENGTH - N_FFT // 2
+        raw_end = self._raw_start + len(self._raw)
+        new = samples[max(raw_end, 0) - block_start :]
+        new = new[: max(0, self.n_samples - max(raw_end, 0))]
+        self._raw = np.concatenate([self._raw, new])
+        raw_end = self._raw_start + len(self._raw)
+
+        ready = self.n_frames if final else raw_end // HOP_LENGTH - CQT_CONTEXT_FRAMES
+        if ready <= self._next:
+            return np.zeros((12, 0), dtype=np.float32)
+
+        context_start = max(0, self._next - CQT_CONTEXT_FRAMES)
+        segment = self._raw[
+            context_start * HOP_LENGTH - self._raw_start :
+            min(raw_end, (ready + CQT_CONTEXT_FRAMES) * HOP_LENGTH) - self._raw_start
+        ]
+        chroma = librosa.feature.chroma_cqt(
+            y=segment, sr=self.sr, hop_length=HOP_LENGTH, tuning=self.tuning
+        )[:, self._next - context_start : ready - context_start]
+        self._next = ready
+
+        keep_from = max(0, self._next - CQT_CONTEXT_FRAMES) * HOP_LENGTH
+        self._raw = self._raw[keep_from - self._raw_start :]
+        self._raw_start = keep_from
+        return chroma
+
+
+def _clamped_db(power: np.ndarray, peak_power: float) -> np.ndarray:
+    """``power_to_db`` with the ``top_db`` floor taken relative to ``peak_power``."""
+    floor = 10.0 * np.log10(max(1e-10, peak_power)) - TOP_DB
+    return np.maximum(librosa.power_to_db(power, top_db=None), floor)
+
+
+class StreamingAnalyzer:
+    """Sonic genome, hook, viral-segment and quality analysis in bounded memory."""
+
+    # Part of the analysis cache key; bump whenever streaming output changes
+    ANALYZER_VERSION = "1"
+
+    def __init__(
+        self,
+        sample_rate: int = 22050,
+        block_frames: int = BLOCK_FRAMES,
+        segment_duration: float = 15.0,
+        top_n: int = 5,
+    ) -> None:
+        """
+        Initialize streaming analyzer.
+
+        Args:
+            sample_rate: Target sample rate for analysis
+            block_frames: STFT frames processed per block
+            segment_duration: Hook and viral segment length in seconds
+            top_n: Number of viral segments to return
+        """
+        self.sample_rate = sample_rate
+        self.block_frames = block_frames
+        self.segment_duration = segment_duration
+        self.top_n = top_n
+        self.extractor = AudioFeatureExtractor(sample_rate=sample_rate)
+        self.viral_detector = ViralHookDetector(sample_rate=sample_rate)
+
+    def analyze(self, audio_path: str) -> dict[str, Any]:
+        """
+        Analyze an audio file without holding it in memory.
+
+        Args:
+            audio_path: Path to audio file (any format soundfile can read)
+
+        Returns:
+            Dictionary with sonic_genome, hook_data (including viral_segments)
+            and quality_metrics
+        """
+        summary = self._summary_pass(audio_path)
+        segments = self._segment_pass(audio_path, summary)
+
+        sonic_genome = self._sonic_genome(summary, segments)
+        quality_metrics = self._quality_metrics(summary, segments)
+        hook_data = segments["hook"]
+        hook_data["viral_segments"] = segments["viral"]["viral_segments"]
+
+        logger.info(
+            f"✅ Streamed {sonic_genome['duration'] / 60:.1f} min of audio "
+            f"in {summary['blocks']} blocks"
+        )
+        return {
+            "sonic_genome": sonic_genome,
+            "hook_data": hook_data,
+            "quality_metrics": quality_metrics,
+        }
+
+    def _frame_blocks(self, chunks: Iterator[np.ndarray]) -> Iterator[tuple[int, np.ndarray]]:
+        return iter_frame_blocks(chunks, block_frames=self.block_frames)
+
+    def _summary_pass(self, audio_path: str) -> dict[str, Any]:
+        """
+        First pass: statistics independent of whole-track normalization.
+
+        Also measures the spectrogram, mel, RMS, onset and novelty peaks the
+        second pass normalizes with.
+        """
+        sr = self.sample_rate
+        stats = {
+            "centroid": RunningStats(),
+            "rolloff": RunningStats(),
+            "bandwidth": RunningStats(),
+            "zcr": RunningStats(),
+            "rms": RunningStats(),
+            "log2_pitch": RunningStats(),
+            "onset": RunningStats(),
+            "novelty": RunningStats(),
+        }
+        tuning = _TuningEstimate()
+        onset_flux = _SpectralFlux()
+        novelty_flux = _SpectralFlux()
+        mel_peak = 0.0
+        power_peak = 0.0
+        n_frames = 0
+        n_blocks = 0
+        n_samples = 0
+
+        def counted_chunks() -> Iterator[np.ndarray]:
+            nonlocal n_samples
+            for chunk in iter_audio_chunks(audio_path, sr):
+                n_samples += len(chunk)
+                yield chunk
+
+        for _, samples in self._frame_blocks(counted_chunks()):
+            S = np.abs(librosa.stft(samples, n_fft=N_FFT, hop_length=HOP_LENGTH, center=False))
+            power = S**2
+            mel = librosa.feature.melspectrogram(S=power, sr=sr)
+            mel_peak = max(mel_peak, float(mel.max()))
+            power_peak = max(power_peak, float(power.max()))
+
+            stats["centroid"].update(librosa.feature.spectral_centroid(S=S, sr=sr)[0])
+            stats["rolloff"].update(librosa.feature.spectral_rolloff(S=S, sr=sr)[0])
+            stats["bandwidth"].update(librosa.feature.spectral_bandwidth(S=S, sr=sr)[0])
+            stats["zcr"].update(
+                librosa.feature.zero_crossing_rate(
+                    samples, frame_length=N_FFT, hop_length=HOP_LENGTH, center=False
+                )[0]
+            )
+            stats["rms"].update(
+                librosa.feature.rms(
+                    y=samples, frame_length=N_FFT, hop_length=HOP_LENGTH, center=False
+                )[0]
+            )
+
+            tuning.update(S, sr)
+
+            trajectory = compute_pitch_trajectory(
+                samples, sr, S=S, hop_length=HOP_LENGTH, fmin=80, fmax=400
+            )
+            stats["log2_pitch"].update(np.log2(trajectory.voiced_pitches))
+
+            # Peaks only; dB floors follow the loudest frame seen so far
+            stats["onset"].update(onset_flux.update(_clamped_db(mel, mel_peak)))
+            stats["novelty"].update(novelty_flux.update(_clamped_db(power, power_peak)))
+
+            n_frames += S.shape[1]
+            n_blocks += 1
+
+        if n_frames == 0:
+            raise ValueError(f"No audio decoded from {audio_path}")
+
+        return {
+            "stats": stats,
+            "tuning": tuning.tuning,
+            "mel_peak": mel_peak,
+            "power_peak": power_peak,
+            "n_frames": n_frames,
+            "n_samples": n_samples,
+            "blocks": n_blocks,
+        }
+
+    def _segment_pass(self, audio_path: str, summary: dict[str, Any]) -> dict[str, Any]:
+        """
+        Second pass: onset-based statistics, tempo, beats and window scoring.
+
+        Hook windows (every frame) and viral windows (every second) are scored
+        as soon as all their frames are available and offered to bounded
+        top-k heaps; frames older than the next window start are dropped.
+        """
+        sr = self.sample_rate
+        stats = summary["stats"]
+        rms_stats, onset_peak, novelty_peak = stats["rms"], stats["onset"], stats["novelty"]
+        n_frames = summary["n_frames"]
+
+        onset_stats = RunningStats()
+        mfcc_stats = RunningStats(13)
+        chroma_stats = RunningStats(12)
+        clarity_stats = RunningStats()
+        chroma_stream = _StreamingChroma(sr, summary["n_samples"], n_frames, summary["tuning"])
+        beat_intervals = RunningStats()
+        onset_flux = _SpectralFlux()
+        novelty_flux = _SpectralFlux()
+
+        ac_frames = int(librosa.time_to_frames(TEMPO_AC_SECONDS, sr=sr, hop_length=HOP_LENGTH))
+        tempogram_sum = np.zeros(ac_frames)
+        tempogram_frames = 0
+        onset_tail = np.zeros(0, dtype=np.float32)
+
+        hook = _HookWindows(self.segment_duration, sr, n_frames)
+        viral = _ViralWindows(
+            self.viral_detector,
+            self.segment_duration,
+            sr,
+            summary["n_samples"],
+            energy_max=float(rms_stats.max),
+            top_n=self.top_n,
+        )
+
+        for first_frame, samples in self._frame_blocks(iter_audio_chunks(audio_path, sr)):
+            S = np.abs(librosa.stft(samples, n_fft=N_FFT, hop_length=HOP_LENGTH, center=False))
+            power = S**2
+            mel_db = _clamped_db(
+                librosa.feature.melspectrogram(S=power, sr=sr), summary["mel_peak"]
+            )
+            onset = onset_flux.update(mel_db)
+            novelty = novelty_flux.update(_clamped_db(power, summary["power_peak"]))
+            rms = librosa.feature.rms(
+                y=samples, frame_length=N_FFT, hop_length=HOP_LENGTH, center=False
+            )[0]
+            frames_done = first_frame + S.shape[1]
+            final = frames_done >= n_frames
+
+            chroma = chroma_stream.update(first_frame, samples, final)
+            chroma_stats.update(chroma)
+            clarity_stats.update(chroma_clarity(chroma))
+
+            onset_stats.update(onset)
+            mfcc_stats.update(librosa.feature.mfcc(S=mel_db, n_mfcc=13))
+
+            # Tempo: mean tempogram over the whole track, windows spanning blocks
+            context = np.concatenate([onset_tail, onset])
+            if len(context) >= ac_frames:
+                tempogram = librosa.feature.tempogram(
+                    onset_envelope=context,
+                    sr=sr,
+                    hop_length=HOP_LENGTH,
+                    win_length=ac_frames,
+                    center=False,
+                )
+                tempogram_sum += tempogram.sum(axis=1)
+                tempogram_frames += tempogram.shape[1]
+            onset_tail = context[-(ac_frames - 1) :]
+
+            # Beats per block (tempo may change over a long set)
+            _, beats = librosa.beat.beat_track(
+                onset_envelope=onset, sr=sr, hop_length=HOP_LENGTH
+            )
+            beat_intervals.update(np.diff(beats))
+            beat_times = librosa.frames_to_time(beats + first_frame, sr=sr, hop_length=HOP_LENGTH)
+
+            onset_norm = (onset - onset_peak.min) / (onset_peak.max - onset_peak.min + 1e-8)
+            onsets = librosa.onset.onset_detect(
+                onset_envelope=onset_norm, sr=sr, hop_length=HOP_LENGTH, normalize=False
+            )
+            onset_times = librosa.frames_to_time(onsets + first_frame, sr=sr, hop_length=HOP_LENGTH)
+
+            rms_norm = (rms - rms_stats.min) / (rms_stats.max - rms_stats.min + 1e-8)
+            hook.update(0.6 * rms_norm + 0.4 * onset_norm, frames_done)
+
+            trajectory = compute_pitch_trajectory(samples, sr, S=S, hop_length=HOP_LENGTH)
+            viral.update(
+                energy=rms,
+                novelty=(novelty - novelty_peak.min)
+                / (novelty_peak.max - novelty_peak.min + 1e-6),
+                f0=trajectory.f0,
+                onset_times=onset_times,
+                beat_times=beat_times,
+                frames_done=frames_done,
+                final=final,
+            )
+
+        if tempogram_frames:
+            tempogram = (tempogram_sum / tempogram_frames)[:, None]
+        else:
+            # Shorter than one autocorrelation window
+            tempogram = librosa.feature.tempogram(
+                onset_envelope=onset_tail, sr=sr, hop_length=HOP_LENGTH, win_length=ac_frames
+            )
+        tempo = float(
+            librosa.feature.tempo(tg=tempogram, sr=sr, hop_length=HOP_LENGTH)[0]
+        )
+
+        duration = summary["n_samples"] / sr
+        best_frame, best_score = hook.best()
+        start_time = best_frame / (sr / HOP_LENGTH)
+        end_time = min(start_time + self.segment_duration, duration)
+        hook_score = float(best_score * 100)
+
+        return {
+            "tempo": tempo,
+            "onset": onset_stats,
+            "mfcc": mfcc_stats,
+            "chroma": chroma_stats,
+            "clarity": clarity_stats,
+            "beat_intervals": beat_intervals,
+            "beat_count": viral.beats_count,
+            "hook": {
+                "start_time": float(start_time),
+                "end_time": float(end_time),
+                "duration": float(end_time - start_time),
+                "hook_score": hook_score,
+                "rationale": self.extractor._generate_hook_rationale(hook_score),
+            },
+            "viral": viral.result(),
+        }
+
+    def _sonic_genome(self, summary: dict[str, Any], segments: dict[str, Any]) -> dict[str, Any]:
+        """Assemble the sonic genome from the streamed statistics."""
+        extractor = self.extractor
+        stats = summary["stats"]
+        tempo = segments["tempo"]
+        intervals = segments["beat_intervals"]
+        key = int(np.argmax(segments["chroma"].mean))
+
+        if segments["beat_count"] < 2 or intervals.count == 0:
+            timing_precision = 50.0
+        else:
+            frame_seconds = HOP_LENGTH / self.sample_rate
+            timing_precision = extractor._score_timing_precision(
+                float(intervals.mean) * frame_seconds,
+                float(intervals.std) * frame_seconds,
+                rms_cv=stats["rms"].cv,
+            )
+
+        return {
+            "duration": summary["n_samples"] / self.sample_rate,
+            "tempo": tempo,
+            "key": key,
+            "key_name": extractor._key_to_name(key),
+            "spectral_centroid_mean": float(stats["centroid"].mean),
+            "spectral_centroid_std": float(stats["centroid"].std),
+            "spectral_rolloff_mean": float(stats["rolloff"].mean),
+            "spectral_rolloff_std": float(stats["rolloff"].std),
+            "spectral_bandwidth_mean": float(stats["bandwidth"].mean),
+            "spectral_bandwidth_std": float(stats["bandwidth"].std),
+            "rms_mean": float(stats["rms"].mean),
+            "rms_std": float(stats["rms"].std),
+            "loudness": float(librosa.amplitude_to_db(stats["rms"].mean)),
+            "zero_crossing_rate_mean": float(stats["zcr"].mean),
+            "zero_crossing_rate_std": float(stats["zcr"].std),
+            "mfcc_means": [float(x) for x in segments["mfcc"].mean],
+            "mfcc_stds": [float(x) for x in segments["mfcc"].std],
+            "energy": extractor._compute_energy(float(stats["rms"].mean)),
+            "danceability": extractor._compute_danceability_aware(
+                tempo, intervals.cv if intervals.count else None, timing_precision
+            ),
+            "valence": extractor._compute_valence(
+                segments["chroma"].mean, float(stats["centroid"].mean)
+            ),
+            "acousticness": extractor._compute_acousticness(
+                float(stats["rolloff"].mean),
+                float(stats["zcr"].mean),
+                stats["rms"].cv,
+                stats["centroid"].cv,
+            ),
+            "timing_precision_score": float(timing_precision),
+            "harmonic_coherence_score": extractor._measure_harmonic_coherence_score(
+                float(segments["clarity"].mean)
+            ),
+            "essentia_features": {},
+            "analysis_mode": "streaming",
+        }
+
+    def _quality_metrics(
+        self, summary: dict[str, Any], segments: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Assemble quality metrics from the streamed statistics."""
+        extractor = self.extractor
+        stats = summary["stats"]
+        log2_pitch = stats["log2_pitch"]
+        onset = segments["onset"]
+
+        pitch_accuracy = extractor._score_pitch_accuracy(
+            float(1200 * log2_pitch.std), log2_pitch.count, summary["n_frames"]
+        )
+        if segments["beat_count"] < 4 or segments["beat_intervals"].count == 0:
+            timing_precision = 50.0
+        else:
+            timing_precision = extractor._score_beat_consistency(
+                segments["beat_intervals"].cv, float(onset.mean), float(onset.std)
+            )
+        harmonic_coherence = extractor._score_harmonic_coherence(
+            float(segments["clarity"].mean), float(np.mean(segments["chroma"].std))
+        )
+        return extractor._quality_metrics_result(
+            pitch_accuracy, timing_precision, harmonic_coherence
+        )
+
+
+class _HookWindows:
+    """Best ``detect_hook`` window over a stream of per-frame hook scores."""
+
+    def __init__(self, segment_duration: float, sr: int, n_frames: int) -> None:
+        self.segment_frames = int(segment_duration * (sr / HOP_LENGTH))
+        self.n_windows = max(0, n_frames - self.segment_frames)
+        self._history = np.zeros(0)
+        self._offset = 0  # track frame index of _history[0]
+        self._next = 0  # next window start frame to score
+        self._top = TopK(1)
+
+    def update(self, scores: np.ndarray, frames_done: int) -> None:
+        """Append per-frame scores and score every window they complete."""
+        self._history = np.concatenate([self._history, scores])
+        # Window i needs frames [i, i + segment_frames)
+        end = min(self.n_windows, frames_done - self.segment_frames + 1)
+        if end > self._next:
+            prefix = np.concatenate(([0.0], np.cumsum(self._history)))
+            starts = np.arange(self._next, end) - self._offset
+            means = (prefix[starts + self.segment_frames] - prefix[starts]) / self.segment_frames
+            best = int(np.argmax(means))
+            self._top.push(float(means[best]), (self._next + best, float(means[best])))
+            self._next = end
+
+        drop = self._next - self._offset
+        self._history = self._history[drop:]
+        self._offset = self._next
+
+    def best(self) -> tuple[int, float]:
+        """Start frame and mean score of the best window (0, 0 if none scores above 0)."""
+        items = self._top.items()
+        if not items or items[0][1] <= 0:
+            return 0, 0.0
+        return items[0]
+
+
+class _ViralWindows:
+    """
+    Viral segment candidates over a stream of frame features.
+
+    Windows start every second, as in ``ViralHookDetector``, and are scored
+    with its ``_score_windows`` from a bounded frame and event history.
+    """
+
+    def __init__(
+        self,
+        detector: ViralHookDetector,
+        segment_duration: float,
+        sr: int,
+        n_samples: int,
+        energy_max: float,
+        top_n: int,
+    ) -> None:
+        self.detector = detector
+        self.segment_duration = segment_duration
+        self.sr = sr
+        self.segment_samples = int(segment_duration * sr)
+        self.n_samples = n_samples
+        self.n_windows = max(0, math.ceil((n_samples - self.segment_samples) / sr))
+        self.energy_max = energy_max
+        self.onsets_count = 0
+        self.beats_count = 0
+        self._energy = np.zeros(0, dtype=np.float32)
+        self._novelty = np.zeros(0, dtype=np.float32)
+        self._f0 = np.zeros(0, dtype=np.float32)
+        self._onsets = np.zeros(0)
+        self._beats = np.zeros(0)
+        self._offset = 0  # track frame index of the frame histories
+        self._next = 0  # next window index to score
+        self._top = TopK(top_n)
+
+    def update(
+        self,
+        energy: np.ndarray,
+        novelty: np.ndarray,
+        f0: np.ndarray,
+        onset_times: np.ndarray,
+        beat_times: np.ndarray,
+        frames_done: int,
+        final: bool,
+    ) -> None:
+        """Append one block of features and score every window it completes."""
+        self._energy = np.concatenate([self._energy, energy])
+        self._novelty = np.concatenate([self._novelty, novelty])
+        self._f0 = np.concatenate([self._f0, f0])
+        self._onsets = np.concatenate([self._onsets, onset_times])
+        self._beats = np.concatenate([self._beats, beat_times])
+        self.onsets_count += len(onset_times)
+        self.beats_count += len(beat_times)
+
+        starts = np.arange(self._next, self.n_windows) * self.sr
+        if not final:
+            # Every frame centred before the window end must be available
+            ready = np.ceil((starts + self.segment_samples) / HOP_LENGTH) <= frames_done
+            starts = starts[ready]
+        if len(starts):
+            windows = self.detector._score_windows(
+                starts,
+                starts + self.segment_samples,
+                self.sr,
+                HOP_LENGTH,
+                self.n_samples / self.sr,
+                self._onsets,
+                self._beats,
+                self._novelty,
+                self._energy,
+                self.energy_max,
+                PitchTrajectory(self._f0, self.sr, HOP_LENGTH),
+                frame_offset=self._offset,
+            )
+            rounded = np.round(windows["score"], 1)
+            for i in range(len(starts)):
+                self._top.push(
+                    float(rounded[i]), {name: values[i] for name, values in windows.items()}
+                )
+            self._next += len(starts)
+
+        # Keep only what the next window can still use
+        next_start = self._next * self.sr
+        drop = next_start // HOP_LENGTH - self._offset
+        if drop > 0:
+            self._energy = self._energy[drop:]
+            self._novelty = self._novelty[drop:]
+            self._f0 = self._f0[drop:]
+            self._offset += drop
+        self._onsets = self._onsets[self._onsets >= next_start / self.sr]
+        self._beats = self._beats[self._beats >= next_start / self.sr]
+
+    def result(self) -> dict[str, Any]:
+        """Viral segment payload, as ``ViralHookDetector.detect_viral_segments``."""
+        candidates = sorted(self._top.items(), key=lambda w: w["start_time"])
+        windows = {
+            name: np.array([w[name] for w in candidates]) for name in (candidates[0] if candidates else {})
+        }
+        segments = (
+            self.detector._top_segments(windows, self.segment_duration, self._top.k)
+            if candidates
+            else []
+        )
+        return {
+            "provider": "librosa-streaming",
+            "segment_duration": self.segment_duration,
+            "total_segments_analyzed": self.n_windows,
+            "viral_segments": segments,
+            "onsets_count": self.onsets_count,
+            "beats_count": self.beats_count,
+        }
@@ -1,14 +1,196 @@
-"""Audio transcription using OpenAI Whisper."""
+"""Audio transcription using Whisper.
+
+A track is transcribed once per audio content: voice activity detection
+(on the Demucs vocal stem when enabled) drops instrumental regions, the voiced
+audio is cut into Whisper-window chunks that are transcribed in parallel on
+the configured backend (faster-whisper int8 by default), and the result,
+with word timestamps, is memoized per audio hash in process and in the
+analysis cache.
+"""
 
 import logging
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from difflib import SequenceMatcher
 from typing import Any
 
-import whisper
+import numpy as np
+
+from ..cache import audio_content_hash, cached_analysis
+from ..inference import run_inference
+from ..models import get_model
+from .decoder import load_audio
+from .transcription_backends import TranscriptionBackend, get_transcription_backend
+from .vad import VAD_SR, detect_voice_regions, plan_chunks
 
 logger = logging.getLogger(__name__)
 
+TRANSCRIPTION_VERSION = "2"
+TRANSCRIPTION_MEMO_MAX_ENTRIES = 16
+
+# (audio hash, options) -> result; per-key locks make concurrent requests for
+# one upload wait for a single transcription
+_memo: OrderedDict[tuple[str, ...], dict[str, Any]] = OrderedDict()
+_memo_locks: dict[tuple[str, ...], threading.Lock] = {}
+_memo_lock = threading.Lock()
+
+
+def load_whisper_model(model_size: str = "small") -> Any:
+    """Model registry loader for Whisper."""
+    import whisper
+
+    return whisper.load_model(model_size)
+
+
+def _vad_audio(audio_path: str, audio: np.ndarray) -> tuple[np.ndarray, bool]:
+    """Audio to run VAD on: the vocal stem when enabled and available, else the mix."""
+    from ...core.config import settings
+
+    if settings.TRANSCRIPTION_VAD_ON_STEMS:
+        from .stem_separator import StemSeparator
+
+        try:
+            vocals = StemSeparator().get_stems(audio_path).load("vocals", sr=VAD_SR)
+            return vocals[: len(audio)], True
+        except Exception as e:
+            logger.warning(f"Vocal stem unavailable for VAD, using the full mix: {e}")
+    return audio, False
+
+
+def _transcribe_chunks(
+    backend: TranscriptionBackend,
+    audio: np.ndarray,
+    chunks: list[tuple[float, float]],
+    language: str | None,
+    task: str,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Transcribe chunks (in parallel where the backend allows) on the track's timeline."""
+
+    def run(chunk: tuple[float, float], chunk_language: str | None) -> dict[str, Any]:
+        start, end = chunk
+        return backend.transcribe(
+            audio[int(start * VAD_SR) : int(end * VAD_SR)], chunk_language, task
+        )
+
+    results: list[dict[str, Any]] = []
+    remaining = chunks
+    if language is None and chunks:
+        # Detect the language once, on the first voiced chunk, so every chunk agrees
+        results.append(run(chunks[0], None))
+        language = results[0].get("language")
+        remaining = chunks[1:]
+
+    with ThreadPoolExecutor(max_workers=backend.max_parallel) as pool:
+        results.extend(pool.map(lambda chunk: run(chunk, language), remaining))
+
+    segments = []
+    for (offset, _), result in zip(chunks, results, strict=True):
+        for segment in result["segments"]:
+            segment["start"] = round(segment["start"] + offset, 3)
+            segment["end"] = round(segment["end"] + offset, 3)
+            for word in segment["words"]:
+                if word["start"] is not None:
+                    word["start"] = round(word["start"] + offset, 3)
+                    word["end"] = round(word["end"] + offset, 3)
+            segments.append(segment)
+    return segments, language
+
+
+def _transcribe_uncached(
+    audio_path: str, model_size: str, language: str | None, task: str
+) -> dict[str, Any]:
+    from ...core.config import settings
+
+    backend = get_transcription_backend(model_size)
+    audio, _ = load_audio(audio_path, sr=VAD_SR, mono=True)
+    duration = len(audio) / VAD_SR
+
+    if settings.TRANSCRIPTION_VAD:
+        vad_audio, isolated = _vad_audio(audio_path, audio)
+        regions = detect_voice_regions(vad_audio, isolated_vocals=isolated)
+    else:
+        regions, isolated = [(0.0, duration)], False
+    chunks = plan_chunks(regions, settings.TRANSCRIPTION_CHUNK_SECONDS)
+
+    voiced = sum(end - start for start, end in chunks)
+    logger.info(
+        f"Transcribing {voiced:.0f}s of {duration:.0f}s in {len(chunks)} chunks "
+        f"({backend.name} {model_size}, VAD on {'vocal stem' if isolated else 'mix'})"
+    )
+    segments, detected_language = _transcribe_chunks(backend, audio, chunks, language, task)
+
+    return {
+        "text": "".join(segment["text"] for segment in segments),
+        "segments": segments,
+        "words": [word for segment in segments for word in segment["words"]],
+        "language": detected_language or language,
+        "backend": backend.name,
+        "model_size": model_size,
+        "duration": round(duration, 2),
+        "voiced_seconds": round(voiced, 2),
+    }
+
+
+def transcribe_file(
+    audio_path: str,
+    model_size: str = "small",
+    language: str | None = None,
+    task: str = "transcribe",
+) -> dict[str, Any]:
+    """
+    Transcribe a file, memoized per audio content and options.
+
+    Args:
+        audio_path: Path to audio file
+        model_size: Whisper model size
+        language: Language code, or None to detect
+        task: "transcribe" or "translate"
+
+    Returns:
+        Dictionary with text, segments (with word timestamps), words,
+        language, backend, duration and voiced_seconds
+    """
+    from ...core.config import settings
+
+    options = f"{settings.TRANSCRIPTION_BACKEND}:{model_size}:{language or 'auto'}:{task}"
+    try:
+        key = (audio_content_hash(audio_path), options)
+    except OSError:
+        return _transcribe_uncached(audio_path, model_size, language, task)
+
+    with _memo_lock:
+        lock = _memo_locks.setdefault(key, threading.Lock())
+    with lock:
+        with _memo_lock:
+            if key in _memo:
+                _memo.move_to_end(key)
+                return _memo[key]
+
+        result = cached_analysis(
+            audio_path,
+            "transcription",
+            f"{TRANSCRIPTION_VERSION}:{options}",
+            lambda: _transcribe_uncached(audio_path, model_size, language, task),
+        )
+        with _memo_lock:
+            _memo[key] = result
+            while len(_memo) > TRANSCRIPTION_MEMO_MAX_ENTRIES:
+                evicted, _ = _memo.popitem(last=False)
+                _memo_locks.pop(evicted, None)
+        return result
+
+
+def transcribe_files(
+    audio_paths: list[str],
+    model_size: str = "small",
+    language: str | None = None,
+    task: str = "transcribe",
+) -> list[dict[str, Any]]:
+    """Transcribe several files, in this process."""
+    return [transcribe_file(path, model_size, language, task) for path in audio_paths]
+
 
 class AudioTranscriber:
     """Transcribe lyrics from audio using Whisper."""
@@ -26,17 +208,12 @@ class AudioTranscriber:
                        - large: Best accuracy (~10GB RAM)
         """
         self.model_size = model_size
-        self._model = None
         logger.info(f"AudioTranscriber initialized with model size: {model_size}")
 
     @property
     def model(self):
-        """Lazy load the Whisper model."""
-        if self._model is None:
-            logger.info(f"Loading Whisper model: {self.model_size}")
-            self._model = whisper.load_model(self.model_size)
-            logger.info("Whisper model loaded successfully")
-        return self._model
+        """Whisper model from the model registry (loaded on first use)."""
+        return get_model("whisper", self.model_size)
 
     def transcribe_lyrics(
         self, 
@@ -55,7 +232,8 @@ class AudioTranscriber:
         Returns:
             {
                 "text": "full lyrics",
-                "segments": [{"start": 0.0, "end": 5.2, "text": "line 1"}],
+                "segments": [{"start": 0.0, "end": 5.2, "text": "line 1", "words": [...]}],
+                "words": [{"word": " line", "start": 0.0, "end": 0.4, "probability": 0.97}],
                 "language": "en",
                 "confidence": 0.85
             }
@@ -63,14 +241,15 @@ class AudioTranscriber:
         try:
             logger.info(f"Transcribing audio: {audio_path}")
             
-            # Transcribe with Whisper
-            result = self.model.transcribe(
-                audio_path,
+            # Transcribe with Whisper (paths are readable by the local inference server)
+            result = run_inference(
+                "transcribe",
+                transcribe_files,
+                audio_paths=[str(audio_path)],
+                model_size=self.model_size,
                 language=language if language != "auto" else None,
                 task=task,
-                fp16=False,  # CPU compatibility
-                verbose=False,
-            )
+            )[0]
             
             # Calculate average confidence from segments
             if result.get("segments"):
@@ -78,7 +257,9 @@ class AudioTranscriber:
                 confidences = []
                 for seg in result["segments"]:
                     # Lower no_speech_prob = higher confidence
-                    no_speech = seg.get("no_speech_prob", 0.5)
+                    no_speech = seg.get("no_speech_prob")
+                    if no_speech is None:
+                        no_speech = 0.5
                     confidence = 1.0 - no_speech
                     confidences.append(confidence)
                 
@@ -94,6 +275,7 @@ class AudioTranscriber:
             return {
                 "text": result["text"].strip(),
                 "segments": result.get("segments", []),
+                "words": result.get("words", []),
                 "language": result.get("language", language),
                 "confidence": round(avg_confidence, 2),
                 "success": True,
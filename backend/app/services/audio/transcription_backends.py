@@ -0,0 +1,199 @@
+"""Speech-to-text backends for lyric transcription.
+
+Each backend transcribes one 16 kHz mono chunk and returns Whisper-style
+segments with word timestamps:
+
+    {"text": str, "language": str,
+     "segments": [{"start", "end", "text", "avg_logprob", "no_speech_prob",
+                   "words": [{"word", "start", "end", "probability"}]}]}
+
+``FasterWhisperBackend`` runs Whisper on CTranslate2 with int8 weights, several
+times faster than PyTorch on CPU, and handles calls from several threads at
+once. ``OpenAIWhisperBackend`` is the reference implementation.
+"""
+
+import importlib.util
+import logging
+import os
+from typing import Any
+
+import numpy as np
+
+from ..models import get_model
+
+logger = logging.getLogger(__name__)
+
+FASTER_WHISPER_AVAILABLE = importlib.util.find_spec("faster_whisper") is not None
+
+
+def load_faster_whisper_model(model_size: str = "small", compute_type: str = "int8") -> Any:
+    """Model registry loader for faster-whisper (CTranslate2)."""
+    from faster_whisper import WhisperModel
+
+    from ...core.config import settings
+
+    # One CTranslate2 worker per concurrently transcribed chunk, sharing the cores
+    workers = max(1, settings.TRANSCRIPTION_PARALLEL_CHUNKS)
+    return WhisperModel(
+        model_size,
+        device="cpu",
+        compute_type=compute_type,
+        cpu_threads=max(1, (os.cpu_count() or 1) // workers),
+        num_workers=workers,
+    )
+
+
+def _round(value: Any) -> float | None:
+    return None if value is None else round(float(value), 3)
+
+
+class TranscriptionBackend:
+    """Base class: transcribe one chunk of 16 kHz mono audio."""
+
+    name = "base"
+    # Chunks this backend can transcribe concurrently
+    max_parallel = 1
+
+    def __init__(self, model_size: str) -> None:
+        """
+        Initialize backend (models load on first use).
+
+        Args:
+            model_size: Whisper model size (tiny, base, small, medium, large)
+        """
+        self.model_size = model_size
+
+    def transcribe(self, audio: np.ndarray, language: str | None, task: str) -> dict[str, Any]:
+        """
+        Transcribe a chunk.
+
+        Args:
+            audio: 16 kHz mono float32 audio
+            language: Language code, or None to detect
+            task: "transcribe" or "translate"
+
+        Returns:
+            Dictionary with text, language and segments (times relative to
+            the chunk)
+        """
+        raise NotImplementedError
+
+
+class FasterWhisperBackend(TranscriptionBackend):
+    """Whisper on CTranslate2 (int8 by default)."""
+
+    name = "faster-whisper"
+
+    def __init__(self, model_size: str, compute_type: str = "int8") -> None:
+        """
+        Initialize backend.
+
+        Args:
+            model_size: Whisper model size
+            compute_type: CTranslate2 compute type (int8, int8_float32, float32)
+        """
+        from ...core.config import settings
+
+        super().__init__(model_size)
+        self.compute_type = compute_type
+        self.max_parallel = max(1, settings.TRANSCRIPTION_PARALLEL_CHUNKS)
+
+    def transcribe(self, audio: np.ndarray, language: str | None, task: str) -> dict[str, Any]:
+        model = get_model("faster_whisper", self.model_size, self.compute_type)
+        segments, info = model.transcribe(
+            audio,
+            language=language,
+            task=task,
+            beam_size=5,
+            word_timestamps=True,
+            vad_filter=False,  # Non-vocal audio was already cut out
+            condition_on_previous_text=False,
+        )
+        result = [
+            {
+                "start": _round(segment.start),
+                "end": _round(segment.end),
+                "text": segment.text,
+                "avg_logprob": _round(segment.avg_logprob),
+                "no_speech_prob": _round(segment.no_speech_prob),
+                "words": [
+                    {
+                        "word": word.word,
+                        "start": _round(word.start),
+                        "end": _round(word.end),
+                        "probability": _round(word.probability),
+                    }
+                    for word in segment.words or []
+                ],
+            }
+            for segment in segments  # Generator: decoding happens here
+        ]
+        return {
+            "text": "".join(segment["text"] for segment in result),
+            "language": info.language,
+            "segments": result,
+        }
+
+
+class OpenAIWhisperBackend(TranscriptionBackend):
+    """Reference openai-whisper on PyTorch (one chunk at a time)."""
+
+    name = "whisper"
+
+    def transcribe(self, audio: np.ndarray, language: str | None, task: str) -> dict[str, Any]:
+        model = get_model("whisper", self.model_size)
+        raw = model.transcribe(
+            audio.astype(np.float32),
+            language=language,
+            task=task,
+            fp16=False,  # CPU compatibility
+            word_timestamps=True,
+            verbose=False,
+        )
+        segments = [
+            {
+                "start": _round(segment["start"]),
+                "end": _round(segment["end"]),
+                "text": segment["text"],
+                "avg_logprob": _round(segment.get("avg_logprob")),
+                "no_speech_prob": _round(segment.get("no_speech_prob")),
+                "words": [
+                    {
+                        "word": word["word"],
+                        "start": _round(word["start"]),
+                        "end": _round(word["end"]),
+                        "probability": _round(word.get("probability")),
+                    }
+                    for word in segment.get("words", [])
+                ],
+            }
+            for segment in raw.get("segments", [])
+        ]
+        return {"text": raw.get("text", ""), "language": raw.get("language"), "segments": segments}
+
+
+def get_transcription_backend(model_size: str) -> TranscriptionBackend:
+    """
+    Build the configured transcription backend.
+
+    Args:
+        model_size: Whisper model size
+
+    Returns:
+        faster-whisper when configured ("auto" or "faster-whisper") and
+        installed, otherwise openai-whisper
+    """
+    from ...core.config import settings
+
+    name = settings.TRANSCRIPTION_BACKEND
+    if name in ("auto", "faster-whisper"):
+        if FASTER_WHISPER_AVAILABLE:
+            return FasterWhisperBackend(model_size, settings.TRANSCRIPTION_COMPUTE_TYPE)
+        if name == "faster-whisper":
+            logger.warning(
+                "⚠️ faster-whisper not installed - using openai-whisper. "
+                "Install with: pip install faster-whisper"
+            )
+    elif name != "whisper":
+        logger.warning(f"⚠️ Unknown TRANSCRIPTION_BACKEND {name!r}; using openai-whisper")
+    return OpenAIWhisperBackend(model_size)
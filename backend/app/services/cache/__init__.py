@@ -0,0 +1,15 @@
+"""Caching services for analysis results."""
+
+from .analysis_cache import (
+    AnalysisCache,
+    audio_content_hash,
+    cached_analysis,
+    get_analysis_cache,
+)
+
+__all__ = [
+    "AnalysisCache",
+    "audio_content_hash",
+    "cached_analysis",
+    "get_analysis_cache",
+]
@@ -0,0 +1,325 @@
+"""Content-addressed on-disk cache for analyzer results.
+
+Entries are keyed by the SHA-256 of the audio bytes plus an analyzer name and
+version string, so a result is reused only when neither the audio nor the
+analyzer code changed. Bump an analyzer's ``ANALYZER_VERSION`` whenever its
+output changes to invalidate stale entries.
+"""
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from ..instrumentation import stage_timer
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024  # 1MB
+HASH_MEMO_MAX_ENTRIES = 1024
+
+# (path, size, mtime_ns) -> sha256, so one upload is hashed only once
+_hash_memo: dict[tuple[str, int, int], str] = {}
+_hash_lock = threading.Lock()
+
+
+def audio_content_hash(audio_path: str | Path) -> str:
+    """
+    Compute the SHA-256 of an audio file, memoized per file version.
+
+    Args:
+        audio_path: Path to audio file
+
+    Returns:
+        Hex digest of the file contents
+    """
+    path = Path(audio_path)
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+
+    with _hash_lock:
+        cached = _hash_memo.get(memo_key)
+    if cached:
+        return cached
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    audio_hash = digest.hexdigest()
+
+    with _hash_lock:
+        if len(_hash_memo) >= HASH_MEMO_MAX_ENTRIES:
+            _hash_memo.clear()
+        _hash_memo[memo_key] = audio_hash
+    return audio_hash
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize numpy scalars/arrays that leak into analyzer output."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class AnalysisCache:
+    """
+    On-disk JSON cache with size-bounded LRU eviction.
+
+    Layout: ``<root>/<hash[:2]>/<hash>/<analyzer>@<version>.json``. File mtime
+    doubles as the last-access time, so eviction order survives restarts.
+    """
+
+    def __init__(self, root: str | Path, max_bytes: int) -> None:
+        """
+        Initialize analysis cache.
+
+        Args:
+            root: Cache directory
+            max_bytes: Total size budget before least-recently-used eviction
+        """
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: int | None = None
+
+    def _entry_path(self, audio_hash: str, analyzer: str, version: str) -> Path:
+        safe_name = f"{analyzer}@{version}".replace("/", "_")
+        return self.root / audio_hash[:2] / audio_hash / f"{safe_name}.json"
+
+    def get(self, audio_hash: str, analyzer: str, version: str) -> Any | None:
+        """
+        Look up a cached analyzer result.
+
+        Args:
+            audio_hash: SHA-256 of the audio file
+            analyzer: Analyzer name (e.g. "sonic_genome")
+            version: Analyzer version string
+
+        Returns:
+            Cached result, or None on miss
+        """
+        path = self._entry_path(audio_hash, analyzer, version)
+        try:
+            with open(path, encoding="utf-8") as f:
+                value = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            # Truncated or corrupt JSON, or bytes that are not UTF-8
+            logger.warning(f"Discarding unreadable cache entry {path}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+        # Touch for LRU ordering
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return value
+
+    def set(self, audio_hash: str, analyzer: str, version: str, value: Any) -> None:
+        """
+        Store an analyzer result.
+
+        Args:
+            audio_hash: SHA-256 of the audio file
+            analyzer: Analyzer name
+            version: Analyzer version string
+            value: JSON-serializable result
+        """
+        path = self._entry_path(audio_hash, analyzer, version)
+        try:
+            payload = json.dumps(value, default=_json_default)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Not caching {analyzer} result: {e}")
+            return
+
+        data = payload.encode("utf-8")
+        tmp_name = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Unique per writer, so concurrent writers in one process never
+            # share a temporary file
+            fd, tmp_name = tempfile.mkstemp(prefix=f".{path.stem}-", suffix=".tmp", dir=path.parent)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            try:
+                replaced_bytes = path.stat().st_size
+            except FileNotFoundError:
+                replaced_bytes = 0
+            os.replace(tmp_name, path)
+        except OSError as e:
+            logger.warning(f"Analysis cache write failed for {analyzer}: {e}")
+            return
+        finally:
+            if tmp_name is not None and os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += len(data) - replaced_bytes
+            over_budget = self._current_size() > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def get_or_compute(
+        self,
+        audio_hash: str,
+        analyzer: str,
+        version: str,
+        compute: Callable[[], Any],
+    ) -> Any:
+        """
+        Return the cached result or compute and store it.
+
+        Results that carry an ``error`` key (the analyzers' soft-failure
+        convention) are returned but not stored, so failures are retried.
+
+        Args:
+            audio_hash: SHA-256 of the audio file
+            analyzer: Analyzer name
+            version: Analyzer version string
+            compute: Zero-argument callable producing the result
+
+        Returns:
+            Analyzer result
+        """
+        cached = self.get(audio_hash, analyzer, version)
+        if cached is not None:
+            logger.info(f"Analysis cache hit: {analyzer}@{version} ({audio_hash[:12]})")
+            return cached
+
+        value = compute()
+        if value is not None and not (isinstance(value, dict) and value.get("error")):
+            self.set(audio_hash, analyzer, version, value)
+        return value
+
+    def _scan(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        if not self.root.exists():
+            return entries
+        for path in self.root.rglob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _current_size(self) -> int:
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, size, _ in self._scan())
+        return self._total_bytes
+
+    def evict(self) -> int:
+        """
+        Remove least-recently-used entries until under 90% of the budget.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            entries = sorted(self._scan())
+            total = sum(size for _, size, _ in entries)
+            target = int(self.max_bytes * 0.9)
+            removed = 0
+
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+                # Drop now-empty hash directories
+                with contextlib.suppress(OSError):
+                    path.parent.rmdir()
+
+            self._total_bytes = total
+
+        if removed:
+            logger.info(f"Analysis cache evicted {removed} entries ({total} bytes remain)")
+        return removed
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            for _, _, path in self._scan():
+                path.unlink(missing_ok=True)
+            self._total_bytes = 0
+
+
+# Singleton instance (lazy-loaded)
+_cache_instance: AnalysisCache | None = None
+
+
+def get_analysis_cache() -> AnalysisCache | None:
+    """
+    Get the process-wide analysis cache.
+
+    Returns:
+        Cache instance, or None when caching is disabled in settings
+    """
+    global _cache_instance
+
+    from ...core.config import settings
+
+    if not settings.ANALYSIS_CACHE_ENABLED:
+        return None
+
+    if _cache_instance is None:
+        _cache_instance = AnalysisCache(
+            settings.ANALYSIS_CACHE_DIR,
+            max_bytes=settings.ANALYSIS_CACHE_MAX_MB * 1024 * 1024,
+        )
+    return _cache_instance
+
+
+def cached_analysis(
+    audio_path: str | Path,
+    analyzer: str,
+    version: str,
+    compute: Callable[[], Any],
+) -> Any:
+    """
+    Run ``compute`` through the analysis cache for ``audio_path``.
+
+    Falls back to computing directly if caching is disabled or the cache
+    cannot be used (missing file, unwritable directory). A computed result
+    is timed as stage ``analyzer.<analyzer>``.
+
+    Args:
+        audio_path: Path to audio file
+        analyzer: Analyzer name
+        version: Analyzer version string
+        compute: Zero-argument callable producing the result
+
+    Returns:
+        Analyzer result
+    """
+    try:
+        cache = get_analysis_cache()
+        audio_hash = audio_content_hash(audio_path) if cache else None
+    except Exception as e:
+        logger.warning(f"Analysis cache unavailable: {e}")
+        cache = None
+        audio_hash = None
+
+    def timed_compute() -> Any:
+        # Cache hits are not timed, so the histograms reflect analyzer cost
+        with stage_timer(f"analyzer.{analyzer}"):
+            return compute()
+
+    if cache is None or audio_hash is None:
+        return timed_compute()
+
+    return cache.get_or_compute(audio_hash, analyzer, version, timed_compute)
@@ -241,7 +241,12 @@ def detect_genre_hybrid(
     sonic_genome: dict[str, Any],
     lyrical_genome: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
-    """Blend ML genre prediction, instrument detection and heuristic scores."""
+    """Blend ML genre prediction, instrument detection and heuristic scores.
+
+    The audio-dependent model outputs (genre classifier and instrument
+    detector) go through the analysis cache; the cheap blending step always
+    reruns because it also depends on the sonic and lyrical genomes.
+    """
     # Start with the heuristic baseline
     heuristic_result = detect_genre(sonic_genome, lyrical_genome)
 
@@ -250,9 +255,17 @@ def detect_genre_hybrid(
 
     # Lazy imports to avoid heavy dependencies when unused
     try:
-        from app.services.classification.genre_ml import classify_file, to_score_map
-        from app.services.audio.instrument_detection import detect_instruments
-        import librosa
+        from app.services.cache import cached_analysis
+        from app.services.classification.genre_ml import (
+            GENRE_MODEL_ID,
+            classify_file,
+            to_score_map,
+        )
+        from app.services.audio.decoder import load_audio
+        from app.services.audio.instrument_detection import (
+            MODEL_ID as INSTRUMENT_MODEL_ID,
+            detect_instruments,
+        )
     except Exception:
         # Required dependencies missing; fall back to heuristic
         return heuristic_result
@@ -263,7 +276,10 @@ def detect_genre_hybrid(
     instrument_debug: dict[str, Any] = {}
 
     try:
-        ml_results = classify_file(audio_path, top_k=10)
+        ml_results = cached_analysis(
+            audio_path, "genre_ml", GENRE_MODEL_ID,
+            lambda: classify_file(audio_path, top_k=10),
+        )
         raw_ml_scores = to_score_map(ml_results)
         canonical_scores: dict[str, float] = {}
         for label, score in raw_ml_scores.items():
@@ -279,8 +295,13 @@ def detect_genre_hybrid(
         ml_metadata = {"error": str(exc)}
 
     try:
-        audio, sr = librosa.load(str(audio_path), sr=16000, duration=30)
-        instrument_debug = detect_instruments(audio, sr)
+        def _detect_instruments() -> dict[str, Any]:
+            audio, sr = load_audio(audio_path, sr=16000, duration=30)
+            return detect_instruments(audio, sr)
+
+        instrument_debug = cached_analysis(
+            audio_path, "instruments", INSTRUMENT_MODEL_ID, _detect_instruments
+        )
         instrument_scores = instrument_debug.get("instruments", {})
     except Exception as exc:  # pragma: no cover - best effort
         instrument_debug = {"error": str(exc), "instruments": {}}
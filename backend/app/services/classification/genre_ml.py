@@ -2,33 +2,66 @@
 
 from __future__ import annotations
 
-from functools import lru_cache
 from pathlib import Path
 from typing import Iterable
 
-import librosa
-from transformers import pipeline
+import numpy as np
+
+from ..audio.decoder import load_audio
+from ..inference import by_equal_length, run_batched, run_inference
+from ..models import get_model
 
 GENRE_MODEL_ID = "danilotpnta/HuBERT-Genre-Clf"
 DEFAULT_SR = 16000
 DEFAULT_DURATION = 30.0
 
 
-@lru_cache(maxsize=1)
+def load_genre_pipeline():
+    """Model registry loader for the genre classifier (torch or ONNX backend)."""
+    from ...core.config import settings
+    from ..models.onnx_backend import load_audio_classifier
+
+    return load_audio_classifier(GENRE_MODEL_ID, settings.GENRE_MODEL_BACKEND)
+
+
 def _genre_pipeline():
-    """Lazy load the Hugging Face pipeline once."""
-    return pipeline("audio-classification", model=GENRE_MODEL_ID)
+    """Genre pipeline from the model registry (loaded on first use)."""
+    return get_model("genre_hubert")
+
+
+def classify_audio_batch(
+    audios: list[np.ndarray], sampling_rate: int, top_k: int = 10
+) -> list[list[dict[str, float]]]:
+    """
+    Classify clips in this process.
+
+    On the inference server, clips of concurrent requests with the same
+    options and length share one forward pass. HuBERT takes no attention
+    mask, so clips of different lengths are never padded into one batch.
+    """
+    @by_equal_length
+    def run_batch(clips: list[np.ndarray]) -> list[list[dict[str, float]]]:
+        clf = _genre_pipeline()
+        return clf(clips, sampling_rate=sampling_rate, top_k=top_k, batch_size=len(clips))
+
+    return run_batched("classify_genre", (sampling_rate, top_k), run_batch, audios)
 
 
 def classify_audio(audio: np.ndarray, sampling_rate: int, top_k: int = 10) -> list[dict[str, float]]:
     """Classify raw audio array and return Hugging Face results."""
-    clf = _genre_pipeline()
-    return clf(audio, sampling_rate=sampling_rate, top_k=top_k)
+    results = run_inference(
+        "classify_genre",
+        classify_audio_batch,
+        audios=[audio],
+        sampling_rate=sampling_rate,
+        top_k=top_k,
+    )
+    return results[0]
 
 
 def classify_file(audio_path: str | Path, *, sr: int = DEFAULT_SR, duration: float = DEFAULT_DURATION, top_k: int = 10) -> list[dict[str, float]]:
     """Load an audio file and classify it."""
-    audio, sr = librosa.load(str(audio_path), sr=sr, duration=duration)
+    audio, sr = load_audio(audio_path, sr=sr, duration=duration)
     return classify_audio(audio, sr, top_k=top_k)
 
 
@@ -0,0 +1,15 @@
+"""Execution helpers for CPU-bound analysis."""
+
+from .process_pool import (
+    AnalysisProcessPool,
+    get_process_pool,
+    run_cpu_bound,
+    shutdown_process_pool,
+)
+
+__all__ = [
+    "AnalysisProcessPool",
+    "get_process_pool",
+    "run_cpu_bound",
+    "shutdown_process_pool",
+]
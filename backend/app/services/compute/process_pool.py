@@ -0,0 +1,349 @@
+"""Managed process pool for CPU-bound analysis.
+
+librosa/numpy analysis holds the GIL for long stretches, so running it on the
+event loop (or in a thread) stalls every other request and only ever uses one
+core. ``AnalysisProcessPool`` runs such functions in worker processes that are
+pre-warmed with the heavy imports and enforces a per-task timeout.
+
+The pool is shared by every concurrent analysis job, so a failure must stay
+with the task that caused it. ``concurrent.futures.ProcessPoolExecutor`` cannot
+do that: when one of its workers dies it fails every pending task and stops
+the other workers. Each worker here is a separate process with its own pipe,
+and a task is tied to the worker that runs it, so a hung, crashed or cancelled
+task costs only its own worker, which is replaced.
+"""
+
+import asyncio
+import contextlib
+import functools
+import importlib
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Imported in every worker at startup so the first task does not pay for them
+WARM_MODULES = (
+    "numpy",
+    "librosa",
+    "app.services.audio.feature_extraction",
+    "app.services.classification.genre_detector",
+    "app.services.lyrics.analysis",
+)
+
+# How often a waiting task checks its deadline and cancellation
+POLL_INTERVAL_SECONDS = 0.5
+
+
+def _warm_worker(modules: tuple[str, ...]) -> None:
+    """Import heavy modules once per worker."""
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Worker could not pre-import {module}: {e}")
+
+
+def _worker_main(conn: Connection, modules: tuple[str, ...]) -> None:
+    """Worker process loop: run each received call and send back its outcome."""
+    _warm_worker(modules)
+    while True:
+        try:
+            call = conn.recv()
+        except (EOFError, OSError):
+            return  # Pool went away
+        if call is None:
+            return
+        try:
+            outcome: tuple[bool, Any] = (True, call())
+        except BaseException as e:
+            outcome = (False, e)
+        try:
+            conn.send(outcome)
+        except Exception as e:
+            # Unpicklable result or exception
+            conn.send((False, RuntimeError(f"Could not return result: {e!r}")))
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class _Worker:
+    """One worker process and the parent's end of its pipe."""
+
+    def __init__(
+        self, context: multiprocessing.context.BaseContext, modules: tuple[str, ...]
+    ) -> None:
+        self.conn, child_conn = context.Pipe()
+        self.process: BaseProcess = context.Process(
+            target=_worker_main, args=(child_conn, modules), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def stop(self) -> None:
+        """Ask the worker to exit after its current task."""
+        with contextlib.suppress(OSError):
+            self.conn.send(None)
+
+    def kill(self) -> None:
+        """Kill the worker now, whatever it is doing."""
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class AnalysisProcessPool:
+    """
+    Process pool with warm-up, per-task timeouts and per-worker recovery.
+
+    Workers are started with the ``spawn`` method: forking a process that
+    already holds torch/BLAS threads and an event loop is not safe. Tasks are
+    handed to workers by a thread per worker, so waiting for a free worker
+    never blocks the event loop or the default thread pool.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        task_timeout: float | None = None,
+        max_tasks_per_child: int | None = None,
+        warm_modules: tuple[str, ...] = WARM_MODULES,
+    ) -> None:
+        """
+        Initialize process pool (workers start on first use or ``warm_up``).
+
+        Args:
+            max_workers: Number of worker processes
+            task_timeout: Default per-task timeout in seconds (None = no limit)
+            max_tasks_per_child: Recycle a worker after this many tasks to
+                bound memory growth from model caches (None = never)
+            warm_modules: Modules imported in each worker at startup
+        """
+        self.max_workers = max(1, max_workers)
+        self.task_timeout = task_timeout
+        self.max_tasks_per_child = max_tasks_per_child
+        self.warm_modules = warm_modules
+        self._context = multiprocessing.get_context("spawn")
+        self._dispatcher: ThreadPoolExecutor | None = None
+        self._idle: queue.SimpleQueue[_Worker] = queue.SimpleQueue()
+        self._workers: set[_Worker] = set()
+        self._lock = threading.Lock()
+
+    def _get_dispatcher(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._dispatcher is None:
+                for _ in range(self.max_workers):
+                    self._idle.put(self._start_worker())
+                # One dispatch thread per worker, so a dispatched task always
+                # finds an idle worker
+                self._dispatcher = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="analysis-pool"
+                )
+                logger.info(f"Started analysis process pool ({self.max_workers} workers)")
+            return self._dispatcher
+
+    def _start_worker(self) -> _Worker:
+        worker = _Worker(self._context, self.warm_modules)
+        self._workers.add(worker)
+        return worker
+
+    def _replace_worker(self, worker: _Worker, reason: str) -> _Worker:
+        """Kill one worker and start a fresh one in its place."""
+        logger.warning(f"Restarting analysis worker {worker.process.pid}: {reason}")
+        worker.kill()
+        with self._lock:
+            self._workers.discard(worker)
+            return self._start_worker()
+
+    def _retire_worker(self, worker: _Worker) -> _Worker:
+        """Let a worker that reached ``max_tasks_per_child`` exit and replace it."""
+        worker.stop()
+        worker.process.join()
+        worker.conn.close()
+        with self._lock:
+            self._workers.discard(worker)
+            return self._start_worker()
+
+    def _dispatch(
+        self,
+        call: Callable[[], T],
+        name: str,
+        timeout: float | None,
+        cancelled: threading.Event,
+    ) -> T:
+        """Dispatch thread: run ``call`` on an idle worker and wait for it."""
+        worker = self._idle.get()
+        try:
+            try:
+                worker.conn.send(call)
+            except (BrokenPipeError, ConnectionResetError, EOFError):
+                worker = self._replace_worker(worker, f"worker died before running {name}")
+                raise BrokenProcessPool(f"Worker died before running {name}") from None
+
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not worker.conn.poll(POLL_INTERVAL_SECONDS):
+                if cancelled.is_set():
+                    worker = self._replace_worker(worker, f"{name} was cancelled")
+                    raise CancelledError(name)
+                if deadline is not None and time.monotonic() >= deadline:
+                    worker = self._replace_worker(worker, f"{name} exceeded {timeout}s")
+                    raise TimeoutError(f"{name} timed out after {timeout}s")
+
+            try:
+                succeeded, value = worker.conn.recv()
+            except (EOFError, OSError):
+                worker = self._replace_worker(worker, f"worker crashed while running {name}")
+                raise BrokenProcessPool(f"Worker crashed while running {name}") from None
+
+            worker.tasks += 1
+            if self.max_tasks_per_child and worker.tasks >= self.max_tasks_per_child:
+                worker = self._retire_worker(worker)
+            if not succeeded:
+                raise value
+            return value
+        finally:
+            self._idle.put(worker)
+
+    async def run(
+        self,
+        fn: Callable[..., T],
+        *args: Any,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> T:
+        """
+        Run ``fn(*args, **kwargs)`` in a worker process.
+
+        ``fn`` and its arguments must be picklable (module-level functions and
+        plain data). If the worker dies, the task is retried once on a fresh
+        worker. Cancelling the caller kills the worker running the task, so
+        abandoned work does not keep a core busy.
+
+        Args:
+            fn: Function to run
+            *args: Positional arguments for ``fn``
+            timeout: Per-task timeout in seconds (defaults to the pool's)
+            **kwargs: Keyword arguments for ``fn``
+
+        Returns:
+            Return value of ``fn``
+
+        Raises:
+            TimeoutError: If the task exceeds its timeout (its worker is replaced)
+            BrokenProcessPool: If the task crashes its worker twice
+        """
+        timeout = timeout if timeout is not None else self.task_timeout
+        call = functools.partial(fn, *args, **kwargs)
+        name = getattr(fn, "__name__", repr(fn))
+        dispatcher = self._get_dispatcher()
+        cancelled = threading.Event()
+
+        for attempt in (1, 2):
+            future = dispatcher.submit(self._dispatch, call, name, timeout, cancelled)
+            try:
+                return await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            except BrokenProcessPool:
+                if attempt == 2:
+                    raise
+                logger.info(f"Retrying {name} on a fresh worker")
+
+        raise AssertionError("unreachable")
+
+    async def warm_up(self) -> None:
+        """Start every worker now so no request pays the spawn/import cost."""
+        pids = await asyncio.gather(
+            *(self.run(_ping, timeout=None) for _ in range(self.max_workers))
+        )
+        logger.info(f"✅ Analysis process pool warm ({len(set(pids))} workers ready)")
+
+    def shutdown(self) -> None:
+        """Wait for running tasks, then stop the worker processes."""
+        with self._lock:
+            dispatcher, self._dispatcher = self._dispatcher, None
+        if dispatcher is None:
+            return
+        dispatcher.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            workers, self._workers = self._workers, set()
+        for worker in workers:
+            worker.stop()
+        for worker in workers:
+            worker.process.join(timeout=5)
+            worker.kill()
+        self._idle = queue.SimpleQueue()
+        logger.info("Analysis process pool stopped")
+
+
+# Singleton instance (lazy-loaded)
+_pool_instance: AnalysisProcessPool | None = None
+
+
+def get_process_pool() -> AnalysisProcessPool | None:
+    """
+    Get the process-wide analysis pool.
+
+    Returns:
+        Pool instance, or None when disabled in settings
+    """
+    global _pool_instance
+
+    from ...core.config import settings
+
+    if not settings.ANALYSIS_POOL_ENABLED:
+        return None
+
+    if _pool_instance is None:
+        _pool_instance = AnalysisProcessPool(
+            max_workers=settings.MAX_CONCURRENT_ANALYSES or os.cpu_count() or 1,
+            task_timeout=settings.ANALYSIS_TIMEOUT or None,
+            max_tasks_per_child=settings.ANALYSIS_POOL_MAX_TASKS_PER_CHILD or None,
+        )
+    return _pool_instance
+
+
+async def run_cpu_bound(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Await a CPU-bound function without blocking the event loop.
+
+    Uses the process pool when enabled, otherwise a thread.
+
+    Args:
+        fn: Picklable function to run
+        *args: Positional arguments for ``fn``
+        **kwargs: Keyword arguments for ``fn``
+
+    Returns:
+        Return value of ``fn``
+    """
+    pool = get_process_pool()
+    if pool is None:
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    return await pool.run(fn, *args, **kwargs)
+
+
+def shutdown_process_pool() -> None:
+    """Stop the analysis pool if it was started."""
+    global _pool_instance
+
+    if _pool_instance is not None:
+        _pool_instance.shutdown()
+        _pool_instance = None
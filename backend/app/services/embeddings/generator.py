@@ -2,16 +2,35 @@
 
 import logging
 
+from typing import Any
+
 import numpy as np
-from sentence_transformers import SentenceTransformer
+
+from ..inference import run_inference
+from ..models import get_model
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+def load_sentence_model(model_name: str = DEFAULT_MODEL_NAME) -> Any:
+    """Model registry loader for sentence-transformers models."""
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name)
+
+
+def encode_texts(texts: list[str], model_name: str = DEFAULT_MODEL_NAME) -> np.ndarray:
+    """Embed texts in one batch, in this process."""
+    model = get_model("sentence_embeddings", model_name)
+    return np.asarray(model.encode(list(texts), convert_to_numpy=True), dtype=np.float32)
+
 
 class EmbeddingGenerator:
     """Generate embeddings for text using sentence-transformers."""
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(self, model_name: str = DEFAULT_MODEL_NAME):
         """
         Initialize embedding generator.
 
@@ -19,15 +38,15 @@ class EmbeddingGenerator:
             model_name: Name of the sentence-transformers model
         """
         self.model_name = model_name
-        self._model: SentenceTransformer | None = None
 
     @property
-    def model(self) -> SentenceTransformer:
-        """Lazy load the model."""
-        if self._model is None:
-            logger.info(f"Loading sentence-transformers model: {self.model_name}")
-            self._model = SentenceTransformer(self.model_name)
-        return self._model
+    def model(self) -> Any:
+        """Model from the model registry (loaded on first use)."""
+        return get_model("sentence_embeddings", self.model_name)
+
+    def _encode(self, texts: list[str]) -> np.ndarray:
+        """Embed texts on the inference server, or in process."""
+        return run_inference("embed_text", encode_texts, texts=texts, model_name=self.model_name)
 
     def generate_embedding(self, text: str) -> list[float]:
         """
@@ -43,7 +62,7 @@ class EmbeddingGenerator:
             # Return zero vector for empty text
             return [0.0] * 384  # MiniLM-L6-v2 produces 384-dim vectors
 
-        embedding = self.model.encode(text, convert_to_numpy=True)
+        embedding = self._encode([text])[0]
         return embedding.tolist()
 
     def generate_embeddings(self, texts: list[str]) -> list[list[float]]:
@@ -72,7 +91,7 @@ class EmbeddingGenerator:
             return [[0.0] * 384 for _ in texts]
 
         # Generate embeddings for valid texts
-        embeddings = self.model.encode(valid_texts, convert_to_numpy=True)
+        embeddings = self._encode(valid_texts)
 
         # Reconstruct full list with zero vectors for empty texts
         result = []
@@ -0,0 +1,34 @@
+"""Shared local inference server and its clients."""
+
+from .batching import (
+    MicroBatcher,
+    batching_stats,
+    by_equal_length,
+    enable_batching,
+    get_batcher,
+    run_batched,
+)
+from .client import (
+    InferenceClient,
+    InferenceError,
+    InferenceUnavailable,
+    get_inference_client,
+    run_inference,
+)
+from .server import ENDPOINTS, InferenceServer
+
+__all__ = [
+    "ENDPOINTS",
+    "InferenceClient",
+    "InferenceError",
+    "InferenceServer",
+    "InferenceUnavailable",
+    "MicroBatcher",
+    "batching_stats",
+    "by_equal_length",
+    "enable_batching",
+    "get_batcher",
+    "get_inference_client",
+    "run_batched",
+    "run_inference",
+]
@@ -0,0 +1,323 @@
+"""Dynamic micro-batching for model forward passes.
+
+On CPU a single-clip forward pass leaves most cores idle and pays the full
+per-call overhead. ``MicroBatcher`` collects items from concurrent callers
+until ``max_batch_size`` items are queued or the oldest has waited
+``max_wait_ms``, runs one batched call, and resolves each caller's future.
+Batch sizes and queue waits are recorded in histograms.
+
+Batching is off unless a process turns it on with ``enable_batching``: the
+inference server does, since concurrent requests for one model meet there,
+and so does a concurrent re-analysis run. In an ordinary analysis or API
+process a clip would wait ``max_wait_ms`` for company that never comes, so
+``run_batched`` calls the model directly there.
+"""
+
+import bisect
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+from collections.abc import Callable, Hashable, Sequence
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+QUEUE_WAIT_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 1000)
+
+
+class Histogram:
+    """Thread-safe histogram with fixed upper bucket bounds (plus +Inf)."""
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        """
+        Initialize histogram.
+
+        Args:
+            buckets: Increasing upper bounds
+        """
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one value."""
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sum += value
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Report the histogram.
+
+        Returns:
+            Dictionary with per-bucket counts (keyed by upper bound, "+Inf"
+            last), total count, sum and mean
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        count = sum(counts)
+        labels = [f"{bound:g}" for bound in self.buckets] + ["+Inf"]
+        return {
+            "buckets": dict(zip(labels, counts, strict=True)),
+            "count": count,
+            "sum": round(total, 3),
+            "mean": round(total / count, 3) if count else None,
+        }
+
+
+@dataclass
+class _Pending:
+    item: Any
+    future: Future
+    enqueued: float = field(default_factory=time.perf_counter)
+
+
+class MicroBatcher:
+    """
+    Merge concurrent single-item calls into batched calls on a worker thread.
+
+    ``run_batch`` receives a list of items and must return one result per
+    item, in order. If it raises, every caller in that batch gets the error.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run_batch: Callable[[list[Any]], Sequence[Any]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 10.0,
+    ) -> None:
+        """
+        Initialize micro-batcher (the worker thread starts on first submit).
+
+        Args:
+            name: Name for logs and stats
+            run_batch: Batched implementation
+            max_batch_size: Largest batch to run
+            max_wait_ms: How long the oldest queued item may wait for others
+        """
+        self.name = name
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(QUEUE_WAIT_BUCKETS_MS)
+        self._queue: queue.Queue[_Pending] = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._pid = os.getpid()
+
+    def _ensure_worker(self) -> None:
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked: the parent's thread and queued items did not come along
+                self._queue = queue.Queue()
+                self._thread = None
+                self._pid = os.getpid()
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._worker, name=f"batcher-{self.name}", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        """
+        Queue one item.
+
+        Args:
+            item: Input for ``run_batch``
+
+        Returns:
+            Future resolving to the item's result
+        """
+        self._ensure_worker()
+        pending = _Pending(item, Future())
+        self._queue.put(pending)
+        return pending.future
+
+    def map(self, items: Sequence[Any]) -> list[Any]:
+        """
+        Run items through the batcher and wait for their results.
+
+        Args:
+            items: Inputs for ``run_batch``
+
+        Returns:
+            Results in input order
+        """
+        futures = [self.submit(item) for item in items]
+        return [future.result() for future in futures]
+
+    def _collect(self) -> list[_Pending]:
+        """Block for one item, then gather more until full or its wait expires."""
+        batch = [self._queue.get()]
+        deadline = batch[0].enqueued + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                remaining = deadline - time.perf_counter()
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    # Past the deadline, still take whatever is already queued
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _worker(self) -> None:
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            for pending in batch:
+                self.queue_wait_ms.observe((started - pending.enqueued) * 1000)
+            self.batch_sizes.observe(len(batch))
+
+            try:
+                results = self.run_batch([pending.item for pending in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"{self.name} returned {len(results)} results for {len(batch)} items"
+                    )
+            except Exception as e:
+                logger.error(f"Batched {self.name} failed ({len(batch)} items): {e}")
+                for pending in batch:
+                    pending.future.set_exception(e)
+                continue
+
+            for pending, result in zip(batch, results, strict=True):
+                pending.future.set_result(result)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Report batching histograms.
+
+        Returns:
+            Dictionary with batch-size and queue-wait (ms) histograms
+        """
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+        }
+
+
+# (name, key) -> batcher; one per model and call options
+_batchers: dict[tuple[str, tuple[Hashable, ...]], MicroBatcher] = {}
+_batchers_lock = threading.Lock()
+
+# Set by the inference server and concurrent re-analysis runs
+_batching_enabled = False
+
+
+def enable_batching(enabled: bool = True) -> None:
+    """Turn micro-batching on for this process."""
+    global _batching_enabled
+    _batching_enabled = enabled
+
+
+def get_batcher(
+    name: str, key: tuple[Hashable, ...], run_batch: Callable[[list[Any]], Sequence[Any]]
+) -> MicroBatcher:
+    """
+    Get the process-wide batcher for a model and call options.
+
+    Items only batch with items sharing the same ``key`` (e.g. sample rate
+    and top_k), since one forward pass takes one set of options.
+
+    Args:
+        name: Model or endpoint name
+        key: Call options that must match within a batch
+        run_batch: Batched implementation, used when the batcher is created
+
+    Returns:
+        Batcher instance
+    """
+    from ...core.config import settings
+
+    with _batchers_lock:
+        batcher = _batchers.get((name, key))
+        if batcher is None:
+            batcher = MicroBatcher(
+                name,
+                run_batch,
+                max_batch_size=settings.INFERENCE_BATCH_MAX_SIZE,
+                max_wait_ms=settings.INFERENCE_BATCH_MAX_WAIT_MS,
+            )
+            _batchers[(name, key)] = batcher
+        return batcher
+
+
+def run_batched(
+    name: str,
+    key: tuple[Hashable, ...],
+    run_batch: Callable[[list[Any]], Sequence[Any]],
+    items: Sequence[Any],
+) -> list[Any]:
+    """
+    Run items through the process's batcher, or directly if batching is off.
+
+    Args:
+        name: Model or endpoint name
+        key: Call options that must match within a batch
+        run_batch: Batched implementation
+        items: Inputs for ``run_batch``
+
+    Returns:
+        Results in input order
+    """
+    if not _batching_enabled:
+        return list(run_batch(list(items)))
+    return get_batcher(name, key, run_batch).map(items)
+
+
+def by_equal_length(
+    run_batch: Callable[[list[Any]], Sequence[Any]],
+) -> Callable[[list[Any]], list[Any]]:
+    """
+    Wrap a batched implementation to run once per group of equal-length clips.
+
+    Raw-waveform models without an attention mask (HuBERT) would otherwise
+    see the zero padding added to shorter clips, which changes their logits.
+
+    Args:
+        run_batch: Batched implementation taking clips of one length
+
+    Returns:
+        Batched implementation taking clips of any length
+    """
+
+    def run_groups(clips: list[Any]) -> list[Any]:
+        results: list[Any] = [None] * len(clips)
+        order = sorted(range(len(clips)), key=lambda i: len(clips[i]))
+        for _, group in itertools.groupby(order, key=lambda i: len(clips[i])):
+            indices = list(group)
+            for index, result in zip(indices, run_batch([clips[i] for i in indices]), strict=True):
+                results[index] = result
+        return results
+
+    return run_groups
+
+
+def batching_stats() -> dict[str, Any]:
+    """
+    Report every batcher in this process.
+
+    Returns:
+        Dictionary of batcher stats keyed by "name:key..." (e.g.
+        "classify_genre:16000:10")
+    """
+    with _batchers_lock:
+        batchers = dict(_batchers)
+    return {
+        ":".join([name, *map(str, key)]): batcher.stats()
+        for (name, key), batcher in batchers.items()
+    }
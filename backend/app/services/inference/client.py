@@ -0,0 +1,184 @@
+"""Thin client for the local inference server.
+
+Services call ``run_inference(method, local_fn, **params)``: with the
+inference server enabled the call goes over its Unix socket, otherwise (or
+when the server cannot be connected to) ``local_fn`` runs the model in
+process. A request that fails once sent is an error, not a fallback.
+"""
+
+import logging
+import socket
+import threading
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from .protocol import HEADER, decode_header, decode_message, encode_message
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class InferenceError(RuntimeError):
+    """The inference server failed to run a request."""
+
+
+class InferenceUnavailable(InferenceError):
+    """The inference server could not be reached."""
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if n == 0:
+            raise ConnectionError("Inference server closed the connection")
+        received += n
+    return bytes(buffer)
+
+
+class InferenceClient:
+    """
+    Blocking client with one connection per calling thread.
+
+    Analysis code runs in threads and worker processes, so calls are
+    synchronous; each thread reuses its own socket.
+    """
+
+    def __init__(self, socket_path: str, timeout: float | None = None) -> None:
+        """
+        Initialize inference client (connects on first call).
+
+        Args:
+            socket_path: Path of the server's Unix socket
+            timeout: Per-request timeout in seconds (None = no limit)
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+            self._local.sock = sock
+        return sock
+
+    def _disconnect(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        self._local.sock = None
+        if sock is not None:
+            sock.close()
+
+    def _connect(self) -> socket.socket:
+        try:
+            return self._connection()
+        except OSError as e:
+            # Refused, no socket file, or no answer to the connect
+            raise InferenceUnavailable(f"Inference server unavailable: {e}") from e
+
+    def call(self, method: str, **params: Any) -> Any:
+        """
+        Run ``method`` on the inference server.
+
+        Args:
+            method: Endpoint name (e.g. "classify_genre")
+            **params: Endpoint parameters (numpy arrays allowed)
+
+        Returns:
+            Endpoint result
+
+        Raises:
+            InferenceUnavailable: If the server cannot be connected to
+            InferenceError: If the server reports a failure, or the request
+                fails or times out once sent
+        """
+        request = encode_message({"method": method, "params": params})
+        reused = getattr(self._local, "sock", None) is not None
+        sock = self._connect()
+        try:
+            try:
+                sock.sendall(request)
+            except (BrokenPipeError, ConnectionResetError):
+                if not reused:
+                    raise
+                # The server closed this idle connection (e.g. it restarted)
+                # without reading anything; send on a fresh one
+                self._disconnect()
+                sock = self._connect()
+                sock.sendall(request)
+            json_length, body_length = decode_header(_recv_exactly(sock, HEADER.size))
+            document = _recv_exactly(sock, json_length)
+            body = _recv_exactly(sock, body_length)
+        except (OSError, ValueError) as e:
+            # The stream is in an unknown state; start over next time
+            self._disconnect()
+            raise InferenceError(f"{method} request to the inference server failed: {e}") from e
+
+        response = decode_message(document, body)
+        if response.get("error"):
+            raise InferenceError(f"{method} failed on the inference server: {response['error']}")
+        return response["result"]
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        self._disconnect()
+
+
+# Singleton instance (lazy-loaded)
+_client_instance: InferenceClient | None = None
+
+
+def get_inference_client() -> InferenceClient | None:
+    """
+    Get the process-wide inference client.
+
+    Returns:
+        Client instance, or None when the inference server is disabled
+    """
+    global _client_instance
+
+    from ...core.config import settings
+
+    if not settings.INFERENCE_SERVER_ENABLED:
+        return None
+
+    if _client_instance is None:
+        _client_instance = InferenceClient(
+            settings.INFERENCE_SOCKET_PATH,
+            timeout=settings.INFERENCE_TIMEOUT or None,
+        )
+    return _client_instance
+
+
+def run_inference(method: str, local: Callable[..., T], **params: Any) -> T:
+    """
+    Run a model call on the inference server, or in process as a fallback.
+
+    Args:
+        method: Inference server endpoint
+        local: In-process implementation taking the same keyword parameters
+        **params: Parameters for the call
+
+    Returns:
+        Result of the call
+
+    Raises:
+        InferenceError: If the server was reached but the call failed there
+            or timed out (the model is not loaded in process then)
+    """
+    client = get_inference_client()
+    if client is not None:
+        try:
+            return client.call(method, **params)
+        except InferenceUnavailable as e:
+            logger.warning(f"⚠️ {e}; running {method} in process")
+    return local(**params)
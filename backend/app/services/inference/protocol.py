@@ -0,0 +1,129 @@
+"""Wire format shared by the inference server and its clients.
+
+A message is a fixed header followed by a JSON document and the raw bytes of
+any numpy arrays it contains (audio in, embeddings out), so audio never goes
+through JSON and nothing is unpickled from the socket::
+
+    !IQ  json length, array bytes length
+    json document; arrays replaced by {"__ndarray__": index, "dtype", "shape"}
+    array bytes, concatenated in index order
+"""
+
+import json
+import struct
+from typing import Any
+
+import numpy as np
+
+HEADER = struct.Struct("!IQ")
+
+# Refuse anything larger (an hour of 16 kHz float32 audio is ~230 MB)
+MAX_MESSAGE_BYTES = 1 << 31
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize numpy scalars that leak into model output."""
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_message(payload: Any) -> bytes:
+    """
+    Serialize a message.
+
+    Args:
+        payload: JSON-compatible data, which may contain numpy arrays
+
+    Returns:
+        Framed message bytes
+    """
+    buffers: list[bytes] = []
+
+    def extract(value: Any) -> Any:
+        if isinstance(value, np.ndarray):
+            array = np.ascontiguousarray(value)
+            buffers.append(array.tobytes())
+            return {
+                "__ndarray__": len(buffers) - 1,
+                "dtype": array.dtype.str,
+                "shape": list(array.shape),
+            }
+        if isinstance(value, dict):
+            return {key: extract(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [extract(item) for item in value]
+        return value
+
+    document = json.dumps(extract(payload), default=_json_default).encode("utf-8")
+    body = b"".join(buffers)
+    return HEADER.pack(len(document), len(body)) + document + body
+
+
+def decode_header(header: bytes) -> tuple[int, int]:
+    """
+    Parse a message header.
+
+    Args:
+        header: ``HEADER.size`` bytes
+
+    Returns:
+        Tuple of (JSON length, array bytes length)
+
+    Raises:
+        ValueError: If the message exceeds ``MAX_MESSAGE_BYTES``
+    """
+    json_length, body_length = HEADER.unpack(header)
+    if json_length + body_length > MAX_MESSAGE_BYTES:
+        raise ValueError(f"Inference message too large ({json_length + body_length} bytes)")
+    return json_length, body_length
+
+
+def decode_message(document: bytes, body: bytes) -> Any:
+    """
+    Deserialize a message, restoring numpy arrays.
+
+    Args:
+        document: JSON part
+        body: Concatenated array bytes
+
+    Returns:
+        Decoded payload
+    """
+    payload = json.loads(document)
+
+    # Arrays were written in index order, so offsets follow from a pre-pass
+    specs: list[dict[str, Any]] = []
+
+    def collect(value: Any) -> None:
+        if isinstance(value, dict):
+            if "__ndarray__" in value:
+                specs.append(value)
+            else:
+                for item in value.values():
+                    collect(item)
+        elif isinstance(value, list):
+            for item in value:
+                collect(item)
+
+    collect(payload)
+    arrays: dict[int, np.ndarray] = {}
+    offset = 0
+    for spec in sorted(specs, key=lambda s: s["__ndarray__"]):
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        arrays[spec["__ndarray__"]] = np.frombuffer(
+            body, dtype=dtype, count=count, offset=offset
+        ).reshape(spec["shape"])
+        offset += count * dtype.itemsize
+
+    def restore(value: Any) -> Any:
+        if isinstance(value, dict):
+            if "__ndarray__" in value:
+                return arrays[value["__ndarray__"]]
+            return {key: restore(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [restore(item) for item in value]
+        return value
+
+    return restore(payload)
@@ -0,0 +1,157 @@
+"""Local inference server hosting the ML models for every process on a host.
+
+Each uvicorn worker and analysis process used to import torch and load its
+own HuBERT, AST, Whisper, MiniLM and BART-MNLI. ``InferenceServer`` loads
+them once (through the model registry) and serves batched requests over a
+Unix socket. Each endpoint runs on its own thread, so different models work
+concurrently while calls to one model are serialized; the audio classifiers
+instead accept concurrent requests and micro-batch them.
+"""
+
+import asyncio
+import importlib
+import logging
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from .batching import enable_batching
+from .protocol import HEADER, decode_header, decode_message, encode_message
+
+logger = logging.getLogger(__name__)
+
+# Endpoint -> in-process implementation ("module:function"), called with the
+# request's keyword parameters
+ENDPOINTS = {
+    "classify_genre": "app.services.classification.genre_ml:classify_audio_batch",
+    "detect_instruments": "app.services.audio.instrument_detection:detect_instruments_batch",
+    "embed_text": "app.services.embeddings.generator:encode_texts",
+    "zero_shot_themes": "app.services.lyrics.theme_extractor:classify_zero_shot",
+    "transcribe": "app.services.audio.transcription:transcribe_files",
+    "batching_stats": "app.services.inference.batching:batching_stats",
+}
+
+# Endpoints that micro-batch internally: they get a thread per possible batch
+# member, so concurrent requests can meet in the batcher
+BATCHED_ENDPOINTS = {"classify_genre", "detect_instruments"}
+
+
+class InferenceServer:
+    """Asyncio Unix-socket server dispatching requests to model endpoints."""
+
+    def __init__(
+        self,
+        socket_path: str,
+        endpoints: dict[str, str] | None = None,
+        batch_concurrency: int = 8,
+    ) -> None:
+        """
+        Initialize inference server.
+
+        Args:
+            socket_path: Path of the Unix socket to listen on
+            endpoints: Endpoint name -> "module:function" implementation
+            batch_concurrency: Concurrent requests per micro-batched endpoint
+                (normally the maximum batch size)
+        """
+        self.socket_path = socket_path
+        self._endpoint_paths = dict(endpoints or ENDPOINTS)
+        self._endpoints: dict[str, Callable[..., Any]] = {}
+        self._executors = {
+            name: ThreadPoolExecutor(
+                max_workers=batch_concurrency if name in BATCHED_ENDPOINTS else 1,
+                thread_name_prefix=f"inference-{name}",
+            )
+            for name in self._endpoint_paths
+        }
+        self._server: asyncio.AbstractServer | None = None
+
+    def _endpoint(self, name: str) -> Callable[..., Any]:
+        if name not in self._endpoints:
+            path = self._endpoint_paths.get(name)
+            if path is None:
+                raise KeyError(f"Unknown inference endpoint {name!r}")
+            module_name, _, attr = path.partition(":")
+            self._endpoints[name] = getattr(importlib.import_module(module_name), attr)
+        return self._endpoints[name]
+
+    async def _dispatch(self, request: dict[str, Any]) -> dict[str, Any]:
+        method = request.get("method", "")
+        try:
+            endpoint = self._endpoint(method)
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._executors[method], lambda: endpoint(**request.get("params", {}))
+            )
+            return {"result": result, "error": None}
+        except Exception as e:
+            logger.error(f"Inference {method or '?'} failed: {e}")
+            return {"result": None, "error": str(e) or type(e).__name__}
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve requests from one client connection until it closes."""
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(HEADER.size)
+                except asyncio.IncompleteReadError:
+                    return  # Client disconnected
+                json_length, body_length = decode_header(header)
+                document = await reader.readexactly(json_length)
+                body = await reader.readexactly(body_length)
+
+                response = await self._dispatch(decode_message(document, body))
+                try:
+                    message = encode_message(response)
+                except (TypeError, ValueError) as e:
+                    message = encode_message({"result": None, "error": f"Unserializable result: {e}"})
+                writer.write(message)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError) as e:
+            logger.warning(f"Dropping inference client connection: {e}")
+        finally:
+            writer.close()
+
+    async def start(self) -> None:
+        """Listen on the socket (replacing a stale socket file)."""
+        # Requests from every process meet here, so batching can fill batches
+        enable_batching()
+
+        path = Path(self.socket_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.unlink(missing_ok=True)
+
+        self._server = await asyncio.start_unix_server(
+            self._handle_connection, path=self.socket_path
+        )
+        # Only processes running as the same user may submit requests
+        os.chmod(self.socket_path, 0o600)
+        logger.info(f"✅ Inference server listening on {self.socket_path}")
+
+    async def serve_until(self, stop: asyncio.Event) -> None:
+        """
+        Serve until ``stop`` is set, then close the socket.
+
+        Args:
+            stop: Event signalling shutdown
+        """
+        if self._server is None:
+            await self.start()
+        try:
+            await stop.wait()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stop listening and release the endpoint threads."""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        Path(self.socket_path).unlink(missing_ok=True)
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        logger.info("Inference server stopped")
@@ -0,0 +1,23 @@
+"""Per-stage latency and memory instrumentation."""
+
+from .stage_metrics import (
+    PROMETHEUS_AVAILABLE,
+    StageTiming,
+    observe_timings,
+    render_metrics,
+    stage_timer,
+    timed_await,
+    timed_call,
+    timing_breakdown,
+)
+
+__all__ = [
+    "PROMETHEUS_AVAILABLE",
+    "StageTiming",
+    "observe_timings",
+    "render_metrics",
+    "stage_timer",
+    "timed_await",
+    "timed_call",
+    "timing_breakdown",
+]
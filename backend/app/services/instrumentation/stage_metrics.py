@@ -0,0 +1,293 @@
+"""Latency, CPU and memory instrumentation of analysis stages.
+
+``stage_timer`` measures a block's wall time, CPU time and peak RSS growth.
+Inside ``timed_call`` (how the stage graph runs every stage) measurements are
+collected and handed back to the caller, so timings taken in a process-pool
+worker reach the process that exports them; outside of one they are observed
+directly. Observed timings feed Prometheus histograms labelled by stage.
+
+Peak RSS growth is how far a stage raised the process high-water mark
+(``VmHWM`` in ``/proc/self/status``). The mark is never reset, so a stage
+that stays below an earlier peak reports 0, and for stages sharing a process
+with concurrent work (thread and async stages) it is an upper bound.
+
+The API, the analysis workers and their pool processes all write metrics to
+``PROMETHEUS_MULTIPROC_DIR``, so any API process can serve all of them.
+"""
+
+import contextvars
+import logging
+import os
+import socket
+import time
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from ...core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# prometheus_client picks its storage when imported, so the shared directory
+# must be in the environment first. Spawned pool workers inherit it.
+# An empty value means per-process metrics, but prometheus_client only checks
+# that the variable exists
+if settings.PROMETHEUS_MULTIPROC_DIR:
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = settings.PROMETHEUS_MULTIPROC_DIR
+    os.makedirs(settings.PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+else:
+    os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+
+# Try to import prometheus_client (optional dependency)
+PROMETHEUS_AVAILABLE = False
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        CollectorRegistry,
+        Histogram,
+        generate_latest,
+        multiprocess,
+        values,
+    )
+
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    logger.warning(
+        "⚠️ prometheus_client not available - stage metrics are not exported. "
+        "Install with: pip install prometheus-client"
+    )
+
+if PROMETHEUS_AVAILABLE and os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    # Files are named by process id, which repeats across containers sharing
+    # the directory (every container's main process is pid 1)
+    _host = socket.gethostname()
+    values.ValueClass = values.MultiProcessValue(lambda: f"{_host}-{os.getpid()}")
+
+SECONDS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600)
+RSS_BUCKETS = tuple(float(2**n * 2**20) for n in range(4, 14))  # 16 MB .. 8 GB
+
+if PROMETHEUS_AVAILABLE:
+    STAGE_SECONDS = Histogram(
+        "tunescore_analysis_stage_seconds",
+        "Wall time of an analysis stage",
+        ["stage", "status"],
+        buckets=SECONDS_BUCKETS,
+    )
+    STAGE_CPU_SECONDS = Histogram(
+        "tunescore_analysis_stage_cpu_seconds",
+        "CPU time of an analysis stage",
+        ["stage"],
+        buckets=SECONDS_BUCKETS,
+    )
+    STAGE_PEAK_RSS_BYTES = Histogram(
+        "tunescore_analysis_stage_peak_rss_delta_bytes",
+        "Peak resident memory growth during an analysis stage",
+        ["stage"],
+        buckets=RSS_BUCKETS,
+    )
+
+
+@dataclass
+class StageTiming:
+    """Resource use of one stage run."""
+
+    stage: str
+    wall_seconds: float
+    cpu_seconds: float | None = None  # None where CPU time is not attributable
+    peak_rss_delta_bytes: int | None = None  # None where /proc is unavailable
+    status: str = "completed"
+
+
+# Timings of the enclosing timed_call, if any
+_collector: contextvars.ContextVar[list[StageTiming] | None] = contextvars.ContextVar(
+    "stage_timing_collector", default=None
+)
+
+
+def _read_status_kb(field: str) -> int | None:
+    """A memory field of /proc/self/status, in kB."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class _PeakTracker:
+    """Growth of the process RSS high-water mark over a block."""
+
+    def __init__(self) -> None:
+        self.start_kb: int | None = None
+
+    def start(self) -> None:
+        self.start_kb = _read_status_kb("VmHWM")
+
+    def stop(self) -> int | None:
+        """Growth of the high-water mark in bytes, or None if unknown."""
+        hwm = _read_status_kb("VmHWM")
+        if self.start_kb is None or hwm is None:
+            return None
+        return max(0, hwm - self.start_kb) * 1024
+
+
+@contextmanager
+def stage_timer(
+    stage: str, cpu_clock: Callable[[], float] | None = time.thread_time
+) -> Iterator[None]:
+    """
+    Measure a block as one stage.
+
+    Args:
+        stage: Stage label, e.g. "genre" or "analyzer.chords"
+        cpu_clock: CPU clock to difference (``time.process_time`` for a
+            process running one task, None for event-loop code whose CPU
+            time is shared with other tasks)
+    """
+    peak = _PeakTracker()
+    peak.start()
+    started = time.perf_counter()
+    cpu_started = cpu_clock() if cpu_clock else None
+    status = "failed"
+    try:
+        yield
+        status = "completed"
+    finally:
+        cpu_seconds = None
+        if cpu_clock is not None and cpu_started is not None:
+            cpu_seconds = cpu_clock() - cpu_started
+        timing = StageTiming(
+            stage=stage,
+            wall_seconds=time.perf_counter() - started,
+            cpu_seconds=cpu_seconds,
+            peak_rss_delta_bytes=peak.stop(),
+            status=status,
+        )
+        collected = _collector.get()
+        if collected is not None:
+            collected.append(timing)
+        else:
+            observe_timings([timing])
+
+
+def timed_call(
+    stage: str,
+    fn: Callable[..., Any],
+    /,
+    *args: Any,
+    cpu_clock: Callable[[], float] | None = time.thread_time,
+    **kwargs: Any,
+) -> tuple[Any, list[StageTiming]]:
+    """
+    Call ``fn(*args, **kwargs)`` as a stage and collect its timings.
+
+    Picklable, so it can wrap process-pool tasks. Timers nested inside
+    ``fn`` (analyzers, LLM calls) are collected too.
+
+    Args:
+        stage: Stage label
+        fn: Function to call
+        *args: Positional arguments for ``fn``
+        cpu_clock: CPU clock, see :func:`stage_timer`
+        **kwargs: Keyword arguments for ``fn``
+
+    Returns:
+        (return value of ``fn``, timings with the stage's own last)
+    """
+    collected: list[StageTiming] = []
+    token = _collector.set(collected)
+    try:
+        with stage_timer(stage, cpu_clock=cpu_clock):
+            value = fn(*args, **kwargs)
+    finally:
+        _collector.reset(token)
+    return value, collected
+
+
+async def timed_await(
+    stage: str, fn: Callable[..., Awaitable[Any]], /, **kwargs: Any
+) -> tuple[Any, list[StageTiming]]:
+    """
+    Await ``fn(**kwargs)`` as a stage and collect its timings.
+
+    CPU time is not measured: the event loop runs other tasks meanwhile.
+    Call it from its own task, so the collector stays local to the stage;
+    timers in threads started with ``asyncio.to_thread`` report to it too.
+
+    Args:
+        stage: Stage label
+        fn: Coroutine function to await
+        **kwargs: Keyword arguments for ``fn``
+
+    Returns:
+        (result of ``fn``, timings with the stage's own last)
+    """
+    collected: list[StageTiming] = []
+    token = _collector.set(collected)
+    try:
+        with stage_timer(stage, cpu_clock=None):
+            value = await fn(**kwargs)
+    finally:
+        _collector.reset(token)
+    return value, collected
+
+
+def observe_timings(timings: Iterable[StageTiming]) -> None:
+    """
+    Record timings in the Prometheus histograms.
+
+    Args:
+        timings: Stage timings
+    """
+    if not PROMETHEUS_AVAILABLE:
+        return
+    for timing in timings:
+        STAGE_SECONDS.labels(timing.stage, timing.status).observe(timing.wall_seconds)
+        if timing.cpu_seconds is not None:
+            STAGE_CPU_SECONDS.labels(timing.stage).observe(timing.cpu_seconds)
+        if timing.peak_rss_delta_bytes is not None:
+            STAGE_PEAK_RSS_BYTES.labels(timing.stage).observe(timing.peak_rss_delta_bytes)
+
+
+def timing_breakdown(timings: Iterable[StageTiming], wall_seconds: float) -> dict[str, Any]:
+    """
+    Per-upload timing summary for the ``Analysis.stage_timings`` column.
+
+    Args:
+        timings: Timings of one pipeline run
+        wall_seconds: Wall time of the whole run
+
+    Returns:
+        Dictionary with the total wall time and each stage's measurements
+    """
+    stages = {}
+    for timing in timings:
+        entry = {
+            key: round(value, 3) if isinstance(value, float) else value
+            for key, value in asdict(timing).items()
+            if key != "stage" and value is not None
+        }
+        stages[timing.stage] = entry
+    return {"wall_seconds": round(wall_seconds, 3), "stages": stages}
+
+
+def render_metrics() -> tuple[bytes, str] | None:
+    """
+    Prometheus exposition of this process's metrics.
+
+    With ``PROMETHEUS_MULTIPROC_DIR`` set, aggregates every process writing
+    to that directory (uvicorn workers, analysis workers and their pools).
+
+    Returns:
+        (payload, content type), or None without prometheus_client
+    """
+    if not PROMETHEUS_AVAILABLE:
+        return None
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -1,5 +1,6 @@
 """Lyrics acquisition orchestrator with multi-source support."""
 
+import asyncio
 import logging
 from typing import Any
 
@@ -99,7 +100,10 @@ class LyricsAcquisition:
             logger.info(f"Falling back to Whisper transcription (model: {whisper_model_size})...")
             try:
                 transcriber = get_transcriber(model_size=whisper_model_size)
-                transcription = transcriber.transcribe_lyrics(str(audio_path))
+                # Whisper is CPU-bound; keep the event loop free while it runs
+                transcription = await asyncio.to_thread(
+                    transcriber.transcribe_lyrics, str(audio_path)
+                )
                 
                 if transcription["success"] and transcription["text"]:
                     logger.info(
@@ -6,6 +6,7 @@ from typing import Any
 
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
+from ..instrumentation import stage_timer
 from .ai_lyrics_critic import critique_lyrics_with_ai
 from .ai_section_detector import analyze_sections_with_ai
 
@@ -58,14 +59,15 @@ class LyricsAnalyzer:
 
         # AI-powered lyrics critique (new ungated feature!)
         logger.info("Attempting AI-powered lyrics critique...")
-        ai_critique = critique_lyrics_with_ai(
-            lyrics,
-            track_title=track_title,
-            artist_name=artist_name,
-            sections=sections,
-            themes=themes,
-            sentiment=overall_sentiment
-        )
+        with stage_timer("llm.lyric_critique"):
+            ai_critique = critique_lyrics_with_ai(
+                lyrics,
+                track_title=track_title,
+                artist_name=artist_name,
+                sections=sections,
+                themes=themes,
+                sentiment=overall_sentiment
+            )
         if ai_critique:
             logger.info(f"✅ AI lyrics critique successful: {ai_critique.get('overall_rating', 'N/A')}/10")
         else:
@@ -110,7 +112,8 @@ class LyricsAnalyzer:
         """
         # Try AI-powered detection first (most accurate)
         logger.info("Attempting AI-powered section detection...")
-        ai_result = analyze_sections_with_ai(lyrics, track_title, artist_name)
+        with stage_timer("llm.lyric_sections"):
+            ai_result = analyze_sections_with_ai(lyrics, track_title, artist_name)
         if ai_result and "sections" in ai_result and ai_result["sections"]:
             logger.info(f"✅ AI section detection successful: {len(ai_result['sections'])} sections")
             return ai_result["sections"]
@@ -7,6 +7,9 @@ zero-shot classification models.
 import logging
 from typing import Any
 
+from ..inference import get_inference_client, run_inference
+from ..models import get_model
+
 logger = logging.getLogger(__name__)
 
 # Try to import transformers
@@ -20,6 +23,25 @@ except ImportError:
     logger.warning("⚠️ Transformers not available - theme extraction disabled")
 
 
+def load_zero_shot_pipeline(model_name: str = "facebook/bart-large-mnli") -> Any:
+    """Model registry loader for zero-shot classification pipelines."""
+    return pipeline("zero-shot-classification", model=model_name, device=-1)  # CPU
+
+
+def classify_zero_shot(
+    texts: list[str],
+    candidate_labels: list[str],
+    model_name: str = "facebook/bart-large-mnli",
+    multi_label: bool = True,
+) -> list[dict[str, Any]]:
+    """Zero-shot classify several texts in one pipeline call, in this process."""
+    if not texts:
+        return []
+    classifier = get_model("zero_shot_themes", model_name)
+    results = classifier(list(texts), candidate_labels=candidate_labels, multi_label=multi_label)
+    return results if isinstance(results, list) else [results]
+
+
 class ThemeExtractor:
     """
     Extract themes from lyrics using zero-shot classification.
@@ -94,18 +116,24 @@ class ThemeExtractor:
             model_name: HuggingFace model for zero-shot classification
         """
         self.model_name = model_name
-        self.classifier = None
-
-        if TRANSFORMERS_AVAILABLE:
-            try:
-                logger.info(f"Loading zero-shot model: {model_name}")
-                self.classifier = pipeline(
-                    "zero-shot-classification", model=model_name, device=-1  # CPU
-                )
-                logger.info("✅ Theme extraction model loaded")
-            except Exception as e:
-                logger.error(f"Failed to load theme extraction model: {e}")
-                self.classifier = None
+        self._load_failed = False
+
+    @property
+    def classifier(self) -> Any:
+        """Zero-shot pipeline from the model registry, or None if unavailable."""
+        if not TRANSFORMERS_AVAILABLE or self._load_failed:
+            return None
+        try:
+            return get_model("zero_shot_themes", self.model_name)
+        except Exception as e:
+            logger.error(f"Failed to load theme extraction model: {e}")
+            self._load_failed = True
+            return None
+
+    @property
+    def available(self) -> bool:
+        """Whether themes can be extracted (on the inference server or locally)."""
+        return get_inference_client() is not None or self.classifier is not None
 
     def extract_themes(
         self, lyrics: str, top_n: int = 5, threshold: float = 0.3
@@ -121,7 +149,7 @@ class ThemeExtractor:
         Returns:
             Dictionary with theme scores and explanations
         """
-        if not TRANSFORMERS_AVAILABLE or self.classifier is None:
+        if not self.available:
             return {
                 "available": False,
                 "error": "Theme extraction not available",
@@ -137,11 +165,14 @@ class ThemeExtractor:
 
         try:
             # Run zero-shot classification
-            result = self.classifier(
-                lyrics,
+            result = run_inference(
+                "zero_shot_themes",
+                classify_zero_shot,
+                texts=[lyrics],
                 candidate_labels=self.THEME_LABELS,
+                model_name=self.model_name,
                 multi_label=True,  # Multiple themes can apply
-            )
+            )[0]
 
             # Extract themes above threshold
             themes = {}
@@ -191,7 +222,7 @@ class ThemeExtractor:
         Returns:
             Theme breakdown by section
         """
-        if not TRANSFORMERS_AVAILABLE or self.classifier is None:
+        if not self.available:
             return {"available": False}
 
         # Simple section detection
@@ -0,0 +1,17 @@
+"""Shared loading and lifecycle management for ML models."""
+
+from .registry import (
+    MODEL_LOADERS,
+    ModelRegistry,
+    get_model,
+    get_model_registry,
+    preload_models,
+)
+
+__all__ = [
+    "MODEL_LOADERS",
+    "ModelRegistry",
+    "get_model",
+    "get_model_registry",
+    "preload_models",
+]
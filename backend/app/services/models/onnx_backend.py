@@ -0,0 +1,399 @@
+"""ONNX Runtime CPU backends for the Hugging Face audio classifiers.
+
+HuBERT (genre) and AST (instruments) run in full fp32 PyTorch by default.
+With ``GENRE_MODEL_BACKEND`` / ``INSTRUMENT_MODEL_BACKEND`` set to "onnx" or
+"onnx-int8", the model is exported to ONNX once (optionally with dynamic int8
+quantization of its MatMul/Gemm weights), cached on disk and run with
+onnxruntime's CPU execution provider.
+
+Before an exported model is used, its probabilities are compared with the
+PyTorch model on a fixed set of synthetic clips. The report is stored next to
+the artifact; if the export drifts beyond the configured tolerance the
+PyTorch pipeline is used instead.
+"""
+
+import json
+import logging
+import os
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Try to import onnxruntime (optional dependency)
+ONNXRUNTIME_AVAILABLE = False
+try:
+    import onnxruntime as ort
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    logger.warning(
+        "⚠️ onnxruntime not available - ONNX classifier backends disabled. "
+        "Install with: pip install onnxruntime onnx"
+    )
+
+MODEL_BACKENDS = ("torch", "onnx", "onnx-int8")
+
+# Bump when the export graph or quantization settings change
+EXPORT_VERSION = "1"
+
+# Operators quantized to int8: the transformer layers, where nearly all of the
+# compute is. The convolutional front ends stay fp32 (ConvInteger is slower
+# than fp32 Conv on most CPUs and costs more accuracy).
+QUANTIZED_OP_TYPES = ["MatMul", "Gemm"]
+
+FIXTURE_SECONDS = 10.0
+
+
+def _artifact_dir(model_id: str, revision: str | None) -> Path:
+    """Cache directory for one model checkpoint and export version."""
+    from ...core.config import settings
+
+    name = model_id.replace("/", "--")
+    return Path(settings.ONNX_CACHE_DIR) / f"{name}@{(revision or 'local')[:12]}" / f"v{EXPORT_VERSION}"
+
+
+def export_audio_classifier(model_id: str, path: Path) -> None:
+    """
+    Export a Hugging Face audio classifier to ONNX (logits output).
+
+    Raw-waveform models (HuBERT) get a dynamic sample axis; spectrogram
+    models (AST) pad every clip to a fixed frame count, so only the batch
+    axis is dynamic.
+
+    Args:
+        model_id: Hugging Face model ID
+        path: Output .onnx path (written atomically)
+    """
+    import torch
+    from transformers import AutoFeatureExtractor, AutoModelForAudioClassification
+
+    model = AutoModelForAudioClassification.from_pretrained(model_id).eval()
+    feature_extractor = AutoFeatureExtractor.from_pretrained(model_id)
+
+    class _Logits(torch.nn.Module):
+        def __init__(self, inner: torch.nn.Module) -> None:
+            super().__init__()
+            self.inner = inner
+
+        def forward(self, input_values: torch.Tensor) -> torch.Tensor:
+            return self.inner(input_values=input_values).logits
+
+    sr = feature_extractor.sampling_rate
+    dummy = feature_extractor(
+        [np.zeros(sr, dtype=np.float32)] * 2, sampling_rate=sr, return_tensors="pt"
+    )["input_values"]
+    input_axes = {0: "batch"} if dummy.dim() > 2 else {0: "batch", 1: "samples"}
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with torch.no_grad():
+        torch.onnx.export(
+            _Logits(model),
+            (dummy,),
+            str(tmp),
+            input_names=["input_values"],
+            output_names=["logits"],
+            dynamic_axes={"input_values": input_axes, "logits": {0: "batch"}},
+            opset_version=17,
+        )
+    os.replace(tmp, path)
+    logger.info(f"Exported {model_id} to {path}")
+
+
+def quantize_model(source: Path, path: Path) -> None:
+    """
+    Apply dynamic int8 weight quantization to an exported model.
+
+    Args:
+        source: fp32 .onnx path
+        path: Output .onnx path (written atomically)
+    """
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    quantize_dynamic(
+        str(source),
+        str(tmp),
+        weight_type=QuantType.QInt8,
+        op_types_to_quantize=QUANTIZED_OP_TYPES,
+    )
+    os.replace(tmp, path)
+    logger.info(f"Quantized {source.name} to int8 ({path.stat().st_size / 1e6:.0f} MB)")
+
+
+class OnnxAudioClassifier:
+    """
+    Drop-in replacement for a Hugging Face "audio-classification" pipeline.
+
+    Called like the pipeline: one clip returns a list of {"label", "score"}
+    dictionaries, a list of clips returns one such list per clip.
+    """
+
+    def __init__(self, model_path: Path, feature_extractor: Any, id2label: dict[int, str]) -> None:
+        """
+        Initialize classifier session.
+
+        Args:
+            model_path: Exported .onnx model
+            feature_extractor: The model's Hugging Face feature extractor
+            id2label: Class index -> label
+        """
+        from ...core.config import settings
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if settings.ONNX_INTRA_OP_THREADS:
+            options.intra_op_num_threads = settings.ONNX_INTRA_OP_THREADS
+
+        self.model_path = model_path
+        self.session = ort.InferenceSession(
+            str(model_path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.feature_extractor = feature_extractor
+        self.id2label = {int(index): label for index, label in id2label.items()}
+
+    def predict_proba(self, audios: Sequence[np.ndarray], sampling_rate: int | None = None) -> np.ndarray:
+        """
+        Class probabilities for a batch of clips.
+
+        Args:
+            audios: Mono clips at the feature extractor's sample rate
+            sampling_rate: Sample rate of the clips (validated by the
+                feature extractor)
+
+        Returns:
+            Array of shape (clips, labels)
+        """
+        features = self.feature_extractor(
+            [np.asarray(audio, dtype=np.float32) for audio in audios],
+            sampling_rate=sampling_rate or self.feature_extractor.sampling_rate,
+            padding=True,
+            return_tensors="np",
+        )
+        (logits,) = self.session.run(
+            ["logits"], {"input_values": features["input_values"].astype(np.float32)}
+        )
+        return _softmax(logits)
+
+    def __call__(
+        self,
+        inputs: np.ndarray | Sequence[np.ndarray],
+        sampling_rate: int | None = None,
+        top_k: int = 5,
+        batch_size: int | None = None,
+    ) -> list[dict[str, Any]] | list[list[dict[str, Any]]]:
+        single = isinstance(inputs, np.ndarray)
+        clips = [inputs] if single else list(inputs)
+        step = batch_size or len(clips) or 1
+        k = min(top_k, len(self.id2label))
+
+        results: list[list[dict[str, Any]]] = []
+        for start in range(0, len(clips), step):
+            for row in self.predict_proba(clips[start : start + step], sampling_rate):
+                top = np.argsort(row)[::-1][:k]
+                results.append(
+                    [{"label": self.id2label[int(i)], "score": float(row[i])} for i in top]
+                )
+        return results[0] if single else results
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return shifted / shifted.sum(axis=-1, keepdims=True)
+
+
+def fixture_clips(sampling_rate: int, seconds: float = FIXTURE_SECONDS) -> list[np.ndarray]:
+    """
+    Deterministic synthetic clips for the parity check.
+
+    They span tonal, percussive, noisy and near-silent material so that
+    quantization error shows up across the feature range, without shipping
+    audio files.
+
+    Args:
+        sampling_rate: Sample rate of the clips
+        seconds: Clip length
+
+    Returns:
+        List of mono float32 clips
+    """
+    rng = np.random.default_rng(20240611)
+    t = np.arange(int(sampling_rate * seconds)) / sampling_rate
+
+    chord = sum(np.sin(2 * np.pi * f * t) for f in (220.0, 277.18, 329.63)) / 3
+    vibrato = np.sin(2 * np.pi * 440.0 * t + 3.0 * np.sin(2 * np.pi * 5.5 * t))
+    harmonics = sum(np.sin(2 * np.pi * 110.0 * n * t) / n for n in range(1, 12)) / 3
+
+    clicks = np.zeros_like(t)
+    beat = int(sampling_rate * 0.5)
+    decay = np.exp(-np.arange(beat // 4) / (sampling_rate * 0.01))
+    for start in range(0, len(t) - len(decay), beat):
+        clicks[start : start + len(decay)] += decay * rng.standard_normal(len(decay))
+    clicks /= np.abs(clicks).max() + 1e-9
+
+    white = rng.standard_normal(len(t)) * 0.3
+    pink = np.fft.irfft(np.fft.rfft(white) / np.maximum(1.0, np.sqrt(np.arange(len(t) // 2 + 1))), n=len(t))
+
+    clips = [
+        0.5 * chord,
+        0.5 * vibrato,
+        0.4 * harmonics,
+        0.6 * clicks,
+        white,
+        pink / (np.abs(pink).max() + 1e-9) * 0.5,
+        0.3 * chord + 0.3 * clicks + 0.05 * white,
+        0.001 * rng.standard_normal(len(t)),
+    ]
+    return [clip.astype(np.float32) for clip in clips]
+
+
+@dataclass
+class ParityReport:
+    """Agreement between an exported model and the PyTorch reference."""
+
+    backend: str
+    clips: int
+    top1_agreement: float
+    max_abs_diff: float
+    mean_abs_diff: float
+    passed: bool
+
+
+def check_parity(
+    model_id: str,
+    classifier: OnnxAudioClassifier,
+    backend: str,
+    clips: Sequence[np.ndarray] | None = None,
+) -> ParityReport:
+    """
+    Compare exported-model probabilities with the PyTorch model.
+
+    Args:
+        model_id: Hugging Face model ID of the reference
+        classifier: Exported classifier under test
+        backend: Backend name recorded in the report
+        clips: Audio at the feature extractor's rate (default: ``fixture_clips``)
+
+    Returns:
+        Parity report; ``passed`` applies ``ONNX_PARITY_MAX_DIFF`` and
+        ``ONNX_PARITY_MIN_TOP1``
+    """
+    import torch
+    from transformers import AutoModelForAudioClassification
+
+    from ...core.config import settings
+
+    sr = classifier.feature_extractor.sampling_rate
+    clips = list(clips) if clips is not None else fixture_clips(sr)
+
+    reference_model = AutoModelForAudioClassification.from_pretrained(model_id).eval()
+    expected = []
+    for clip in clips:
+        features = classifier.feature_extractor(clip, sampling_rate=sr, return_tensors="pt")
+        with torch.no_grad():
+            logits = reference_model(input_values=features["input_values"]).logits
+        expected.append(_softmax(logits.numpy())[0])
+    del reference_model
+
+    actual = np.concatenate([classifier.predict_proba([clip], sr) for clip in clips])
+    expected_array = np.stack(expected)
+
+    diff = np.abs(actual - expected_array)
+    top1 = float(np.mean(actual.argmax(axis=1) == expected_array.argmax(axis=1)))
+    max_diff = float(diff.max())
+    return ParityReport(
+        backend=backend,
+        clips=len(clips),
+        top1_agreement=round(top1, 4),
+        max_abs_diff=round(max_diff, 6),
+        mean_abs_diff=round(float(diff.mean()), 6),
+        passed=max_diff <= settings.ONNX_PARITY_MAX_DIFF and top1 >= settings.ONNX_PARITY_MIN_TOP1,
+    )
+
+
+def load_onnx_classifier(model_id: str, backend: str, verify: bool = True) -> OnnxAudioClassifier:
+    """
+    Load (exporting on first use) an ONNX classifier, checking parity once.
+
+    Args:
+        model_id: Hugging Face model ID
+        backend: "onnx" or "onnx-int8"
+        verify: Run the parity check if no stored report exists
+
+    Returns:
+        Classifier instance
+
+    Raises:
+        RuntimeError: If onnxruntime is missing or the export fails parity
+    """
+    if not ONNXRUNTIME_AVAILABLE:
+        raise RuntimeError("onnxruntime is not installed")
+
+    from transformers import AutoConfig, AutoFeatureExtractor
+
+    config = AutoConfig.from_pretrained(model_id)
+    directory = _artifact_dir(model_id, getattr(config, "_commit_hash", None))
+    fp32_path = directory / "model.onnx"
+    if not fp32_path.exists():
+        export_audio_classifier(model_id, fp32_path)
+
+    model_path = fp32_path
+    if backend == "onnx-int8":
+        model_path = directory / "model.int8.onnx"
+        if not model_path.exists():
+            quantize_model(fp32_path, model_path)
+
+    classifier = OnnxAudioClassifier(
+        model_path, AutoFeatureExtractor.from_pretrained(model_id), config.id2label
+    )
+
+    report_path = directory / f"parity.{backend}.json"
+    if report_path.exists():
+        report = json.loads(report_path.read_text())
+    elif verify:
+        report = asdict(check_parity(model_id, classifier, backend))
+        report_path.write_text(json.dumps(report, indent=2))
+        logger.info(f"ONNX parity for {model_id} ({backend}): {report}")
+    else:
+        report = None
+
+    if report is not None and not report["passed"]:
+        raise RuntimeError(
+            f"{backend} export of {model_id} failed the parity check "
+            f"(max diff {report['max_abs_diff']}, top-1 agreement {report['top1_agreement']})"
+        )
+    return classifier
+
+
+def load_audio_classifier(model_id: str, backend: str = "torch") -> Any:
+    """
+    Load an audio classifier on the configured backend.
+
+    Falls back to the PyTorch pipeline when the ONNX backend cannot be used.
+
+    Args:
+        model_id: Hugging Face model ID
+        backend: One of ``MODEL_BACKENDS``
+
+    Returns:
+        Pipeline-compatible classifier
+    """
+    from ...core.config import settings
+
+    if backend not in MODEL_BACKENDS:
+        logger.warning(f"⚠️ Unknown model backend {backend!r} for {model_id}; using torch")
+    elif backend != "torch":
+        try:
+            classifier = load_onnx_classifier(model_id, backend, verify=settings.ONNX_PARITY_CHECK)
+            logger.info(f"✅ Loaded {model_id} with the {backend} backend")
+            return classifier
+        except Exception as e:
+            logger.warning(f"⚠️ {backend} backend unavailable for {model_id} ({e}); using torch")
+
+    from transformers import pipeline
+
+    return pipeline("audio-classification", model=model_id)
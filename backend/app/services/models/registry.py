@@ -0,0 +1,343 @@
+"""Process-wide registry for heavy ML models.
+
+Every model used to be loaded lazily by its own service (Whisper, HuBERT,
+AST, MiniLM, BART-MNLI, DistilBART, Demucs), so the first request needing it
+paid tens of seconds and nothing bounded how many stayed resident.
+``ModelRegistry`` loads models through named loaders, can preload a
+configured set at startup, reports each model's memory, and evicts the
+least recently used models when a RAM budget is exceeded.
+
+Services must fetch their model from the registry on every use rather than
+keeping their own reference, otherwise eviction cannot free it.
+"""
+
+import gc
+import importlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Model name -> "module:function". Loaders take the model's arguments
+# (e.g. a checkpoint name) and return the loaded model.
+MODEL_LOADERS = {
+    "whisper": "app.services.audio.transcription:load_whisper_model",
+    "faster_whisper": "app.services.audio.transcription_backends:load_faster_whisper_model",
+    "genre_hubert": "app.services.classification.genre_ml:load_genre_pipeline",
+    "instrument_ast": "app.services.audio.instrument_detection:load_instrument_pipeline",
+    "sentence_embeddings": "app.services.embeddings.generator:load_sentence_model",
+    "zero_shot_themes": "app.services.lyrics.theme_extractor:load_zero_shot_pipeline",
+    "news_summarizer": "app.industry_snapshot.ai_digest:load_summarizer_pipeline",
+    "demucs": "app.services.audio.stem_separator:load_demucs_model",
+}
+
+
+def _rss_bytes() -> int:
+    """Resident set size of this process (0 where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _parameter_bytes(model: Any) -> int:
+    """Bytes held by the parameters and buffers of a torch-backed model."""
+    try:
+        import torch
+    except ImportError:
+        return 0
+
+    # The model itself, or the network inside a Hugging Face pipeline
+    for module in (model, getattr(model, "model", None)):
+        if isinstance(module, torch.nn.Module):
+            return sum(
+                tensor.numel() * tensor.element_size()
+                for tensor in (*module.parameters(), *module.buffers())
+            )
+    return 0
+
+
+@dataclass
+class LoadedModel:
+    """A resident model and its bookkeeping."""
+
+    key: tuple[str, ...]
+    model: Any
+    memory_bytes: int
+    memory_source: str  # "parameters" or "rss"
+    load_seconds: float
+    last_used: float = field(default_factory=time.time)
+    uses: int = 0
+
+
+class ModelRegistry:
+    """
+    Named, memoized model loading with an LRU memory budget.
+
+    Models are keyed by name plus loader arguments, so ``("whisper", "small")``
+    and ``("whisper", "medium")`` are separate entries.
+    """
+
+    def __init__(
+        self,
+        loaders: dict[str, str | Callable[..., Any]] | None = None,
+        memory_budget_bytes: int | None = None,
+    ) -> None:
+        """
+        Initialize model registry (nothing is loaded until requested).
+
+        Args:
+            loaders: Model name -> loader callable or "module:function" path
+            memory_budget_bytes: Evict least recently used models above this
+                total (None = unlimited)
+        """
+        self._loaders: dict[str, str | Callable[..., Any]] = dict(loaders or MODEL_LOADERS)
+        self.memory_budget_bytes = memory_budget_bytes
+        self._models: OrderedDict[tuple[str, ...], LoadedModel] = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: dict[tuple[str, ...], threading.Lock] = {}
+
+    def register(self, name: str, loader: str | Callable[..., Any]) -> None:
+        """
+        Register or replace a model loader.
+
+        Args:
+            name: Model name
+            loader: Loader callable or "module:function" path
+        """
+        self._loaders[name] = loader
+
+    def _resolve_loader(self, name: str) -> Callable[..., Any]:
+        loader = self._loaders.get(name)
+        if loader is None:
+            raise KeyError(f"Unknown model {name!r}; registered: {sorted(self._loaders)}")
+        if isinstance(loader, str):
+            module_name, _, attr = loader.partition(":")
+            loader = getattr(importlib.import_module(module_name), attr)
+            self._loaders[name] = loader
+        return loader
+
+    def get(self, name: str, *args: str) -> Any:
+        """
+        Return a model, loading it on first use.
+
+        Concurrent callers for the same model wait for a single load.
+
+        Args:
+            name: Model name
+            *args: Loader arguments (e.g. checkpoint or size)
+
+        Returns:
+            Loaded model
+        """
+        key = (name, *args)
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                return self._touch(entry)
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                entry = self._models.get(key)
+                if entry is not None:
+                    return self._touch(entry)
+
+            entry = self._load(key)
+            with self._lock:
+                self._models[key] = entry
+                self._touch(entry)
+                self._evict_over_budget(keep=key)
+            return entry.model
+
+    def _touch(self, entry: LoadedModel) -> Any:
+        entry.last_used = time.time()
+        entry.uses += 1
+        self._models.move_to_end(entry.key)
+        return entry.model
+
+    def _load(self, key: tuple[str, ...]) -> LoadedModel:
+        name, *args = key
+        loader = self._resolve_loader(name)
+        label = ":".join(key)
+
+        logger.info(f"Loading model {label}")
+        rss_before = _rss_bytes()
+        started = time.perf_counter()
+        model = loader(*args)
+        load_seconds = time.perf_counter() - started
+
+        memory_bytes = _parameter_bytes(model)
+        memory_source = "parameters"
+        if not memory_bytes:
+            memory_bytes = max(0, _rss_bytes() - rss_before)
+            memory_source = "rss"
+
+        logger.info(
+            f"✅ Model {label} loaded in {load_seconds:.1f}s "
+            f"({memory_bytes / 2**20:.0f} MB, {memory_source})"
+        )
+        return LoadedModel(key, model, memory_bytes, memory_source, load_seconds)
+
+    def _evict_over_budget(self, keep: tuple[str, ...]) -> None:
+        """Drop least recently used models until within budget (lock held)."""
+        if not self.memory_budget_bytes:
+            return
+
+        evicted = False
+        while self.total_bytes > self.memory_budget_bytes:
+            victim = next((k for k in self._models if k != keep), None)
+            if victim is None:
+                break
+            freed = self._models.pop(victim).memory_bytes
+            evicted = True
+            logger.info(
+                f"Evicted model {':'.join(victim)} ({freed / 2**20:.0f} MB) "
+                f"to stay within the model memory budget"
+            )
+
+        # Weights are freed once callers drop their references; collect
+        # any reference cycles (common in HF pipelines) now
+        if evicted:
+            gc.collect()
+
+    @property
+    def total_bytes(self) -> int:
+        """Memory attributed to the resident models."""
+        return sum(entry.memory_bytes for entry in self._models.values())
+
+    def evict(self, name: str, *args: str) -> bool:
+        """
+        Unload a model.
+
+        Args:
+            name: Model name
+            *args: Loader arguments it was loaded with
+
+        Returns:
+            Whether the model was resident
+        """
+        with self._lock:
+            resident = self._models.pop((name, *args), None) is not None
+        if resident:
+            gc.collect()
+        return resident
+
+    def preload(self, specs: Iterable[str]) -> list[str]:
+        """
+        Load models ahead of the first request.
+
+        Args:
+            specs: Model specs, "name" or "name:arg[:arg...]"
+
+        Returns:
+            Specs that failed to load
+        """
+        failed = []
+        for spec in specs:
+            name, *args = spec.split(":")
+            try:
+                self.get(name, *args)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not preload model {spec}: {e}")
+                failed.append(spec)
+        return failed
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Report resident models, most recently used last.
+
+        Returns:
+            Dictionary with per-model memory/usage and the budget
+        """
+        with self._lock:
+            models = [
+                {
+                    "model": ":".join(entry.key),
+                    "memory_mb": round(entry.memory_bytes / 2**20, 1),
+                    "memory_source": entry.memory_source,
+                    "load_seconds": round(entry.load_seconds, 2),
+                    "uses": entry.uses,
+                    "idle_seconds": round(time.time() - entry.last_used, 1),
+                }
+                for entry in self._models.values()
+            ]
+            total = self.total_bytes
+        return {
+            "models": models,
+            "total_mb": round(total / 2**20, 1),
+            "budget_mb": round(self.memory_budget_bytes / 2**20, 1)
+            if self.memory_budget_bytes
+            else None,
+            "process_rss_mb": round(_rss_bytes() / 2**20, 1),
+        }
+
+
+# Singleton instance (lazy-loaded)
+_registry_instance: ModelRegistry | None = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """
+    Get the process-wide model registry.
+
+    Returns:
+        Registry instance
+    """
+    global _registry_instance
+
+    from ...core.config import settings
+
+    if _registry_instance is None:
+        _registry_instance = ModelRegistry(
+            memory_budget_bytes=settings.MODEL_MEMORY_BUDGET_MB * 2**20 or None,
+        )
+    return _registry_instance
+
+
+def get_model(name: str, *args: str) -> Any:
+    """
+    Fetch a model from the process-wide registry.
+
+    Args:
+        name: Model name (see ``MODEL_LOADERS``)
+        *args: Loader arguments
+
+    Returns:
+        Loaded model
+    """
+    return get_model_registry().get(name, *args)
+
+
+def preload_models(before_fork: bool = False) -> list[str]:
+    """
+    Load the models listed in ``MODEL_PRELOAD``.
+
+    With ``before_fork`` the loaded objects are moved to the GC's permanent
+    generation, so collections in forked workers never write to their pages
+    and the weights stay shared copy-on-write.
+
+    Args:
+        before_fork: Called in a server master process that forks workers
+
+    Returns:
+        Specs that failed to load
+    """
+    from ...core.config import settings
+
+    specs = settings.model_preload
+    if not specs:
+        return []
+
+    failed = get_model_registry().preload(specs)
+    if before_fork:
+        gc.collect()
+        gc.freeze()
+    return failed
@@ -0,0 +1,41 @@
+"""Track analysis pipeline and its job queue."""
+
+from .analysis import PIPELINE_STAGES, run_analysis_pipeline, run_preview_analysis
+from .dedup import (
+    DuplicateMatch,
+    clone_analysis,
+    deduplicate_upload,
+    find_by_content_hash,
+    find_duplicate,
+    fingerprint_upload,
+    index_fingerprint,
+    reused_audio_features,
+)
+from .queue import (
+    JOB_STAGES,
+    JobClaimLost,
+    JobProgress,
+    claim_next_job,
+    enqueue_analysis_job,
+    run_analysis_job,
+)
+
+__all__ = [
+    "JOB_STAGES",
+    "PIPELINE_STAGES",
+    "DuplicateMatch",
+    "JobClaimLost",
+    "JobProgress",
+    "claim_next_job",
+    "clone_analysis",
+    "deduplicate_upload",
+    "enqueue_analysis_job",
+    "find_by_content_hash",
+    "find_duplicate",
+    "fingerprint_upload",
+    "index_fingerprint",
+    "reused_audio_features",
+    "run_analysis_job",
+    "run_analysis_pipeline",
+    "run_preview_analysis",
+]
@@ -0,0 +1,603 @@
+"""Full track analysis pipeline.
+
+Runs every analysis stage for an uploaded track and stages the results on the
+given database session. Used by the analysis worker for queued jobs and by the
+upload endpoint when the queue is disabled.
+
+Stages form a :class:`~.dag.StageGraph`: audio analyzers, lyrics lookup and
+LLM calls that do not depend on each other run concurrently, and database
+writes happen once the graph is done. The wall time, CPU time and peak memory
+of every stage, analyzer and LLM call are stored on the analysis row.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...models import Analysis, PitchCopy, Track, TrackAsset, TrackTags
+from ..ai_enhancement import (
+    explain_genre_with_ai,
+    explain_hooks_with_ai,
+    predict_breakout_with_ai,
+)
+from ..ai_tagging.mood_classifier import MoodClassifier
+from ..ai_tagging.pitch_generator import PitchGenerator
+from ..audio.context import AudioContext
+from ..audio.feature_extraction import (
+    AudioFeatureExtractor,
+    analyze_audio,
+    use_streaming_analysis,
+)
+from ..audio.overview import ensure_overview
+from ..audio.preview import PROVISIONAL_FIELDS, analyze_preview
+from ..audio.renditions import create_hook_clips, create_stream_rendition
+from ..audio.streaming import probe_duration
+from ..audio.transcription import get_transcriber
+from ..classification import detect_genre, detect_genre_hybrid
+from ..compute import run_cpu_bound
+from ..embeddings.search import create_embedding_for_track
+from ..instrumentation import stage_timer, timing_breakdown
+from ..lyrics.acquisition import LyricsAcquisition
+from ..lyrics.analysis import LyricsAnalyzer
+from ..scoring import calculate_tunescore
+from .dag import ProgressCallback, Stage, StageGraph
+from .dedup import reused_audio_features
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages, as reported by /tracks/{id}/status (independent stages
+# run concurrently, so several can be running at once)
+PIPELINE_STAGES = (
+    "audio_features",
+    "stream_rendition",
+    "hook_clips",
+    "lyrics_acquisition",
+    "lyrics_verification",
+    "lyrical_analysis",
+    "tunescore",
+    "genre",
+    "embedding",
+    "tags",
+    "pitch",
+    "ai_enhancements",
+)
+
+
+def _analyze_audio(audio_path: str) -> dict[str, Any]:
+    """
+    Process-pool entry point for the audio stage.
+
+    Every analyzer and the waveform/spectrogram overview run on one decoded
+    context, so the file is decoded and its STFT and beats computed once.
+    """
+    ctx = None
+    if not use_streaming_analysis(audio_path):
+        ctx = AudioContext(audio_path, sample_rate=AudioFeatureExtractor().sample_rate)
+    result = analyze_audio(ctx or audio_path)
+    try:
+        with stage_timer("analyzer.overview"):
+            ensure_overview(audio_path, ctx=ctx)
+    except Exception as e:
+        logger.warning(f"Waveform/spectrogram overview failed for {audio_path}: {e}")
+    return result
+
+
+def _analyze_lyrical_genome(
+    lyrics_acquisition: dict[str, Any], track_title: str, artist_name: str | None
+) -> dict[str, Any]:
+    """Process-pool entry point for the lyrical analysis stage."""
+    return LyricsAnalyzer().analyze_lyrics(
+        lyrics_acquisition["text"], track_title=track_title, artist_name=artist_name or ""
+    )
+
+
+def _detect_genre(
+    audio_features: dict[str, Any] | None,
+    lyrical_analysis: dict[str, Any] | None,
+    audio_path: str | None,
+) -> dict[str, Any]:
+    """Process-pool entry point for the genre stage (hybrid, else heuristic)."""
+    sonic_genome = (audio_features or {}).get("sonic_genome") or {}
+    try:
+        return detect_genre_hybrid(audio_path, sonic_genome, lyrical_analysis)
+    except Exception as exc:  # pragma: no cover - resilience
+        logger.warning(f"Hybrid genre detection failed, falling back: {exc}")
+        return detect_genre(sonic_genome, lyrical_analysis)
+
+
+def _call_llm(name: str, fn: Callable[..., Any], **kwargs: Any) -> Any:
+    """Run one blocking LLM call under its own stage timer."""
+    with stage_timer(f"llm.{name}"):
+        return fn(**kwargs)
+
+
+async def run_preview_analysis(
+    db: AsyncSession, track: Track, track_asset: TrackAsset
+) -> Analysis:
+    """
+    Stage a provisional analysis computed from a short excerpt.
+
+    Takes a few seconds instead of minutes, so the analysis worker commits
+    it before starting the full pipeline and a provisional TuneScore shows
+    up right away; ``run_analysis_pipeline`` later refines the same row in
+    place. The caller owns the transaction and must commit.
+
+    Args:
+        db: Database session
+        track: Track being analyzed
+        track_asset: Track asset with the audio path
+
+    Returns:
+        The provisional analysis, with ``provisional_fields`` set
+    """
+    logger.info(f"Starting preview analysis for track {track.id}")
+    preview = await run_cpu_bound(analyze_preview, str(track_asset.audio_path))
+
+    sonic_genome = {**preview["sonic_genome"], "preview_excerpt": preview["excerpt"]}
+    hook_data = preview["hook_data"]
+    # No lyrics yet: the lyric component uses its neutral default
+    tunescore_data = calculate_tunescore(sonic_genome, None, hook_data)
+
+    track.duration = sonic_genome.get("duration")
+    analysis = Analysis(
+        track_id=track.id,
+        sonic_genome=sonic_genome,
+        hook_data=hook_data,
+        tunescore=tunescore_data,
+        provisional_fields=list(PROVISIONAL_FIELDS),
+    )
+    db.add(analysis)
+    await db.flush()
+    logger.info(
+        f"✅ Provisional TuneScore for track {track.id}: {tunescore_data.get('overall_score')}"
+    )
+    return analysis
+
+
+async def _provisional_analysis(db: AsyncSession, track_id: int) -> Analysis | None:
+    """Latest preview analysis of a track still awaiting the full pipeline."""
+    result = await db.execute(
+        select(Analysis)
+        .where(Analysis.track_id == track_id, Analysis.provisional_fields.isnot(None))
+        .order_by(Analysis.created_at.desc())
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def run_analysis_pipeline(
+    db: AsyncSession,
+    track: Track,
+    track_asset: TrackAsset,
+    artist_name: str | None = None,
+    verify_lyrics: bool = False,
+    progress: ProgressCallback | None = None,
+    reuse_audio_from: int | None = None,
+) -> dict[str, Any]:
+    """
+    Analyze an uploaded track and stage the results on ``db``.
+
+    A provisional preview analysis of the track, if any, is refined in
+    place rather than superseded by a new row. CPU-bound analyzers run in
+    the analysis process pool and blocking transcription/LLM calls in
+    threads, so the caller's event loop stays responsive. The caller owns
+    the transaction and must commit.
+
+    Args:
+        db: Database session
+        track: Track being analyzed
+        track_asset: Track asset with the audio path and any provided lyrics
+        artist_name: Artist name for lyrics lookup and AI context
+        verify_lyrics: Verify user-provided lyrics against a transcription
+        progress: Optional stage progress callback
+        reuse_audio_from: Analyzed track with the same audio (usually
+            another user's) whose audio analysis replaces the audio stage;
+            lyrics-derived stages still run
+
+    Returns:
+        Dictionary with the created analysis, lyrics transcription info and
+        Phase 2 AI cost
+    """
+    from ...core.config import settings
+
+    started = time.perf_counter()
+    audio_path = str(track_asset.audio_path) if track_asset.audio_path else None
+    provided_lyrics = track_asset.lyrics_text
+    cpu_timeout = settings.ANALYSIS_TIMEOUT or None
+    io_timeout = settings.ANALYSIS_IO_TIMEOUT or None
+
+    def features(audio_features: dict[str, Any] | None) -> dict[str, Any]:
+        return audio_features or {}
+
+    # Lyrics acquisition using multi-source orchestrator
+    async def acquire_lyrics() -> dict[str, Any]:
+        # Read from the header so the lookup does not wait for audio analysis
+        duration = await asyncio.to_thread(probe_duration, audio_path) if audio_path else None
+        lyrics_result = await LyricsAcquisition().get_lyrics(
+            audio_path=audio_path,
+            track_title=track.title,
+            artist_name=artist_name,
+            duration=duration,
+            provided_lyrics=provided_lyrics,
+        )
+
+        # Update track asset with lyrics provenance
+        track_asset.lyrics_text = lyrics_result["text"] if lyrics_result["success"] else None
+        track_asset.lyrics_source = lyrics_result["source"]
+        track_asset.lyrics_confidence = lyrics_result["confidence"]
+        track_asset.lyrics_language = lyrics_result.get("language")
+        track_asset.lyrics_metadata = lyrics_result.get("metadata", {})
+        return lyrics_result
+
+    def has_lyrics(values: dict[str, Any]) -> bool:
+        lyrics_result = values["lyrics_acquisition"]
+        return bool(lyrics_result and lyrics_result["success"] and lyrics_result["text"])
+
+    # Verify user-provided lyrics if requested
+    def should_verify(values: dict[str, Any]) -> bool:
+        return (
+            verify_lyrics
+            and bool(audio_path)
+            and has_lyrics(values)
+            and values["lyrics_acquisition"]["source"] == "user"
+        )
+
+    def verify(lyrics_acquisition: dict[str, Any]) -> None:
+        logger.info(f"Verifying user-provided lyrics for track {track.id}")
+        transcriber = get_transcriber()
+        result = transcriber.transcribe_lyrics(audio_path)
+        if result["success"] and result["text"]:
+            comparison = transcriber.compare_lyrics(lyrics_acquisition["text"], result["text"])
+            logger.info(
+                f"Lyrics verification complete. Similarity: {comparison['similarity_score']:.2f}"
+            )
+
+    def score(
+        audio_features: dict[str, Any] | None, lyrical_analysis: dict[str, Any] | None
+    ) -> dict[str, Any]:
+        logger.info(f"Calculating TuneScore for track {track.id}")
+        core = features(audio_features)
+        return calculate_tunescore(
+            core.get("sonic_genome") or {}, lyrical_analysis, core.get("hook_data")
+        )
+
+    # ===== UNGATED AI FEATURES =====
+    def generate_tags(
+        audio_features: dict[str, Any] | None, lyrical_analysis: dict[str, Any] | None
+    ) -> dict[str, Any]:
+        logger.info(f"Generating AI tags for track {track.id}")
+        sonic_genome = features(audio_features).get("sonic_genome") or {}
+        classifier = MoodClassifier()
+        mood_data = classifier.classify(sonic_genome, lyrical_analysis)
+        commercial_tags = classifier.classify_commercial_tags(sonic_genome)
+        logger.info(
+            f"✅ Tags generated: {len(mood_data.get('moods', []))} moods, "
+            f"{len(commercial_tags)} commercial tags"
+        )
+        return {
+            "moods": mood_data.get("moods", []),
+            "commercial_tags": commercial_tags,
+            "use_cases": mood_data.get("use_cases", []),
+            "sounds_like": mood_data.get("sounds_like", []),
+        }
+
+    def generate_pitch(
+        audio_features: dict[str, Any] | None,
+        lyrical_analysis: dict[str, Any] | None,
+        tags: dict[str, Any] | None,
+    ) -> dict[str, Any] | None:
+        logger.info(f"Generating AI pitch copy for track {track.id}")
+        try:
+            return PitchGenerator().generate_pitch(
+                track_title=track.title,
+                artist_name=artist_name,
+                sonic_genome=features(audio_features).get("sonic_genome") or {},
+                lyrical_genome=lyrical_analysis,
+                tags={
+                    "moods": tags["moods"],
+                    "commercial_tags": tags["commercial_tags"],
+                    "sounds_like": tags["sounds_like"],
+                }
+                if tags
+                else None,
+            )
+        except ValueError as e:
+            logger.warning(f"Pitch generation unavailable (no AI key): {e}")
+            return None
+
+    # ===== PHASE 2: AI-ENHANCED HEURISTICS =====
+    async def enhance(
+        audio_features: dict[str, Any] | None,
+        lyrical_analysis: dict[str, Any] | None,
+        tunescore: dict[str, Any] | None,
+        genre: dict[str, Any] | None,
+        tags: dict[str, Any] | None,
+    ) -> dict[str, Any]:
+        core = features(audio_features)
+        sonic_genome = core.get("sonic_genome")
+        hook_data = core.get("hook_data")
+
+        async def explain_genre() -> dict[str, Any] | None:
+            logger.info(f"Generating AI genre reasoning for track {track.id}")
+            return await asyncio.to_thread(
+                _call_llm,
+                "genre_reasoning",
+                explain_genre_with_ai,
+                track_title=track.title,
+                artist_name=artist_name,
+                sonic_genome=sonic_genome,
+                genre_predictions=genre,
+                lyrical_themes=lyrical_analysis.get("themes", []) if lyrical_analysis else None,
+            )
+
+        async def explain_hooks() -> dict[str, Any] | None:
+            logger.info(f"Generating AI hook explanation for track {track.id}")
+            return await asyncio.to_thread(
+                _call_llm,
+                "hook_explanation",
+                explain_hooks_with_ai,
+                track_title=track.title,
+                hook_data=hook_data,
+                lyrical_sections=lyrical_analysis.get("sections", []) if lyrical_analysis else None,
+                sonic_genome=sonic_genome,
+            )
+
+        async def predict_breakout() -> dict[str, Any] | None:
+            logger.info(f"Generating AI breakout prediction for track {track.id}")
+            top_genres = genre.get("top_genres") if genre else None
+            primary_genre = top_genres[0].get("genre", "Unknown") if top_genres else "Unknown"
+            return await asyncio.to_thread(
+                _call_llm,
+                "breakout_prediction",
+                predict_breakout_with_ai,
+                track_title=track.title,
+                artist_name=artist_name,
+                tunescore=tunescore,
+                genre=primary_genre,
+                moods=tags["moods"] if tags else [],
+                hook_strength=hook_data.get("hook_strength", 0.5) if hook_data else 0.5,
+                track_duration=sonic_genome.get("duration", None) if sonic_genome else None,
+            )
+
+        # The three LLM calls are independent of each other
+        calls = {}
+        if genre and sonic_genome:
+            calls["genre_reasoning"] = explain_genre()
+        if hook_data:
+            calls["hook_explanation"] = explain_hooks()
+        if tunescore and genre:
+            calls["breakout_prediction"] = predict_breakout()
+
+        ai_enhancements: dict[str, Any] = {}
+        results = await asyncio.gather(*calls.values(), return_exceptions=True)
+        for name, result in zip(calls, results, strict=True):
+            if isinstance(result, Exception):
+                logger.error(f"AI {name.replace('_', ' ')} failed: {result}")
+            elif result:
+                ai_enhancements[name] = result
+                logger.info(f"✅ AI {name.replace('_', ' ')}: ${result.get('cost', 0):.4f}")
+        return ai_enhancements
+
+    # All audio analyzers and the waveform/spectrogram overview, on one
+    # decode, unless a duplicate's audio analysis can be reused
+    reused_audio = None
+    if reuse_audio_from is not None:
+        reused_audio = await reused_audio_features(db, reuse_audio_from)
+    if reused_audio is not None:
+        logger.info(f"Track {track.id} reuses the audio analysis of track {reuse_audio_from}")
+
+        async def reuse_audio() -> dict[str, Any]:
+            return reused_audio
+
+        audio_stage = Stage("audio_features", reuse_audio)
+    else:
+        audio_stage = Stage(
+            "audio_features",
+            functools.partial(_analyze_audio, audio_path),
+            kind="cpu",
+            timeout=cpu_timeout,
+        )
+
+    graph = StageGraph(
+        [
+            audio_stage,
+            # Small AAC rendition for playback, and clips of the top hooks
+            Stage(
+                "stream_rendition",
+                functools.partial(create_stream_rendition, audio_path),
+                kind="cpu",
+                timeout=cpu_timeout,
+            ),
+            Stage(
+                "hook_clips",
+                functools.partial(create_hook_clips, audio_path),
+                inputs=("audio_features",),
+                kind="cpu",
+                timeout=cpu_timeout,
+            ),
+            # May fall back to a Whisper transcription, so CPU-sized timeout
+            Stage("lyrics_acquisition", acquire_lyrics, timeout=cpu_timeout, critical=True),
+            Stage(
+                "lyrics_verification",
+                verify,
+                inputs=("lyrics_acquisition",),
+                kind="thread",
+                timeout=cpu_timeout,
+                when=should_verify,
+            ),
+            Stage(
+                "lyrical_analysis",
+                functools.partial(
+                    _analyze_lyrical_genome, track_title=track.title, artist_name=artist_name
+                ),
+                inputs=("lyrics_acquisition",),
+                kind="cpu",
+                timeout=cpu_timeout,
+                when=has_lyrics,
+            ),
+            Stage(
+                "tunescore",
+                score,
+                inputs=("audio_features", "lyrical_analysis"),
+                kind="thread",
+                critical=True,
+            ),
+            # Hybrid genre detection (ML + instruments + heuristics)
+            Stage(
+                "genre",
+                functools.partial(_detect_genre, audio_path=audio_path),
+                inputs=("audio_features", "lyrical_analysis"),
+                kind="cpu",
+                timeout=cpu_timeout,
+                critical=True,
+            ),
+            Stage(
+                "tags",
+                generate_tags,
+                inputs=("audio_features", "lyrical_analysis"),
+                kind="thread",
+            ),
+            Stage(
+                "pitch",
+                generate_pitch,
+                inputs=("audio_features", "lyrical_analysis", "tags"),
+                kind="thread",
+                timeout=io_timeout,
+            ),
+            Stage(
+                "ai_enhancements",
+                enhance,
+                inputs=(
+                    "audio_features",
+                    "lyrical_analysis",
+                    "tunescore",
+                    "genre",
+                    "tags",
+                ),
+                timeout=io_timeout,
+            ),
+        ]
+    )
+
+    logger.info(f"Starting analysis for track {track.id}")
+    outcomes = await graph.run(progress, label=f"track {track.id}")
+    results = {name: outcome.value for name, outcome in outcomes.items()}
+
+    core = features(results["audio_features"])
+    sonic_genome = core.get("sonic_genome")
+    hook_data = core.get("hook_data")
+    if sonic_genome:
+        track.duration = sonic_genome.get("duration")
+
+    lyrics_result = results["lyrics_acquisition"]
+    transcription = None
+    if lyrics_result["success"] and lyrics_result["source"] != "user":
+        transcription = {
+            "text": lyrics_result["text"],
+            "language": lyrics_result.get("language") or "en",
+            "confidence": lyrics_result["confidence"],
+            "success": True,
+            "verified": False,
+        }
+
+    lyrical_genome = results["lyrical_analysis"]
+    tunescore_data = results["tunescore"]
+    genre_data = results["genre"]
+    ai_enhancements: dict[str, Any] = results["ai_enhancements"] or {}
+
+    ai_lyric_critique = None
+    if lyrical_genome and lyrical_genome.get("ai_critique"):
+        ai_lyric_critique = lyrical_genome["ai_critique"]
+
+    analysis = await _provisional_analysis(db, track.id)
+    if analysis is None:
+        analysis = Analysis(track_id=track.id)
+        db.add(analysis)
+    analysis.sonic_genome = sonic_genome or {}
+    analysis.lyrical_genome = lyrical_genome or {}
+    analysis.hook_data = hook_data or {}
+    analysis.tunescore = tunescore_data
+    analysis.genre_predictions = genre_data
+    analysis.quality_metrics = core.get("quality_metrics") or {}
+    analysis.mastering_quality = core.get("mastering_quality") or {}
+    analysis.chord_analysis = core.get("chord_analysis") or {}
+    analysis.ai_lyric_critique = ai_lyric_critique
+    analysis.provisional_fields = None
+
+    if ai_enhancements:
+        total_ai_cost = sum(value.get("cost", 0) for value in ai_enhancements.values())
+        current_ai_costs = dict(analysis.ai_costs or {})
+        current_ai_costs.update({
+            "genre_reasoning": ai_enhancements.get("genre_reasoning", {}).get("cost", 0),
+            "hook_explanation": ai_enhancements.get("hook_explanation", {}).get("cost", 0),
+            "breakout_prediction": ai_enhancements.get("breakout_prediction", {}).get("cost", 0),
+            "phase2_total": total_ai_cost,
+            "grand_total": current_ai_costs.get("total", 0) + total_ai_cost,
+        })
+        analysis.ai_costs = current_ai_costs
+
+        # Store AI enhancements alongside the data they explain
+        if genre_data:
+            analysis.genre_predictions = {
+                **genre_data,
+                "ai_reasoning": ai_enhancements.get("genre_reasoning"),
+            }
+        if hook_data and ai_enhancements.get("hook_explanation"):
+            analysis.hook_data = {
+                **hook_data,
+                "ai_explanation": ai_enhancements["hook_explanation"],
+            }
+        if tunescore_data and ai_enhancements.get("breakout_prediction"):
+            analysis.tunescore = {
+                **tunescore_data,
+                "ai_breakout": ai_enhancements["breakout_prediction"],
+            }
+        logger.info(f"✅ Phase 2 AI enhancements complete: ${total_ai_cost:.4f}")
+
+    tags = results["tags"]
+    if tags is not None:
+        db.add(TrackTags(track_id=track.id, **tags))
+
+    pitch_data = results["pitch"]
+    if pitch_data is not None:
+        db.add(
+            PitchCopy(
+                track_id=track.id,
+                elevator_pitch=pitch_data.get("elevator_pitch"),
+                short_description=pitch_data.get("short_description"),
+                sync_pitch=pitch_data.get("sync_pitch"),
+                cost=pitch_data.get("cost"),
+                generated_at=pitch_data.get("generated_at"),
+            )
+        )
+        logger.info(f"✅ Pitch copy generated (cost: ${pitch_data.get('cost', 0):.4f})")
+
+    # Embedding generation reads the analysis back for themes, and shares
+    # the session, so it runs after everything else
+    await db.flush()
+    logger.info(f"Generating embedding for track {track.id}")
+    embedding_outcomes = await StageGraph(
+        [Stage("embedding", functools.partial(create_embedding_for_track, track.id, db))]
+    ).run(progress, label=f"track {track.id}")
+
+    analysis.stage_timings = timing_breakdown(
+        [
+            timing
+            for outcome in [*outcomes.values(), *embedding_outcomes.values()]
+            for timing in outcome.timings
+        ],
+        wall_seconds=time.perf_counter() - started,
+    )
+
+    return {
+        "analysis": analysis,
+        "transcription": transcription,
+        "ai_enhanced": bool(ai_enhancements),
+        "ai_cost": (analysis.ai_costs or {}).get("grand_total", 0.0),
+    }
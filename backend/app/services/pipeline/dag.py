@@ -0,0 +1,257 @@
+"""Stage graph engine for the analysis pipeline.
+
+Each stage declares the stages whose results it consumes. ``StageGraph.run``
+starts every stage as soon as its inputs are done, so independent stages
+overlap and wall time approaches the graph's critical path instead of the
+sum of all stages.
+
+Stage kinds:
+    cpu: picklable function run in the analysis process pool (a thread when
+        the pool is disabled)
+    thread: blocking function (HTTP/LLM clients) run in a thread
+    async: coroutine function run as a task on the event loop
+
+A failing stage is logged and reported, and its dependents receive None for
+its result, like the try/except blocks the pipeline used before; only a
+``critical`` stage failure aborts the run.
+
+Every stage runs under a stage timer: its wall time, CPU time and peak RSS
+growth, plus those of timers nested in it, are exported as Prometheus
+histograms and returned on its outcome.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..compute import get_process_pool
+from ..instrumentation import StageTiming, observe_timings, timed_await, timed_call
+
+logger = logging.getLogger(__name__)
+
+STAGE_KINDS = ("cpu", "thread", "async")
+
+# progress(stage, status, error) with status in
+# running/completed/failed/skipped/cancelled
+ProgressCallback = Callable[[str, str, str | None], Awaitable[None]]
+
+
+@dataclass
+class Stage:
+    """
+    One node of a stage graph.
+
+    ``fn`` is called with one keyword argument per input stage, holding that
+    stage's result (None if it failed or was skipped).
+    """
+
+    name: str
+    fn: Callable[..., Any]
+    inputs: tuple[str, ...] = ()
+    kind: str = "async"
+    timeout: float | None = None  # Seconds (None = no limit)
+    critical: bool = False  # Failure aborts the whole run
+    # Called with the input results; False skips the stage
+    when: Callable[[dict[str, Any]], bool] | None = None
+
+    def __post_init__(self) -> None:
+        if self.kind not in STAGE_KINDS:
+            raise ValueError(f"Unknown stage kind {self.kind!r} for {self.name}")
+
+
+@dataclass
+class StageOutcome:
+    """Result of one stage run."""
+
+    name: str
+    status: str  # completed, failed or skipped
+    value: Any = None
+    error: BaseException | None = None
+    seconds: float = 0.0
+    timings: list[StageTiming] = field(default_factory=list)  # Nested timers first
+
+
+class StageGraph:
+    """Dependency graph of stages, run with maximal concurrency."""
+
+    def __init__(self, stages: Iterable[Stage]) -> None:
+        """
+        Initialize and validate a stage graph.
+
+        Args:
+            stages: Stages in any order
+
+        Raises:
+            ValueError: On duplicate names, unknown inputs or cycles
+        """
+        self.stages: dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage {stage.name}")
+            self.stages[stage.name] = stage
+
+        for stage in self.stages.values():
+            unknown = set(stage.inputs) - set(self.stages)
+            if unknown:
+                raise ValueError(f"Stage {stage.name} has unknown inputs {sorted(unknown)}")
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> list[str]:
+        remaining = {name: set(stage.inputs) for name, stage in self.stages.items()}
+        order: list[str] = []
+        while remaining:
+            ready = [name for name, inputs in remaining.items() if not inputs]
+            if not ready:
+                raise ValueError(f"Stage graph has a cycle among {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+                order.append(name)
+            for inputs in remaining.values():
+                inputs.difference_update(ready)
+        return order
+
+    def critical_path_seconds(self, outcomes: dict[str, StageOutcome]) -> float:
+        """Longest chain of stage durations through the graph."""
+        finish: dict[str, float] = {}
+        for name in self.order:
+            start = max((finish[dep] for dep in self.stages[name].inputs), default=0.0)
+            finish[name] = start + (outcomes[name].seconds if name in outcomes else 0.0)
+        return max(finish.values(), default=0.0)
+
+    async def run(
+        self, progress: ProgressCallback | None = None, label: str = ""
+    ) -> dict[str, StageOutcome]:
+        """
+        Run every stage, each as soon as its inputs are done.
+
+        Args:
+            progress: Optional stage progress callback
+            label: Context for log messages (e.g. "track 42")
+
+        Returns:
+            Stage name -> outcome
+
+        Raises:
+            Exception: The error of a failed critical stage (stages still
+                running are cancelled)
+        """
+        started = time.perf_counter()
+        outcomes: dict[str, StageOutcome] = {}
+        pending = dict(self.stages)
+        running: dict[asyncio.Task[StageOutcome], Stage] = {}
+
+        async def report(name: str, status: str, error: str | None = None) -> None:
+            if progress is not None:
+                await progress(name, status, error)
+
+        try:
+            while pending or running:
+                # Start (or skip) everything whose inputs are done; a skip can
+                # make further stages ready, so scan until nothing changes
+                changed = True
+                while changed:
+                    changed = False
+                    for name, stage in list(pending.items()):
+                        if not all(dep in outcomes for dep in stage.inputs):
+                            continue
+                        del pending[name]
+                        values = {dep: outcomes[dep].value for dep in stage.inputs}
+                        if stage.when is not None and not stage.when(values):
+                            outcomes[name] = StageOutcome(name, "skipped")
+                            await report(name, "skipped")
+                            changed = True
+                            continue
+                        task = asyncio.create_task(self._execute(stage, values, report, label))
+                        running[task] = stage
+
+                if not running:
+                    continue
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    stage = running.pop(task)
+                    outcome = task.result()
+                    outcomes[stage.name] = outcome
+                    if outcome.status == "failed" and stage.critical:
+                        assert outcome.error is not None
+                        raise outcome.error
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        wall = time.perf_counter() - started
+        logger.info(
+            f"Stage graph{f' for {label}' if label else ''} finished in {wall:.1f}s "
+            f"(critical path {self.critical_path_seconds(outcomes):.1f}s, "
+            f"stages total {sum(outcome.seconds for outcome in outcomes.values()):.1f}s)"
+        )
+        return outcomes
+
+    async def _execute(
+        self,
+        stage: Stage,
+        values: dict[str, Any],
+        report: Callable[..., Awaitable[None]],
+        label: str,
+    ) -> StageOutcome:
+        """Run one stage, converting its failure into an outcome."""
+        await report(stage.name, "running")
+        started = time.perf_counter()
+        try:
+            value, timings = await self._call(stage, values)
+        except asyncio.CancelledError:
+            # Not a stage failure: the run was abandoned (a critical stage
+            # failed, or the job is being shut down). Record it and let the
+            # cancellation propagate.
+            seconds = time.perf_counter() - started
+            logger.warning(f"Stage {stage.name} cancelled{f' for {label}' if label else ''}")
+            observe_timings([StageTiming(stage.name, seconds, status="cancelled")])
+            await report(stage.name, "cancelled")
+            raise
+        except Exception as e:
+            seconds = time.perf_counter() - started
+            if isinstance(e, asyncio.TimeoutError):
+                e = TimeoutError(f"Stage {stage.name} timed out after {stage.timeout}s")
+            logger.error(f"Stage {stage.name} failed{f' for {label}' if label else ''}: {e}")
+            # Timings taken inside a failed call are lost with it
+            timings = [StageTiming(stage.name, seconds, status="failed")]
+            observe_timings(timings)
+            await report(stage.name, "failed", str(e))
+            return StageOutcome(stage.name, "failed", error=e, seconds=seconds, timings=timings)
+
+        seconds = time.perf_counter() - started
+        observe_timings(timings)
+        await report(stage.name, "completed")
+        return StageOutcome(
+            stage.name, "completed", value=value, seconds=seconds, timings=timings
+        )
+
+    async def _call(
+        self, stage: Stage, values: dict[str, Any]
+    ) -> tuple[Any, list[StageTiming]]:
+        """Run a stage's function; returns its value and timings."""
+        if stage.kind == "cpu":
+            pool = get_process_pool()
+            if pool is not None:
+                # The pool enforces the timeout and replaces hung workers; a
+                # worker runs one task, so the process CPU clock is the stage's
+                return await pool.run(
+                    timed_call,
+                    stage.name,
+                    stage.fn,
+                    timeout=stage.timeout,
+                    cpu_clock=time.process_time,
+                    **values,
+                )
+            call: Awaitable[Any] = asyncio.to_thread(timed_call, stage.name, stage.fn, **values)
+        elif stage.kind == "thread":
+            # A timed-out thread cannot be killed; its result is discarded
+            call = asyncio.to_thread(timed_call, stage.name, stage.fn, **values)
+        else:
+            call = timed_await(stage.name, stage.fn, **values)
+        return await asyncio.wait_for(call, timeout=stage.timeout)
@@ -0,0 +1,414 @@
+"""Duplicate upload detection through the fingerprint index.
+
+Every upload is hashed (SHA-256 of the bytes) and fingerprinted. A byte-for-
+byte copy is found with one indexed lookup on ``track_fingerprints``; a
+re-encoded or resampled copy through the ``fingerprint_hashes`` inverted
+index, scored by time-aligned hash hits. Near-duplicates must also have
+about the same length, so an excerpt or an extended edit of a track is not
+mistaken for a copy of it.
+
+A copy of one of the uploader's own analyzed tracks reuses its whole
+analysis instead of running the pipeline. A copy of another user's track
+reuses only the results computed from the audio: its lyrics, lyrical genome
+and AI write-ups belong to that user, so the lyrics-derived stages run again.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...models import (
+    Analysis,
+    Embedding,
+    FingerprintHash,
+    Track,
+    TrackAsset,
+    TrackFingerprint,
+    TrackTags,
+)
+from ..audio.fingerprint import (
+    FINGERPRINT_VERSION,
+    Fingerprint,
+    compute_fingerprint,
+    score_matches,
+)
+from ..cache import audio_content_hash
+from ..compute import run_cpu_bound
+
+logger = logging.getLogger(__name__)
+
+# Hashes per IN (...) query, well under the driver's bind parameter limit
+LOOKUP_BATCH_SIZE = 5000
+
+# Analysis columns copied to a duplicate upload
+CLONED_ANALYSIS_FIELDS = (
+    "sonic_genome",
+    "lyrical_genome",
+    "hook_data",
+    "tunescore",
+    "genre_predictions",
+    "quality_metrics",
+    "mastering_quality",
+    "chord_analysis",
+    "ai_lyric_critique",
+)
+
+# Analysis columns derived from the audio alone, reusable across owners
+AUDIO_ANALYSIS_FIELDS = (
+    "sonic_genome",
+    "hook_data",
+    "quality_metrics",
+    "mastering_quality",
+    "chord_analysis",
+)
+
+CLONED_LYRICS_FIELDS = (
+    "lyrics_text",
+    "lyrics_source",
+    "lyrics_confidence",
+    "lyrics_language",
+    "lyrics_metadata",
+)
+
+
+@dataclass
+class DuplicateMatch:
+    """An indexed track matching an upload."""
+
+    track_id: int
+    similarity: float
+    exact: bool  # Same bytes, not just the same audio
+
+
+def _fingerprint_file(audio_path: str) -> tuple[str, Fingerprint]:
+    """Process-pool entry point: content hash and fingerprint of a file."""
+    return audio_content_hash(audio_path), compute_fingerprint(audio_path)
+
+
+async def fingerprint_upload(audio_path: str) -> tuple[str, Fingerprint]:
+    """
+    Hash and fingerprint an uploaded file.
+
+    Args:
+        audio_path: Path to the saved upload
+
+    Returns:
+        (SHA-256 hex digest, fingerprint)
+    """
+    return await run_cpu_bound(_fingerprint_file, audio_path)
+
+
+async def find_by_content_hash(
+    db: AsyncSession, audio_hash: str, user_id: int | None = None
+) -> TrackFingerprint | None:
+    """
+    Earliest indexed track with exactly these bytes.
+
+    Args:
+        db: Database session
+        audio_hash: SHA-256 hex digest of the audio file
+        user_id: Only search this user's tracks (default: all tracks)
+
+    Returns:
+        Fingerprint row, or None if the bytes were never uploaded
+    """
+    stmt = select(TrackFingerprint).where(TrackFingerprint.audio_hash == audio_hash.lower())
+    if user_id is not None:
+        stmt = stmt.join(Track, Track.id == TrackFingerprint.track_id).where(
+            Track.user_id == user_id
+        )
+    result = await db.execute(stmt.order_by(TrackFingerprint.created_at).limit(1))
+    return result.scalar_one_or_none()
+
+
+async def find_duplicate(
+    db: AsyncSession,
+    audio_hash: str,
+    fingerprint: Fingerprint,
+    threshold: float | None = None,
+    exclude_track_id: int | None = None,
+    user_id: int | None = None,
+) -> DuplicateMatch | None:
+    """
+    Find an indexed track with the same audio.
+
+    Args:
+        db: Database session
+        audio_hash: SHA-256 of the upload
+        fingerprint: Fingerprint of the upload
+        threshold: Minimum similarity (default: FINGERPRINT_MATCH_THRESHOLD setting)
+        exclude_track_id: Track to ignore (the upload itself, if indexed)
+        user_id: Only match this user's tracks (default: all tracks)
+
+    Returns:
+        Best match, or None
+    """
+    from ...core.config import settings
+
+    threshold = settings.FINGERPRINT_MATCH_THRESHOLD if threshold is None else threshold
+
+    exact = await find_by_content_hash(db, audio_hash, user_id=user_id)
+    if exact is not None and exact.track_id != exclude_track_id:
+        return DuplicateMatch(track_id=exact.track_id, similarity=1.0, exact=True)
+
+    query_hashes = np.unique(fingerprint.lookup()[0])
+    rows: list[tuple[int, int, int]] = []
+    for start in range(0, len(query_hashes), LOOKUP_BATCH_SIZE):
+        batch = [int(value) for value in query_hashes[start : start + LOOKUP_BATCH_SIZE]]
+        result = await db.execute(
+            select(FingerprintHash.hash, FingerprintHash.track_id, FingerprintHash.offset)
+            .where(FingerprintHash.hash.in_(batch))
+        )
+        rows.extend(tuple(row) for row in result.all())
+    if not rows:
+        return None
+
+    hits = np.array(rows, dtype=np.int64)
+    candidates = {int(track_id) for track_id in np.unique(hits[:, 1])} - {exclude_track_id}
+    stmt = select(TrackFingerprint.track_id, TrackFingerprint.duration).where(
+        TrackFingerprint.track_id.in_(candidates),
+        TrackFingerprint.version == FINGERPRINT_VERSION,
+    )
+    if user_id is not None:
+        stmt = stmt.join(Track, Track.id == TrackFingerprint.track_id).where(
+            Track.user_id == user_id
+        )
+    result = await db.execute(stmt)
+    # Same recording means about the same length, not just shared hashes
+    tolerance = settings.FINGERPRINT_DURATION_TOLERANCE
+    same_length = [
+        track_id
+        for track_id, duration in result.all()
+        if duration
+        and abs(duration - fingerprint.duration)
+        <= tolerance * max(duration, fingerprint.duration)
+    ]
+    keep = np.isin(hits[:, 1], same_length)
+
+    scores = score_matches(fingerprint, hits[keep, 0], hits[keep, 1], hits[keep, 2])
+    if not scores:
+        return None
+    track_id, similarity = max(scores.items(), key=lambda item: item[1])
+    if similarity < threshold:
+        return None
+    return DuplicateMatch(track_id=track_id, similarity=similarity, exact=False)
+
+
+async def index_fingerprint(
+    db: AsyncSession,
+    track_id: int,
+    audio_hash: str,
+    fingerprint: Fingerprint,
+    match: DuplicateMatch | None = None,
+) -> TrackFingerprint:
+    """
+    Add a track to the fingerprint index.
+
+    The caller owns the transaction and must commit.
+
+    Args:
+        db: Database session
+        track_id: Track the audio belongs to
+        audio_hash: SHA-256 of the audio file
+        fingerprint: Its fingerprint
+        match: Track whose analysis the upload reused, if any
+
+    Returns:
+        The staged fingerprint row
+    """
+    row = TrackFingerprint(
+        track_id=track_id,
+        audio_hash=audio_hash,
+        version=FINGERPRINT_VERSION,
+        hash_count=len(fingerprint.hashes),
+        duration=fingerprint.duration,
+        duplicate_of_id=match.track_id if match else None,
+        similarity=match.similarity if match else None,
+    )
+    db.add(row)
+
+    # (hash, offset) pairs repeat when a peak pair recurs in the same frame
+    pairs = np.unique(np.stack([fingerprint.hashes, fingerprint.offsets], axis=1), axis=0)
+    if len(pairs):
+        await db.execute(
+            insert(FingerprintHash),
+            [
+                {"track_id": track_id, "hash": int(value), "offset": int(offset)}
+                for value, offset in pairs
+            ],
+        )
+    await db.flush()
+    return row
+
+
+async def _finished_analysis(db: AsyncSession, track_id: int) -> Analysis | None:
+    """Latest analysis of a track that is not a preview estimate."""
+    result = await db.execute(
+        select(Analysis)
+        .where(Analysis.track_id == track_id, Analysis.provisional_fields.is_(None))
+        .order_by(Analysis.created_at.desc())
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+async def clone_analysis(
+    db: AsyncSession, source_track_id: int, track: Track, track_asset: TrackAsset
+) -> Analysis | None:
+    """
+    Copy the finished analysis of a duplicate onto a new upload.
+
+    Copies the analysis, AI tags, embedding and acquired lyrics, so the
+    source must belong to the same user as the new track; for another
+    user's track use ``reused_audio_features`` instead. Pitch copy is not
+    copied: it is written around the source track's title and artist.
+    Nothing is copied when the uploader supplied lyrics that differ from the
+    source's, since the lyrical analysis would not describe them. The caller
+    owns the transaction and must commit.
+
+    Args:
+        db: Database session
+        source_track_id: Analyzed track with the same audio
+        track: New track
+        track_asset: New track's asset
+
+    Returns:
+        The new analysis, or None if the source belongs to another user, has
+        no finished analysis or has different lyrics
+    """
+    source_track = await db.get(Track, source_track_id)
+    if source_track is None or source_track.user_id != track.user_id:
+        return None
+
+    source = await _finished_analysis(db, source_track_id)
+    if source is None:
+        return None
+
+    source_asset = (
+        await db.execute(select(TrackAsset).where(TrackAsset.track_id == source_track_id))
+    ).scalar_one_or_none()
+    if track_asset.lyrics_text:
+        source_lyrics = source_asset.lyrics_text if source_asset else None
+        if (source_lyrics or "").strip() != track_asset.lyrics_text.strip():
+            logger.info(
+                f"Track {track.id} matches track {source_track_id} but has its own lyrics; "
+                "running the full analysis"
+            )
+            return None
+    elif source_asset is not None:
+        for field in CLONED_LYRICS_FIELDS:
+            setattr(track_asset, field, getattr(source_asset, field))
+
+    track.duration = source_track.duration
+
+    analysis = Analysis(
+        track_id=track.id,
+        ai_costs={},  # Nothing was spent on this upload
+        **{field: getattr(source, field) for field in CLONED_ANALYSIS_FIELDS},
+    )
+    db.add(analysis)
+
+    tags = (
+        await db.execute(select(TrackTags).where(TrackTags.track_id == source_track_id))
+    ).scalar_one_or_none()
+    if tags is not None:
+        db.add(
+            TrackTags(
+                track_id=track.id,
+                moods=tags.moods,
+                commercial_tags=tags.commercial_tags,
+                use_cases=tags.use_cases,
+                sounds_like=tags.sounds_like,
+            )
+        )
+
+    embedding = (
+        await db.execute(select(Embedding).where(Embedding.track_id == source_track_id))
+    ).scalar_one_or_none()
+    if embedding is not None:
+        db.add(
+            Embedding(
+                track_id=track.id,
+                vector=embedding.vector,
+                model_version=embedding.model_version,
+            )
+        )
+
+    await db.flush()
+    logger.info(f"✅ Track {track.id} reuses the analysis of track {source_track_id}")
+    return analysis
+
+
+async def reused_audio_features(db: AsyncSession, source_track_id: int) -> dict[str, Any] | None:
+    """
+    Audio-derived results of a duplicate, in the pipeline's audio stage shape.
+
+    Safe to reuse for any owner: nothing here comes from the source's
+    lyrics or from LLM calls about them (the AI hook explanation, which
+    cites lyric sections, is dropped).
+
+    Args:
+        db: Database session
+        source_track_id: Analyzed track with the same audio
+
+    Returns:
+        Audio stage result, or None if the source has no finished analysis
+    """
+    source = await _finished_analysis(db, source_track_id)
+    if source is None or not source.sonic_genome:
+        return None
+
+    features = {field: getattr(source, field) or {} for field in AUDIO_ANALYSIS_FIELDS}
+    features["hook_data"] = {
+        key: value for key, value in features["hook_data"].items() if key != "ai_explanation"
+    }
+    features["viral_segments"] = {
+        "viral_segments": features["hook_data"].get("viral_segments") or []
+    }
+    return features
+
+
+async def deduplicate_upload(
+    db: AsyncSession, track: Track, track_asset: TrackAsset
+) -> tuple[Analysis | None, DuplicateMatch | None]:
+    """
+    Fingerprint an upload, add it to the index and reuse a duplicate's analysis.
+
+    Decodes the whole file, so queued uploads run this in the analysis
+    worker rather than in the upload request. A failure is logged and
+    treated as no match; the index writes happen in a savepoint, so they
+    cannot abort the caller's transaction. The caller must commit.
+
+    Args:
+        db: Database session
+        track: Uploaded track
+        track_asset: Its asset with the audio path
+
+    Returns:
+        (analysis cloned from one of the owner's tracks or None, matched
+        track or None). With a match but no clone, the pipeline can still
+        reuse the match's audio analysis.
+    """
+    track_id = track.id  # Attributes expire if the savepoint rolls back
+    try:
+        audio_hash, fingerprint = await fingerprint_upload(str(track_asset.audio_path))
+        async with db.begin_nested():
+            match = await find_duplicate(db, audio_hash, fingerprint, exclude_track_id=track.id)
+            cloned = None
+            if match is not None:
+                cloned = await clone_analysis(db, match.track_id, track, track_asset)
+            await index_fingerprint(
+                db, track.id, audio_hash, fingerprint, match=match if cloned else None
+            )
+    except Exception as e:
+        logger.warning(f"Fingerprinting failed for track {track_id}: {e}")
+        # Reload what the rolled-back savepoint expired, so callers can
+        # keep using the objects without implicit (sync) lazy loads
+        await db.refresh(track)
+        await db.refresh(track_asset)
+        return None, None
+    return cloned, match
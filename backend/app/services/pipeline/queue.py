@@ -0,0 +1,391 @@
+"""Postgres-backed analysis job queue.
+
+Uploads enqueue a row in ``analysis_jobs``; worker processes claim rows with
+``SELECT ... FOR UPDATE SKIP LOCKED`` so several workers, on one machine or
+many, never pick up the same job. Running jobs heartbeat on every stage
+transition, and jobs whose worker died are reclaimed once the heartbeat is
+older than ``ANALYSIS_JOB_STALE_SECONDS``. Every write a worker makes to a job
+row is conditional on its claim still holding, so a worker whose job was
+reclaimed stops instead of overwriting the new owner's progress or result.
+
+Everything that decodes the upload runs in the worker, so the upload request
+only saves the file: the job first fingerprints the audio (a copy of one of
+the owner's analyzed tracks completes the job right away), then commits a
+provisional preview analysis, then runs the full pipeline.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import ColumnElement, and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.config import settings
+from ...core.database import AsyncSessionLocal
+from ...models import Analysis, AnalysisJob, Artist, Track, TrackAsset
+from .analysis import PIPELINE_STAGES, run_analysis_pipeline, run_preview_analysis
+from .dedup import deduplicate_upload
+
+logger = logging.getLogger(__name__)
+
+# Stages of a queued job, as reported by /tracks/{id}/status
+JOB_STAGES = ("fingerprint", "preview", *PIPELINE_STAGES)
+
+
+class JobClaimLost(RuntimeError):
+    """The job was reclaimed (or failed) after its worker stopped heartbeating."""
+
+
+def _initial_stages() -> dict[str, dict[str, Any]]:
+    return {name: {"status": "pending"} for name in JOB_STAGES}
+
+
+def _claimed(job_id: int, worker_id: str | None, attempt: int) -> ColumnElement[bool]:
+    """Match a job row only while the given claim on it still holds."""
+    return and_(
+        AnalysisJob.id == job_id,
+        AnalysisJob.status == "running",
+        AnalysisJob.worker_id == worker_id,
+        # The same worker may reclaim its own stale job; that is a new claim
+        AnalysisJob.attempts == attempt,
+    )
+
+
+async def enqueue_analysis_job(
+    db: AsyncSession,
+    track_id: int,
+    artist_name: str | None = None,
+    verify_lyrics: bool = False,
+) -> AnalysisJob:
+    """
+    Add an analysis job for a track to the queue.
+
+    The job becomes visible to workers when the caller commits.
+
+    Args:
+        db: Database session
+        track_id: Track to analyze
+        artist_name: Artist name passed to the pipeline
+        verify_lyrics: Verify user-provided lyrics against a transcription
+
+    Returns:
+        The pending job
+    """
+    job = AnalysisJob(
+        track_id=track_id,
+        status="queued",
+        stages=_initial_stages(),
+        options={"artist_name": artist_name, "verify_lyrics": verify_lyrics},
+        max_attempts=settings.ANALYSIS_JOB_MAX_ATTEMPTS,
+    )
+    db.add(job)
+    await db.flush()
+    logger.info(f"Queued analysis job {job.id} for track {track_id}")
+    return job
+
+
+async def claim_next_job(worker_id: str) -> AnalysisJob | None:
+    """
+    Claim the oldest runnable job.
+
+    Runnable means queued, or running with a stale heartbeat (its worker
+    crashed). Stale jobs that already used up their attempts are failed
+    instead of being claimed again.
+
+    Args:
+        worker_id: Identifier of the claiming worker (host:pid)
+
+    Returns:
+        The claimed job, or None if the queue is empty
+    """
+    while True:
+        async with AsyncSessionLocal() as db:
+            now = datetime.utcnow()
+            stale_before = now - timedelta(seconds=settings.ANALYSIS_JOB_STALE_SECONDS)
+            stmt = (
+                select(AnalysisJob)
+                .where(
+                    or_(
+                        AnalysisJob.status == "queued",
+                        and_(
+                            AnalysisJob.status == "running",
+                            AnalysisJob.heartbeat_at < stale_before,
+                        ),
+                    )
+                )
+                .order_by(AnalysisJob.created_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            job = (await db.execute(stmt)).scalar_one_or_none()
+            if job is None:
+                return None
+
+            if job.status == "running":
+                logger.warning(
+                    f"Reclaiming analysis job {job.id} from unresponsive worker {job.worker_id}"
+                )
+                if job.attempts >= job.max_attempts:
+                    job.status = "failed"
+                    job.error = f"Worker {job.worker_id} stopped responding"
+                    job.finished_at = now
+                    await db.commit()
+                    continue
+
+            job.status = "running"
+            job.worker_id = worker_id
+            job.attempts += 1
+            job.stage = None
+            job.stages = _initial_stages()
+            job.error = None
+            job.started_at = now
+            job.heartbeat_at = now
+            await db.commit()
+            return job
+
+
+class JobProgress:
+    """
+    Pipeline progress callback that persists stage status on the job row.
+
+    Updates are committed in their own short transaction so the status
+    endpoint sees them while the pipeline's transaction is still open. They
+    are serialized, since concurrent stages report at the same time and an
+    older snapshot must not overwrite a newer one. Once the job has been
+    reclaimed by another worker, updates raise ``JobClaimLost``.
+    """
+
+    def __init__(self, job: AnalysisJob) -> None:
+        """
+        Initialize progress reporter.
+
+        Args:
+            job: Job being processed
+        """
+        self.job_id = job.id
+        self.claim = _claimed(job.id, job.worker_id, job.attempts)
+        self.stages: dict[str, dict[str, Any]] = {
+            name: dict(entry) for name, entry in (job.stages or {}).items()
+        }
+        self._running: list[str] = []
+        self._lock = asyncio.Lock()
+
+    async def __call__(self, stage: str, status: str, error: str | None = None) -> None:
+        async with self._lock:
+            now = datetime.utcnow()
+            entry = self.stages.setdefault(stage, {})
+            entry["status"] = status
+            if status == "running":
+                entry["started_at"] = now.isoformat()
+                self._running.append(stage)
+            else:
+                entry["finished_at"] = now.isoformat()
+                if stage in self._running:
+                    self._running.remove(stage)
+            if error:
+                entry["error"] = error
+
+            await self._update(
+                # Most recently started stage still running
+                stage=self._running[-1] if self._running else None,
+                stages={name: dict(value) for name, value in self.stages.items()},
+                heartbeat_at=now,
+            )
+
+    async def heartbeat(self) -> None:
+        """
+        Refresh the job heartbeat so it is not reclaimed as stale.
+
+        Raises:
+            JobClaimLost: If the job was already reclaimed
+        """
+        await self._update(heartbeat_at=datetime.utcnow())
+
+    async def _update(self, **values: Any) -> None:
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    update(AnalysisJob).where(self.claim).values(**values)
+                )
+                await db.commit()
+        except Exception as e:
+            # Progress is advisory; never fail the analysis over it
+            logger.warning(f"Failed to record progress for job {self.job_id}: {e}")
+            return
+        if result.rowcount == 0:
+            raise JobClaimLost(f"Analysis job {self.job_id} was reclaimed by another worker")
+
+
+async def _commit_preview(track_id: int) -> bool:
+    """
+    Commit a provisional preview analysis in its own transaction.
+
+    The status endpoint then shows a provisional TuneScore while the full
+    pipeline, whose results are committed only at the end, is still running.
+
+    Returns:
+        True if a preview was stored (False if the track already has an
+        analysis, e.g. from an earlier attempt of the job)
+    """
+    async with AsyncSessionLocal() as db:
+        existing = await db.execute(
+            select(Analysis.id).where(Analysis.track_id == track_id).limit(1)
+        )
+        if existing.scalar_one_or_none() is not None:
+            return False
+        track = await db.get(Track, track_id)
+        track_asset = (
+            await db.execute(select(TrackAsset).where(TrackAsset.track_id == track_id))
+        ).scalar_one()
+        await run_preview_analysis(db, track, track_asset)
+        await db.commit()
+        return True
+
+
+async def _release_job(
+    progress: JobProgress, error: str, retry: bool, count_attempt: bool = True
+) -> None:
+    """Put an unfinished job back in the queue, or fail it (if still claimed)."""
+    values: dict[str, Any] = {
+        "status": "queued" if retry else "failed",
+        "stage": None,
+        "stages": progress.stages,
+        "error": error,
+        "finished_at": None if retry else datetime.utcnow(),
+    }
+    if not count_attempt:
+        values["attempts"] = AnalysisJob.attempts - 1
+    async with AsyncSessionLocal() as db:
+        await db.execute(update(AnalysisJob).where(progress.claim).values(**values))
+        await db.commit()
+
+
+async def run_analysis_job(job: AnalysisJob, progress: JobProgress | None = None) -> bool:
+    """
+    Run the analysis pipeline for a claimed job.
+
+    Results and the job's completion are committed in one transaction, so a
+    crash between the two cannot produce a duplicate analysis on retry.
+    Failed jobs are re-queued until they run out of attempts. A cancelled
+    job (worker shutdown) is rolled back and re-queued without using up an
+    attempt, and the cancellation is re-raised. If the job was reclaimed by
+    another worker meanwhile, its results are rolled back and the job row is
+    left to the new owner.
+
+    Args:
+        job: Job returned by ``claim_next_job``
+        progress: Progress reporter (created from the job if omitted)
+
+    Returns:
+        True if the job completed
+
+    Raises:
+        asyncio.CancelledError: If the job was cancelled (it is re-queued)
+    """
+    progress = progress or JobProgress(job)
+    options = job.options or {}
+
+    async with AsyncSessionLocal() as db:
+        try:
+            track = await db.get(Track, job.track_id)
+            if track is None:
+                raise ValueError(f"Track {job.track_id} no longer exists")
+
+            result = await db.execute(
+                select(TrackAsset).where(TrackAsset.track_id == track.id)
+            )
+            track_asset = result.scalar_one_or_none()
+            if track_asset is None:
+                raise ValueError(f"Track {track.id} has no audio asset")
+
+            artist_name = options.get("artist_name")
+            if artist_name is None and track.artist_id:
+                artist = await db.get(Artist, track.artist_id)
+                artist_name = artist.name if artist else None
+
+            logger.info(f"Running analysis job {job.id} for track {track.id}")
+            cloned, match = None, None
+            if settings.FINGERPRINT_ENABLED:
+                await progress("fingerprint", "running")
+                cloned, match = await deduplicate_upload(db, track, track_asset)
+                await progress("fingerprint", "completed")
+            else:
+                await progress("fingerprint", "skipped")
+
+            if cloned is not None:
+                # A copy of one of the owner's analyzed tracks: nothing to run
+                for name in ("preview", *PIPELINE_STAGES):
+                    progress.stages[name] = {"status": "skipped"}
+                pipeline_result = {"ai_cost": 0.0}
+            else:
+                # A reused audio analysis is instant, so no preview for it
+                if settings.ANALYSIS_PREVIEW_ENABLED and match is None:
+                    await progress("preview", "running")
+                    try:
+                        stored = await _commit_preview(track.id)
+                        await progress("preview", "completed" if stored else "skipped")
+                    except Exception as e:
+                        logger.warning(f"Preview analysis failed for track {track.id}: {e}")
+                        await progress("preview", "failed", str(e))
+                else:
+                    await progress("preview", "skipped")
+
+                pipeline_result = await run_analysis_pipeline(
+                    db,
+                    track,
+                    track_asset,
+                    artist_name=artist_name,
+                    verify_lyrics=bool(options.get("verify_lyrics")),
+                    progress=progress,
+                    reuse_audio_from=match.track_id if match else None,
+                )
+
+            completed = await db.execute(
+                update(AnalysisJob)
+                .where(progress.claim)
+                .values(
+                    status="completed",
+                    stage=None,
+                    stages=progress.stages,
+                    finished_at=datetime.utcnow(),
+                )
+            )
+            if completed.rowcount == 0:
+                raise JobClaimLost(f"Analysis job {job.id} was reclaimed by another worker")
+            await db.commit()
+            logger.info(
+                f"✅ Analysis job {job.id} complete "
+                f"(AI cost: ${pipeline_result['ai_cost']:.4f})"
+            )
+            return True
+
+        except asyncio.CancelledError:
+            logger.warning(f"Analysis job {job.id} cancelled; re-queueing it")
+
+            async def requeue() -> None:
+                await db.rollback()
+                await _release_job(
+                    progress, "Cancelled (worker shutdown)", retry=True, count_attempt=False
+                )
+
+            # Shielded so a second cancellation cannot leave the job "running"
+            await asyncio.shield(requeue())
+            raise
+
+        except JobClaimLost as e:
+            await db.rollback()
+            logger.warning(f"{e}; discarding this worker's results")
+            return False
+
+        except Exception as e:
+            await db.rollback()
+            error = str(e)
+            logger.error(f"Analysis job {job.id} failed: {error}")
+
+    retry = job.attempts < job.max_attempts
+    await _release_job(progress, error, retry)
+    if retry:
+        logger.info(f"Re-queued analysis job {job.id} (attempt {job.attempts}/{job.max_attempts})")
+    return False
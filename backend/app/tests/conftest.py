@@ -0,0 +1,9 @@
+"""Shared pytest setup."""
+
+import os
+
+# Settings require these; the tests never connect to the database
+os.environ.setdefault("JWT_SECRET", "test-secret")
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/tunescore_test")
+# Keep stage metrics in process instead of writing to files/metrics
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "")
@@ -0,0 +1,124 @@
+"""Eviction, soft-failure and corruption handling of AnalysisCache."""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from app.services.cache import AnalysisCache, audio_content_hash
+
+AUDIO_HASH = "ab" * 32
+# json.dumps of a 98-character string is 100 bytes
+ENTRY_VALUE = "x" * 98
+ENTRY_BYTES = 100
+
+
+def _fill(cache: AnalysisCache, count: int) -> list[Path]:
+    """Store ``count`` entries, oldest first by mtime."""
+    paths = []
+    base = time.time() - 1000
+    for i in range(count):
+        cache.set(AUDIO_HASH, f"analyzer{i}", "1", ENTRY_VALUE)
+        path = cache._entry_path(AUDIO_HASH, f"analyzer{i}", "1")
+        os.utime(path, (base + i, base + i))
+        paths.append(path)
+    return paths
+
+
+def test_evict_removes_least_recently_used_down_to_90_percent(tmp_path: Path) -> None:
+    paths = _fill(AnalysisCache(tmp_path, max_bytes=10_000), 10)
+    cache = AnalysisCache(tmp_path, max_bytes=5 * ENTRY_BYTES)
+    # A read refreshes the oldest entry
+    assert cache.get(AUDIO_HASH, "analyzer0", "1") == ENTRY_VALUE
+
+    removed = cache.evict()
+
+    # 1000 bytes down to at most 450
+    assert removed == 6
+    assert [path.exists() for path in paths] == [True] + [False] * 6 + [True] * 3
+    assert cache._current_size() == 4 * ENTRY_BYTES
+
+
+def test_set_evicts_when_over_budget(tmp_path: Path) -> None:
+    cache = AnalysisCache(tmp_path, max_bytes=5 * ENTRY_BYTES)
+    paths = _fill(cache, 5)
+
+    cache.set(AUDIO_HASH, "newest", "1", ENTRY_VALUE)
+
+    assert [path.exists() for path in paths] == [False, False] + [True] * 3
+    assert cache.get(AUDIO_HASH, "newest", "1") == ENTRY_VALUE
+    assert cache._current_size() == 4 * ENTRY_BYTES
+
+
+def test_overwrite_keeps_size_accurate(tmp_path: Path) -> None:
+    cache = AnalysisCache(tmp_path, max_bytes=10_000)
+    cache.set(AUDIO_HASH, "genre", "1", ENTRY_VALUE)
+
+    cache.set(AUDIO_HASH, "genre", "1", "y" * 48)
+
+    assert cache._current_size() == 50
+    files = [path.name for path in tmp_path.rglob("*") if path.is_file()]
+    assert files == ["genre@1.json"]
+
+
+def test_error_results_are_returned_but_not_stored(tmp_path: Path) -> None:
+    cache = AnalysisCache(tmp_path, max_bytes=10_000)
+    calls = []
+
+    def compute() -> dict[str, str]:
+        calls.append(1)
+        return {"error": "model unavailable"}
+
+    result = cache.get_or_compute(AUDIO_HASH, "genre", "1", compute)
+
+    assert result == {"error": "model unavailable"}
+    assert cache.get(AUDIO_HASH, "genre", "1") is None
+    cache.get_or_compute(AUDIO_HASH, "genre", "1", compute)
+    assert len(calls) == 2
+
+
+def test_results_are_stored_and_reused(tmp_path: Path) -> None:
+    cache = AnalysisCache(tmp_path, max_bytes=10_000)
+    calls = []
+
+    def compute() -> dict[str, float]:
+        calls.append(1)
+        return {"tempo": 120.0}
+
+    assert cache.get_or_compute(AUDIO_HASH, "tempo", "1", compute) == {"tempo": 120.0}
+    assert cache.get_or_compute(AUDIO_HASH, "tempo", "1", compute) == {"tempo": 120.0}
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("content", [b"{not json", b"\xff\xfe\x00garbage", b""])
+def test_corrupt_entry_is_discarded(tmp_path: Path, content: bytes) -> None:
+    cache = AnalysisCache(tmp_path, max_bytes=10_000)
+    path = cache._entry_path(AUDIO_HASH, "chords", "2")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(content)
+
+    assert cache.get(AUDIO_HASH, "chords", "2") is None
+    assert not path.exists()
+
+    value = cache.get_or_compute(AUDIO_HASH, "chords", "2", lambda: {"key": "C major"})
+    assert value == {"key": "C major"}
+    assert json.loads(path.read_text()) == {"key": "C major"}
+
+
+def test_content_hash_memo_is_invalidated_by_mtime(tmp_path: Path) -> None:
+    audio = tmp_path / "track.wav"
+    audio.write_bytes(b"first version")
+    stat = audio.stat()
+    first = audio_content_hash(audio)
+
+    # Same size and mtime: the memoized hash is returned without re-reading
+    audio.write_bytes(b"other version")
+    os.utime(audio, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert audio_content_hash(audio) == first
+
+    os.utime(audio, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    second = audio_content_hash(audio)
+    assert second != first
+    assert second == audio_content_hash(tmp_path / "track.wav")
@@ -0,0 +1,139 @@
+"""Matrix-product chord and key detection of ChordAnalyzer against the original loops."""
+
+from typing import Any
+
+import numpy as np
+import pytest
+
+from app.services.audio.chord_analyzer import ChordAnalyzer
+from app.services.audio.context import AudioContext
+from benchmarks.corpus import SyntheticTrack, write_track
+
+SR = 22050
+HOP_LENGTH = ChordAnalyzer.HOP_LENGTH
+KEYS = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+
+
+def _reference_key(chroma: np.ndarray) -> tuple[str, str]:
+    """Key and mode as the original ``_detect_key`` computed them."""
+    avg_chroma = np.mean(chroma, axis=1)
+    key_index = int(np.argmax(avg_chroma))
+    major = np.roll(np.array([1, 0, 1, 0, 1, 1, 0, 1, 0, 1, 0, 1]), key_index)
+    minor = np.roll(np.array([1, 0, 1, 1, 0, 1, 0, 1, 1, 0, 1, 0]), key_index)
+    major_corr = np.corrcoef(avg_chroma, major)[0, 1]
+    minor_corr = np.corrcoef(avg_chroma, minor)[0, 1]
+    return KEYS[key_index], "major" if major_corr > minor_corr else "minor"
+
+
+def _reference_chords(chroma: np.ndarray, sr: int) -> list[dict[str, Any]]:
+    """Chords as the original ``_detect_chords`` loop computed them."""
+    chords = []
+    frames_per_second = sr / HOP_LENGTH
+    window_size = int(2 * frames_per_second)
+
+    for i in range(0, chroma.shape[1], window_size // 2):
+        window = chroma[:, i : i + window_size]
+        if window.shape[1] < window_size // 2:
+            break
+        avg_chroma = np.mean(window, axis=1)
+        avg_chroma = avg_chroma / (np.sum(avg_chroma) + 1e-8)
+
+        best_chord, best_score = "N", 0
+        for name, template in ChordAnalyzer.CHORD_TEMPLATES.items():
+            template = np.array(template)
+            score = np.dot(avg_chroma, template) / (
+                np.linalg.norm(avg_chroma) * np.linalg.norm(template) + 1e-8
+            )
+            if score > best_score:
+                best_chord, best_score = name, score
+
+        confidence = 0.0
+        if best_chord != "N":
+            confidence = float(np.clip(best_score, 0, 1))
+        chords.append(
+            {
+                "time": round(i / frames_per_second, 1),
+                "chord": best_chord,
+                "confidence": round(confidence, 2),
+                "duration": 2.0,
+            }
+        )
+    return chords
+
+
+def _reference_modulations(
+    chords: list[dict[str, Any]], chroma: np.ndarray, sr: int
+) -> list[dict[str, Any]]:
+    """Modulations as the original ``_detect_modulations`` loop computed them."""
+    modulations: list[dict[str, Any]] = []
+    segment_length = len(chords) // 4 if len(chords) >= 4 else len(chords)
+    if segment_length < 2:
+        return modulations
+
+    prev_key = prev_mode = None
+    for i in range(0, len(chords), segment_length):
+        segment_chords = chords[i : i + segment_length]
+        start_frame = int(segment_chords[0]["time"] * sr / HOP_LENGTH)
+        end_frame = int(segment_chords[-1]["time"] * sr / HOP_LENGTH)
+        segment_chroma = chroma[:, start_frame:end_frame]
+        if segment_chroma.shape[1] == 0:
+            continue
+
+        key, mode = _reference_key(segment_chroma)
+        if prev_key is not None and (key != prev_key or mode != prev_mode):
+            modulations.append(
+                {
+                    "time": segment_chords[0]["time"],
+                    "from_key": f"{prev_key} {prev_mode}",
+                    "to_key": f"{key} {mode}",
+                }
+            )
+        prev_key, prev_mode = key, mode
+    return modulations
+
+
+def _random_chromagrams() -> list[np.ndarray]:
+    """Noisy chromagrams of varying length, some with shifting tonal centres."""
+    rng = np.random.default_rng(7)
+    chromagrams = []
+    for n_frames in (5, 21, 22, 64, 333, 1000):
+        chroma = rng.random((12, n_frames)) ** 3
+        # Emphasise a different triad in each quarter so keys change
+        for quarter, root in enumerate(rng.integers(0, 12, size=4)):
+            frames = slice(quarter * n_frames // 4, (quarter + 1) * n_frames // 4)
+            chroma[[root, (root + 4) % 12, (root + 7) % 12], frames] += 1.0
+        chromagrams.append(chroma / chroma.max(axis=0, keepdims=True))
+    return chromagrams
+
+
+@pytest.fixture(scope="module")
+def synthetic_chroma(tmp_path_factory: pytest.TempPathFactory) -> np.ndarray:
+    """Chromagram of the 30-second synthetic chord track."""
+    path = write_track(SyntheticTrack("chords", "30s"), tmp_path_factory.mktemp("corpus"))
+    return AudioContext(path, sample_rate=SR).chroma_cqt(hop_length=HOP_LENGTH)
+
+
+def test_detection_matches_reference_on_synthetic_track(synthetic_chroma: np.ndarray) -> None:
+    analyzer = ChordAnalyzer(sample_rate=SR)
+
+    chords = analyzer._detect_chords(synthetic_chroma, SR, hop_length=HOP_LENGTH)
+
+    assert chords == _reference_chords(synthetic_chroma, SR)
+    assert analyzer._detect_key(synthetic_chroma) == _reference_key(synthetic_chroma)
+    assert analyzer._detect_modulations(
+        chords, synthetic_chroma, SR, hop_length=HOP_LENGTH
+    ) == _reference_modulations(chords, synthetic_chroma, SR)
+
+
+@pytest.mark.parametrize("chroma", _random_chromagrams(), ids=lambda c: f"{c.shape[1]}frames")
+def test_detection_matches_reference_on_random_chroma(chroma: np.ndarray) -> None:
+    analyzer = ChordAnalyzer(sample_rate=SR)
+
+    chords = analyzer._detect_chords(chroma, SR, hop_length=HOP_LENGTH)
+    reference_chords = _reference_chords(chroma, SR)
+
+    assert chords == reference_chords
+    assert analyzer._detect_key(chroma) == _reference_key(chroma)
+    assert analyzer._detect_modulations(
+        chords, chroma, SR, hop_length=HOP_LENGTH
+    ) == _reference_modulations(reference_chords, chroma, SR)
@@ -0,0 +1,222 @@
+"""Duplicate upload matching and analysis reuse."""
+
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models import Analysis, Track, TrackAsset, TrackFingerprint
+from app.services.audio.fingerprint import (
+    Fingerprint,
+    compute_fingerprint,
+    score_matches,
+)
+from app.services.pipeline import dedup
+from benchmarks.corpus import SyntheticTrack, write_track
+
+ORIGINAL_ID, UNRELATED_ID = 1, 2
+SOURCE_LYRICS = "first verse\nchorus"
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_as_json(type_: JSONB, compiler: object, **kw: object) -> str:
+    return "JSON"
+
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory: pytest.TempPathFactory) -> dict[str, Path]:
+    """Two unrelated tracks plus a re-encoded and a trimmed copy of each."""
+    directory = tmp_path_factory.mktemp("corpus")
+    paths = {}
+    for kind in ("chords", "noise"):
+        original = write_track(SyntheticTrack(kind, "30s"), directory)
+        y, sr = sf.read(original, dtype="float32")
+        paths[kind] = original
+        # Lossy, quieter copy
+        paths[f"{kind}-mp3"] = directory / f"{kind}-copy.mp3"
+        sf.write(paths[f"{kind}-mp3"], 0.7 * y, sr, format="MP3")
+        # Leading silence trimmed, off the fingerprint's frame grid
+        paths[f"{kind}-trimmed"] = directory / f"{kind}-trimmed.wav"
+        sf.write(paths[f"{kind}-trimmed"], y[int(0.5 * sr) :], sr)
+    return paths
+
+
+def _index_rows(*entries: tuple[int, Fingerprint]) -> tuple[np.ndarray, ...]:
+    """(hashes, track_ids, offsets) as ``index_fingerprint`` stores them."""
+    hashes, track_ids, offsets = [], [], []
+    for track_id, fingerprint in entries:
+        pairs = np.unique(
+            np.stack([fingerprint.hashes, fingerprint.offsets], axis=1), axis=0
+        )
+        hashes.append(pairs[:, 0])
+        offsets.append(pairs[:, 1])
+        track_ids.append(np.full(len(pairs), track_id))
+    return tuple(
+        np.concatenate(parts).astype(np.int64) for parts in (hashes, track_ids, offsets)
+    )
+
+
+@pytest.mark.parametrize("kind", ["chords", "noise"])
+@pytest.mark.parametrize("copy", ["mp3", "trimmed"])
+def test_reencoded_or_trimmed_copy_matches(
+    corpus: dict[str, Path], kind: str, copy: str
+) -> None:
+    unrelated = "noise" if kind == "chords" else "chords"
+    hashes, track_ids, offsets = _index_rows(
+        (ORIGINAL_ID, compute_fingerprint(str(corpus[kind]))),
+        (UNRELATED_ID, compute_fingerprint(str(corpus[unrelated]))),
+    )
+    query = compute_fingerprint(str(corpus[f"{kind}-{copy}"]))
+    # The index lookup find_duplicate runs
+    hit = np.isin(hashes, query.lookup()[0])
+
+    scores = score_matches(query, hashes[hit], track_ids[hit], offsets[hit])
+
+    assert scores[ORIGINAL_ID] >= settings.FINGERPRINT_MATCH_THRESHOLD
+    assert scores.get(UNRELATED_ID, 0.0) < settings.FINGERPRINT_MATCH_THRESHOLD
+
+
+def test_identical_audio_scores_one(corpus: dict[str, Path]) -> None:
+    fingerprint = compute_fingerprint(str(corpus["chords"]))
+    hashes, track_ids, offsets = _index_rows((ORIGINAL_ID, fingerprint))
+
+    assert score_matches(fingerprint, hashes, track_ids, offsets) == {ORIGINAL_ID: 1.0}
+
+
+@pytest.fixture
+async def db(tmp_path: Path) -> AsyncIterator[AsyncSession]:
+    """Session on a fresh SQLite database with every table."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+
+    # pysqlite's own transaction handling breaks SAVEPOINT; let SQLAlchemy
+    # emit BEGIN itself
+    @event.listens_for(engine.sync_engine, "connect")
+    def _autocommit_driver(dbapi_connection: object, _: object) -> None:
+        dbapi_connection.isolation_level = None  # type: ignore[attr-defined]
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin(connection: object) -> None:
+        connection.exec_driver_sql("BEGIN")  # type: ignore[attr-defined]
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+async def _track(
+    db: AsyncSession, user_id: int, audio_path: Path, lyrics: str | None = None
+) -> tuple[Track, TrackAsset]:
+    track = Track(title=f"upload by {user_id}", user_id=user_id, duration=30.0)
+    db.add(track)
+    await db.flush()
+    asset = TrackAsset(
+        track_id=track.id, audio_path=str(audio_path), lyrics_text=lyrics
+    )
+    db.add(asset)
+    await db.flush()
+    return track, asset
+
+
+async def _analyzed_source(db: AsyncSession, user_id: int, audio_path: Path) -> Track:
+    """An analyzed track with acquired lyrics, indexed by its exact bytes."""
+    source, _ = await _track(db, user_id, audio_path, lyrics=SOURCE_LYRICS)
+    db.add(
+        Analysis(
+            track_id=source.id, sonic_genome={"tempo": 100.0}, tunescore={"overall": 71}
+        )
+    )
+    await dedup.index_fingerprint(
+        db,
+        source.id,
+        dedup.audio_content_hash(audio_path),
+        compute_fingerprint(str(audio_path)),
+    )
+    await db.commit()
+    return source
+
+
+async def _analyses(db: AsyncSession, track_id: int) -> list[Analysis]:
+    result = await db.execute(select(Analysis).where(Analysis.track_id == track_id))
+    return list(result.scalars())
+
+
+async def test_clone_analysis_refuses_another_owners_track(
+    db: AsyncSession, corpus: dict[str, Path]
+) -> None:
+    source = await _analyzed_source(db, user_id=1, audio_path=corpus["chords"])
+    track, asset = await _track(db, user_id=2, audio_path=corpus["chords"])
+
+    cloned = await dedup.clone_analysis(db, source.id, track, asset)
+
+    assert cloned is None
+    assert await _analyses(db, track.id) == []
+    assert asset.lyrics_text is None
+
+
+async def test_clone_analysis_copies_the_owners_track(
+    db: AsyncSession, corpus: dict[str, Path]
+) -> None:
+    source = await _analyzed_source(db, user_id=1, audio_path=corpus["chords"])
+    track, asset = await _track(db, user_id=1, audio_path=corpus["chords"])
+
+    cloned = await dedup.clone_analysis(db, source.id, track, asset)
+
+    assert cloned is not None
+    assert cloned.sonic_genome == {"tempo": 100.0}
+    assert cloned.ai_costs == {}
+    assert asset.lyrics_text == SOURCE_LYRICS
+
+
+async def test_deduplicate_upload_reuses_a_reencoded_copy(
+    db: AsyncSession, corpus: dict[str, Path], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "ANALYSIS_POOL_ENABLED", False)
+    source = await _analyzed_source(db, user_id=1, audio_path=corpus["chords"])
+    track, asset = await _track(db, user_id=1, audio_path=corpus["chords-mp3"])
+
+    cloned, match = await dedup.deduplicate_upload(db, track, asset)
+
+    assert match is not None
+    assert (match.track_id, match.exact) == (source.id, False)
+    assert cloned is not None
+    assert cloned.tunescore == {"overall": 71}
+    indexed = await db.get(TrackFingerprint, track.id)
+    assert indexed is not None
+    assert indexed.duplicate_of_id == source.id
+
+
+async def test_deduplicate_upload_rolls_back_its_savepoint_on_failure(
+    db: AsyncSession, corpus: dict[str, Path], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "ANALYSIS_POOL_ENABLED", False)
+    source = await _analyzed_source(db, user_id=1, audio_path=corpus["chords"])
+    track, asset = await _track(db, user_id=1, audio_path=corpus["chords"])
+    # Work of the caller's transaction from before the savepoint
+    track.title = "renamed before fingerprinting"
+    await db.flush()
+
+    async def failing_index(*args: object, **kwargs: object) -> None:
+        raise RuntimeError("index write failed")
+
+    monkeypatch.setattr(dedup, "index_fingerprint", failing_index)
+
+    cloned, match = await dedup.deduplicate_upload(db, track, asset)
+
+    assert (cloned, match) == (None, None)
+    # The clone made inside the savepoint is gone, the caller's work is not
+    assert await _analyses(db, track.id) == []
+    assert await db.get(TrackFingerprint, track.id) is None
+    assert asset.lyrics_text is None
+    assert track.title == "renamed before fingerprinting"
+    await db.commit()
+    assert len(await _analyses(db, source.id)) == 1
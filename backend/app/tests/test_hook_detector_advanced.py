@@ -0,0 +1,164 @@
+"""Vectorized window scoring of ViralHookDetector against the original loop."""
+
+import librosa
+import numpy as np
+import pytest
+
+from app.services.audio.context import AudioContext
+from app.services.audio.hook_detector_advanced import ViralHookDetector
+from app.services.audio.pitch import PitchTrajectory
+from benchmarks.corpus import SyntheticTrack, write_track
+
+SEGMENT_DURATION = 15.0
+HOP_LENGTH = 512
+
+# The loop averaged float32 frame features in float32, the prefix sums use
+# float64
+RTOL = 1e-6
+# Whole-track piptrack frames vs one piptrack per segment (edge padding)
+HOOK_TOLERANCE = 0.005
+
+
+def _reference_scores(
+    y: np.ndarray,
+    sr: int,
+    duration: float,
+    onsets: np.ndarray,
+    beats: np.ndarray,
+    novelty: np.ndarray,
+    energy: np.ndarray,
+) -> dict[str, np.ndarray]:
+    """Per-window factors as the original ``_score_segments`` loop computed them."""
+    factors: dict[str, list[float]] = {
+        "onset_density": [],
+        "beat_quality": [],
+        "energy": [],
+        "novelty": [],
+        "hook_memorability": [],
+        "score": [],
+    }
+    segment_samples = int(SEGMENT_DURATION * sr)
+
+    for start_sample in range(0, len(y) - segment_samples, sr):
+        end_sample = start_sample + segment_samples
+        start, end = start_sample / sr, end_sample / sr
+        start_frame, end_frame = start_sample // HOP_LENGTH, end_sample // HOP_LENGTH
+
+        segment_onsets = onsets[(onsets >= start) & (onsets < end)]
+        onset_score = min(1.0, len(segment_onsets) / (end - start) / 7.0)
+
+        segment_beats = beats[(beats >= start) & (beats < end)]
+        beat_score = 0.0
+        if len(segment_beats) >= 2:
+            intervals = np.diff(segment_beats)
+            regularity = 1.0 - np.std(intervals) / (np.mean(intervals) + 1e-6)
+            beat_score = max(0.0, min(1.0, regularity))
+
+        segment_energy = energy[start_frame:end_frame]
+        energy_score = (
+            min(1.0, np.mean(segment_energy) / (np.max(energy) + 1e-6))
+            if len(segment_energy)
+            else 0.0
+        )
+
+        segment_novelty = novelty[start_frame:end_frame]
+        novelty_score = min(1.0, np.mean(segment_novelty)) if len(segment_novelty) else 0.0
+
+        pitches, magnitudes = librosa.piptrack(y=y[start_sample:end_sample], sr=sr)
+        pitch_track = [
+            pitches[magnitudes[:, t].argmax(), t] for t in range(pitches.shape[1])
+        ]
+        pitch_track = [pitch for pitch in pitch_track if pitch > 0]
+        hook_score = 0.0
+        if len(pitch_track) >= 10:
+            consistency = 1.0 - np.std(pitch_track) / (np.mean(pitch_track) + 1e-6)
+            hook_score = max(0.0, min(1.0, consistency))
+
+        score = (
+            onset_score * 0.15
+            + beat_score * 0.20
+            + energy_score * 0.25
+            + novelty_score * 0.20
+            + hook_score * 0.20
+        )
+        if 15 < start < duration - 30:
+            score *= 1.1
+
+        factors["onset_density"].append(onset_score)
+        factors["beat_quality"].append(beat_score)
+        factors["energy"].append(energy_score)
+        factors["novelty"].append(novelty_score)
+        factors["hook_memorability"].append(hook_score)
+        factors["score"].append(score * 100)
+
+    return {name: np.array(values) for name, values in factors.items()}
+
+
+@pytest.fixture(scope="module")
+def chords_context(tmp_path_factory: pytest.TempPathFactory) -> AudioContext:
+    """Shared context of the 30-second synthetic chord track."""
+    path = write_track(SyntheticTrack("chords", "30s"), tmp_path_factory.mktemp("corpus"))
+    return AudioContext(path)
+
+
+def test_score_segments_matches_reference_loop(chords_context: AudioContext) -> None:
+    ctx = chords_context
+    detector = ViralHookDetector()
+    onsets = librosa.onset.onset_detect(
+        onset_envelope=ctx.onset_envelope, sr=ctx.sr, units="time"
+    )
+    beats = ctx.beat_times
+    novelty = detector._compute_novelty(ctx)
+    energy = ctx.rms
+
+    windows = detector._score_segments(
+        ctx, ctx.duration, onsets, beats, novelty, energy, SEGMENT_DURATION
+    )
+    reference = _reference_scores(
+        ctx.y, ctx.sr, ctx.duration, onsets, beats, novelty, energy
+    )
+
+    assert len(windows["start_time"]) == len(reference["score"]) > 0
+    for name in ("onset_density", "beat_quality", "energy", "novelty"):
+        np.testing.assert_allclose(windows[name], reference[name], rtol=RTOL, atol=1e-9)
+    np.testing.assert_allclose(
+        windows["hook_memorability"], reference["hook_memorability"], atol=HOOK_TOLERANCE
+    )
+    np.testing.assert_allclose(
+        windows["score"], reference["score"], atol=HOOK_TOLERANCE * 0.20 * 1.1 * 100
+    )
+
+
+def test_score_windows_handles_a_frame_offset(chords_context: AudioContext) -> None:
+    """Scoring from a trailing slice of the frames equals scoring the whole track."""
+    ctx = chords_context
+    detector = ViralHookDetector()
+    novelty = detector._compute_novelty(ctx)
+    energy = ctx.rms
+    trajectory = ctx.pitch_trajectory()
+    beats = ctx.beat_times
+    onsets = librosa.onset.onset_detect(
+        onset_envelope=ctx.onset_envelope, sr=ctx.sr, units="time"
+    )
+
+    offset = 200  # frames
+    starts = np.arange(offset * HOP_LENGTH, len(ctx.y) - 15 * ctx.sr, ctx.sr)
+    ends = starts + 15 * ctx.sr
+    args = (ctx.sr, HOP_LENGTH, ctx.duration, onsets, beats)
+
+    whole = detector._score_windows(
+        starts, ends, *args, novelty, energy, float(np.max(energy)), trajectory
+    )
+    sliced = detector._score_windows(
+        starts,
+        ends,
+        *args,
+        novelty[offset:],
+        energy[offset:],
+        float(np.max(energy)),
+        PitchTrajectory(trajectory.f0[offset:], trajectory.sr, trajectory.hop_length),
+        frame_offset=offset,
+    )
+
+    for name, values in whole.items():
+        np.testing.assert_allclose(sliced[name], values, rtol=1e-12, atol=1e-12)
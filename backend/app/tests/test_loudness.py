@@ -0,0 +1,108 @@
+"""BS.1770-4 loudness and true-peak metering of LoudnessMeter."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from app.services.audio.loudness import LoudnessMeter, measure_loudness
+from app.services.audio.mastering_analyzer import SILENCE_DB, MasteringAnalyzer
+
+SR = 48000
+
+
+def _sine(
+    freq: float, seconds: float = 10.0, amplitude: float = 1.0, phase: float = 0.0
+) -> np.ndarray:
+    t = np.arange(int(seconds * SR)) / SR
+    return amplitude * np.sin(2 * np.pi * freq * t + phase)
+
+
+def test_full_scale_997hz_sine_reads_minus_3_01_lufs() -> None:
+    # BS.1770-4: a 0 dBFS 997 Hz sine in one channel reads -3.01 LKFS
+    measurement = measure_loudness(_sine(997), SR)
+
+    assert measurement.integrated_lufs == pytest.approx(-3.01, abs=0.01)
+    assert measurement.max_short_term_lufs == pytest.approx(-3.01, abs=0.01)
+    assert measurement.loudness_range == pytest.approx(0.0, abs=0.01)
+
+
+def test_minus_20_dbfs_stereo_sine_reads_minus_20_lufs() -> None:
+    channel = _sine(997, amplitude=10 ** (-20 / 20))
+
+    measurement = measure_loudness(np.stack([channel, channel]), SR)
+
+    assert measurement.integrated_lufs == pytest.approx(-20.0, abs=0.01)
+
+
+@pytest.mark.parametrize("block_seconds", [0.05, 1.0, 3.7, 100.0])
+def test_result_does_not_depend_on_block_size(block_seconds: float) -> None:
+    rng = np.random.default_rng(3)
+    tone = _sine(440, seconds=12, amplitude=0.3)
+    audio = 0.2 * rng.standard_normal((2, 12 * SR)) + tone
+    expected = measure_loudness(audio, SR, block_seconds=10.0)
+
+    measurement = measure_loudness(audio, SR, block_seconds=block_seconds)
+
+    assert measurement.integrated_lufs == pytest.approx(expected.integrated_lufs, abs=1e-9)
+    assert measurement.true_peak_dbtp == pytest.approx(expected.true_peak_dbtp, abs=1e-6)
+    assert measurement.dynamic_range == pytest.approx(expected.dynamic_range, abs=1e-9)
+    assert measurement.short_term_lufs == expected.short_term_lufs
+
+
+def test_silence_reads_the_absolute_gate() -> None:
+    meter = LoudnessMeter(SR, 2)
+    meter.process(np.zeros((2, 5 * SR)))
+
+    measurement = meter.result()
+
+    assert measurement.integrated_lufs == -70.0
+    assert measurement.max_momentary_lufs == -70.0
+    assert set(measurement.short_term_lufs) == {-70.0}
+    assert measurement.sample_peak_db == -np.inf
+
+
+def test_mastering_clamps_silence_to_silence_db(tmp_path: Path) -> None:
+    path = tmp_path / "silence.wav"
+    sf.write(path, np.zeros((5 * SR, 2), dtype=np.float32), SR)
+
+    result = MasteringAnalyzer().analyze(str(path))
+
+    assert result["lufs"] == -70.0
+    assert result["peak_db"] == SILENCE_DB
+    assert result["true_peak_dbtp"] == SILENCE_DB
+    assert result["rms_db"] == SILENCE_DB
+
+
+def test_true_peak_catches_inter_sample_peaks() -> None:
+    # A quarter-rate sine sampled 45 degrees off its crests: the samples sit
+    # 3 dB below the waveform's peak
+    measurement = measure_loudness(_sine(SR / 4, amplitude=0.5, phase=np.pi / 4), SR)
+
+    assert measurement.sample_peak_db == pytest.approx(-9.03, abs=0.01)
+    assert measurement.true_peak_dbtp == pytest.approx(-6.02, abs=0.1)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_true_peak_is_at_least_sample_peak(seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    audio = rng.uniform(-1, 1, size=(2, 3 * SR)) * rng.uniform(0.01, 1)
+
+    measurement = measure_loudness(audio, SR)
+
+    assert measurement.true_peak_dbtp >= measurement.sample_peak_db
+
+
+def test_integrated_loudness_matches_pyloudnorm() -> None:
+    pyloudnorm = pytest.importorskip("pyloudnorm")
+    rng = np.random.default_rng(11)
+    # Loud and quiet passages, so both gates matter
+    envelope = np.repeat(rng.choice([0.02, 0.1, 0.5], size=20), SR)
+    tone = _sine(220, seconds=20, amplitude=0.5)
+    audio = envelope * (0.3 * rng.standard_normal((2, 20 * SR)) + tone)
+
+    measurement = measure_loudness(audio, SR)
+
+    expected = pyloudnorm.Meter(SR).integrated_loudness(audio.T)
+    assert measurement.integrated_lufs == pytest.approx(expected, abs=0.1)
@@ -0,0 +1,107 @@
+"""Timeouts, crash recovery and worker recycling of AnalysisProcessPool."""
+
+import os
+import time
+from collections.abc import AsyncIterator
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import pytest
+
+from app.services.compute import AnalysisProcessPool
+
+# Spawned workers import this module to unpickle the task functions below
+
+
+def _pid() -> int:
+    return os.getpid()
+
+
+def _sleep(seconds: float) -> int:
+    time.sleep(seconds)
+    return os.getpid()
+
+
+def _raise(message: str) -> None:
+    raise ValueError(message)
+
+
+def _crash(attempts_file: str) -> None:
+    with open(attempts_file, "a") as f:
+        f.write(f"{os.getpid()}\n")
+    os._exit(1)
+
+
+def _crash_once(marker: str) -> str:
+    if not os.path.exists(marker):
+        Path(marker).touch()
+        os._exit(1)
+    return "recovered"
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+@pytest.fixture
+async def pool() -> AsyncIterator[AnalysisProcessPool]:
+    pool = AnalysisProcessPool(max_workers=1, warm_modules=())
+    yield pool
+    pool.shutdown()
+
+
+async def test_timeout_kills_and_replaces_the_worker(pool: AnalysisProcessPool) -> None:
+    first = await pool.run(_pid)
+
+    with pytest.raises(TimeoutError, match="_sleep timed out after 0.2s"):
+        await pool.run(_sleep, 30, timeout=0.2)
+
+    second = await pool.run(_pid)
+    assert second != first
+    assert not _alive(first)
+    assert len(pool._workers) == 1
+
+
+async def test_task_errors_keep_the_worker(pool: AnalysisProcessPool) -> None:
+    first = await pool.run(_pid)
+
+    with pytest.raises(ValueError, match="bad input"):
+        await pool.run(_raise, "bad input")
+
+    assert await pool.run(_pid) == first
+
+
+async def test_crashed_task_is_retried_once_then_raised(
+    pool: AnalysisProcessPool, tmp_path: Path
+) -> None:
+    attempts_file = tmp_path / "attempts"
+
+    with pytest.raises(BrokenProcessPool, match="crashed while running _crash"):
+        await pool.run(_crash, str(attempts_file))
+
+    pids = attempts_file.read_text().split()
+    assert len(pids) == 2
+    assert pids[0] != pids[1]
+    # The pool still works afterwards
+    assert int(pids[1]) != await pool.run(_pid)
+
+
+async def test_crash_then_success_on_the_retry(
+    pool: AnalysisProcessPool, tmp_path: Path
+) -> None:
+    assert await pool.run(_crash_once, str(tmp_path / "crashed")) == "recovered"
+
+
+async def test_max_tasks_per_child_recycles_workers() -> None:
+    pool = AnalysisProcessPool(max_workers=1, max_tasks_per_child=2, warm_modules=())
+    try:
+        pids = [await pool.run(_pid) for _ in range(5)]
+    finally:
+        pool.shutdown()
+
+    assert pids[0] == pids[1] != pids[2] == pids[3] != pids[4]
+    assert len(set(pids)) == 3
@@ -0,0 +1,180 @@
+"""Scheduling, failure handling and timeouts of the analysis StageGraph."""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+import pytest
+
+from app.services.pipeline.dag import Stage, StageGraph
+
+
+class Recorder:
+    """Progress callback that keeps every (stage, status, error) report."""
+
+    def __init__(self) -> None:
+        self.events: list[tuple[str, str, str | None]] = []
+
+    async def __call__(self, stage: str, status: str, error: str | None = None) -> None:
+        self.events.append((stage, status, error))
+
+    def statuses(self, stage: str) -> list[str]:
+        return [status for name, status, _ in self.events if name == stage]
+
+
+StageFn = Callable[..., Awaitable[object]]
+
+
+def _value(result: object, delay: float = 0.0) -> StageFn:
+    async def stage(**inputs: object) -> object:
+        await asyncio.sleep(delay)
+        return (result, inputs) if inputs else result
+
+    return stage
+
+
+def _fail(message: str, delay: float = 0.0) -> StageFn:
+    async def stage(**inputs: object) -> object:
+        await asyncio.sleep(delay)
+        raise RuntimeError(message)
+
+    return stage
+
+
+async def test_stages_start_once_their_inputs_are_done() -> None:
+    log: list[str] = []
+
+    def tracked(name: str, delay: float) -> StageFn:
+        async def stage(**inputs: object) -> dict[str, object]:
+            log.append(f"{name} start")
+            await asyncio.sleep(delay)
+            log.append(f"{name} end")
+            return {"name": name, **inputs}
+
+        return stage
+
+    graph = StageGraph(
+        [
+            Stage("mix", tracked("mix", 0.05), inputs=("decode", "stems")),
+            Stage("stems", tracked("stems", 0.05), inputs=("decode",)),
+            Stage("decode", tracked("decode", 0.01)),
+            Stage("lyrics", tracked("lyrics", 0.05)),
+        ]
+    )
+
+    outcomes = await graph.run()
+
+    order = graph.order
+    assert order.index("decode") < order.index("stems") < order.index("mix")
+    assert log.index("decode end") < log.index("stems start")
+    assert log.index("stems end") < log.index("mix start")
+    # Independent stages overlap
+    assert log.index("lyrics start") < log.index("decode end")
+    assert outcomes["mix"].value == {
+        "name": "mix",
+        "decode": {"name": "decode"},
+        "stems": {"name": "stems", "decode": {"name": "decode"}},
+    }
+    assert all(outcome.status == "completed" for outcome in outcomes.values())
+
+
+async def test_non_critical_failure_keeps_other_results() -> None:
+    progress = Recorder()
+    graph = StageGraph(
+        [
+            Stage("decode", _value("audio")),
+            Stage("genre", _fail("model missing"), inputs=("decode",)),
+            Stage("tempo", _value(120), inputs=("decode",)),
+            Stage("summary", _value("summary"), inputs=("genre", "tempo")),
+        ]
+    )
+
+    outcomes = await graph.run(progress)
+
+    assert outcomes["genre"].status == "failed"
+    assert str(outcomes["genre"].error) == "model missing"
+    assert outcomes["tempo"].value == (120, {"decode": "audio"})
+    # Dependents of the failed stage still run, with None for its result
+    tempo = outcomes["tempo"].value
+    assert outcomes["summary"].value == ("summary", {"genre": None, "tempo": tempo})
+    assert ("genre", "failed", "model missing") in progress.events
+    assert progress.statuses("summary") == ["running", "completed"]
+
+
+async def test_critical_failure_cancels_running_and_dependent_stages() -> None:
+    progress = Recorder()
+    graph = StageGraph(
+        [
+            Stage("decode", _fail("corrupt upload", delay=0.02), critical=True),
+            Stage("features", _value("features"), inputs=("decode",)),
+            Stage("lyrics", _value("lyrics", delay=5.0)),
+        ]
+    )
+
+    started = time.perf_counter()
+    with pytest.raises(RuntimeError, match="corrupt upload"):
+        await graph.run(progress)
+
+    assert time.perf_counter() - started < 2.0
+    assert progress.statuses("lyrics") == ["running", "cancelled"]
+    assert progress.statuses("features") == []
+
+
+async def test_stage_timeout_fails_only_that_stage() -> None:
+    graph = StageGraph(
+        [
+            Stage("transcription", _value("words", delay=5.0), timeout=0.05),
+            Stage("slow_thread", lambda: time.sleep(0.5), kind="thread", timeout=0.05),
+            Stage("tempo", _value(120)),
+            Stage("summary", _value("summary"), inputs=("transcription",)),
+        ]
+    )
+
+    started = time.perf_counter()
+    outcomes = await graph.run()
+
+    assert time.perf_counter() - started < 2.0
+    for name in ("transcription", "slow_thread"):
+        assert outcomes[name].status == "failed"
+        assert isinstance(outcomes[name].error, TimeoutError)
+        assert f"Stage {name} timed out after 0.05s" in str(outcomes[name].error)
+    assert outcomes["tempo"].value == 120
+    assert outcomes["summary"].value == ("summary", {"transcription": None})
+
+
+async def test_when_false_skips_the_stage() -> None:
+    progress = Recorder()
+    graph = StageGraph(
+        [
+            Stage("lyrics", _value(None)),
+            Stage(
+                "themes",
+                _value("themes"),
+                inputs=("lyrics",),
+                when=lambda inputs: inputs["lyrics"] is not None,
+            ),
+            Stage("summary", _value("summary"), inputs=("themes",)),
+        ]
+    )
+
+    outcomes = await graph.run(progress)
+
+    assert outcomes["themes"].status == "skipped"
+    assert progress.statuses("themes") == ["skipped"]
+    assert outcomes["summary"].value == ("summary", {"themes": None})
+
+
+@pytest.mark.parametrize(
+    ("stages", "message"),
+    [
+        (
+            [Stage("a", _value(1), inputs=("b",)), Stage("b", _value(2), inputs=("a",))],
+            "cycle",
+        ),
+        ([Stage("a", _value(1), inputs=("missing",))], "unknown inputs"),
+        ([Stage("a", _value(1)), Stage("a", _value(2))], "Duplicate stage"),
+    ],
+)
+def test_invalid_graphs_are_rejected(stages: list[Stage], message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        StageGraph(stages)
@@ -0,0 +1 @@
+"""Offline CPU benchmarks of the audio analyzers (run scripts/benchmark_analyzers.py)."""
@@ -0,0 +1,332 @@
+"""Timing and memory benchmarks of the audio analyzers.
+
+Each benchmark runs one analyzer cold: the decode memo is cleared first and
+the analysis cache is expected to be disabled, so a measurement covers the
+decode plus every derived feature the analyzer needs. Runs use
+:func:`~app.services.instrumentation.timed_call`, the stage timer of the
+pipeline, for wall time, CPU time and peak RSS growth.
+
+Results are keyed "<track>/<benchmark>" and compared with a stored baseline;
+a benchmark regresses when it is slower or grows memory beyond the
+thresholds (and beyond an absolute noise floor).
+"""
+
+import os
+import platform
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import soundfile as sf
+
+from app.services.audio.context import AudioContext
+from app.services.audio.decoder import clear_decode_memo
+from app.services.instrumentation import timed_call
+
+from .corpus import CORPUS_VERSION
+
+# Per-analyzer benchmarks skip longer tracks, which the pipeline streams
+MAX_ANALYZER_SECONDS = 600
+
+# Differences below these are noise, whatever the relative change
+MIN_SLOWDOWN_SECONDS = 0.05
+MIN_MEMORY_GROWTH_MB = 16.0
+
+
+def _sonic_genome(path: str) -> Any:
+    from app.services.audio.feature_extraction import AudioFeatureExtractor
+
+    extractor = AudioFeatureExtractor()
+    return extractor.extract_sonic_genome(AudioContext(path, extractor.sample_rate))
+
+
+def _hook(path: str) -> Any:
+    from app.services.audio.feature_extraction import AudioFeatureExtractor
+
+    extractor = AudioFeatureExtractor()
+    return extractor.detect_hook(AudioContext(path, extractor.sample_rate))
+
+
+def _quality_metrics(path: str) -> Any:
+    from app.services.audio.feature_extraction import AudioFeatureExtractor
+
+    extractor = AudioFeatureExtractor()
+    return extractor.extract_quality_metrics(AudioContext(path, extractor.sample_rate))
+
+
+def _spectral(path: str) -> Any:
+    from app.services.audio.spectral_advanced import AdvancedSpectralAnalyzer
+
+    analyzer = AdvancedSpectralAnalyzer()
+    return analyzer.analyze(AudioContext(path, analyzer.sample_rate))
+
+
+def _mastering(path: str) -> Any:
+    from app.services.audio.mastering_analyzer import MasteringAnalyzer
+
+    analyzer = MasteringAnalyzer()
+    return analyzer.analyze(AudioContext(path, analyzer.sample_rate))
+
+
+def _chords(path: str) -> Any:
+    from app.services.audio.chord_analyzer import ChordAnalyzer
+
+    analyzer = ChordAnalyzer()
+    return analyzer.analyze(AudioContext(path, analyzer.sample_rate))
+
+
+def _viral_segments(path: str) -> Any:
+    from app.services.audio.hook_detector_advanced import ViralHookDetector
+
+    detector = ViralHookDetector()
+    return detector.detect_viral_segments(
+        AudioContext(path, detector.sample_rate), segment_duration=15.0, top_n=5
+    )
+
+
+def _genre_hybrid(path: str) -> Any:
+    from app.services.classification import detect_genre_hybrid
+
+    result = detect_genre_hybrid(path, {}, None)
+    # The hybrid detector degrades to heuristics when a model fails; timing
+    # that would hide the model cost, so treat it as unavailable
+    components = result.get("components") or {}
+    for component in ("ml", "instruments"):
+        error = (components.get(component) or {}).get("error")
+        if error:
+            raise RuntimeError(f"{component} model failed: {error}")
+    if result.get("method") != "hybrid_ml_instrument":
+        raise RuntimeError("ML dependencies not installed")
+    return result
+
+
+def _extract_audio_features(path: str) -> Any:
+    from app.services.audio.feature_extraction import extract_audio_features
+
+    return extract_audio_features(path)
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """One analyzer entry point."""
+
+    name: str
+    fn: Callable[[str], Any]
+    max_seconds: float | None = MAX_ANALYZER_SECONDS
+    needs_models: bool = False  # Hugging Face models, from the local cache only
+
+
+BENCHMARKS = (
+    Benchmark("decode", lambda path: AudioContext(path).y),
+    Benchmark("sonic_genome", _sonic_genome),
+    Benchmark("hook", _hook),
+    Benchmark("quality_metrics", _quality_metrics),
+    Benchmark("spectral_advanced", _spectral),
+    Benchmark("mastering", _mastering),
+    Benchmark("chords", _chords),
+    Benchmark("viral_segments", _viral_segments),
+    Benchmark("genre_hybrid", _genre_hybrid, needs_models=True),
+    # Streams long audio, like the pipeline
+    Benchmark("extract_audio_features", _extract_audio_features, max_seconds=None),
+)
+
+
+@dataclass
+class Measurement:
+    """Aggregate of the repeated runs of one benchmark on one track."""
+
+    wall_seconds: float  # Median
+    cpu_seconds: float | None  # Median
+    peak_rss_mb: float | None  # Largest
+    runs: int
+
+
+@dataclass
+class Regression:
+    """A benchmark beyond its baseline thresholds."""
+
+    key: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return self.current / self.baseline - 1 if self.baseline else float("inf")
+
+
+@dataclass
+class BenchmarkReport:
+    """Results of one benchmark run, in the baseline file format."""
+
+    corpus_version: int = CORPUS_VERSION
+    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    machine: dict[str, Any] = field(
+        default_factory=lambda: {
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpus": os.cpu_count(),
+            "python": platform.python_version(),
+        }
+    )
+    results: dict[str, Measurement] = field(default_factory=dict)
+    skipped: dict[str, str] = field(default_factory=dict)  # key -> reason
+
+    def to_json(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "BenchmarkReport":
+        report = cls(
+            corpus_version=data.get("corpus_version", 0),
+            created_at=data.get("created_at", ""),
+            machine=data.get("machine", {}),
+            skipped=data.get("skipped", {}),
+        )
+        report.results = {
+            key: Measurement(**value) for key, value in data.get("results", {}).items()
+        }
+        return report
+
+
+def measure(benchmark: Benchmark, path: str, repeat: int) -> Measurement:
+    """
+    Run a benchmark cold ``repeat`` times.
+
+    Args:
+        benchmark: Benchmark to run
+        path: Audio file
+        repeat: Number of runs
+
+    Returns:
+        Aggregated measurement
+
+    Raises:
+        Exception: Whatever the analyzer raises
+    """
+    walls, cpus, peaks = [], [], []
+    for _ in range(repeat):
+        clear_decode_memo()
+        _, timings = timed_call(
+            benchmark.name, benchmark.fn, path, cpu_clock=time.process_time
+        )
+        timing = timings[-1]
+        walls.append(timing.wall_seconds)
+        if timing.cpu_seconds is not None:
+            cpus.append(timing.cpu_seconds)
+        if timing.peak_rss_delta_bytes is not None:
+            peaks.append(timing.peak_rss_delta_bytes / 2**20)
+    return Measurement(
+        wall_seconds=round(statistics.median(walls), 4),
+        cpu_seconds=round(statistics.median(cpus), 4) if cpus else None,
+        peak_rss_mb=round(max(peaks), 1) if peaks else None,
+        runs=repeat,
+    )
+
+
+def audio_duration(path: str | Path) -> float:
+    """Duration of an audio file from its header."""
+    info = sf.info(str(path))
+    return info.frames / info.samplerate
+
+
+def run_benchmarks(
+    tracks: dict[str, Path],
+    benchmarks: tuple[Benchmark, ...] = BENCHMARKS,
+    repeat: int = 3,
+    warmup: Path | None = None,
+    log: Callable[[str], None] = print,
+) -> BenchmarkReport:
+    """
+    Run every benchmark on every track.
+
+    Args:
+        tracks: Track name -> audio file
+        benchmarks: Benchmarks to run
+        repeat: Runs per measurement (tracks over 10 minutes run once)
+        warmup: Short file run through every benchmark first, unmeasured, so
+            imports, numba compilation and model loading are not timed
+        log: Progress output
+
+    Returns:
+        Report with a measurement or a skip reason per "<track>/<benchmark>"
+    """
+    report = BenchmarkReport()
+    unavailable: dict[str, str] = {}
+
+    if warmup is not None:
+        for benchmark in benchmarks:
+            try:
+                benchmark.fn(str(warmup))
+            except Exception as e:
+                if benchmark.needs_models:
+                    unavailable[benchmark.name] = f"models unavailable offline: {e}"
+                else:
+                    raise
+
+    for track_name, path in tracks.items():
+        duration = audio_duration(path)
+        for benchmark in benchmarks:
+            key = f"{track_name}/{benchmark.name}"
+            if benchmark.name in unavailable:
+                report.skipped[key] = unavailable[benchmark.name]
+                continue
+            if benchmark.max_seconds is not None and duration > benchmark.max_seconds:
+                report.skipped[key] = f"longer than {benchmark.max_seconds:.0f}s"
+                continue
+
+            runs = repeat if duration <= MAX_ANALYZER_SECONDS else 1
+            measurement = measure(benchmark, str(path), runs)
+            report.results[key] = measurement
+            peak = measurement.peak_rss_mb
+            log(
+                f"   {key:<45} {measurement.wall_seconds:8.3f}s  "
+                + (f"{peak:7.1f} MB" if peak is not None else "    n/a")
+            )
+    return report
+
+
+def compare(
+    report: BenchmarkReport,
+    baseline: BenchmarkReport,
+    max_slowdown: float = 0.25,
+    max_memory_growth: float = 0.25,
+) -> list[Regression]:
+    """
+    Find benchmarks that regressed against a baseline.
+
+    Args:
+        report: Current results
+        baseline: Stored baseline
+        max_slowdown: Allowed relative wall time increase
+        max_memory_growth: Allowed relative peak RSS increase
+
+    Returns:
+        Regressions (empty if all benchmarks are within thresholds)
+    """
+    regressions = []
+    for key, current in report.results.items():
+        previous = baseline.results.get(key)
+        if previous is None:
+            continue
+        if (
+            current.wall_seconds > previous.wall_seconds * (1 + max_slowdown)
+            and current.wall_seconds - previous.wall_seconds > MIN_SLOWDOWN_SECONDS
+        ):
+            regressions.append(
+                Regression(key, "wall_seconds", previous.wall_seconds, current.wall_seconds)
+            )
+        if (
+            current.peak_rss_mb is not None
+            and previous.peak_rss_mb is not None
+            and current.peak_rss_mb > previous.peak_rss_mb * (1 + max_memory_growth)
+            and current.peak_rss_mb - previous.peak_rss_mb > MIN_MEMORY_GROWTH_MB
+        ):
+            regressions.append(
+                Regression(key, "peak_rss_mb", previous.peak_rss_mb, current.peak_rss_mb)
+            )
+    return regressions
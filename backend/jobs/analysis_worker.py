@@ -0,0 +1,155 @@
+"""Analysis queue worker.
+
+Claims upload analysis jobs from the ``analysis_jobs`` table and runs the full
+analysis pipeline. Start as many workers as the machine has capacity for;
+workers on different machines share the same queue through Postgres.
+
+Usage:
+    python jobs/analysis_worker.py                  # run until SIGTERM/SIGINT
+    python jobs/analysis_worker.py --once           # drain the queue and exit
+    python jobs/analysis_worker.py --concurrency 2  # jobs in flight at once
+"""
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import os
+import signal
+import socket
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.core.database import close_database
+from app.services.compute import get_process_pool, shutdown_process_pool
+from app.services.models import preload_models
+from app.services.pipeline import (
+    JobClaimLost,
+    JobProgress,
+    claim_next_job,
+    run_analysis_job,
+)
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_INTERVAL_SECONDS = 30
+
+
+async def _heartbeat(progress: JobProgress) -> None:
+    """Keep a long-running stage from looking like a dead worker."""
+    try:
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL_SECONDS)
+            await progress.heartbeat()
+    except JobClaimLost as e:
+        # The pipeline stops at its next stage report
+        logger.warning(f"{e}; stopping its heartbeat")
+
+
+async def _process_jobs(
+    worker_id: str, stop: asyncio.Event, once: bool, stats: dict[str, int]
+) -> None:
+    """Claim and run jobs one at a time until stopped."""
+    while not stop.is_set():
+        try:
+            job = await claim_next_job(worker_id)
+        except Exception as e:
+            logger.error(f"Failed to claim analysis job: {e}")
+            job = None
+
+        if job is None:
+            if once:
+                return
+            # Sleep until the next poll, waking early on shutdown
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    stop.wait(), timeout=settings.ANALYSIS_WORKER_POLL_SECONDS
+                )
+            continue
+
+        # A claimed job always runs to completion; shutdown waits for it
+        progress = JobProgress(job)
+        heartbeat = asyncio.create_task(_heartbeat(progress))
+        try:
+            succeeded = await run_analysis_job(job, progress)
+        finally:
+            heartbeat.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await heartbeat
+
+        stats["completed" if succeeded else "failed"] += 1
+
+
+async def run_worker(concurrency: int = 1, once: bool = False) -> dict[str, int]:
+    """
+    Process analysis jobs until stopped.
+
+    Concurrent jobs share this process's analysis process pool, so their
+    CPU-bound stages run on separate cores.
+
+    Args:
+        concurrency: Number of jobs to run at the same time
+        once: Exit when the queue is empty instead of polling
+
+    Returns:
+        Dictionary with processing stats
+    """
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    stats = {"completed": 0, "failed": 0}
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    logger.info(f"Analysis worker {worker_id} started ({concurrency} concurrent jobs)")
+
+    await asyncio.gather(
+        *(_process_jobs(worker_id, stop, once, stats) for _ in range(max(1, concurrency)))
+    )
+
+    logger.info(
+        f"Analysis worker {worker_id} stopping: "
+        f"{stats['completed']} completed, {stats['failed']} failed"
+    )
+    return stats
+
+
+async def main() -> None:
+    """Main entry point for the worker."""
+    parser = argparse.ArgumentParser(description="TuneScore analysis worker")
+    parser.add_argument(
+        "--once", action="store_true", help="Exit once the queue is empty"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Jobs to run at once (default: analysis process pool size)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    pool = get_process_pool()
+    if pool is not None:
+        await pool.warm_up()
+    concurrency = args.concurrency or (pool.max_workers if pool else 1)
+    await asyncio.to_thread(preload_models)
+
+    try:
+        await run_worker(concurrency=concurrency, once=args.once)
+    finally:
+        shutdown_process_pool()
+        await close_database()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
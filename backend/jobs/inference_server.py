@@ -0,0 +1,60 @@
+"""Local inference server.
+
+Hosts the ML models (genre, instruments, embeddings, themes, transcription)
+for every API worker and analysis process on this host, so each model is
+loaded once. Clients connect over ``INFERENCE_SOCKET_PATH`` when
+``INFERENCE_SERVER_ENABLED`` is set.
+
+Usage:
+    python jobs/inference_server.py                 # run until SIGTERM/SIGINT
+    python jobs/inference_server.py --socket /path  # override the socket path
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.services.inference import InferenceServer
+from app.services.models import preload_models
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    """Main entry point for the inference server."""
+    parser = argparse.ArgumentParser(description="TuneScore inference server")
+    parser.add_argument(
+        "--socket",
+        default=settings.INFERENCE_SOCKET_PATH,
+        help="Unix socket path (default: INFERENCE_SOCKET_PATH)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    # Load MODEL_PRELOAD before accepting requests; others load on first use
+    await asyncio.to_thread(preload_models)
+
+    server = InferenceServer(
+        args.socket, batch_concurrency=settings.INFERENCE_BATCH_MAX_SIZE
+    )
+    await server.serve_until(stop)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
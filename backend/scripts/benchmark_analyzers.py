@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark the audio analyzers against a stored baseline.
+
+Times every analyzer and the full extract_audio_features run on a
+deterministic synthetic corpus (click track, chord progression, pink noise
+at 30 s and 4 min, plus 60 min with --long) and on any fixture audio given,
+records peak memory, and compares with the baseline JSON. Runs offline on
+CPU: the analysis cache is disabled, and Hugging Face models are only used
+if already in the local cache (genre_hybrid is skipped otherwise).
+
+Usage:
+    python scripts/benchmark_analyzers.py
+    python scripts/benchmark_analyzers.py --long --only chords,mastering
+    python scripts/benchmark_analyzers.py --update-baseline
+    python scripts/benchmark_analyzers.py --fixtures ~/audio/fixtures --repeat 5
+
+Exits with status 1 if any benchmark regressed.
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+# Offline, CPU-only and uncached, before any app module reads the environment
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "")
+os.environ["ANALYSIS_CACHE_ENABLED"] = "false"
+os.environ["INFERENCE_SERVER_ENABLED"] = "false"
+os.environ["PROMETHEUS_MULTIPROC_DIR"] = ""  # Keep timings out of the shared metrics
+os.environ.setdefault("PITCH_SOURCE", "mix")
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://localhost/unused")
+os.environ.setdefault("JWT_SECRET", "unused")
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from benchmarks.corpus import SyntheticTrack, synthetic_corpus, write_track
+from benchmarks.runner import BENCHMARKS, BenchmarkReport, compare, run_benchmarks
+
+DEFAULT_BASELINE = backend_path / "benchmarks" / "baseline.json"
+DEFAULT_CORPUS_DIR = backend_path / "files" / "cache" / "benchmarks"
+FIXTURE_EXTENSIONS = {".mp3", ".wav", ".flac", ".m4a", ".ogg"}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the audio analyzers")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--output", type=Path, help="Also write this run's results here")
+    parser.add_argument("--corpus-dir", type=Path, default=DEFAULT_CORPUS_DIR)
+    parser.add_argument("--fixtures", type=Path, help="Directory of real audio files to include")
+    parser.add_argument("--long", action="store_true", help="Include the 60-minute tracks")
+    parser.add_argument("--only", help="Comma-separated benchmark names")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    parser.add_argument("--max-slowdown", type=float, default=0.25, help="Allowed wall time increase")
+    parser.add_argument("--max-memory-growth", type=float, default=0.25, help="Allowed peak RSS increase")
+    args = parser.parse_args()
+
+    benchmarks = BENCHMARKS
+    if args.only:
+        names = {name.strip() for name in args.only.split(",")}
+        unknown = names - {benchmark.name for benchmark in BENCHMARKS}
+        if unknown:
+            print(f"❌ Unknown benchmarks: {', '.join(sorted(unknown))}")
+            sys.exit(2)
+        benchmarks = tuple(benchmark for benchmark in BENCHMARKS if benchmark.name in names)
+
+    print("🎛️  Rendering synthetic corpus...")
+    lengths = ("30s", "4min", "60min") if args.long else ("30s", "4min")
+    tracks = synthetic_corpus(args.corpus_dir, lengths)
+    if args.fixtures:
+        for path in sorted(args.fixtures.iterdir()):
+            if path.suffix.lower() in FIXTURE_EXTENSIONS:
+                tracks[f"fixture:{path.name}"] = path
+    warmup = write_track(SyntheticTrack("chords", "30s"), args.corpus_dir)
+
+    print(f"⏱️  Running {len(benchmarks)} benchmarks on {len(tracks)} tracks...")
+    report = run_benchmarks(tracks, benchmarks, repeat=args.repeat, warmup=warmup)
+    for key, reason in report.skipped.items():
+        print(f"   ⏭️  {key}: {reason}")
+
+    if args.output:
+        args.output.write_text(json.dumps(report.to_json(), indent=2))
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report.to_json(), indent=2))
+        print(f"✅ Baseline written to {args.baseline}")
+        sys.exit(0)
+
+    if not args.baseline.exists():
+        print(f"⚠️  No baseline at {args.baseline}; run with --update-baseline to create one")
+        sys.exit(0)
+
+    baseline = BenchmarkReport.from_json(json.loads(args.baseline.read_text()))
+    if baseline.corpus_version != report.corpus_version:
+        print("⚠️  Baseline was recorded on another corpus version; re-record it")
+        sys.exit(0)
+    if baseline.machine != report.machine:
+        print(f"⚠️  Baseline machine differs: {baseline.machine}")
+
+    regressions = compare(report, baseline, args.max_slowdown, args.max_memory_growth)
+    for regression in regressions:
+        print(
+            f"   ❌ {regression.key} {regression.metric}: "
+            f"{regression.baseline:g} -> {regression.current:g} ({regression.change:+.0%})"
+        )
+    print("❌ Regressions found" if regressions else "✅ No regressions against the baseline")
+    sys.exit(1 if regressions else 0)
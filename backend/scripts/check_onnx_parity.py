@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Check ONNX classifier exports against their PyTorch models.
+
+Exports (and int8-quantizes) the genre and instrument classifiers if needed,
+then compares class probabilities with PyTorch on the synthetic fixture clips
+plus any audio files given. The stored parity report is replaced, so a model
+that failed before is retried with the current tolerances.
+
+Usage:
+    python scripts/check_onnx_parity.py
+    python scripts/check_onnx_parity.py --model genre --backend onnx song1.mp3 song2.wav
+
+Exits with status 1 if any model fails.
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_path))
+
+from app.services.audio.decoder import load_audio
+from app.services.audio.instrument_detection import MODEL_ID as INSTRUMENT_MODEL_ID
+from app.services.classification.genre_ml import DEFAULT_DURATION, GENRE_MODEL_ID
+from app.services.models.onnx_backend import (
+    ONNXRUNTIME_AVAILABLE,
+    check_parity,
+    fixture_clips,
+    load_onnx_classifier,
+)
+
+MODELS = {"genre": GENRE_MODEL_ID, "instrument": INSTRUMENT_MODEL_ID}
+
+
+def check_model(model_id: str, backend: str, audio_files: list[str]) -> bool:
+    """Run and store the parity check for one model; return whether it passed."""
+    print(f"\n📦 {model_id} ({backend})")
+    classifier = load_onnx_classifier(model_id, backend, verify=False)
+
+    sr = classifier.feature_extractor.sampling_rate
+    clips = fixture_clips(sr)
+    for path in audio_files:
+        audio, _ = load_audio(path, sr=sr, mono=True, duration=DEFAULT_DURATION)
+        clips.append(audio)
+
+    report = check_parity(model_id, classifier, backend, clips)
+    report_path = classifier.model_path.parent / f"parity.{backend}.json"
+    report_path.write_text(json.dumps(asdict(report), indent=2))
+
+    print(f"   Clips:            {report.clips}")
+    print(f"   Top-1 agreement:  {report.top1_agreement:.2%}")
+    print(f"   Max prob diff:    {report.max_abs_diff:.4f}")
+    print(f"   Mean prob diff:   {report.mean_abs_diff:.5f}")
+    print(f"   {'✅ PASSED' if report.passed else '❌ FAILED'} (report: {report_path})")
+    return report.passed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check ONNX classifier parity with PyTorch")
+    parser.add_argument("audio_files", nargs="*", help="Extra audio files to compare on")
+    parser.add_argument("--model", choices=[*MODELS, "all"], default="all")
+    parser.add_argument("--backend", choices=["onnx", "onnx-int8"], default="onnx-int8")
+    args = parser.parse_args()
+
+    if not ONNXRUNTIME_AVAILABLE:
+        print("❌ onnxruntime not installed: pip install onnxruntime onnx")
+        sys.exit(1)
+
+    names = list(MODELS) if args.model == "all" else [args.model]
+    results = [check_model(MODELS[name], args.backend, args.audio_files) for name in names]
+    sys.exit(0 if all(results) else 1)
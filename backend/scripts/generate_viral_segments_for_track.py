@@ -13,6 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import AsyncSessionLocal
 from app.models import Track, TrackAsset, Analysis
+from app.services.audio.context import AudioContext
 from app.services.audio.hook_detector_advanced import ViralHookDetector
 
 
@@ -49,8 +50,10 @@ async def generate_viral_segments(track_id: int):
         print(f"🎵 Generating viral segments for track {track_id}...")
         try:
             detector = ViralHookDetector()
+            # Reuses the stored frame-level features instead of re-decoding
+            ctx = AudioContext.from_feature_store(asset.audio_path, detector.sample_rate)
             viral_result = detector.detect_viral_segments(
-                asset.audio_path, 
+                ctx, 
                 segment_duration=15.0, 
                 top_n=5
             )
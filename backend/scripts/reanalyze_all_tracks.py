@@ -7,8 +7,18 @@ This script:
 2. Recalculates TuneScore with improved algorithm
 3. Adds songwriting quality analysis
 4. Properly manages database connections (no hanging connections)
+
+Usage:
+    python scripts/reanalyze_all_tracks.py                  # one track at a time
+    python scripts/reanalyze_all_tracks.py --concurrency 4  # tracks in flight at once
+
+With --concurrency above 1, analysis runs in threads and micro-batching is
+turned on for this process, so the genre/instrument classifier clips of
+concurrent tracks share forward passes (when the inference server is used,
+it batches them instead).
 """
 
+import argparse
 import asyncio
 import sys
 from pathlib import Path
@@ -23,8 +33,15 @@ from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
 from app.models import Analysis, Track, TrackAsset
-from app.services.audio.feature_extraction import AudioFeatureExtractor
+from app.services.audio.context import AudioContext
+from app.services.audio.feature_extraction import (
+    AudioFeatureExtractor,
+    quality_metrics_cache_version,
+    sonic_genome_cache_version,
+)
+from app.services.cache import cached_analysis
 from app.services.classification import detect_genre, detect_genre_hybrid
+from app.services.inference import enable_batching
 from app.services.lyrics.analysis import analyze_lyrics
 from app.services.scoring import calculate_tunescore
 
@@ -72,11 +89,18 @@ async def reanalyze_track(track_id: int, db: AsyncSession) -> dict:
         print(f"Re-analyzing Track {track_id}: {track.title}")
         print(f"{'='*60}")
         
+        # One lazy decode shared by both extractors; cache hits skip it entirely
+        extractor = AudioFeatureExtractor()
+        ctx = AudioContext(asset.audio_path, sample_rate=extractor.sample_rate)
+        
         # Re-extract sonic genome with new context-aware metrics (CRITICAL!)
         print("→ Re-extracting sonic genome with context-aware metrics...")
         try:
-            extractor = AudioFeatureExtractor()
-            sonic_genome = extractor.extract_sonic_genome(asset.audio_path)
+            sonic_genome = await asyncio.to_thread(
+                cached_analysis,
+                asset.audio_path, "sonic_genome", sonic_genome_cache_version(extractor),
+                lambda: extractor.extract_sonic_genome(ctx),
+            )
             
             old_dance = analysis.sonic_genome.get('danceability', 0) if analysis.sonic_genome else 0
             new_dance = sonic_genome.get('danceability', 0)
@@ -96,8 +120,12 @@ async def reanalyze_track(track_id: int, db: AsyncSession) -> dict:
         # Extract quality metrics (NEW!)
         print("→ Extracting quality metrics...")
         try:
-            extractor = AudioFeatureExtractor()
-            quality_metrics = extractor.extract_quality_metrics(asset.audio_path)
+            quality_metrics = await asyncio.to_thread(
+                cached_analysis,
+                asset.audio_path, "quality_metrics",
+                quality_metrics_cache_version(extractor, ctx),
+                lambda: extractor.extract_quality_metrics(ctx),
+            )
             
             analysis.quality_metrics = quality_metrics
             result["updated_fields"].append("quality_metrics")
@@ -134,7 +162,7 @@ async def reanalyze_track(track_id: int, db: AsyncSession) -> dict:
         if asset.lyrics_text:
             print("→ Re-analyzing lyrics with songwriting quality...")
             try:
-                lyrical_genome = analyze_lyrics(asset.lyrics_text)
+                lyrical_genome = await asyncio.to_thread(analyze_lyrics, asset.lyrics_text)
                 
                 old_sw_score = None
                 if analysis.lyrical_genome and 'songwriting_quality' in analysis.lyrical_genome:
@@ -157,7 +185,8 @@ async def reanalyze_track(track_id: int, db: AsyncSession) -> dict:
         # Re-detect genre using hybrid ML + instrument detection
         print("→ Re-detecting genre (hybrid ML + instruments)...")
         try:
-            genre_data = detect_genre_hybrid(
+            genre_data = await asyncio.to_thread(
+                detect_genre_hybrid,
                 asset.audio_path,
                 analysis.sonic_genome or {},
                 analysis.lyrical_genome
@@ -207,8 +236,12 @@ async def reanalyze_track(track_id: int, db: AsyncSession) -> dict:
     return result
 
 
-async def reanalyze_all_tracks():
+async def reanalyze_all_tracks(concurrency: int = 1):
     """Re-analyze all tracks with proper connection management."""
+    concurrency = max(1, concurrency)
+    if concurrency > 1:
+        # Concurrent tracks' classifier clips meet in this process's batchers
+        enable_batching()
     
     # Create engine with proper pool settings
     engine = create_async_engine(
@@ -216,7 +249,7 @@ async def reanalyze_all_tracks():
         echo=False,
         pool_pre_ping=True,  # Verify connections before using
         pool_recycle=3600,   # Recycle connections after 1 hour
-        pool_size=5,         # Small pool for batch processing
+        pool_size=max(5, concurrency),  # Small pool for batch processing
         max_overflow=0,      # No overflow connections
     )
     
@@ -243,14 +276,20 @@ async def reanalyze_all_tracks():
         
         # Process each track with its own session
         results = []
-        for track_id, title in tracks:
-            # Create fresh session for each track
-            async with async_session() as db:
-                result = await reanalyze_track(track_id, db)
-                results.append(result)
-            
-            # Small delay to avoid overwhelming the system
-            await asyncio.sleep(0.1)
+        remaining = iter(tracks)
+
+        async def worker():
+            for track_id, title in remaining:
+                # Create fresh session for each track
+                async with async_session() as db:
+                    result = await reanalyze_track(track_id, db)
+                    results.append(result)
+
+                # Small delay to avoid overwhelming the system
+                await asyncio.sleep(0.1)
+
+        # Workers share the track iterator
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
         
         # Print summary
         print(f"\n{'='*60}")
@@ -289,6 +328,12 @@ async def reanalyze_all_tracks():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-analyze all tracks")
+    parser.add_argument(
+        "--concurrency", type=int, default=1, help="Tracks to re-analyze at once"
+    )
+    args = parser.parse_args()
+
     print("="*60)
     print("TuneScore - Track Re-Analysis Script")
     print("="*60)
@@ -300,5 +345,5 @@ if __name__ == "__main__":
     print()
     
     # Run the re-analysis
-    asyncio.run(reanalyze_all_tracks())
+    asyncio.run(reanalyze_all_tracks(concurrency=args.concurrency))
 
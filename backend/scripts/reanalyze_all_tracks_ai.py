@@ -1,5 +1,10 @@
 #!/usr/bin/env python3
-"""Re-analyze all tracks with AI-enhanced pipeline (ungated features)."""
+"""Re-analyze all tracks with AI-enhanced pipeline (ungated features).
+
+Only the lyrics, tag and pitch-copy passes run here, on the stored lyrics
+and sonic genome. No audio analyzer runs, so the audio analysis cache has
+nothing to serve; use ``reanalyze_all_tracks.py`` for the audio analysis.
+"""
 
 import asyncio
 import os
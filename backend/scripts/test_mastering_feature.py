@@ -57,6 +57,8 @@ async def test_mastering_quality():
             print()
             print(f"LUFS: {mastering_quality['lufs']} ({mastering_quality['lufs_grade']})")
             print(f"Peak: {mastering_quality['peak_db']} dBFS")
+            print(f"True Peak: {mastering_quality['true_peak_dbtp']} dBTP")
+            print(f"Loudness Range: {mastering_quality['loudness_range']} LU")
             print(f"RMS: {mastering_quality['rms_db']} dBFS")
             print(f"Dynamic Range: {mastering_quality['dynamic_range']} DR ({mastering_quality['dr_grade']})")
             print(f"Overall Quality: {mastering_quality['overall_quality']}/100 ({mastering_quality['quality_grade']})")